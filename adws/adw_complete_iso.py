@@ -39,6 +39,7 @@ from adw_modules.state import ADWState
 from adw_modules.github import make_issue_comment
 from adw_modules.workflow_ops import format_issue_message
 from adw_modules.utils import setup_logger, check_env_vars
+from adw_modules.heartbeat import start_heartbeat
 from adw_modules.worktree_ops import validate_worktree, remove_worktree
 
 # Agent name constant
@@ -213,6 +214,7 @@ def main():
     # Set up logger with ADW ID
     logger = setup_logger(adw_id, "adw_complete_iso")
     logger.info(f"ADW Complete Iso starting - ID: {adw_id}, Issue: {issue_number}")
+    start_heartbeat(adw_id, "adw_complete_iso")
 
     # Validate environment
     check_env_vars(logger)
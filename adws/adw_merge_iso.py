@@ -4,11 +4,16 @@
 # ///
 
 """
-ADW Merge Isolated - Agent-Based Worktree Merge
+ADW Merge Isolated - Queued Worktree Merge
 
-This workflow uses the agent pattern to merge an isolated ADW worktree into main.
-Unlike the previous direct-execution approach, this delegates the merge to a Claude
-agent that can handle errors, fix issues, and retry within the same context.
+This workflow merges an isolated ADW worktree into main through the merge queue
+(utils/merge/queue.py): the branch is merged in a scratch worktree together with
+any other ADWs waiting to merge, validated once per batch and pushed, without
+touching the main checkout.
+
+Branches that conflict are handed to a Claude agent that can handle errors, fix
+issues, and retry within the same context. The agent also takes over if the queue
+cannot run, or for every merge with ADW_MERGE_EXECUTOR=agent.
 
 Usage:
   uv run adw_merge_iso.py <adw-id> [merge-method]
@@ -23,6 +28,10 @@ The agent will:
 3. Handle any errors (test failures, conflicts, config issues)
 4. Retry operations after fixing issues
 5. Only fail if truly unable to proceed after multiple attempts
+
+Environment:
+  ADW_MERGE_EXECUTOR: "queue" (default) or "agent"
+  ADW_MERGE_QUEUE_BATCH_SIZE: Most ADWs validated together (default: 4)
 """
 
 import sys
@@ -32,12 +41,15 @@ from dotenv import load_dotenv
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from adw_modules.data_types import AgentPromptResponse
 from adw_modules.state import ADWState
 from adw_modules.utils import setup_logger
+from adw_modules.heartbeat import start_heartbeat
 from adw_modules.websocket_client import WebSocketNotifier
 from adw_modules.workflow_ops import execute_merge_workflow
 from adw_modules.github import make_issue_comment_safe
 from adw_modules.workflow_ops import format_issue_message
+from utils.merge.queue import MergeQueue, MergeQueueError, MERGED, FAILED
 
 
 def parse_arguments():
@@ -61,8 +73,33 @@ def parse_arguments():
     return adw_id, merge_method
 
 
+def merge_with_queue(adw_id, branch_name, merge_method, logger):
+    """Merge through the merge queue.
+
+    Returns:
+        AgentPromptResponse-compatible result, or None if the agent should merge
+        instead (conflicts, or the queue could not run)
+    """
+    try:
+        entry = MergeQueue(logger=logger).merge(adw_id, branch_name, merge_method)
+    except (MergeQueueError, OSError) as e:
+        logger.warning(f"Merge queue unavailable, falling back to agent-based merge: {e}")
+        return None
+
+    if entry["status"] == MERGED:
+        return AgentPromptResponse(
+            output=f"Merged in queue batch {entry['batch_id']} as {entry['merged_commit']}",
+            success=True
+        )
+    if entry["status"] == FAILED:
+        return AgentPromptResponse(output=entry["error"] or "Merge queue rejected the branch", success=False)
+
+    logger.info(f"Merge queue could not merge cleanly ({entry['error']}), handing over to agent")
+    return None
+
+
 def main():
-    """Main entry point - orchestrate agent-based merge."""
+    """Main entry point - orchestrate queued or agent-based merge."""
     load_dotenv()
 
     # Parse arguments
@@ -71,6 +108,7 @@ def main():
     # Setup logger
     logger = setup_logger(adw_id)
     logger.info(f"ADW Merge ISO (Agent-Based) starting - ID: {adw_id}, Method: {merge_method}")
+    start_heartbeat(adw_id, "adw_merge_iso")
 
     # Load state
     state = ADWState.load(adw_id)
@@ -103,22 +141,30 @@ def main():
             state
         )
 
-    # Execute merge using agent pattern
-    # The agent will handle errors, fix issues, and retry within the same context
-    notifier.notify_progress(
-        "adw_merge_iso", 30, "Merging",
-        "Agent executing merge workflow..."
-    )
-
     try:
-        response = execute_merge_workflow(
-            adw_id=adw_id,
-            merge_method=merge_method,
-            logger=logger,
-        )
+        response = None
+        if os.getenv("ADW_MERGE_EXECUTOR", "queue") != "agent":
+            notifier.notify_progress(
+                "adw_merge_iso", 30, "Merging",
+                "Waiting in merge queue..."
+            )
+            response = merge_with_queue(adw_id, branch_name, merge_method, logger)
+
+        if response is None:
+            # Execute merge using agent pattern
+            # The agent will handle errors, fix issues, and retry within the same context
+            notifier.notify_progress(
+                "adw_merge_iso", 30, "Merging",
+                "Agent executing merge workflow..."
+            )
+            response = execute_merge_workflow(
+                adw_id=adw_id,
+                merge_method=merge_method,
+                logger=logger,
+            )
 
         if response.success:
-            logger.info("Agent-based merge completed successfully")
+            logger.info(f"Merge completed successfully: {response.output}")
             notifier.notify_complete(
                 "adw_merge_iso",
                 f"Successfully merged {branch_name} to main"
@@ -129,7 +175,7 @@ def main():
                     issue_number,
                     format_issue_message(
                         adw_id, "merger",
-                        f"Successfully merged `{branch_name}` to main using agent-based workflow"
+                        f"Successfully merged `{branch_name}` to main"
                     ),
                     state
                 )
@@ -0,0 +1,287 @@
+"""
+Activity Retention - Rolls up and archives old adw_activity_logs rows.
+
+Every state change and every POST /adws/{adw_id}/activity adds a row to
+adw_activity_logs, and soft-deleting an ADW leaves its rows behind, so the
+table only ever grows. The trigger server calls run() in the background
+every ADW_ACTIVITY_RETENTION_INTERVAL_SECONDS:
+
+1. Archive: the full activity history of ADWs that are soft-deleted, gone
+   from adw_states, or completed more than archive_after_days ago is moved
+   verbatim into the archive database (agentickanban_archive.db next to
+   the main database), where GET /adws/{adw_id}/activity still finds it.
+2. Roll up: per-event rows older than rollup_after_days that are still in
+   the main database are folded into per-ADW daily counts in
+   adw_activity_daily and deleted.
+3. Vacuum: pages freed by the deletes are returned to the filesystem with
+   PRAGMA incremental_vacuum. This needs auto_vacuum = INCREMENTAL, which
+   new databases get from schema.sql; existing databases are converted
+   once with enable_incremental_vacuum() (a full VACUUM, run it while the
+   board is idle).
+
+Rows are moved in batches of batch_size, each in its own short BEGIN
+IMMEDIATE transaction with a pause in between, so workflows writing state
+and activity are never locked out for longer than one batch.
+
+Usage:
+    retention = ActivityRetention()
+    stats = retention.run()
+    print(stats["archived_rows"], stats["rolled_up_rows"])
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from adw_modules.db_paths import ensure_tables, get_default_db_path
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive.adw_activity_logs (
+    id INTEGER PRIMARY KEY,
+    adw_id TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    event_data TEXT,
+    field_changed TEXT,
+    old_value TEXT,
+    new_value TEXT,
+    user TEXT,
+    workflow_step TEXT,
+    timestamp TIMESTAMP NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS archive.idx_archived_activity_adw_id
+    ON adw_activity_logs(adw_id, timestamp DESC, id DESC);
+"""
+
+LOG_COLUMNS = (
+    "id, adw_id, event_type, event_data, field_changed, old_value, new_value, "
+    "user, workflow_step, timestamp"
+)
+
+# ADWs whose whole history moves to the archive (GET /adws/{adw_id}/activity
+# reads it from there once nothing is left in the main database)
+ARCHIVABLE_ADWS_SQL = """
+    SELECT adw_id FROM adw_states
+    WHERE (deleted_at IS NOT NULL
+           OR (status = 'completed' AND COALESCE(completed_at, updated_at) < datetime('now', ?)))
+      AND EXISTS (SELECT 1 FROM adw_activity_logs l WHERE l.adw_id = adw_states.adw_id)
+    UNION
+    SELECT DISTINCT l.adw_id FROM adw_activity_logs l
+    WHERE NOT EXISTS (SELECT 1 FROM adw_states s WHERE s.adw_id = l.adw_id)
+"""
+
+ROLLUP_SQL = """
+    INSERT INTO adw_activity_daily (adw_id, day, event_type, event_count, first_at, last_at)
+    SELECT adw_id, date(timestamp), event_type, COUNT(*), MIN(timestamp), MAX(timestamp)
+    FROM adw_activity_logs
+    WHERE id IN (SELECT id FROM temp.retention_batch)
+    GROUP BY adw_id, date(timestamp), event_type
+    ON CONFLICT (adw_id, day, event_type) DO UPDATE SET
+        event_count = event_count + excluded.event_count,
+        first_at = MIN(first_at, excluded.first_at),
+        last_at = MAX(last_at, excluded.last_at)
+"""
+
+# Pages released per incremental_vacuum step
+VACUUM_STEP_PAGES = 2000
+
+
+def default_archive_path(db_path: Path) -> Path:
+    """The archive database that sits next to db_path."""
+    return db_path.with_name(f"{db_path.stem}_archive{db_path.suffix}")
+
+
+class ActivityRetention:
+    """Archives, rolls up and vacuums adw_activity_logs in small batches."""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        archive_path: Optional[Path] = None,
+        rollup_after_days: Optional[float] = None,
+        archive_after_days: Optional[float] = None,
+        batch_size: int = 500,
+        pause: float = 0.05
+    ):
+        """
+        Initialize the retention engine.
+
+        Args:
+            db_path: SQLite database path (defaults to the ADW database)
+            archive_path: Archive database path (defaults to <db>_archive.db)
+            rollup_after_days: Age after which per-event rows are rolled up
+                (ADW_ACTIVITY_ROLLUP_DAYS, default 30)
+            archive_after_days: Time since completion after which an ADW's
+                history is archived (ADW_ACTIVITY_ARCHIVE_DAYS, default 7)
+            batch_size: Rows moved per write transaction
+            pause: Seconds to sleep between batches so writers get in
+        """
+        self.db_path = Path(db_path or get_default_db_path())
+        self.archive_path = Path(archive_path or default_archive_path(self.db_path))
+        self.rollup_after_days = (
+            rollup_after_days if rollup_after_days is not None
+            else float(os.getenv("ADW_ACTIVITY_ROLLUP_DAYS", "30"))
+        )
+        self.archive_after_days = (
+            archive_after_days if archive_after_days is not None
+            else float(os.getenv("ADW_ACTIVITY_ARCHIVE_DAYS", "7"))
+        )
+        self.batch_size = batch_size
+        self.pause = pause
+        self._stop = threading.Event()
+
+    def _connect(self) -> sqlite3.Connection:
+        ensure_tables(self.db_path, "adw_activity_daily")
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("ATTACH DATABASE ? AS archive", (str(self.archive_path),))
+        conn.executescript(ARCHIVE_SCHEMA)
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS retention_batch (id INTEGER PRIMARY KEY)")
+        return conn
+
+    def stop(self) -> None:
+        """Ask a running run() to return after its current batch."""
+        self._stop.set()
+
+    def _batches(self, conn: sqlite3.Connection, select_ids: str, params: tuple, move: List[str]) -> int:
+        """
+        Repeatedly load up to batch_size ids from select_ids into
+        temp.retention_batch and run the move statements on them, one
+        IMMEDIATE transaction per batch, until no ids are left.
+
+        Returns:
+            Number of rows moved
+        """
+        moved = 0
+        while not self._stop.is_set():
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM temp.retention_batch")
+                count = conn.execute(
+                    f"INSERT INTO temp.retention_batch (id) {select_ids} LIMIT ?",
+                    params + (self.batch_size,)
+                ).rowcount
+                for statement in move:
+                    conn.execute(statement)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            moved += count
+            if count < self.batch_size:
+                break
+            time.sleep(self.pause)
+        return moved
+
+    def archive(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        """Move the activity of finished and deleted ADWs to the archive database."""
+        adw_ids = [
+            row["adw_id"] for row in
+            conn.execute(ARCHIVABLE_ADWS_SQL, (f"-{self.archive_after_days} days",))
+        ]
+        archived_adws = archived_rows = 0
+        for adw_id in adw_ids:
+            if self._stop.is_set():
+                break
+            moved = self._batches(
+                conn,
+                "SELECT id FROM main.adw_activity_logs WHERE adw_id = ?",
+                (adw_id,),
+                [
+                    f"""
+                    INSERT OR IGNORE INTO archive.adw_activity_logs ({LOG_COLUMNS})
+                    SELECT {LOG_COLUMNS} FROM main.adw_activity_logs
+                    WHERE id IN (SELECT id FROM temp.retention_batch)
+                    """,
+                    "DELETE FROM main.adw_activity_logs WHERE id IN (SELECT id FROM temp.retention_batch)",
+                ]
+            )
+            if moved:
+                archived_adws += 1
+                archived_rows += moved
+        return {"archived_adws": archived_adws, "archived_rows": archived_rows}
+
+    def rollup(self, conn: sqlite3.Connection) -> int:
+        """Fold per-event rows older than rollup_after_days into adw_activity_daily."""
+        return self._batches(
+            conn,
+            "SELECT id FROM main.adw_activity_logs WHERE timestamp < datetime('now', ?)",
+            (f"-{self.rollup_after_days} days",),
+            [
+                ROLLUP_SQL,
+                "DELETE FROM main.adw_activity_logs WHERE id IN (SELECT id FROM temp.retention_batch)",
+            ]
+        )
+
+    def incremental_vacuum(self, conn: sqlite3.Connection) -> int:
+        """
+        Release free pages in VACUUM_STEP_PAGES steps.
+
+        Returns:
+            Pages released (0 unless auto_vacuum is INCREMENTAL)
+        """
+        if conn.execute("PRAGMA main.auto_vacuum").fetchone()[0] != 2:
+            return 0
+        released = 0
+        while not self._stop.is_set():
+            free = conn.execute("PRAGMA main.freelist_count").fetchone()[0]
+            if free == 0:
+                break
+            # execute() would release a single page; executescript() runs the pragma to completion
+            conn.executescript(f"PRAGMA main.incremental_vacuum({VACUUM_STEP_PAGES})")
+            released += min(free, VACUUM_STEP_PAGES)
+            time.sleep(self.pause)
+        return released
+
+    def enable_incremental_vacuum(self) -> bool:
+        """
+        Switch an existing database to auto_vacuum = INCREMENTAL.
+
+        Runs a full VACUUM, which locks the database for its duration.
+
+        Returns:
+            True if the database was converted, False if it already was
+        """
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return False
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        finally:
+            conn.close()
+        logger.info(f"Enabled incremental vacuum on {self.db_path}")
+        return True
+
+    def run(self) -> Dict[str, float]:
+        """
+        Archive, roll up and vacuum once.
+
+        Returns:
+            {"archived_adws", "archived_rows", "rolled_up_rows",
+             "vacuumed_pages", "seconds"}
+        """
+        self._stop.clear()
+        start = time.perf_counter()
+        conn = self._connect()
+        try:
+            stats: Dict[str, float] = dict(self.archive(conn))
+            stats["rolled_up_rows"] = self.rollup(conn)
+            stats["vacuumed_pages"] = self.incremental_vacuum(conn)
+        finally:
+            conn.close()
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+
+        if stats["archived_rows"] or stats["rolled_up_rows"]:
+            logger.info(
+                f"Activity retention archived {stats['archived_rows']} rows from "
+                f"{stats['archived_adws']} ADWs, rolled up {stats['rolled_up_rows']} rows and "
+                f"released {stats['vacuumed_pages']} pages in {stats['seconds']}s"
+            )
+        return stats
@@ -47,6 +47,8 @@ from typing import Optional, Dict, Any, Set
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+from adw_modules.artifact_index import index_artifact, spec_type_for_file, SCREENSHOT
+
 
 class AgentDirectoryMonitor:
     """
@@ -673,6 +675,7 @@ class AgentDirectoryMonitor:
                         # New screenshot found
                         self.seen_screenshots.add(screenshot_str)
                         self.logger.info(f"New screenshot detected: {screenshot_path.name}")
+                        index_artifact(self.adw_id, SCREENSHOT, screenshot_path, self.logger)
 
                         # Broadcast screenshot available event
                         self._broadcast_screenshot(screenshot_str)
@@ -721,6 +724,7 @@ class AgentDirectoryMonitor:
                 # New spec found
                 self.seen_specs.add(spec_str)
                 self.logger.info(f"New spec detected: {spec_path.name}")
+                index_artifact(self.adw_id, spec_type_for_file(spec_path.name), spec_path, self.logger)
 
                 # Broadcast spec created event
                 self._broadcast_spec(spec_str)
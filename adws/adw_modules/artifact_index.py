@@ -0,0 +1,190 @@
+"""
+Artifact Index - SQLite index of files ADWs produce.
+
+Plans, patch specs and review screenshots are recorded in the
+``adw_artifacts`` table (type, path, size, mtime, content hash) when the
+workflow that produces them writes them, so looking one up is an indexed
+query instead of globbing the main specs directory and every worktree.
+
+Files written before the index existed are picked up by ``backfill()``,
+which crawls the project once (the trigger server runs it in the background
+while the index is empty). Lookups skip rows whose file has since been
+removed, and callers fall back to their old search when the index has no
+answer.
+
+Usage:
+    index_artifact("abc12345", "plan", "/path/to/trees/abc12345/specs/issue-1-adw-abc12345-sdlc_planner-x.md")
+    plan = ArtifactIndex().latest("abc12345", "plan")
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from adw_modules.db_paths import ensure_tables, get_default_db_path, get_project_root
+
+logger = logging.getLogger(__name__)
+
+# Artifact types
+PLAN = "plan"
+PATCH = "patch"
+SPEC = "spec"
+SCREENSHOT = "screenshot"
+
+# issue-{issue_number}-adw-{adw_id}-{agent_name}-{slug}.md
+SPEC_FILE_PATTERN = re.compile(r"^issue-\d+-adw-([A-Za-z0-9]{8})-(.+)\.md$")
+SCREENSHOT_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif")
+
+
+def spec_type_for_file(file_name: str) -> str:
+    """Artifact type of a spec file, from the agent named in its file name."""
+    if "sdlc_planner" in file_name:
+        return PLAN
+    if "patch" in file_name:
+        return PATCH
+    return SPEC
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactIndex:
+    """SQLite-backed index of ADW artifacts."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or get_default_db_path())
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Workflows can run before the server has migrated the database
+        ensure_tables(self.db_path, "adw_artifacts")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _describe(adw_id: str, artifact_type: str, path: Union[str, Path]) -> Dict[str, Any]:
+        path = Path(path).resolve()
+        stat = path.stat()
+        return {
+            "adw_id": adw_id,
+            "artifact_type": artifact_type,
+            "path": str(path),
+            "size_bytes": stat.st_size,
+            "mtime": stat.st_mtime,
+            "content_hash": _hash_file(path),
+        }
+
+    def _upsert(self, conn: sqlite3.Connection, artifacts: List[Dict[str, Any]]) -> None:
+        conn.executemany(
+            """
+            INSERT INTO adw_artifacts (adw_id, artifact_type, path, size_bytes, mtime, content_hash)
+            VALUES (:adw_id, :artifact_type, :path, :size_bytes, :mtime, :content_hash)
+            ON CONFLICT(adw_id, path) DO UPDATE SET
+                artifact_type = excluded.artifact_type,
+                size_bytes = excluded.size_bytes,
+                mtime = excluded.mtime,
+                content_hash = excluded.content_hash,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            artifacts
+        )
+
+    def record(self, adw_id: str, artifact_type: str, path: Union[str, Path]) -> Dict[str, Any]:
+        """
+        Index a file, or refresh its entry if it is already indexed.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        artifact = self._describe(adw_id, artifact_type, path)
+        with self._connect() as conn:
+            self._upsert(conn, [artifact])
+        return artifact
+
+    def find(self, adw_id: str, artifact_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Indexed artifacts of an ADW that still exist, most recently modified first."""
+        query = "SELECT * FROM adw_artifacts WHERE adw_id = ?"
+        params: List[Any] = [adw_id]
+        if artifact_type:
+            query += " AND artifact_type = ?"
+            params.append(artifact_type)
+        query += " ORDER BY mtime DESC"
+
+        with self._connect() as conn:
+            rows = [dict(row) for row in conn.execute(query, params)]
+        return [row for row in rows if os.path.exists(row["path"])]
+
+    def latest(self, adw_id: str, artifact_type: str) -> Optional[Dict[str, Any]]:
+        """Most recently modified existing artifact of a type, if any."""
+        artifacts = self.find(adw_id, artifact_type)
+        return artifacts[0] if artifacts else None
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM adw_artifacts").fetchone()[0]
+
+    def backfill(self, project_root: Optional[Path] = None) -> int:
+        """
+        Index artifacts written before the index existed.
+
+        Crawls specs/ in the project and in every worktree (including nested
+        trees/*/trees/*), and agents/*/*/review_img/ for screenshots.
+
+        Returns:
+            Number of files indexed
+        """
+        root = Path(project_root or get_project_root())
+        specs_dirs = [root / "specs", *root.glob("trees/*/specs"), *root.glob("trees/*/trees/*/specs")]
+
+        artifacts = []
+        for specs_dir in specs_dirs:
+            for spec in specs_dir.glob("issue-*-adw-*.md"):
+                match = SPEC_FILE_PATTERN.match(spec.name)
+                if match:
+                    self._add_described(artifacts, match.group(1), spec_type_for_file(spec.name), spec)
+
+        for screenshot_dir in root.glob("agents/*/*/review_img"):
+            adw_id = screenshot_dir.parent.parent.name
+            for screenshot in screenshot_dir.iterdir():
+                if screenshot.suffix.lower() in SCREENSHOT_EXTENSIONS:
+                    self._add_described(artifacts, adw_id, SCREENSHOT, screenshot)
+
+        with self._connect() as conn:
+            self._upsert(conn, artifacts)
+        logger.info(f"Backfilled {len(artifacts)} artifacts from {root}")
+        return len(artifacts)
+
+    def _add_described(self, artifacts: List[Dict[str, Any]], adw_id: str, artifact_type: str, path: Path) -> None:
+        try:
+            artifacts.append(self._describe(adw_id, artifact_type, path))
+        except OSError as e:
+            logger.warning(f"Skipping unreadable artifact {path}: {e}")
+
+    def backfill_if_empty(self, project_root: Optional[Path] = None) -> int:
+        """Run the one-off backfill unless the index already has entries."""
+        if self.count():
+            return 0
+        return self.backfill(project_root)
+
+
+def index_artifact(
+    adw_id: str,
+    artifact_type: str,
+    path: Union[str, Path],
+    log: Optional[logging.Logger] = None
+) -> None:
+    """Index an artifact from a workflow; failures are logged, never raised."""
+    try:
+        ArtifactIndex().record(adw_id, artifact_type, path)
+    except (OSError, sqlite3.Error) as e:
+        (log or logger).warning(f"Failed to index {artifact_type} artifact {path}: {e}")
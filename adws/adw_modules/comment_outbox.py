@@ -0,0 +1,324 @@
+"""
+Comment Outbox - Durable, coalescing queue for GitHub issue comments.
+
+Workflow steps post progress comments constantly, and each one used to block
+the workflow on a `gh issue comment` subprocess. make_issue_comment() now
+appends the comment to an outbox table in the ADW SQLite database and
+returns; a background sender thread drains the table, joining consecutive
+pending messages for the same issue into a single comment and retrying
+failed posts with exponential backoff.
+
+Rows are claimed under BEGIN IMMEDIATE with a lease, so several workflow
+processes can share the outbox without double-posting, and rows left behind
+by a process that died mid-send are picked up again once the lease expires.
+A process that has queued comments flushes its outbox at exit. Sent rows
+are deleted after SENT_RETENTION_SECONDS.
+
+Set ADW_COMMENT_OUTBOX=0 to post synchronously instead.
+
+Usage:
+    outbox = get_comment_outbox()
+    outbox.enqueue("owner/repo", "42", "[ADW-AGENTS] abc123_ops: ✅ Tests passed")
+"""
+
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from adw_modules.db_paths import ensure_tables, get_default_db_path
+
+logger = logging.getLogger(__name__)
+
+# GitHub rejects comment bodies over 65536 characters
+MAX_COMMENT_CHARS = 60000
+
+# Bodies are prefixed with this bot identifier; coalesced comments keep only one
+BOT_PREFIX = "[ADW-AGENTS]"
+
+# How long a workflow process waits at exit for its queued comments
+EXIT_FLUSH_TIMEOUT = 10.0
+
+# Sent rows are kept this long
+SENT_RETENTION_SECONDS = 7 * 24 * 3600
+
+PostComment = Callable[[str, str, str], Optional[str]]
+
+
+def _coalesce(bodies: List[str]) -> str:
+    parts = []
+    for i, body in enumerate(bodies):
+        if i > 0 and body.startswith(BOT_PREFIX):
+            body = body[len(BOT_PREFIX):].lstrip()
+        parts.append(body)
+    return "\n\n".join(parts)
+
+
+class CommentOutbox:
+    """SQLite-backed comment queue with a background sender thread."""
+
+    def __init__(
+        self,
+        post: PostComment,
+        db_path: Optional[Path] = None,
+        flush_interval: float = 1.0,
+        max_attempts: int = 5,
+        base_backoff: float = 2.0,
+        lease_seconds: float = 120.0,
+        flush_at_exit: bool = False,
+    ):
+        """
+        Initialize the outbox.
+
+        Args:
+            post: Posts (repo_path, issue_id, body), returns an error message or None
+            db_path: SQLite database path (defaults to the ADW database)
+            flush_interval: Seconds the sender waits for more messages before posting
+            max_attempts: Attempts before a comment is marked failed
+            base_backoff: Retry delay in seconds, doubled on every attempt
+            lease_seconds: Time after which a claimed but unsent batch is retried
+            flush_at_exit: Flush at interpreter exit once something was enqueued
+        """
+        self.post = post
+        self.db_path = Path(db_path or get_default_db_path())
+        self.flush_interval = flush_interval
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.lease_seconds = lease_seconds
+        self.flush_at_exit = flush_at_exit
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        ensure_tables(self.db_path, "github_comment_outbox")
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._exit_flush_registered = False
+        self._last_prune = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=10.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def enqueue(self, repo_path: str, issue_id: str, body: str) -> int:
+        """
+        Queue a comment and return immediately.
+
+        Returns:
+            Outbox row ID
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO github_comment_outbox (repo_path, issue_id, body) VALUES (?, ?, ?)",
+                (repo_path, str(issue_id), body)
+            )
+            row_id = cursor.lastrowid
+        with self._lock:
+            if self.flush_at_exit and not self._exit_flush_registered:
+                atexit.register(self.flush, EXIT_FLUSH_TIMEOUT)
+                self._exit_flush_registered = True
+        self.start()
+        self._wake.set()
+        return row_id
+
+    def start(self) -> None:
+        """Start the background sender if it isn't running."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="comment-outbox", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background sender. Unsent comments stay queued."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(timeout=self.flush_interval)
+            self._wake.clear()
+            # Give a burst of progress messages a moment to accumulate
+            if self._stop.wait(self.flush_interval):
+                break
+            try:
+                while self.send_due() and not self._stop.is_set():
+                    pass
+                if time.time() - self._last_prune > 3600:
+                    self.prune()
+            except Exception as e:
+                logger.error(f"Comment outbox sender failed: {e}", exc_info=True)
+
+    def _claim(self) -> List[Dict]:
+        """Claim every due pending comment and group them into per-issue batches."""
+        now = time.time()
+        token = uuid.uuid4().hex
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                """
+                SELECT id, repo_path, issue_id, body, attempts FROM github_comment_outbox
+                WHERE (status = 'pending' AND next_attempt_at <= ?)
+                   OR (status = 'sending' AND claimed_at < ?)
+                ORDER BY id
+                """,
+                (now, now - self.lease_seconds)
+            ).fetchall()
+            if rows:
+                placeholders = ",".join("?" * len(rows))
+                conn.execute(
+                    f"""
+                    UPDATE github_comment_outbox SET status = 'sending', claim_token = ?, claimed_at = ?
+                    WHERE id IN ({placeholders})
+                    """,
+                    (token, now, *[row["id"] for row in rows])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        batches: Dict[tuple, Dict] = {}
+        for row in rows:
+            key = (row["repo_path"], row["issue_id"])
+            batch = batches.get(key)
+            # Start a new comment rather than exceed GitHub's body limit
+            if batch is None or sum(len(b) for b in batch["bodies"]) + len(row["body"]) > MAX_COMMENT_CHARS:
+                if batch is not None:
+                    batches[(*key, batch["ids"][0])] = batches.pop(key)
+                batch = batches[key] = {
+                    "repo_path": row["repo_path"],
+                    "issue_id": row["issue_id"],
+                    "ids": [],
+                    "bodies": [],
+                    "attempts": 0,
+                }
+            batch["ids"].append(row["id"])
+            batch["bodies"].append(row["body"])
+            batch["attempts"] = max(batch["attempts"], row["attempts"])
+        return sorted(batches.values(), key=lambda b: b["ids"][0])
+
+    def _finish(self, batch: Dict, error: Optional[str]) -> None:
+        placeholders = ",".join("?" * len(batch["ids"]))
+        with self._connect() as conn:
+            if error is None:
+                conn.execute(
+                    f"""
+                    UPDATE github_comment_outbox
+                    SET status = 'sent', sent_at = CURRENT_TIMESTAMP, claim_token = NULL, last_error = NULL
+                    WHERE id IN ({placeholders})
+                    """,
+                    batch["ids"]
+                )
+                return
+
+            attempts = batch["attempts"] + 1
+            status = "failed" if attempts >= self.max_attempts else "pending"
+            next_attempt_at = time.time() + self.base_backoff * 2 ** (attempts - 1)
+            conn.execute(
+                f"""
+                UPDATE github_comment_outbox
+                SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?, claim_token = NULL
+                WHERE id IN ({placeholders})
+                """,
+                (status, attempts, next_attempt_at, error, *batch["ids"])
+            )
+        if status == "failed":
+            logger.error(f"Giving up on comment for issue #{batch['issue_id']} after {attempts} attempts: {error}")
+        else:
+            logger.warning(f"Comment for issue #{batch['issue_id']} failed, retrying: {error}")
+
+    def send_due(self) -> int:
+        """
+        Post every comment that is due now, one coalesced comment per issue.
+
+        Returns:
+            Number of comments posted to GitHub
+        """
+        posted = 0
+        for batch in self._claim():
+            try:
+                error = self.post(batch["repo_path"], batch["issue_id"], _coalesce(batch["bodies"]))
+            except Exception as e:
+                error = str(e)
+            self._finish(batch, error)
+            if error is None:
+                posted += 1
+        return posted
+
+    def prune(self, older_than: float = SENT_RETENTION_SECONDS) -> int:
+        """
+        Delete comments sent more than older_than seconds ago.
+
+        Returns:
+            Number of rows deleted
+        """
+        self._last_prune = time.time()
+        with self._connect() as conn:
+            return conn.execute(
+                "DELETE FROM github_comment_outbox WHERE status = 'sent' AND sent_at < datetime('now', ?)",
+                (f"-{older_than} seconds",)
+            ).rowcount
+
+    def pending_count(self) -> int:
+        """Number of comments not yet sent or given up on."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM github_comment_outbox WHERE status IN ('pending', 'sending')"
+            ).fetchone()[0]
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """
+        Send queued comments now, waiting out retry backoff up to the timeout.
+
+        Returns:
+            True if nothing is left pending
+        """
+        self.stop()
+        deadline = time.monotonic() + timeout
+        while True:
+            self.send_due()
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT MIN(next_attempt_at) FROM github_comment_outbox WHERE status = 'pending'"
+                ).fetchone()
+            next_attempt_at = row[0]
+            if next_attempt_at is None:
+                return True
+            delay = max(0.0, next_attempt_at - time.time())
+            if time.monotonic() + delay > deadline:
+                return False
+            time.sleep(delay)
+
+
+_outbox: Optional[CommentOutbox] = None
+_outbox_lock = threading.Lock()
+
+
+def outbox_enabled() -> bool:
+    """Whether comments go through the outbox (ADW_COMMENT_OUTBOX, default on)."""
+    return os.getenv("ADW_COMMENT_OUTBOX", "1").lower() not in ("0", "false", "no")
+
+
+def get_comment_outbox() -> CommentOutbox:
+    """Process-wide outbox posting through the gh CLI, flushed at exit once used."""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            from adw_modules.github import post_issue_comment
+
+            _outbox = CommentOutbox(post=post_issue_comment, flush_at_exit=True)
+        return _outbox
@@ -0,0 +1,96 @@
+"""
+DB Paths - Locations of the project, its ADW database and its schema.
+
+adws/database/schema.sql is the only definition of the ADW database's
+tables. The server creates and migrates the database from it; modules that
+may run before the server has (the cron trigger, workflow processes) call
+ensure_tables() with the tables they use, which runs those tables' CREATE
+TABLE / CREATE INDEX statements from schema.sql once per process.
+
+Usage:
+    db_path = get_default_db_path()
+    ensure_tables(db_path, "adw_heartbeats")
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Set, Tuple, Union
+
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / "database" / "schema.sql"
+
+_CREATE_TABLE = re.compile(r"CREATE TABLE IF NOT EXISTS (\w+)\s*\(", re.IGNORECASE)
+_CREATE_INDEX = re.compile(r"CREATE (?:UNIQUE )?INDEX IF NOT EXISTS \w+\s+ON (\w+)\s*\(", re.IGNORECASE)
+
+_ensured: Set[Tuple[str, Tuple[str, ...]]] = set()
+_ensured_lock = threading.Lock()
+
+
+def get_project_root() -> Path:
+    """The main project's root directory, also when running inside trees/<adw_id>."""
+    project_root = Path(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    path_parts = project_root.parts
+    if 'trees' in path_parts:
+        project_root = Path(*path_parts[:path_parts.index('trees')])
+    return project_root
+
+
+def get_default_db_path() -> Path:
+    """Path of the main project's ADW database (worktree aware)."""
+    return get_project_root() / "adws" / "database" / "agentickanban.db"
+
+
+@lru_cache(maxsize=None)
+def schema_statements(*tables: str) -> List[str]:
+    """
+    CREATE TABLE and CREATE INDEX statements for tables, from schema.sql.
+
+    Raises:
+        ValueError: If a table is not defined in schema.sql
+    """
+    text = re.sub(r"--[^\n]*", "", SCHEMA_PATH.read_text())
+    creates = {}
+    indexes: List[Tuple[str, str]] = []
+    for statement in re.split(r";\s*\n", text):
+        statement = statement.strip()
+        if match := _CREATE_TABLE.match(statement):
+            creates[match.group(1)] = statement
+        elif match := _CREATE_INDEX.match(statement):
+            indexes.append((match.group(1), statement))
+
+    missing = [table for table in tables if table not in creates]
+    if missing:
+        raise ValueError(f"Tables not defined in {SCHEMA_PATH}: {missing}")
+    return [creates[table] for table in tables] + [
+        statement for table, statement in indexes if table in tables
+    ]
+
+
+def ensure_tables(db: Union[str, Path, sqlite3.Connection], *tables: str) -> None:
+    """
+    Create tables (and their indexes) from schema.sql if they don't exist.
+
+    Runs at most once per process for a given database path and tables.
+    """
+    if isinstance(db, sqlite3.Connection):
+        for statement in schema_statements(*tables):
+            db.execute(statement)
+        return
+
+    key = (str(Path(db).resolve()), tables)
+    if key in _ensured:
+        return
+    with _ensured_lock:
+        if key in _ensured:
+            return
+        conn = sqlite3.connect(str(db), timeout=10.0)
+        try:
+            with conn:
+                for statement in schema_statements(*tables):
+                    conn.execute(statement)
+        finally:
+            conn.close()
+        _ensured.add(key)
@@ -25,6 +25,13 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# All non-deleted ADWs, most recently updated first
+DISCOVER_ADWS_SQL = """
+    SELECT * FROM adw_states
+    WHERE deleted_at IS NULL
+    ORDER BY updated_at DESC
+"""
+
 
 def get_agents_directory() -> str:
     """Get the path to the agents directory."""
@@ -74,12 +81,7 @@ def _discover_from_database() -> List[Dict[str, Any]]:
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
-        # Query all non-deleted ADWs
-        cursor.execute("""
-            SELECT * FROM adw_states
-            WHERE deleted_at IS NULL
-            ORDER BY updated_at DESC
-        """)
+        cursor.execute(DISCOVER_ADWS_SQL)
         rows = cursor.fetchall()
         conn.close()
 
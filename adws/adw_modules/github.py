@@ -256,7 +256,9 @@ def make_issue_comment(issue_id: str, comment: str) -> None:
     """Post a comment to a GitHub issue using gh CLI.
 
     This function now automatically detects kanban mode and gracefully handles
-    missing GitHub issues by saving comments to files instead.
+    missing GitHub issues by saving comments to files instead. GitHub comments
+    are queued in the comment outbox and posted in the background (see
+    comment_outbox.py).
     """
     # Try to detect kanban mode from current execution context
     import glob
@@ -301,12 +303,35 @@ def make_issue_comment(issue_id: str, comment: str) -> None:
     if not comment.startswith(ADW_BOT_IDENTIFIER):
         comment = f"{ADW_BOT_IDENTIFIER} {comment}"
 
+    # Progress chatter goes through the outbox so the workflow never waits on gh
+    from .comment_outbox import get_comment_outbox, outbox_enabled
+    if outbox_enabled():
+        try:
+            get_comment_outbox().enqueue(repo_path, issue_id, comment)
+            return
+        except Exception as e:
+            logger.debug(f"Comment outbox unavailable, posting directly: {e}")
+
+    error = post_issue_comment(repo_path, issue_id, comment)
+    if error:
+        logger.warning(f"GitHub comment failed: {error}")
+
+
+def post_issue_comment(repo_path: str, issue_id: str, comment: str) -> Optional[str]:
+    """Post a comment body as-is with gh CLI.
+
+    Returns:
+        None if the comment was posted (or the issue doesn't exist),
+        otherwise the error message
+    """
+    logger = logging.getLogger(__name__)
+
     # Build command
     cmd = [
         "gh",
         "issue",
         "comment",
-        issue_id,
+        str(issue_id),
         "-R",
         repo_path,
         "--body",
@@ -318,19 +343,19 @@ def make_issue_comment(issue_id: str, comment: str) -> None:
 
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, env=env)
-
-        if result.returncode == 0:
-            logger.debug(f"Successfully posted comment to issue #{issue_id}")
-        else:
-            # Don't raise exceptions for missing GitHub issues - just log and continue
-            error_msg = result.stderr.strip() if result.stderr else f"GitHub CLI failed with code {result.returncode}"
-            if "Could not resolve to an issue" in error_msg:
-                logger.debug(f"GitHub issue #{issue_id} not found - this is expected in kanban mode")
-            else:
-                logger.warning(f"GitHub comment failed: {error_msg}")
     except Exception as e:
-        # Don't raise exceptions - just log and continue gracefully
-        logger.debug(f"GitHub comment error (continuing): {e}")
+        return f"GitHub comment error: {e}"
+
+    if result.returncode == 0:
+        logger.debug(f"Successfully posted comment to issue #{issue_id}")
+        return None
+
+    error_msg = result.stderr.strip() if result.stderr else f"GitHub CLI failed with code {result.returncode}"
+    # Missing GitHub issues are expected in kanban mode - nothing to retry
+    if "Could not resolve to an issue" in error_msg:
+        logger.debug(f"GitHub issue #{issue_id} not found - this is expected in kanban mode")
+        return None
+    return error_msg
 
 
 def mark_issue_in_progress(issue_id: str) -> None:
@@ -378,8 +403,14 @@ def mark_issue_in_progress(issue_id: str) -> None:
         print(f"Assigned issue #{issue_id} to self")
 
 
-def fetch_open_issues(repo_path: str) -> List[GitHubIssueListItem]:
-    """Fetch all open issues from the GitHub repository."""
+def fetch_open_issues(repo_path: str, updated_since: Optional[str] = None) -> List[GitHubIssueListItem]:
+    """Fetch open issues from the GitHub repository.
+
+    Args:
+        repo_path: owner/repo
+        updated_since: Optional ISO 8601 UTC timestamp - only issues updated
+            at or after it are returned (GitHub search ``updated:>=``)
+    """
     try:
         cmd = [
             "gh",
@@ -394,6 +425,8 @@ def fetch_open_issues(repo_path: str) -> List[GitHubIssueListItem]:
             "--limit",
             "1000",
         ]
+        if updated_since:
+            cmd.extend(["--search", f"updated:>={updated_since}"])
 
         # Set up environment with GitHub token if available
         env = get_github_env()
@@ -459,6 +492,70 @@ def fetch_issue_comments(repo_path: str, issue_number: int) -> List[Dict]:
         return []
 
 
+def fetch_latest_comments(
+    repo_path: str, issue_numbers: List[int], batch_size: int = 50
+) -> Dict[int, Optional[Dict]]:
+    """Fetch the latest comment of many issues with batched GraphQL queries.
+
+    One ``gh api graphql`` call covers up to batch_size issues (one aliased
+    ``issue(number:)`` field each) instead of one ``gh issue view`` per issue.
+
+    Args:
+        repo_path: owner/repo
+        issue_numbers: Issues to look up
+        batch_size: Issues per GraphQL query
+
+    Returns:
+        Dict of issue number to its latest comment (id, body, createdAt), or
+        None if it has no comments. Issues that could not be fetched (failed
+        batch, not an issue) are left out so callers can fall back.
+    """
+    owner, _, name = repo_path.partition("/")
+    env = get_github_env()
+    latest: Dict[int, Optional[Dict]] = {}
+
+    for start in range(0, len(issue_numbers), batch_size):
+        batch = issue_numbers[start:start + batch_size]
+        fields = " ".join(
+            f"i{number}: issue(number: {int(number)}) "
+            "{ comments(last: 1) { nodes { id body createdAt } } }"
+            for number in batch
+        )
+        query = (
+            "query($owner: String!, $name: String!) "
+            f"{{ repository(owner: $owner, name: $name) {{ {fields} }} }}"
+        )
+        cmd = [
+            "gh", "api", "graphql",
+            "-f", f"query={query}",
+            "-F", f"owner={owner}",
+            "-F", f"name={name}",
+        ]
+
+        # Missing issues come back as null with an error, which makes gh exit
+        # non-zero - still use whatever data was returned
+        result = subprocess.run(cmd, capture_output=True, text=True, env=env)
+        try:
+            data = json.loads(result.stdout) if result.stdout else {}
+        except json.JSONDecodeError as e:
+            print(f"ERROR: Failed to parse GraphQL comments response: {e}", file=sys.stderr)
+            continue
+
+        repository = (data.get("data") or {}).get("repository") or {}
+        if not repository and result.returncode != 0:
+            print(f"ERROR: Failed to fetch comments batch: {result.stderr}", file=sys.stderr)
+            continue
+
+        for number in batch:
+            issue = repository.get(f"i{number}")
+            if issue is None:
+                continue
+            nodes = issue["comments"]["nodes"]
+            latest[number] = nodes[-1] if nodes else None
+
+    return latest
+
+
 def find_keyword_from_comment(keyword: str, issue: GitHubIssue) -> Optional[GitHubComment]:
     """Find the latest comment containing a specific keyword.
     
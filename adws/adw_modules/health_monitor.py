@@ -0,0 +1,221 @@
+"""
+Health Monitor - Cached, background-refreshed system health checks.
+
+Health probes (load balancers, the kanban UI) hit the trigger server far more
+often than the underlying state changes, and the checks themselves shell out
+to git, gh and claude. This module runs the checks in-process on a schedule,
+off the event loop, and keeps the latest result of each check with its
+timestamp so the health endpoint can answer from memory.
+
+Checks are plain callables returning a CheckResult-like object (anything with
+success/error/warning/details attributes), e.g. the functions in
+adw_modules/health_checks.py. Expensive checks can be marked deep-only so they
+only run on an explicit deep refresh.
+
+Usage:
+    monitor = HealthMonitor(
+        checks={"git_repository": check_git_repo, "github_cli": check_github_cli},
+        deep_checks={"claude_code": check_claude_code},
+    )
+    monitor.start()                  # schedule background refreshes
+    monitor.snapshot()               # cached results, never blocks
+    await monitor.refresh(deep=True)  # run everything now
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; a final +Inf bucket is implied
+LATENCY_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (Prometheus-style upper bounds)."""
+
+    def __init__(self, buckets_ms: tuple = LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float) -> None:
+        """Record one observation."""
+        self.counts[bisect.bisect_left(self.buckets_ms, duration_ms)] += 1
+        self.count += 1
+        self.sum_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize with cumulative bucket counts keyed by upper bound."""
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip([*map(str, self.buckets_ms), "+Inf"], self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "avg_ms": round(self.sum_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "buckets_ms": buckets,
+        }
+
+
+class HealthMonitor:
+    """
+    Runs health checks in the background and caches their latest results.
+
+    Checks run concurrently in worker threads with a per-check timeout.
+    Concurrent refresh requests share a single in-flight run instead of
+    stacking subprocesses.
+    """
+
+    def __init__(
+        self,
+        checks: Dict[str, Callable[[], Any]],
+        deep_checks: Optional[Dict[str, Callable[[], Any]]] = None,
+        interval_seconds: float = 60.0,
+        check_timeout_seconds: float = 45.0,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            checks: Checks run on every scheduled refresh, keyed by name
+            deep_checks: Expensive checks only run by refresh(deep=True)
+            interval_seconds: Delay between scheduled refreshes
+            check_timeout_seconds: Time after which a check is reported failed
+        """
+        self.checks = checks
+        self.deep_checks = deep_checks or {}
+        self.interval_seconds = interval_seconds
+        self.check_timeout_seconds = check_timeout_seconds
+
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._histograms: Dict[str, LatencyHistogram] = {
+            name: LatencyHistogram() for name in [*self.checks, *self.deep_checks]
+        }
+        self._inflight: Dict[bool, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.last_refresh: Optional[str] = None
+
+    def start(self) -> None:
+        """Start the background refresh loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run_forever())
+
+    async def stop(self) -> None:
+        """Cancel the background refresh loop and any in-flight refresh."""
+        tasks = [t for t in [self._task, *self._inflight.values()] if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._inflight.clear()
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Scheduled health check failed: {e}", exc_info=True)
+            await asyncio.sleep(self.interval_seconds)
+
+    async def refresh(self, deep: bool = False) -> Dict[str, Any]:
+        """
+        Run the checks now and update the cache.
+
+        Args:
+            deep: Also run the deep-only checks
+
+        Returns:
+            Snapshot after the refresh
+        """
+        # Join an in-flight run of the same kind rather than starting another
+        task = self._inflight.get(deep)
+        if task is None or task.done():
+            task = asyncio.get_running_loop().create_task(self._refresh(deep))
+            self._inflight[deep] = task
+        await asyncio.shield(task)
+        return self.snapshot()
+
+    async def _refresh(self, deep: bool) -> None:
+        checks = dict(self.checks)
+        if deep:
+            checks.update(self.deep_checks)
+
+        await asyncio.gather(*(self._run_check(name, fn) for name, fn in checks.items()))
+        self.last_refresh = datetime.now().isoformat()
+
+    async def _run_check(self, name: str, fn: Callable[[], Any]) -> None:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                asyncio.to_thread(fn), timeout=self.check_timeout_seconds
+            )
+            entry = {
+                "success": bool(result.success),
+                "error": result.error,
+                "warning": getattr(result, "warning", None),
+                "details": result.details,
+            }
+        except asyncio.TimeoutError:
+            # The worker thread can't be interrupted; it finishes in the background
+            entry = {
+                "success": False,
+                "error": f"Check timed out after {self.check_timeout_seconds:g} seconds",
+                "warning": None,
+                "details": {},
+            }
+        except Exception as e:
+            entry = {"success": False, "error": f"Check raised: {e}", "warning": None, "details": {}}
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        self._histograms[name].observe(duration_ms)
+        entry["checked_at"] = datetime.now().isoformat()
+        entry["duration_ms"] = round(duration_ms, 3)
+        self._results[name] = entry
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the cached health state without running anything.
+
+        A check that hasn't run yet is reported as pending, and a check whose
+        details say skipped is reported as-is; neither counts as a failure.
+        Deep-only checks are reported from their last deep run.
+
+        Returns:
+            Dict with success, last_refresh, checks, warnings, errors and
+            latency histograms per check
+        """
+        checks = {}
+        errors: List[str] = []
+        warnings: List[str] = []
+        for name in [*self.checks, *self.deep_checks]:
+            entry = self._results.get(name)
+            if entry is None:
+                checks[name] = {"success": None, "pending": True}
+                continue
+            checks[name] = entry
+            if entry["details"].get("skipped"):
+                continue
+            if not entry["success"]:
+                errors.append(f"{name}: {entry['error'] or 'check failed'}")
+            elif entry["warning"]:
+                warnings.append(entry["warning"])
+
+        return {
+            "success": not errors,
+            "last_refresh": self.last_refresh,
+            "checks": checks,
+            "warnings": warnings,
+            "errors": errors,
+            "latency": {name: h.to_dict() for name, h in self._histograms.items()},
+        }
@@ -0,0 +1,182 @@
+"""
+Heartbeat - Process registration for workflow liveness checks.
+
+Every workflow process registers its PID in the adw_heartbeats table when it
+starts and a daemon thread refreshes the row's last_heartbeat every
+ADW_HEARTBEAT_INTERVAL_SECONDS. A normal interpreter exit (including
+sys.exit and uncaught exceptions) stamps exited_at; a process that is killed
+or crashes leaves the row open, which is how the liveness monitor tells a
+dead workflow from a long-running one.
+
+The trigger server also registers each process it launches as a 'launcher'
+row, so an ADW is covered from the moment it is spawned, including the
+composite workflows that only run other workflows as subprocesses.
+
+Set ADW_HEARTBEAT_INTERVAL_SECONDS=0 to disable heartbeats.
+
+Usage:
+    start_heartbeat(adw_id, "adw_build_iso")        # in the workflow process
+    register_launch(adw_id, process.pid, "adw_sdlc_iso")  # in the trigger
+"""
+
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from adw_modules.db_paths import ensure_tables, get_default_db_path
+
+logger = logging.getLogger(__name__)
+
+LAUNCHER = "launcher"
+WORKFLOW = "workflow"
+
+
+def heartbeat_interval() -> float:
+    return float(os.getenv("ADW_HEARTBEAT_INTERVAL_SECONDS", "10"))
+
+
+def process_start_time(pid: int) -> Optional[int]:
+    """
+    When a process started, in clock ticks since boot.
+
+    Together with the PID this identifies a process even after the PID has
+    been reused. Only available where /proc is (Linux).
+
+    Returns:
+        The start time, or None if the process is gone or /proc is unavailable
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # Field 22; the command name in field 2 may itself contain spaces and parentheses
+    return int(stat.rsplit(")", 1)[1].split()[19])
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    ensure_tables(db_path, "adw_heartbeats")
+    return sqlite3.connect(str(db_path), timeout=10.0, isolation_level=None)
+
+
+def _register(db_path: Path, adw_id: str, pid: int, role: str, workflow_name: str) -> None:
+    now = time.time()
+    with _connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO adw_heartbeats
+                (adw_id, pid, role, workflow_name, started_at, process_start, last_heartbeat)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (adw_id, pid, role, workflow_name, now, process_start_time(pid), now)
+        )
+
+
+class WorkflowHeartbeat:
+    """Registers the current process for an ADW and keeps its heartbeat fresh."""
+
+    def __init__(
+        self,
+        adw_id: str,
+        workflow_name: str,
+        db_path: Optional[Path] = None,
+        interval: Optional[float] = None
+    ):
+        self.adw_id = adw_id
+        self.workflow_name = workflow_name
+        self.db_path = Path(db_path or get_default_db_path())
+        self.interval = interval if interval is not None else heartbeat_interval()
+        self.pid = os.getpid()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Register the process and start beating."""
+        _register(self.db_path, self.adw_id, self.pid, WORKFLOW, self.workflow_name)
+        self._thread = threading.Thread(
+            target=self._run, name=f"heartbeat-{self.adw_id}", daemon=True
+        )
+        self._thread.start()
+
+    def beat(self) -> None:
+        with _connect(self.db_path) as conn:
+            conn.execute(
+                "UPDATE adw_heartbeats SET last_heartbeat = ? WHERE adw_id = ? AND pid = ?",
+                (time.time(), self.adw_id, self.pid)
+            )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.beat()
+            except sqlite3.Error as e:
+                logger.debug(f"Heartbeat for {self.adw_id} failed: {e}")
+
+    def stop(self) -> None:
+        """Stop beating and record a clean exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        try:
+            with _connect(self.db_path) as conn:
+                conn.execute(
+                    "UPDATE adw_heartbeats SET exited_at = ? WHERE adw_id = ? AND pid = ?",
+                    (time.time(), self.adw_id, self.pid)
+                )
+        except sqlite3.Error as e:
+            logger.debug(f"Could not record exit of {self.adw_id}: {e}")
+
+
+_heartbeat: Optional[WorkflowHeartbeat] = None
+
+
+def start_heartbeat(
+    adw_id: str,
+    workflow_name: str,
+    db_path: Optional[Path] = None
+) -> Optional[WorkflowHeartbeat]:
+    """
+    Start this process's heartbeat for an ADW, stopped cleanly at exit.
+
+    Does nothing if heartbeats are disabled, the ADW database (db_path,
+    defaulting to the project database) doesn't exist yet, or the process
+    is already beating.
+
+    Returns:
+        The running heartbeat, or None
+    """
+    global _heartbeat
+    if _heartbeat is not None or heartbeat_interval() <= 0:
+        return _heartbeat
+
+    db_path = Path(db_path or get_default_db_path())
+    if not db_path.exists():
+        return None
+
+    heartbeat = WorkflowHeartbeat(adw_id, workflow_name, db_path=db_path)
+    try:
+        heartbeat.start()
+    except sqlite3.Error as e:
+        logger.warning(f"Could not register heartbeat for {adw_id}: {e}")
+        return None
+    atexit.register(heartbeat.stop)
+    _heartbeat = heartbeat
+    return heartbeat
+
+
+def register_launch(adw_id: str, pid: int, workflow_name: str, db_path: Optional[Path] = None) -> None:
+    """
+    Record a workflow process spawned by the trigger server.
+
+    Launching a workflow also clears a previous stuck flag on the ADW, so the
+    new run is monitored afresh.
+    """
+    db_path = Path(db_path or get_default_db_path())
+    _register(db_path, adw_id, pid, LAUNCHER, workflow_name)
+    with _connect(db_path) as conn:
+        conn.execute("UPDATE adw_states SET is_stuck = 0 WHERE adw_id = ? AND is_stuck = 1", (adw_id,))
@@ -0,0 +1,204 @@
+"""
+Issue Poller - Incremental GitHub issue polling for the cron trigger.
+
+Each cycle lists only the open issues updated since the last cycle's
+watermark (GitHub search ``updated:>=``), fetches their latest comments in
+batched GraphQL queries and decides which ones should trigger a workflow.
+Watermarks and per-issue state (latest comment acted on, processed flag)
+live in the ADW SQLite database, so a restart resumes where the previous
+run stopped instead of re-inspecting every open issue.
+
+Trigger rules (unchanged from the original cron trigger):
+1. An unprocessed issue with no comments is processed
+2. An issue whose latest comment is exactly 'adw' is processed, once per comment
+"""
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from adw_modules.db_paths import ensure_tables, get_default_db_path
+from adw_modules.github import fetch_issue_comments, fetch_latest_comments, fetch_open_issues
+
+
+class PollStateStore:
+    """SQLite-backed watermarks and per-issue state for issue polling."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or get_default_db_path())
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # The cron trigger can run before the server has migrated the database
+        ensure_tables(self.db_path, "github_poll_watermarks", "github_issue_poll_state")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get_watermark(self, repo_path: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT updated_at FROM github_poll_watermarks WHERE repo_path = ?",
+                (repo_path,)
+            ).fetchone()
+        return row["updated_at"] if row else None
+
+    def set_watermark(self, repo_path: str, updated_at: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO github_poll_watermarks (repo_path, updated_at, polled_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(repo_path) DO UPDATE SET
+                    updated_at = excluded.updated_at,
+                    polled_at = excluded.polled_at
+                """,
+                (repo_path, updated_at)
+            )
+
+    def get_issue_states(self, repo_path: str, issue_numbers: List[int]) -> Dict[int, sqlite3.Row]:
+        if not issue_numbers:
+            return {}
+        placeholders = ",".join("?" * len(issue_numbers))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT issue_number, last_comment_id, processed_at
+                FROM github_issue_poll_state
+                WHERE repo_path = ? AND issue_number IN ({placeholders})
+                """,
+                (repo_path, *issue_numbers)
+            ).fetchall()
+        return {row["issue_number"]: row for row in rows}
+
+    def record_issue(
+        self,
+        repo_path: str,
+        issue_number: int,
+        last_comment_id: Optional[str],
+        processed: bool = False,
+    ) -> None:
+        """Remember the latest comment acted on (and whether a workflow was triggered)."""
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO github_issue_poll_state (repo_path, issue_number, last_comment_id, processed_at)
+                VALUES (?, ?, ?, CASE WHEN ? THEN CURRENT_TIMESTAMP END)
+                ON CONFLICT(repo_path, issue_number) DO UPDATE SET
+                    last_comment_id = excluded.last_comment_id,
+                    processed_at = COALESCE(excluded.processed_at, processed_at)
+                """,
+                (repo_path, issue_number, last_comment_id, processed)
+            )
+
+
+def _format_timestamp(dt) -> str:
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class IssuePoller:
+    """Finds and triggers qualifying issues, inspecting only recently updated ones."""
+
+    def __init__(
+        self,
+        repo_path: str,
+        store: PollStateStore,
+        trigger: Callable[[int], bool],
+        max_workers: int = 4,
+    ):
+        """
+        Args:
+            repo_path: owner/repo
+            store: Watermark and issue state store
+            trigger: Starts the workflow for an issue, returns success
+            max_workers: Parallel per-issue comment fetches when the
+                batched GraphQL lookup misses issues
+        """
+        self.repo_path = repo_path
+        self.store = store
+        self.trigger = trigger
+        self.max_workers = max_workers
+
+    def _latest_comments(self, issue_numbers: List[int]) -> Dict[int, Optional[Dict]]:
+        latest = fetch_latest_comments(self.repo_path, issue_numbers)
+
+        missing = [n for n in issue_numbers if n not in latest]
+        if missing:
+            def fetch_one(number):
+                comments = fetch_issue_comments(self.repo_path, number)
+                return number, comments[-1] if comments else None
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                latest.update(pool.map(fetch_one, missing))
+
+        return latest
+
+    @staticmethod
+    def _qualifies(issue_number: int, latest_comment: Optional[Dict], state) -> bool:
+        processed = state is not None and state["processed_at"] is not None
+        last_comment_id = state["last_comment_id"] if state is not None else None
+
+        if latest_comment is None:
+            if processed:
+                return False
+            print(f"INFO: Issue #{issue_number} has no comments - marking for processing")
+            return True
+
+        if latest_comment.get("id") == last_comment_id:
+            return False
+
+        if latest_comment.get("body", "").strip().lower() == "adw":
+            print(f"INFO: Issue #{issue_number} - latest comment is 'adw' - marking for processing")
+            return True
+
+        return False
+
+    def poll(self, should_stop: Callable[[], bool] = lambda: False) -> Dict[str, int]:
+        """
+        Run one polling cycle.
+
+        Args:
+            should_stop: Checked between triggers for graceful shutdown
+
+        Returns:
+            Counts of fetched, qualifying and triggered issues
+        """
+        watermark = self.store.get_watermark(self.repo_path)
+        issues = fetch_open_issues(self.repo_path, updated_since=watermark)
+        stats = {"fetched": len(issues), "qualifying": 0, "triggered": 0}
+        if not issues:
+            return stats
+
+        numbers = [issue.number for issue in issues if issue.number]
+        states = self.store.get_issue_states(self.repo_path, numbers)
+        latest = self._latest_comments(numbers)
+
+        # Re-inspect failed issues next cycle by not moving the watermark past them
+        new_watermark = max(issue.updated_at for issue in issues)
+        for issue in issues:
+            number = issue.number
+            if not number:
+                continue
+            comment = latest.get(number)
+            if not self._qualifies(number, comment, states.get(number)):
+                continue
+
+            stats["qualifying"] += 1
+            if should_stop():
+                print("INFO: Shutdown requested, stopping issue processing")
+                new_watermark = min(new_watermark, issue.updated_at)
+                break
+
+            comment_id = comment.get("id") if comment else None
+            if self.trigger(number):
+                stats["triggered"] += 1
+                self.store.record_issue(self.repo_path, number, comment_id, processed=True)
+            else:
+                print(f"WARNING: Failed to process issue #{number}, will retry in next cycle")
+                new_watermark = min(new_watermark, issue.updated_at)
+
+        # Watermark is inclusive (updated:>=), so equal timestamps are re-read
+        self.store.set_watermark(self.repo_path, _format_timestamp(new_watermark))
+        return stats
@@ -0,0 +1,455 @@
+"""
+KPI Engine - Deterministic agentic KPI aggregation.
+
+Computes per-stage KPIs for an ADW without an agent round trip:
+
+- cycle time and entries per stage, from the state_change rows
+  adw_activity_logs gets on every state save (their workflow_step names the
+  workflow script, and so the stage) and on status changes (a completed or
+  errored ADW stops the clock)
+- attempts, retries, status and duration per stage, from the orchestrator's
+  execution state (adw_states.orchestrator_state)
+- agent runs, turns, token usage and cost, from the ``result`` messages in
+  agents/{adw_id}/{agent_name}/raw_output.jsonl
+
+Aggregation is incremental. Activity logs are consumed past a per-ADW
+cursor (the last activity log id seen, plus the stage the ADW is in and when
+it entered it), and each raw_output.jsonl is read from the byte offset where
+the previous refresh stopped. A refresh therefore only touches rows and
+lines added since the last one, and running it twice does not double count.
+Orchestrator state is a snapshot and simply overwrites its columns.
+
+Usage:
+    engine = KpiEngine()
+    kpis = engine.refresh("abc12345", state.data.get("orchestrator"))
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+from adw_modules.db_paths import ensure_tables, get_default_db_path, get_project_root
+
+logger = logging.getLogger(__name__)
+
+# Agent name prefixes mapped to the stage whose usage they are billed to.
+# Checked in order; unknown agents are billed to "other".
+AGENT_STAGE_PREFIXES = (
+    ("sdlc_planner", "plan"),
+    ("planner", "plan"),
+    ("issue_classifier", "plan"),
+    ("adw_classifier", "plan"),
+    ("branch_generator", "plan"),
+    ("clarifier", "plan"),
+    ("sdlc_implementor", "build"),
+    ("implementor", "build"),
+    ("test", "test"),
+    ("e2e_test", "test"),
+    ("review", "review"),
+    ("documenter", "document"),
+    ("ops", "document"),
+    ("kpi_tracker", "document"),
+    ("patch", "patch"),
+    ("merger", "merge"),
+    ("conflict_resolver", "merge"),
+    ("pr_creator", "ship"),
+    ("shipper", "ship"),
+    ("completer", "ship"),
+)
+
+# Workflow scripts mapped to the stage they run, for the workflow_step
+# ADWState.save() logs with each state_change row
+WORKFLOW_STAGES = {
+    "adw_clarify_iso": "plan",
+    "adw_plan_iso": "plan",
+    "adw_build_iso": "build",
+    "adw_test_iso": "test",
+    "adw_review_iso": "review",
+    "adw_document_iso": "document",
+    "adw_patch_iso": "patch",
+    "adw_merge_iso": "merge",
+    "adw_ship_iso": "ship",
+    "adw_complete_iso": "ship",
+}
+
+FINISHED_STATUSES = ("completed", "errored")
+
+ERROR_EVENT_TYPES = ("error_occurred", "workflow_failed")
+
+USAGE_FIELDS = {
+    "input_tokens": "input_tokens",
+    "output_tokens": "output_tokens",
+    "cache_creation_input_tokens": "cache_creation_tokens",
+    "cache_read_input_tokens": "cache_read_tokens",
+}
+
+# Leading bytes hashed to notice a raw_output.jsonl rewritten by a retry
+HEAD_DIGEST_BYTES = 4096
+
+
+def get_default_agents_dir() -> Path:
+    """Path of the main project's agents directory (worktree aware)."""
+    return get_project_root() / "agents"
+
+
+def stage_for_agent(agent_name: str) -> str:
+    """Stage an agent's token usage and cost are attributed to."""
+    for prefix, stage in AGENT_STAGE_PREFIXES:
+        if agent_name.startswith(prefix):
+            return stage
+    return "other"
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse SQLite CURRENT_TIMESTAMP or ISO 8601 values as naive UTC."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _seconds_between(start: Optional[str], end: Optional[str]) -> Optional[float]:
+    started, ended = _parse_timestamp(start), _parse_timestamp(end)
+    if started is None or ended is None:
+        return None
+    return max(0.0, (ended - started).total_seconds())
+
+
+def _head_digest(f: BinaryIO, consumed: int) -> str:
+    """
+    Digest of the start of a file, up to the bytes consumed so far.
+
+    Hashing no further than consumed keeps the digest stable while the file
+    grows past a short first line.
+    """
+    f.seek(0)
+    return hashlib.sha256(f.read(min(HEAD_DIGEST_BYTES, consumed))).hexdigest()
+
+
+class KpiEngine:
+    """Incremental KPI aggregation into the ADW SQLite database."""
+
+    def __init__(self, db_path: Optional[Path] = None, agents_dir: Optional[Path] = None):
+        self.db_path = Path(db_path or get_default_db_path())
+        self.agents_dir = Path(agents_dir or get_default_agents_dir())
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Workflows can run before the server has migrated the database
+        ensure_tables(self.db_path, "adw_kpi_stage_metrics", "adw_kpi_cursors", "adw_kpi_usage_offsets")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _immediate(self) -> Iterator[sqlite3.Connection]:
+        # Cursor reads and metric updates commit together, so concurrent
+        # refreshes of the same ADW cannot count the same rows twice
+        conn = sqlite3.connect(str(self.db_path), timeout=5.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _add(conn: sqlite3.Connection, adw_id: str, stage: str, **deltas: float) -> None:
+        """Add deltas to a stage's counters, creating the row if needed."""
+        columns = ", ".join(deltas)
+        placeholders = ", ".join("?" * len(deltas))
+        updates = ", ".join(f"{name} = {name} + excluded.{name}" for name in deltas)
+        conn.execute(
+            f"""
+            INSERT INTO adw_kpi_stage_metrics (adw_id, stage, {columns})
+            VALUES (?, ?, {placeholders})
+            ON CONFLICT(adw_id, stage) DO UPDATE SET
+                {updates},
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (adw_id, stage, *deltas.values())
+        )
+
+    def ingest_activity_logs(self, adw_id: str) -> int:
+        """
+        Fold activity log rows added since the last refresh into the metrics.
+
+        Returns:
+            Number of activity log rows consumed
+        """
+        with self._immediate() as conn:
+            cursor = conn.execute(
+                "SELECT last_activity_id, current_stage, stage_entered_at FROM adw_kpi_cursors WHERE adw_id = ?",
+                (adw_id,)
+            ).fetchone()
+            last_id = cursor["last_activity_id"] if cursor else 0
+            current_stage = cursor["current_stage"] if cursor else None
+            entered_at = cursor["stage_entered_at"] if cursor else None
+
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT id, event_type, field_changed, new_value, workflow_step, timestamp
+                    FROM adw_activity_logs
+                    WHERE adw_id = ? AND id > ?
+                    ORDER BY id
+                    """,
+                    (adw_id, last_id)
+                ).fetchall()
+            except sqlite3.OperationalError:
+                # Activity logs are created by the server's schema
+                return 0
+            if not rows:
+                return 0
+
+            for row in rows:
+                if row["event_type"] == "state_change":
+                    # A finished ADW has no stage but keeps when it finished, so
+                    # the final save's own workflow_step doesn't reopen one
+                    finished = current_stage is None and entered_at is not None
+                    if row["field_changed"] == "status":
+                        if row["new_value"] in FINISHED_STATUSES:
+                            next_stage = None
+                        elif row["new_value"] == "in_progress" and finished:
+                            current_stage, entered_at = None, None
+                            continue
+                        else:
+                            continue
+                    elif row["workflow_step"] in WORKFLOW_STAGES and not finished:
+                        next_stage = WORKFLOW_STAGES[row["workflow_step"]]
+                    else:
+                        continue
+                    if next_stage == current_stage:
+                        continue
+
+                    if current_stage is not None:
+                        elapsed = _seconds_between(entered_at, row["timestamp"])
+                        if elapsed is not None:
+                            self._add(conn, adw_id, current_stage, time_in_stage_seconds=elapsed)
+                    current_stage, entered_at = next_stage, row["timestamp"]
+                    if current_stage is not None:
+                        self._add(conn, adw_id, current_stage, entries=1)
+                elif row["event_type"] in ERROR_EVENT_TYPES:
+                    self._add(conn, adw_id, current_stage or "other", errors=1)
+
+            conn.execute(
+                """
+                INSERT INTO adw_kpi_cursors (adw_id, last_activity_id, current_stage, stage_entered_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(adw_id) DO UPDATE SET
+                    last_activity_id = excluded.last_activity_id,
+                    current_stage = excluded.current_stage,
+                    stage_entered_at = excluded.stage_entered_at,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                (adw_id, rows[-1]["id"], current_stage, entered_at)
+            )
+            return len(rows)
+
+    def ingest_usage(self, adw_id: str) -> int:
+        """
+        Fold new agent ``result`` messages into token and cost totals.
+
+        Each Claude Code session ends with one result message carrying the
+        session's usage and total_cost_usd, so only those lines are counted.
+
+        Returns:
+            Number of result messages consumed
+        """
+        adw_dir = self.agents_dir / adw_id
+        if not adw_dir.is_dir():
+            return 0
+
+        consumed = 0
+        for output_file in sorted(adw_dir.glob("*/raw_output.jsonl")):
+            agent_name = output_file.parent.name
+            with self._immediate() as conn:
+                consumed += self._ingest_output_file(conn, adw_id, agent_name, output_file)
+        return consumed
+
+    def _ingest_output_file(
+        self,
+        conn: sqlite3.Connection,
+        adw_id: str,
+        agent_name: str,
+        output_file: Path,
+    ) -> int:
+        row = conn.execute(
+            "SELECT head_digest, byte_offset FROM adw_kpi_usage_offsets WHERE adw_id = ? AND agent_name = ?",
+            (adw_id, agent_name)
+        ).fetchone()
+        offset = row["byte_offset"] if row else 0
+
+        with open(output_file, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            # Retries rewrite the file from scratch; start over when the bytes
+            # already consumed have changed
+            if row and (size < offset or _head_digest(f, offset) != row["head_digest"]):
+                offset = 0
+            f.seek(offset)
+            data = f.read()
+            # Leave a partially written last line for the next refresh
+            complete = data[:data.rfind(b"\n") + 1]
+            head_digest = _head_digest(f, offset + len(complete))
+
+        totals = {column: 0 for column in USAGE_FIELDS.values()}
+        totals.update(agent_runs=0, num_turns=0, cost_usd=0.0)
+        for line in complete.splitlines():
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(message, dict) or message.get("type") != "result":
+                continue
+            usage = message.get("usage") or {}
+            for field, column in USAGE_FIELDS.items():
+                totals[column] += int(usage.get(field) or 0)
+            totals["agent_runs"] += 1
+            totals["num_turns"] += int(message.get("num_turns") or 0)
+            totals["cost_usd"] += float(message.get("total_cost_usd") or 0)
+
+        if totals["agent_runs"]:
+            self._add(conn, adw_id, stage_for_agent(agent_name), **totals)
+        conn.execute(
+            """
+            INSERT INTO adw_kpi_usage_offsets (adw_id, agent_name, head_digest, byte_offset)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(adw_id, agent_name) DO UPDATE SET
+                head_digest = excluded.head_digest,
+                byte_offset = excluded.byte_offset
+            """,
+            (adw_id, agent_name, head_digest, offset + len(complete))
+        )
+        return totals["agent_runs"]
+
+    def _load_orchestrator_state(self, adw_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT orchestrator_state FROM adw_states WHERE adw_id = ?",
+                    (adw_id,)
+                ).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        if not row or not row["orchestrator_state"]:
+            return None
+        try:
+            return json.loads(row["orchestrator_state"])
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to parse orchestrator_state for ADW {adw_id}")
+            return None
+
+    def record_orchestrator_state(self, adw_id: str, orchestrator_state: Optional[Dict[str, Any]]) -> int:
+        """
+        Store per-stage attempts, status and timing from orchestrator state.
+
+        Returns:
+            Number of stages recorded
+        """
+        execution = (orchestrator_state or {}).get("execution") or {}
+        stages = execution.get("stages") or []
+        with self._immediate() as conn:
+            for stage in stages:
+                conn.execute(
+                    """
+                    INSERT INTO adw_kpi_stage_metrics
+                        (adw_id, stage, attempts, stage_status, started_at, completed_at, duration_seconds)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(adw_id, stage) DO UPDATE SET
+                        attempts = excluded.attempts,
+                        stage_status = excluded.stage_status,
+                        started_at = excluded.started_at,
+                        completed_at = excluded.completed_at,
+                        duration_seconds = excluded.duration_seconds,
+                        updated_at = CURRENT_TIMESTAMP
+                    """,
+                    (
+                        adw_id,
+                        stage["stage_name"],
+                        int(stage.get("attempts") or 0),
+                        stage.get("status"),
+                        stage.get("started_at"),
+                        stage.get("completed_at"),
+                        _seconds_between(stage.get("started_at"), stage.get("completed_at")),
+                    )
+                )
+        return len(stages)
+
+    def refresh(self, adw_id: str, orchestrator_state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Bring an ADW's KPIs up to date and return them.
+
+        Args:
+            adw_id: ADW identifier
+            orchestrator_state: Orchestrator state from ADWState; read from
+                adw_states when omitted
+
+        Returns:
+            KPIs as returned by get_kpis()
+        """
+        if orchestrator_state is None:
+            orchestrator_state = self._load_orchestrator_state(adw_id)
+        if orchestrator_state:
+            self.record_orchestrator_state(adw_id, orchestrator_state)
+        self.ingest_activity_logs(adw_id)
+        self.ingest_usage(adw_id)
+        return self.get_kpis(adw_id)
+
+    def get_kpis(self, adw_id: str) -> Dict[str, Any]:
+        """
+        Per-stage KPIs and totals for an ADW.
+
+        Cycle time is the orchestrator's stage duration when known, otherwise
+        the time spent in the stage according to stage transitions. Attempts
+        is the larger of orchestrator attempts and times the stage was entered.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM adw_kpi_stage_metrics WHERE adw_id = ? ORDER BY started_at IS NULL, started_at, stage",
+                (adw_id,)
+            ).fetchall()
+
+        stages = []
+        for row in rows:
+            attempts = max(row["attempts"], row["entries"])
+            cycle_time = row["duration_seconds"]
+            if cycle_time is None:
+                cycle_time = row["time_in_stage_seconds"]
+            stages.append({
+                "stage": row["stage"],
+                "status": row["stage_status"],
+                "cycle_time_seconds": round(cycle_time, 3),
+                "attempts": attempts,
+                "retries": max(attempts - 1, 0),
+                "errors": row["errors"],
+                "agent_runs": row["agent_runs"],
+                "num_turns": row["num_turns"],
+                "input_tokens": row["input_tokens"],
+                "output_tokens": row["output_tokens"],
+                "cache_creation_tokens": row["cache_creation_tokens"],
+                "cache_read_tokens": row["cache_read_tokens"],
+                "cost_usd": round(row["cost_usd"], 6),
+            })
+
+        summed = ("cycle_time_seconds", "retries", "errors", "agent_runs", "input_tokens",
+                  "output_tokens", "cache_creation_tokens", "cache_read_tokens", "cost_usd")
+        totals = {name: sum(stage[name] for stage in stages) for name in summed}
+        totals["cycle_time_seconds"] = round(totals["cycle_time_seconds"], 3)
+        totals["cost_usd"] = round(totals["cost_usd"], 6)
+        return {"adw_id": adw_id, "stages": stages, "totals": totals}
@@ -0,0 +1,218 @@
+"""
+Liveness Monitor - Flags dead and hung workflows from heartbeats and PIDs.
+
+Replaces the old "in_progress and not updated for 30 minutes" scan, which
+could not tell a long build from a dead process. Every few seconds the
+trigger server calls check(), which looks only at in_progress ADWs (a
+partial index on adw_states keeps this O(active)) and their adw_heartbeats
+rows (see adw_modules/heartbeat.py):
+
+- a process whose PID is gone without a recorded clean exit is dead,
+  as is one whose PID now belongs to a process started at another time
+- a launcher the server spawned that exited non-zero is dead
+- a live workflow process that hasn't beaten for heartbeat_timeout is hung
+- an ADW still in_progress after all of its processes exited (longer ago
+  than heartbeat_timeout, so a finishing workflow can record its status)
+  is dead
+- ADWs with no heartbeat rows at all (started before heartbeats existed,
+  or outside the trigger) fall back to the 30-minute updated_at rule
+
+Dead and hung ADWs get is_stuck = 1 (the database trigger logs a
+stuck_detected activity) and are returned so the caller can push them to
+clients.
+
+Usage:
+    monitor = LivenessMonitor()
+    for flagged in monitor.check():
+        print(flagged["adw_id"], flagged["reason"])
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from adw_modules.db_paths import ensure_tables, get_default_db_path
+from adw_modules.heartbeat import LAUNCHER, WORKFLOW, process_start_time
+
+logger = logging.getLogger(__name__)
+
+# ADWs without heartbeats are flagged after this long without an update
+LEGACY_STUCK_SECONDS = 30 * 60
+
+# Exited heartbeat rows are kept this long
+RETENTION_SECONDS = 7 * 24 * 3600
+
+ACTIVE_ADWS_SQL = """
+    SELECT s.adw_id, s.workflow_name, s.updated_at,
+           h.pid, h.role, h.workflow_name AS process_name, h.process_start,
+           h.last_heartbeat, h.exited_at
+    FROM adw_states s
+    LEFT JOIN adw_heartbeats h ON h.adw_id = s.adw_id
+    WHERE s.status = 'in_progress' AND s.deleted_at IS NULL AND s.is_stuck = 0
+"""
+
+Probe = Callable[[int], Tuple[bool, Optional[int]]]
+
+
+def probe_process(pid: int) -> Tuple[bool, Optional[int]]:
+    """
+    Check whether a process is running.
+
+    Children of this process are reaped, so their exit code is known;
+    for other processes only liveness can be determined.
+
+    Returns:
+        (alive, exit_code) where exit_code is None unless known
+    """
+    try:
+        waited, status = os.waitpid(pid, os.WNOHANG)
+    except ChildProcessError:
+        pass  # Not our child
+    else:
+        if waited == 0:
+            return True, None
+        return False, os.waitstatus_to_exitcode(status)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False, None
+    except PermissionError:
+        return True, None  # Exists, owned by another user
+    return True, None
+
+
+class LivenessMonitor:
+    """Checks in_progress ADWs against their processes and heartbeats."""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        heartbeat_timeout: Optional[float] = None,
+        legacy_stuck_seconds: float = LEGACY_STUCK_SECONDS,
+        probe: Probe = probe_process,
+        start_time: Callable[[int], Optional[int]] = process_start_time
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            db_path: SQLite database path (defaults to the ADW database)
+            heartbeat_timeout: Seconds without a heartbeat after which a live
+                workflow process counts as hung
+            legacy_stuck_seconds: Idle time after which an ADW without
+                heartbeats is flagged
+            probe: Returns (alive, exit_code) for a PID
+            start_time: Returns a PID's process start time, or None if unknown
+        """
+        self.db_path = Path(db_path or get_default_db_path())
+        self.heartbeat_timeout = (
+            heartbeat_timeout if heartbeat_timeout is not None
+            else float(os.getenv("ADW_HEARTBEAT_TIMEOUT_SECONDS", "60"))
+        )
+        self.legacy_stuck_seconds = legacy_stuck_seconds
+        self.probe = probe
+        self.start_time = start_time
+        self._last_prune = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        ensure_tables(self.db_path, "adw_heartbeats")
+        conn = sqlite3.connect(str(self.db_path), timeout=10.0)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _verdict(self, rows: List[sqlite3.Row], now: float, exits: List[tuple]) -> Optional[str]:
+        """Reason an ADW is dead or hung, or None; appends processes found gone to exits."""
+        adw_id = rows[0]["adw_id"]
+        if rows[0]["pid"] is None:
+            updated_at = datetime.fromisoformat(rows[0]["updated_at"].replace('Z', '+00:00'))
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)  # SQLite CURRENT_TIMESTAMP is UTC
+            if updated_at < datetime.now(timezone.utc) - timedelta(seconds=self.legacy_stuck_seconds):
+                return f"No activity for {self.legacy_stuck_seconds / 60:.0f} minutes"
+            return None
+
+        reason = None
+        running = False
+        last_exit = 0.0
+        for row in rows:
+            if row["exited_at"] is not None:
+                last_exit = max(last_exit, row["exited_at"])
+                continue
+            name = row["process_name"] or rows[0]["workflow_name"] or "workflow"
+            alive, exit_code = self.probe(row["pid"])
+            if alive and row["process_start"] is not None:
+                # The PID may have been reused after the workflow died
+                started = self.start_time(row["pid"])
+                alive = started is None or started == row["process_start"]
+            if not alive:
+                exits.append((now, exit_code, adw_id, row["pid"]))
+                last_exit = now
+                if row["role"] == WORKFLOW:
+                    reason = reason or f"{name} (pid {row['pid']}) died without exiting cleanly"
+                elif exit_code:
+                    reason = reason or f"{name} (pid {row['pid']}) exited with code {exit_code}"
+            elif row["role"] == WORKFLOW and now - row["last_heartbeat"] > self.heartbeat_timeout:
+                reason = reason or (
+                    f"{name} (pid {row['pid']}) has not sent a heartbeat for "
+                    f"{now - row['last_heartbeat']:.0f} seconds"
+                )
+            else:
+                running = True
+
+        if reason is None and not running and now - last_exit > self.heartbeat_timeout:
+            reason = (
+                f"All processes exited {now - last_exit:.0f} seconds ago "
+                "but the workflow is still in progress"
+            )
+        return reason
+
+    def check(self) -> List[Dict[str, str]]:
+        """
+        Flag dead and hung in_progress ADWs.
+
+        Returns:
+            One {"adw_id", "workflow_name", "reason"} dict per newly flagged ADW
+        """
+        now = time.time()
+        with self._connect() as conn:
+            by_adw: Dict[str, List[sqlite3.Row]] = defaultdict(list)
+            for row in conn.execute(ACTIVE_ADWS_SQL):
+                by_adw[row["adw_id"]].append(row)
+
+            exits: List[tuple] = []
+            flagged = []
+            for adw_id, rows in by_adw.items():
+                try:
+                    reason = self._verdict(rows, now, exits)
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Could not check liveness of {adw_id}: {e}")
+                    continue
+                if reason:
+                    flagged.append({
+                        "adw_id": adw_id,
+                        "workflow_name": rows[0]["workflow_name"] or rows[0]["process_name"] or "",
+                        "reason": reason,
+                    })
+
+            conn.executemany(
+                "UPDATE adw_heartbeats SET exited_at = ?, exit_code = ? WHERE adw_id = ? AND pid = ?",
+                exits
+            )
+            conn.executemany(
+                "UPDATE adw_states SET is_stuck = 1 WHERE adw_id = ? AND is_stuck = 0",
+                [(entry["adw_id"],) for entry in flagged]
+            )
+
+            if now - self._last_prune > 3600:
+                conn.execute("DELETE FROM adw_heartbeats WHERE exited_at < ?", (now - RETENTION_SECONDS,))
+                self._last_prune = now
+
+        for entry in flagged:
+            logger.warning(f"Flagged {entry['adw_id']} as stuck: {entry['reason']}")
+        return flagged
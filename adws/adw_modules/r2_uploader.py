@@ -1,23 +1,75 @@
-"""Cloudflare R2 uploader for ADW screenshots."""
+"""Cloudflare R2 uploader for ADW screenshots.
+
+Screenshots are uploaded concurrently under content-addressed keys
+(adw/{adw_id}/review/{sha256 prefix}/{filename}). Before uploading, the
+uploader checks a local per-ADW manifest and then HEADs the key, so identical
+images from review retries are never uploaded twice. Files above the
+multipart threshold are uploaded in parts.
+
+Set CLOUDFLARE_R2_ENDPOINT_URL to point at another S3-compatible endpoint
+(e.g. a local stand-in for tests).
+"""
 
 import os
+import json
+import hashlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Optional, Dict, List
 from pathlib import Path
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
 from botocore.exceptions import ClientError
 
+MULTIPART_THRESHOLD_BYTES = 8 * 1024 * 1024
+MANIFEST_FILENAME = "r2_manifest.json"
+
+
+def file_sha256(file_path: str) -> str:
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 class R2Uploader:
     """Handle uploads to Cloudflare R2 public bucket."""
     
-    def __init__(self, logger: logging.Logger):
+    def __init__(
+        self,
+        logger: logging.Logger,
+        max_workers: int = 4,
+        multipart_threshold: int = MULTIPART_THRESHOLD_BYTES,
+        manifest_dir: Optional[str] = None,
+    ):
+        """
+        Args:
+            logger: Logger instance
+            max_workers: Concurrent uploads in upload_screenshots
+            multipart_threshold: File size in bytes above which uploads are multipart
+            manifest_dir: Directory holding per-ADW upload manifests
+                (defaults to the project's agents/ directory)
+        """
         self.logger = logger
         self.client = None
         self.bucket_name = None
         self.public_domain = None
         self.enabled = False
+        self.max_workers = max_workers
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=max(multipart_threshold, 5 * 1024 * 1024),
+            max_concurrency=max_workers,
+        )
+        self.manifest_dir = Path(manifest_dir) if manifest_dir else Path(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        ) / "agents"
+        self._manifest_lock = threading.Lock()
         
         # Initialize if all required env vars exist
         self._initialize()
@@ -29,6 +81,7 @@ class R2Uploader:
         secret_access_key = os.getenv("CLOUDFLARE_R2_SECRET_ACCESS_KEY")
         self.bucket_name = os.getenv("CLOUDFLARE_R2_BUCKET_NAME")
         self.public_domain = os.getenv("CLOUDFLARE_R2_PUBLIC_DOMAIN", "tac-public-imgs.iddagents.com")
+        endpoint_url = os.getenv("CLOUDFLARE_R2_ENDPOINT_URL") or f'https://{account_id}.r2.cloudflarestorage.com'
         
         # Check if all required vars are present
         if not all([account_id, access_key_id, secret_access_key, self.bucket_name]):
@@ -39,10 +92,17 @@ class R2Uploader:
             # Create R2 client
             self.client = boto3.client(
                 's3',
-                endpoint_url=f'https://{account_id}.r2.cloudflarestorage.com',
+                endpoint_url=endpoint_url,
                 aws_access_key_id=access_key_id,
                 aws_secret_access_key=secret_access_key,
-                config=Config(signature_version='s3v4'),
+                config=Config(
+                    signature_version='s3v4',
+                    s3={'addressing_style': 'path'},
+                    # R2 doesn't accept the default streaming CRC32 trailers
+                    request_checksum_calculation='when_required',
+                    response_checksum_validation='when_required',
+                    max_pool_connections=max(10, self.max_workers * 2),
+                ),
                 region_name='us-east-1'
             )
             self.enabled = True
@@ -82,7 +142,7 @@ class R2Uploader:
         
         try:
             # Upload file
-            self.client.upload_file(file_path, self.bucket_name, object_key)
+            self.client.upload_file(file_path, self.bucket_name, object_key, Config=self.transfer_config)
             self.logger.info(f"Uploaded {file_path} to R2 as {object_key}")
             
             # Generate public URL
@@ -96,10 +156,102 @@ class R2Uploader:
             self.logger.error(f"Unexpected error uploading to R2: {e}")
             return None
     
+    def _public_url(self, object_key: str) -> str:
+        return f"https://{self.public_domain}/{object_key}"
+    
+    def _object_exists(self, object_key: str) -> bool:
+        """HEAD the object; errors other than not-found count as missing so the upload is attempted."""
+        try:
+            self.client.head_object(Bucket=self.bucket_name, Key=object_key)
+            return True
+        except ClientError as e:
+            code = str(e.response.get("Error", {}).get("Code", ""))
+            if code not in ("404", "NoSuchKey", "NotFound"):
+                self.logger.warning(f"HEAD {object_key} failed, uploading anyway: {e}")
+            return False
+    
+    def _manifest_path(self, adw_id: str) -> Path:
+        return self.manifest_dir / adw_id / MANIFEST_FILENAME
+    
+    def load_manifest(self, adw_id: str) -> Dict[str, Dict]:
+        """Load the local record of uploaded content (sha256 -> object info) for an ADW."""
+        path = self._manifest_path(adw_id)
+        try:
+            with open(path, "r") as f:
+                return json.load(f).get("objects", {})
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable R2 manifest {path}: {e}")
+            return {}
+    
+    def _save_manifest(self, adw_id: str, objects: Dict[str, Dict]) -> None:
+        path = self._manifest_path(adw_id)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"version": 1, "objects": objects}, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Failed to write R2 manifest {path}: {e}")
+    
+    def upload_content_addressed(
+        self,
+        file_path: str,
+        adw_id: str,
+        manifest: Optional[Dict[str, Dict]] = None,
+    ) -> Optional[str]:
+        """
+        Upload a file under a content-hash key unless it is already stored.
+        
+        Args:
+            file_path: Path to the file to upload
+            adw_id: ADW workflow ID for organizing uploads
+            manifest: Manifest dict to consult and update (updated in place)
+            
+        Returns:
+            Public URL, or None if upload is disabled or fails
+        """
+        if not self.enabled:
+            return None
+        
+        if not os.path.exists(file_path):
+            self.logger.warning(f"File not found at absolute path: {file_path}")
+            return None
+        
+        digest = file_sha256(file_path)
+        if manifest is not None and digest in manifest:
+            self.logger.info(f"Skipping upload of {file_path}: already uploaded as {manifest[digest]['key']}")
+            return manifest[digest]["url"]
+        
+        object_key = f"adw/{adw_id}/review/{digest[:16]}/{Path(file_path).name}"
+        if self._object_exists(object_key):
+            self.logger.info(f"Skipping upload of {file_path}: {object_key} already in R2")
+            public_url = self._public_url(object_key)
+        else:
+            public_url = self.upload_file(file_path, object_key)
+            if not public_url:
+                return None
+        
+        if manifest is not None:
+            with self._manifest_lock:
+                manifest[digest] = {
+                    "key": object_key,
+                    "url": public_url,
+                    "size": os.path.getsize(file_path),
+                    "uploaded_at": datetime.now().isoformat(),
+                }
+        return public_url
+    
     def upload_screenshots(self, screenshots: List[str], adw_id: str) -> Dict[str, str]:
         """
         Upload multiple screenshots and return mapping of local paths to public URLs.
         
+        Uploads run concurrently (up to max_workers) under content-addressed
+        keys, skipping content already recorded in the ADW's manifest or
+        already present in the bucket.
+        
         Args:
             screenshots: List of local screenshot file paths
             adw_id: ADW workflow ID for organizing uploads
@@ -107,20 +259,25 @@ class R2Uploader:
         Returns:
             Dict mapping local paths to public URLs (or original paths if upload disabled/failed)
         """
-        url_mapping = {}
-        
-        for screenshot_path in screenshots:
-            if not screenshot_path:
-                continue
-                
-            # Generate object key with ADW ID for organization
-            filename = Path(screenshot_path).name
-            object_key = f"adw/{adw_id}/review/{filename}"
-            
-            # Upload and get public URL
-            public_url = self.upload_file(screenshot_path, object_key)
-            
-            # Map to public URL if successful, otherwise keep original path
-            url_mapping[screenshot_path] = public_url or screenshot_path
-            
-        return url_mapping
\ No newline at end of file
+        paths = list(dict.fromkeys(p for p in screenshots if p))
+        if not self.enabled or not paths:
+            return {path: path for path in paths}
+        
+        manifest = self.load_manifest(adw_id)
+        known = len(manifest)
+        
+        def upload(path: str) -> Optional[str]:
+            try:
+                return self.upload_content_addressed(os.path.abspath(path), adw_id, manifest)
+            except Exception as e:
+                self.logger.error(f"Unexpected error uploading {path} to R2: {e}")
+                return None
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths))) as pool:
+            urls = list(pool.map(upload, paths))
+        
+        if len(manifest) != known:
+            self._save_manifest(adw_id, manifest)
+        
+        # Map to public URL if successful, otherwise keep original path
+        return {path: url or path for path, url in zip(paths, urls)}
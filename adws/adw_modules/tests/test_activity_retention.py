@@ -0,0 +1,252 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["pytest"]
+# ///
+
+"""
+Unit tests for activity log archival, rollup and incremental vacuum.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from adw_modules.activity_retention import ARCHIVABLE_ADWS_SQL, ActivityRetention, default_archive_path
+
+SCHEMA_FILE = Path(__file__).resolve().parents[2] / "database" / "schema.sql"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    db_path = tmp_path / "adw.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(SCHEMA_FILE.read_text())
+    conn.close()
+    return db_path
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _add_adw(db_path, adw_id, status="in_progress", completed_at=None, deleted_at=None):
+    conn = _connect(db_path)
+    conn.execute(
+        "INSERT INTO adw_states (adw_id, status, completed_at, deleted_at) VALUES (?, ?, ?, ?)",
+        (adw_id, status, completed_at, deleted_at)
+    )
+    conn.execute("DELETE FROM adw_activity_logs WHERE adw_id = ?", (adw_id,))
+    conn.commit()
+    conn.close()
+
+
+def _log(db_path, adw_id, count, days_ago=0, event_type="user_action"):
+    conn = _connect(db_path)
+    conn.execute(
+        """
+        WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+        INSERT INTO adw_activity_logs (adw_id, event_type, event_data, timestamp)
+        SELECT ?, ?, printf('{"n": %d, "pad": "%s"}', n, hex(randomblob(64))),
+               datetime('now', ?, '+' || (n % 60) || ' seconds')
+        FROM seq
+        """,
+        (count, adw_id, event_type, f"-{days_ago} days")
+    )
+    conn.commit()
+    conn.close()
+
+
+def _counts(db_path):
+    conn = _connect(db_path)
+    rows = conn.execute("SELECT adw_id, COUNT(*) AS n FROM adw_activity_logs GROUP BY adw_id").fetchall()
+    conn.close()
+    return {row["adw_id"]: row["n"] for row in rows}
+
+
+def _archived_counts(db_path):
+    conn = _connect(default_archive_path(db_path))
+    rows = conn.execute("SELECT adw_id, COUNT(*) AS n FROM adw_activity_logs GROUP BY adw_id").fetchall()
+    conn.close()
+    return {row["adw_id"]: row["n"] for row in rows}
+
+
+@pytest.fixture
+def retention(db_path):
+    return ActivityRetention(
+        db_path=db_path, rollup_after_days=30, archive_after_days=7, batch_size=10, pause=0
+    )
+
+
+class TestArchive:
+    """Test cases for moving finished ADWs to the archive database."""
+
+    def test_finished_and_deleted_adws_are_archived(self, db_path, retention):
+        _add_adw(db_path, "active01")
+        _add_adw(db_path, "recent01", status="completed", completed_at="2999-01-01 00:00:00")
+        _add_adw(db_path, "old00001", status="completed", completed_at="2000-01-01 00:00:00")
+        _add_adw(db_path, "deleted1", deleted_at="2000-01-01 00:00:00")
+        for adw_id in ("active01", "recent01", "old00001", "deleted1"):
+            _log(db_path, adw_id, 25)
+        # Left behind by a hard delete without foreign key enforcement
+        _log(db_path, "orphan01", 5)
+
+        stats = retention.run()
+
+        assert stats["archived_adws"] == 3
+        assert stats["archived_rows"] == 55
+        assert _counts(db_path) == {"active01": 25, "recent01": 25}
+        assert _archived_counts(db_path) == {"old00001": 25, "deleted1": 25, "orphan01": 5}
+
+    def test_adws_without_activity_are_skipped(self, db_path, retention):
+        _add_adw(db_path, "old00001", status="completed", completed_at="2000-01-01 00:00:00")
+        _add_adw(db_path, "deleted1", deleted_at="2000-01-01 00:00:00")
+
+        conn = _connect(db_path)
+        candidates = conn.execute(ARCHIVABLE_ADWS_SQL, ("-7 days",)).fetchall()
+        conn.close()
+
+        assert candidates == []
+        assert retention.run()["archived_adws"] == 0
+
+    def test_archived_rows_are_kept_verbatim(self, db_path, retention):
+        _add_adw(db_path, "deleted1", deleted_at="2000-01-01 00:00:00")
+        _log(db_path, "deleted1", 3)
+        conn = _connect(db_path)
+        before = [dict(row) for row in conn.execute("SELECT * FROM adw_activity_logs ORDER BY id")]
+        conn.close()
+
+        retention.run()
+
+        conn = _connect(default_archive_path(db_path))
+        after = [dict(row) for row in conn.execute("SELECT * FROM adw_activity_logs ORDER BY id")]
+        conn.close()
+        assert [{k: v for k, v in row.items() if k != "archived_at"} for row in after] == before
+
+
+class TestRollup:
+    """Test cases for folding old activity into daily counts."""
+
+    def test_old_rows_become_daily_counts(self, db_path, retention):
+        _add_adw(db_path, "active01")
+        _log(db_path, "active01", 23, days_ago=40)
+        _log(db_path, "active01", 7, days_ago=40, event_type="state_change")
+        _log(db_path, "active01", 4, days_ago=1)
+
+        stats = retention.run()
+
+        assert stats["rolled_up_rows"] == 30
+        assert _counts(db_path) == {"active01": 4}
+        conn = _connect(db_path)
+        daily = {
+            row["event_type"]: row["event_count"]
+            for row in conn.execute("SELECT * FROM adw_activity_daily WHERE adw_id = 'active01'")
+        }
+        conn.close()
+        assert daily == {"user_action": 23, "state_change": 7}
+
+    def test_later_runs_add_to_existing_counts(self, db_path, retention):
+        _add_adw(db_path, "active01")
+        _log(db_path, "active01", 5, days_ago=40)
+        retention.run()
+        _log(db_path, "active01", 6, days_ago=40)
+
+        retention.run()
+
+        conn = _connect(db_path)
+        rows = conn.execute("SELECT event_count FROM adw_activity_daily").fetchall()
+        conn.close()
+        assert [row["event_count"] for row in rows] == [11]
+
+    def test_stop_interrupts_between_batches(self, db_path, retention):
+        _add_adw(db_path, "active01")
+        _log(db_path, "active01", 50, days_ago=40)
+        retention.pause = 0.05
+
+        def stop_soon():
+            time.sleep(0.02)
+            retention.stop()
+
+        threading.Thread(target=stop_soon).start()
+        stats = retention.run()
+
+        assert 0 < stats["rolled_up_rows"] < 50
+        assert stats["rolled_up_rows"] + _counts(db_path)["active01"] == 50
+
+
+class TestVacuum:
+    """Test cases for incremental vacuum."""
+
+    def test_freed_pages_are_released(self, db_path, retention):
+        _add_adw(db_path, "deleted1", deleted_at="2000-01-01 00:00:00")
+        _log(db_path, "deleted1", 3000)
+        size_before = db_path.stat().st_size
+        retention.batch_size = 1000
+
+        stats = retention.run()
+
+        conn = _connect(db_path)
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+        conn.close()
+        assert stats["vacuumed_pages"] > 0
+        assert db_path.stat().st_size < size_before
+
+    def test_existing_database_is_converted(self, tmp_path):
+        db_path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("CREATE TABLE t (x)")
+        conn.close()
+        retention = ActivityRetention(db_path=db_path)
+
+        assert retention.enable_incremental_vacuum()
+        assert not retention.enable_incremental_vacuum()
+        conn = sqlite3.connect(str(db_path))
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        conn.close()
+
+
+def test_writers_are_not_blocked_during_run(db_path):
+    """Activity keeps being written while a large backlog is archived and rolled up."""
+    rows = int(os.environ.get("ACTIVITY_RETENTION_BENCH_ROWS", "10000"))
+    _add_adw(db_path, "active01")
+    _add_adw(db_path, "deleted1", deleted_at="2000-01-01 00:00:00")
+    _log(db_path, "active01", rows, days_ago=40)
+    _log(db_path, "deleted1", rows)
+    retention = ActivityRetention(db_path=db_path, batch_size=500, pause=0.01)
+
+    done = threading.Event()
+    waits = []
+
+    def write():
+        conn = sqlite3.connect(str(db_path), timeout=10.0)
+        while not done.is_set():
+            start = time.perf_counter()
+            conn.execute("INSERT INTO adw_activity_logs (adw_id, event_type) VALUES ('active01', 'user_action')")
+            conn.commit()
+            waits.append(time.perf_counter() - start)
+            time.sleep(0.02)
+        conn.close()
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        stats = retention.run()
+    finally:
+        done.set()
+        writer.join()
+
+    assert stats["archived_rows"] == rows
+    assert stats["rolled_up_rows"] == rows
+    assert waits and max(waits) < 1.0
+    print(f"\n{2 * rows} rows retained in {stats['seconds']}s; {len(waits)} concurrent writes, "
+          f"slowest waited {max(waits) * 1000:.1f}ms")
@@ -0,0 +1,96 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["pytest"]
+# ///
+
+"""
+Unit tests for the artifact index.
+
+Runs against a temporary database and a temporary project tree.
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from adw_modules.artifact_index import ArtifactIndex, spec_type_for_file
+
+ADW_ID = "art12345"
+
+
+@pytest.fixture
+def index(tmp_path):
+    return ArtifactIndex(db_path=tmp_path / "adws" / "database" / "adw.db")
+
+
+def _write(path, content="content"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+class TestArtifactIndex:
+    """Test cases for ArtifactIndex."""
+
+    def test_record_stores_size_mtime_and_hash(self, index, tmp_path):
+        plan = _write(tmp_path / "specs" / f"issue-1-adw-{ADW_ID}-sdlc_planner-x.md", "plan")
+
+        artifact = index.record(ADW_ID, "plan", plan)
+
+        assert artifact["size_bytes"] == 4
+        assert artifact["mtime"] == plan.stat().st_mtime
+        assert len(artifact["content_hash"]) == 64
+        assert index.latest(ADW_ID, "plan")["path"] == str(plan.resolve())
+
+    def test_record_updates_existing_entry(self, index, tmp_path):
+        plan = _write(tmp_path / "plan.md", "first")
+        first = index.record(ADW_ID, "plan", plan)
+
+        _write(plan, "second version")
+        second = index.record(ADW_ID, "plan", plan)
+
+        assert len(index.find(ADW_ID)) == 1
+        assert second["content_hash"] != first["content_hash"]
+        assert index.latest(ADW_ID, "plan")["size_bytes"] == len("second version")
+
+    def test_latest_prefers_newest_existing_file(self, index, tmp_path):
+        old = _write(tmp_path / "old.md")
+        new = _write(tmp_path / "new.md")
+        os.utime(old, (time.time() - 60, time.time() - 60))
+        index.record(ADW_ID, "plan", old)
+        index.record(ADW_ID, "plan", new)
+        index.record(ADW_ID, "screenshot", _write(tmp_path / "shot.png"))
+
+        assert index.latest(ADW_ID, "plan")["path"] == str(new.resolve())
+
+        new.unlink()
+        assert index.latest(ADW_ID, "plan")["path"] == str(old.resolve())
+        assert index.latest("other123", "plan") is None
+
+    def test_record_missing_file_raises(self, index, tmp_path):
+        with pytest.raises(OSError):
+            index.record(ADW_ID, "plan", tmp_path / "missing.md")
+
+    def test_backfill_crawls_specs_worktrees_and_screenshots(self, index, tmp_path):
+        _write(tmp_path / "specs" / f"issue-1-adw-{ADW_ID}-sdlc_planner-main.md")
+        _write(tmp_path / "trees" / "nest0001" / "trees" / "nest0002" / "specs" / "issue-2-adw-nest0002-patch_planner-fix.md")
+        _write(tmp_path / "trees" / "wt000001" / "specs" / "notes.md")
+        _write(tmp_path / "agents" / ADW_ID / "reviewer" / "review_img" / "ui.png")
+        _write(tmp_path / "agents" / ADW_ID / "reviewer" / "review_img" / "notes.txt")
+
+        assert index.backfill_if_empty(tmp_path) == 3
+        assert index.backfill_if_empty(tmp_path) == 0
+
+        assert index.latest(ADW_ID, "plan") is not None
+        assert index.latest("nest0002", "patch") is not None
+        assert index.latest(ADW_ID, "screenshot")["path"].endswith("ui.png")
+
+    def test_spec_type_for_file(self):
+        assert spec_type_for_file(f"issue-1-adw-{ADW_ID}-sdlc_planner-x.md") == "plan"
+        assert spec_type_for_file(f"issue-1-adw-{ADW_ID}-patch_planner-x.md") == "patch"
+        assert spec_type_for_file(f"issue-1-adw-{ADW_ID}-reviewer-x.md") == "spec"
@@ -0,0 +1,199 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["pytest", "pydantic", "python-dotenv"]
+# ///
+
+"""
+Unit tests for the GitHub comment outbox.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from adw_modules.comment_outbox import CommentOutbox
+
+REPO = "acme/widgets"
+
+
+class FakePoster:
+    """Records posted comments; fails the first `failures` calls."""
+
+    def __init__(self, failures=0, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.posted = []
+        self.calls = 0
+
+    def __call__(self, repo_path, issue_id, body):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.calls <= self.failures:
+            return "HTTP 502"
+        self.posted.append((repo_path, issue_id, body))
+        return None
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "agentickanban.db"
+
+
+def _statuses(db_path):
+    with sqlite3.connect(str(db_path)) as conn:
+        return [row[0] for row in conn.execute("SELECT status FROM github_comment_outbox ORDER BY id")]
+
+
+class TestCommentOutbox:
+    """Test cases for CommentOutbox."""
+
+    def test_enqueue_does_not_wait_for_post(self, db_path):
+        poster = FakePoster(delay=1.0)
+        outbox = CommentOutbox(poster, db_path, flush_interval=0.05)
+        try:
+            start = time.perf_counter()
+            for i in range(5):
+                outbox.enqueue(REPO, "7", f"[ADW-AGENTS] abc_ops: step {i}")
+            assert time.perf_counter() - start < 0.5
+        finally:
+            outbox.stop()
+
+    def test_consecutive_messages_coalesce_per_issue(self, db_path):
+        poster = FakePoster()
+        outbox = CommentOutbox(poster, db_path, flush_interval=60)
+        outbox.enqueue(REPO, "7", "[ADW-AGENTS] abc_ops: started")
+        outbox.enqueue(REPO, "8", "[ADW-AGENTS] def_ops: started")
+        outbox.enqueue(REPO, "7", "[ADW-AGENTS] abc_tester: ✅ tests passed")
+
+        assert outbox.flush(timeout=5)
+
+        assert poster.posted == [
+            (REPO, "7", "[ADW-AGENTS] abc_ops: started\n\nabc_tester: ✅ tests passed"),
+            (REPO, "8", "[ADW-AGENTS] def_ops: started"),
+        ]
+        assert _statuses(db_path) == ["sent", "sent", "sent"]
+
+    def test_background_sender_posts(self, db_path):
+        poster = FakePoster()
+        outbox = CommentOutbox(poster, db_path, flush_interval=0.05)
+        try:
+            outbox.enqueue(REPO, "7", "hello")
+            deadline = time.monotonic() + 5
+            while not poster.posted and time.monotonic() < deadline:
+                time.sleep(0.02)
+        finally:
+            outbox.stop()
+        assert poster.posted == [(REPO, "7", "hello")]
+
+    def test_failed_post_is_retried_with_backoff(self, db_path):
+        poster = FakePoster(failures=2)
+        outbox = CommentOutbox(poster, db_path, flush_interval=60, base_backoff=0.05)
+        outbox.enqueue(REPO, "7", "hello")
+
+        assert outbox.send_due() == 0
+        # Not due again until the backoff elapses
+        assert outbox.send_due() == 0
+        assert poster.calls == 1
+
+        assert outbox.flush(timeout=5)
+        assert poster.calls == 3
+        assert poster.posted == [(REPO, "7", "hello")]
+
+    def test_gives_up_after_max_attempts(self, db_path):
+        poster = FakePoster(failures=100)
+        outbox = CommentOutbox(poster, db_path, flush_interval=60, max_attempts=3, base_backoff=0.01)
+        outbox.enqueue(REPO, "7", "hello")
+
+        assert outbox.flush(timeout=5)
+        assert poster.calls == 3
+        assert _statuses(db_path) == ["failed"]
+        assert outbox.pending_count() == 0
+
+    def test_queue_survives_restart(self, db_path):
+        first = CommentOutbox(FakePoster(failures=100), db_path, flush_interval=60)
+        first.enqueue(REPO, "7", "one")
+        first.enqueue(REPO, "7", "two")
+        first.stop()
+
+        poster = FakePoster()
+        assert CommentOutbox(poster, db_path, flush_interval=60).flush(timeout=5)
+        assert poster.posted == [(REPO, "7", "one\n\ntwo")]
+
+    def test_old_sent_rows_are_pruned(self, db_path):
+        outbox = CommentOutbox(FakePoster(), db_path, flush_interval=60)
+        outbox.enqueue(REPO, "7", "old")
+        outbox.flush(timeout=5)
+        outbox.enqueue(REPO, "7", "new")
+        outbox.flush(timeout=5)
+        outbox.enqueue(REPO, "7", "pending")
+        with sqlite3.connect(str(db_path)) as conn:
+            conn.execute("UPDATE github_comment_outbox SET sent_at = datetime('now', '-8 days') WHERE body = 'old'")
+
+        assert outbox.prune() == 1
+        assert _statuses(db_path) == ["sent", "pending"]
+
+    def test_exit_flush_registered_on_first_enqueue(self, db_path):
+        with patch("adw_modules.comment_outbox.atexit.register") as register:
+            outbox = CommentOutbox(FakePoster(), db_path, flush_interval=60, flush_at_exit=True)
+            register.assert_not_called()
+            outbox.enqueue(REPO, "7", "one")
+            outbox.enqueue(REPO, "7", "two")
+            outbox.stop()
+
+        register.assert_called_once_with(outbox.flush, 10.0)
+
+    def test_expired_claim_is_reclaimed(self, db_path):
+        outbox = CommentOutbox(FakePoster(), db_path, flush_interval=60, lease_seconds=0.1)
+        outbox.enqueue(REPO, "7", "hello")
+        # Simulate a sender that crashed mid-post
+        outbox._claim()
+        assert outbox.send_due() == 0
+
+        time.sleep(0.15)
+        assert outbox.send_due() == 1
+
+    def test_concurrent_senders_post_once(self, db_path):
+        poster = FakePoster(delay=0.05)
+        outboxes = [CommentOutbox(poster, db_path, flush_interval=60) for _ in range(4)]
+        for i in range(20):
+            outboxes[0].enqueue(REPO, str(i % 5), f"message {i}")
+
+        threads = [threading.Thread(target=o.send_due) for o in outboxes]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        sent = [body for _, _, body in poster.posted]
+        assert sorted(m for body in sent for m in body.split("\n\n")) == sorted(f"message {i}" for i in range(20))
+
+
+class TestMakeIssueComment:
+    """make_issue_comment queues instead of running gh."""
+
+    def test_make_issue_comment_enqueues(self, db_path, tmp_path, monkeypatch):
+        from adw_modules import comment_outbox, github
+
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("ADW_COMMENT_OUTBOX", raising=False)
+        outbox = CommentOutbox(FakePoster(), db_path, flush_interval=60)
+        monkeypatch.setattr(outbox, "start", lambda: None)
+        monkeypatch.setattr(comment_outbox, "_outbox", outbox)
+
+        with patch.object(github, "get_repo_url", return_value=f"https://github.com/{REPO}"), \
+                patch.object(github.subprocess, "run") as mock_run:
+            github.make_issue_comment("7", "abc_ops: started")
+
+        mock_run.assert_not_called()
+        assert outbox.pending_count() == 1
+        with sqlite3.connect(str(db_path)) as conn:
+            row = conn.execute("SELECT repo_path, issue_id, body FROM github_comment_outbox").fetchone()
+        assert row == (REPO, "7", "[ADW-AGENTS] abc_ops: started")
@@ -0,0 +1,152 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["pytest", "pytest-asyncio"]
+# ///
+
+"""
+Unit tests for HealthMonitor module.
+
+Tests cached health snapshots, deep refreshes, timeouts, refresh
+coalescing and latency histograms.
+"""
+
+import asyncio
+import sys
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from adw_modules.health_monitor import HealthMonitor, LatencyHistogram
+
+
+def _run(coro):
+    """Run a coroutine on a private loop (leaves the global loop untouched)."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _ok(**details):
+    return lambda: SimpleNamespace(success=True, error=None, warning=None, details=details)
+
+
+def _fail(error):
+    return lambda: SimpleNamespace(success=False, error=error, warning=None, details={})
+
+
+class TestLatencyHistogram:
+    """Test cases for LatencyHistogram."""
+
+    def test_cumulative_buckets(self):
+        hist = LatencyHistogram(buckets_ms=(10, 100))
+        for ms in (5, 10, 50, 500):
+            hist.observe(ms)
+
+        data = hist.to_dict()
+        assert data["buckets_ms"] == {"10": 2, "100": 3, "+Inf": 4}
+        assert data["count"] == 4
+        assert data["max_ms"] == 500
+        assert data["avg_ms"] == 141.25
+
+
+class TestHealthMonitor:
+    """Test cases for HealthMonitor class."""
+
+    def test_snapshot_before_first_refresh_is_pending(self):
+        monitor = HealthMonitor(checks={"git": _ok()})
+
+        snapshot = monitor.snapshot()
+
+        assert snapshot["success"] is True
+        assert snapshot["last_refresh"] is None
+        assert snapshot["checks"]["git"] == {"success": None, "pending": True}
+
+    def test_refresh_caches_results_and_errors(self):
+        monitor = HealthMonitor(checks={"git": _ok(repo="x"), "gh": _fail("not authenticated")})
+
+        _run(monitor.refresh())
+        snapshot = monitor.snapshot()
+
+        assert snapshot["success"] is False
+        assert snapshot["errors"] == ["gh: not authenticated"]
+        assert snapshot["checks"]["git"]["details"] == {"repo": "x"}
+        assert "checked_at" in snapshot["checks"]["git"]
+        assert snapshot["latency"]["gh"]["count"] == 1
+
+    def test_deep_checks_only_run_on_deep_refresh(self):
+        calls = []
+
+        def deep():
+            calls.append(1)
+            return SimpleNamespace(success=True, error=None, warning=None, details={})
+
+        monitor = HealthMonitor(checks={"git": _ok()}, deep_checks={"claude": deep})
+
+        _run(monitor.refresh())
+        assert calls == []
+        assert monitor.snapshot()["checks"]["claude"]["pending"] is True
+
+        _run(monitor.refresh(deep=True))
+        assert calls == [1]
+        assert monitor.snapshot()["checks"]["claude"]["success"] is True
+
+    def test_skipped_check_is_not_a_failure(self):
+        skipped = lambda: SimpleNamespace(success=False, error=None, warning=None, details={"skipped": True})
+        monitor = HealthMonitor(checks={"claude": skipped})
+
+        _run(monitor.refresh())
+
+        assert monitor.snapshot()["success"] is True
+
+    def test_slow_check_times_out(self):
+        release = threading.Event()
+        monitor = HealthMonitor(checks={"slow": lambda: release.wait(5)}, check_timeout_seconds=0.05)
+
+        _run(monitor.refresh())
+        release.set()
+
+        entry = monitor.snapshot()["checks"]["slow"]
+        assert entry["success"] is False
+        assert "timed out" in entry["error"]
+
+    def test_concurrent_refreshes_share_one_run(self):
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.05)
+            return SimpleNamespace(success=True, error=None, warning=None, details={})
+
+        monitor = HealthMonitor(checks={"slow": slow})
+
+        async def burst():
+            await asyncio.gather(*(monitor.refresh() for _ in range(10)))
+
+        _run(burst())
+
+        assert calls == [1]
+
+    def test_snapshot_does_not_wait_for_running_checks(self):
+        release = threading.Event()
+        monitor = HealthMonitor(checks={"slow": lambda: release.wait(5)})
+
+        async def probe():
+            monitor.start()
+            await asyncio.sleep(0.01)
+            start = time.perf_counter()
+            snapshot = monitor.snapshot()
+            elapsed = time.perf_counter() - start
+            release.set()
+            await monitor.stop()
+            return snapshot, elapsed
+
+        snapshot, elapsed = _run(probe())
+
+        assert snapshot["checks"]["slow"]["pending"] is True
+        assert elapsed < 0.01
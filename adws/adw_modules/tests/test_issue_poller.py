@@ -0,0 +1,226 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["pytest", "pydantic", "python-dotenv"]
+# ///
+
+"""
+Unit tests for incremental GitHub issue polling.
+
+Runs against a fake `gh` executable on PATH that serves issues from a JSON
+file and records every invocation.
+"""
+
+import json
+import os
+import stat
+import sys
+import textwrap
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from adw_modules.issue_poller import IssuePoller, PollStateStore
+
+REPO = "acme/widgets"
+
+FAKE_GH = textwrap.dedent('''\
+    #!{python}
+    import json, os, re, sys
+
+    state = json.load(open(os.environ["FAKE_GH_STATE"]))
+    with open(os.environ["FAKE_GH_LOG"], "a") as log:
+        log.write(json.dumps(sys.argv[1:]) + "\\n")
+    args = sys.argv[1:]
+    issues = {{i["number"]: i for i in state["issues"]}}
+
+    if args[:2] == ["issue", "list"]:
+        since = None
+        if "--search" in args:
+            since = args[args.index("--search") + 1].split(">=", 1)[1]
+        out = [
+            {{k: i[k] for k in ("number", "title", "body", "labels", "createdAt", "updatedAt")}}
+            for i in state["issues"] if since is None or i["updatedAt"] >= since
+        ]
+        print(json.dumps(out))
+    elif args[:2] == ["api", "graphql"]:
+        if state.get("graphql_fail"):
+            sys.stderr.write("graphql unavailable")
+            sys.exit(1)
+        query = args[args.index("-f") + 1]
+        repo, errors = {{}}, []
+        for alias, number in re.findall(r"(i\\d+): issue\\(number: (\\d+)\\)", query):
+            issue = issues.get(int(number))
+            if issue is None:
+                repo[alias] = None
+                errors.append({{"message": "not found"}})
+            else:
+                repo[alias] = {{"comments": {{"nodes": issue["comments"][-1:]}}}}
+        print(json.dumps({{"data": {{"repository": repo}}, **({{"errors": errors}} if errors else {{}})}}))
+        sys.exit(1 if errors else 0)
+    elif args[:2] == ["issue", "view"]:
+        print(json.dumps({{"comments": issues[int(args[2])]["comments"]}}))
+    else:
+        sys.exit(2)
+''')
+
+
+def _issue(number, updated, comments=()):
+    return {
+        "number": number,
+        "title": f"Issue {number}",
+        "body": "",
+        "labels": [],
+        "createdAt": "2025-01-01T00:00:00Z",
+        "updatedAt": updated,
+        "comments": [
+            {"id": f"IC_{number}_{i}", "body": body, "createdAt": f"2025-01-01T00:00:0{i}Z"}
+            for i, body in enumerate(comments)
+        ],
+    }
+
+
+class FakeGitHub:
+    """Fake gh CLI backed by a JSON state file."""
+
+    def __init__(self, tmp_path, monkeypatch):
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        gh = bin_dir / "gh"
+        gh.write_text(FAKE_GH.format(python=sys.executable))
+        gh.chmod(gh.stat().st_mode | stat.S_IEXEC)
+
+        self.state_file = tmp_path / "gh_state.json"
+        self.log_file = tmp_path / "gh_calls.jsonl"
+        self.state = {"issues": []}
+        self.save()
+
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        monkeypatch.setenv("FAKE_GH_STATE", str(self.state_file))
+        monkeypatch.setenv("FAKE_GH_LOG", str(self.log_file))
+        monkeypatch.delenv("GITHUB_PAT", raising=False)
+
+    def save(self):
+        self.state_file.write_text(json.dumps(self.state))
+
+    def calls(self):
+        """Return and reset the recorded gh invocations."""
+        if not self.log_file.exists():
+            return []
+        calls = [json.loads(line) for line in self.log_file.read_text().splitlines()]
+        self.log_file.unlink()
+        return calls
+
+
+@pytest.fixture
+def gh(tmp_path, monkeypatch):
+    return FakeGitHub(tmp_path, monkeypatch)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "agentickanban.db"
+
+
+def _poller(db_path, triggered, fail=()):
+    def trigger(number):
+        if number in fail:
+            return False
+        triggered.append(number)
+        return True
+
+    return IssuePoller(REPO, PollStateStore(db_path), trigger)
+
+
+def _kinds(calls):
+    return [" ".join(call[:2]) for call in calls]
+
+
+class TestIssuePoller:
+    """Test cases for IssuePoller."""
+
+    def test_first_cycle_batches_comment_lookups(self, gh, db_path):
+        gh.state["issues"] = [
+            _issue(1, "2025-01-02T00:00:00Z"),
+            _issue(2, "2025-01-03T00:00:00Z", ["looks good", "adw"]),
+            _issue(3, "2025-01-04T00:00:00Z", ["just a comment"]),
+        ]
+        gh.save()
+        triggered = []
+
+        stats = _poller(db_path, triggered).poll()
+
+        assert sorted(triggered) == [1, 2]
+        assert stats == {"fetched": 3, "qualifying": 2, "triggered": 2}
+        calls = gh.calls()
+        assert _kinds(calls) == ["issue list", "api graphql"]
+        assert "--search" not in calls[0]
+
+    def test_later_cycles_only_fetch_updated_issues(self, gh, db_path):
+        gh.state["issues"] = [
+            _issue(1, "2025-01-02T00:00:00Z"),
+            _issue(2, "2025-01-03T00:00:00Z", ["note"]),
+        ]
+        gh.save()
+        triggered = []
+        poller = _poller(db_path, triggered)
+        poller.poll()
+        gh.calls()
+
+        stats = poller.poll()
+
+        list_call = gh.calls()[0]
+        assert list_call[list_call.index("--search") + 1] == "updated:>=2025-01-03T00:00:00Z"
+        # Only the issue at the (inclusive) watermark comes back
+        assert stats["fetched"] == 1
+        assert triggered == [1]
+
+    def test_state_survives_restart_and_new_adw_comment_retriggers(self, gh, db_path):
+        gh.state["issues"] = [_issue(1, "2025-01-02T00:00:00Z"), _issue(2, "2025-01-02T00:00:00Z", ["adw"])]
+        gh.save()
+        triggered = []
+        _poller(db_path, triggered).poll()
+
+        # Restart: fresh poller and store on the same database, bot commented meanwhile
+        gh.state["issues"][0] = _issue(1, "2025-01-05T00:00:00Z", ["[ADW-AGENTS] working"])
+        gh.save()
+        _poller(db_path, triggered).poll()
+        assert sorted(triggered) == [1, 2]
+
+        # A new 'adw' comment re-triggers a processed issue
+        gh.state["issues"][0] = _issue(1, "2025-01-06T00:00:00Z", ["[ADW-AGENTS] working", "adw"])
+        gh.save()
+        _poller(db_path, triggered).poll()
+        assert sorted(triggered) == [1, 1, 2]
+
+    def test_failed_trigger_holds_watermark(self, gh, db_path):
+        gh.state["issues"] = [_issue(1, "2025-01-02T00:00:00Z"), _issue(2, "2025-01-09T00:00:00Z", ["x"])]
+        gh.save()
+        triggered = []
+
+        _poller(db_path, triggered, fail={1}).poll()
+        assert PollStateStore(db_path).get_watermark(REPO) == "2025-01-02T00:00:00Z"
+
+        _poller(db_path, triggered).poll()
+        assert triggered == [1]
+        assert PollStateStore(db_path).get_watermark(REPO) == "2025-01-09T00:00:00Z"
+
+    def test_graphql_failure_falls_back_to_issue_view(self, gh, db_path):
+        gh.state["issues"] = [_issue(n, "2025-01-02T00:00:00Z", ["adw"] if n % 2 else []) for n in range(1, 7)]
+        gh.state["graphql_fail"] = True
+        gh.save()
+        triggered = []
+
+        _poller(db_path, triggered).poll()
+
+        assert sorted(triggered) == [1, 2, 3, 4, 5, 6]
+        assert _kinds(gh.calls()).count("issue view") == 6
+
+    def test_many_issues_use_one_query_per_batch(self, gh, db_path):
+        gh.state["issues"] = [_issue(n, "2025-01-02T00:00:00Z", ["note"]) for n in range(1, 121)]
+        gh.save()
+
+        _poller(db_path, []).poll()
+
+        assert _kinds(gh.calls()) == ["issue list"] + ["api graphql"] * 3
@@ -0,0 +1,252 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["pytest"]
+# ///
+
+"""
+Unit tests for the KPI engine.
+
+Runs against a temporary database created from schema.sql and a temporary
+agents directory holding raw_output.jsonl files.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from adw_modules.kpi_engine import KpiEngine, stage_for_agent
+
+SCHEMA = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "database", "schema.sql")
+ADW_ID = "kpi12345"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "adw.db"
+    with sqlite3.connect(path) as conn:
+        with open(SCHEMA) as f:
+            conn.executescript(f.read())
+        conn.execute("INSERT INTO adw_states (adw_id, issue_number) VALUES (?, 1)", (ADW_ID,))
+    return path
+
+
+@pytest.fixture
+def engine(db_path, tmp_path):
+    return KpiEngine(db_path=db_path, agents_dir=tmp_path / "agents")
+
+
+def _log(db_path, event_type, timestamp, field=None, new=None, step=None):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT INTO adw_activity_logs (adw_id, event_type, field_changed, new_value, workflow_step, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (ADW_ID, event_type, field, new, step, timestamp)
+        )
+
+
+def _save(db_path, workflow_step, timestamp):
+    """The state_change row ADWState.save() logs."""
+    _log(db_path, "state_change", timestamp, step=workflow_step)
+
+
+def _status(db_path, status, timestamp):
+    """The state_change row the status trigger logs."""
+    _log(db_path, "state_change", timestamp, field="status", new=status)
+
+
+def _result(cost, input_tokens, output_tokens, turns=3):
+    return {
+        "type": "result",
+        "subtype": "success",
+        "num_turns": turns,
+        "total_cost_usd": cost,
+        "usage": {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_creation_input_tokens": 10,
+            "cache_read_input_tokens": 20,
+        },
+    }
+
+
+def _write_output(tmp_path, agent_name, messages, mode="w", session="s1"):
+    path = tmp_path / "agents" / ADW_ID / agent_name / "raw_output.jsonl"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, mode) as f:
+        if mode == "w":
+            f.write(json.dumps({"type": "system", "subtype": "init", "session_id": session}) + "\n")
+        for message in messages:
+            f.write(json.dumps(message) + "\n")
+    return path
+
+
+def _stage(kpis, name):
+    return next(stage for stage in kpis["stages"] if stage["stage"] == name)
+
+
+class TestKpiEngine:
+    """Test cases for KpiEngine."""
+
+    def test_cycle_time_and_retries_from_workflow_steps(self, engine, db_path):
+        _save(db_path, "ensure_adw_id", "2026-01-01 09:59:00")
+        _save(db_path, "adw_plan_iso", "2026-01-01 10:00:00")
+        _save(db_path, "adw_plan_iso", "2026-01-01 10:02:00")
+        _save(db_path, "adw_build_iso", "2026-01-01 10:05:00")
+        _log(db_path, "error_occurred", "2026-01-01 10:06:00")
+        _save(db_path, "adw_plan_iso", "2026-01-01 10:10:00")
+        _save(db_path, "adw_build_iso", "2026-01-01 10:12:00")
+        # The final save logs the status change, then its own workflow step
+        _status(db_path, "completed", "2026-01-01 10:20:00")
+        _save(db_path, "adw_build_iso", "2026-01-01 10:20:00")
+
+        kpis = engine.refresh(ADW_ID)
+
+        plan = _stage(kpis, "plan")
+        assert plan["cycle_time_seconds"] == 420
+        assert plan["attempts"] == 2
+        assert plan["retries"] == 1
+        build = _stage(kpis, "build")
+        assert build["cycle_time_seconds"] == 780
+        assert build["attempts"] == 2
+        assert build["errors"] == 1
+
+    def test_rerun_after_completion_starts_a_new_stage(self, engine, db_path):
+        _save(db_path, "adw_build_iso", "2026-01-01 10:00:00")
+        _status(db_path, "completed", "2026-01-01 10:01:00")
+        _save(db_path, "adw_build_iso", "2026-01-01 10:01:00")
+        engine.refresh(ADW_ID)
+
+        _status(db_path, "in_progress", "2026-01-02 09:00:00")
+        _save(db_path, "adw_test_iso", "2026-01-02 09:00:00")
+        _status(db_path, "completed", "2026-01-02 09:03:00")
+        kpis = engine.refresh(ADW_ID)
+
+        assert _stage(kpis, "build")["cycle_time_seconds"] == 60
+        assert _stage(kpis, "build")["attempts"] == 1
+        assert _stage(kpis, "test")["cycle_time_seconds"] == 180
+
+    def test_activity_logs_are_consumed_incrementally(self, engine, db_path):
+        _save(db_path, "adw_plan_iso", "2026-01-01 10:00:00")
+        engine.refresh(ADW_ID)
+        assert engine.ingest_activity_logs(ADW_ID) == 0
+
+        # The open stage is timed across refreshes via the cursor
+        _save(db_path, "adw_build_iso", "2026-01-01 10:30:00")
+        assert engine.ingest_activity_logs(ADW_ID) == 1
+
+        plan = _stage(engine.get_kpis(ADW_ID), "plan")
+        assert plan["cycle_time_seconds"] == 1800
+        assert plan["attempts"] == 1
+
+    def test_orchestrator_state_sets_attempts_and_duration(self, engine):
+        orchestrator = {"execution": {"stages": [
+            {"stage_name": "test", "status": "completed", "attempts": 3,
+             "started_at": "2026-01-01T10:00:00", "completed_at": "2026-01-01T10:02:30"},
+            {"stage_name": "review", "status": "pending", "attempts": 0,
+             "started_at": None, "completed_at": None},
+        ]}}
+
+        engine.refresh(ADW_ID, orchestrator)
+        kpis = engine.refresh(ADW_ID, orchestrator)
+
+        test = _stage(kpis, "test")
+        assert test["status"] == "completed"
+        assert test["attempts"] == 3
+        assert test["retries"] == 2
+        assert test["cycle_time_seconds"] == 150
+        assert _stage(kpis, "review")["retries"] == 0
+
+    def test_orchestrator_state_read_from_adw_states(self, engine, db_path):
+        orchestrator = {"execution": {"stages": [
+            {"stage_name": "build", "status": "completed", "attempts": 2,
+             "started_at": "2026-01-01T10:00:00", "completed_at": "2026-01-01T10:01:00"},
+        ]}}
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                "UPDATE adw_states SET orchestrator_state = ? WHERE adw_id = ?",
+                (json.dumps(orchestrator), ADW_ID)
+            )
+
+        assert _stage(engine.refresh(ADW_ID), "build")["attempts"] == 2
+
+    def test_usage_and_cost_from_result_messages(self, engine, tmp_path):
+        _write_output(tmp_path, "sdlc_planner", [
+            {"type": "assistant", "message": {"usage": {"input_tokens": 999}}},
+            _result(0.25, 100, 50),
+        ])
+        _write_output(tmp_path, "test_runner", [_result(0.5, 200, 80)])
+
+        kpis = engine.refresh(ADW_ID)
+
+        plan = _stage(kpis, "plan")
+        assert plan["input_tokens"] == 100
+        assert plan["output_tokens"] == 50
+        assert plan["cache_read_tokens"] == 20
+        assert plan["agent_runs"] == 1
+        assert plan["num_turns"] == 3
+        assert kpis["totals"]["cost_usd"] == 0.75
+        assert kpis["totals"]["input_tokens"] == 300
+
+    def test_usage_is_read_incrementally(self, engine, tmp_path):
+        path = _write_output(tmp_path, "reviewer", [_result(0.1, 10, 1)])
+        engine.refresh(ADW_ID)
+        assert engine.ingest_usage(ADW_ID) == 0
+
+        # A partially written line is left for the next refresh
+        with open(path, "a") as f:
+            f.write(json.dumps(_result(0.2, 20, 2))[:15])
+        assert engine.ingest_usage(ADW_ID) == 0
+
+        with open(path, "a") as f:
+            f.write(json.dumps(_result(0.2, 20, 2))[15:] + "\n")
+        assert engine.ingest_usage(ADW_ID) == 1
+
+        review = _stage(engine.get_kpis(ADW_ID), "review")
+        assert review["input_tokens"] == 30
+        assert review["agent_runs"] == 2
+
+    def test_rewritten_output_file_is_read_from_start(self, engine, tmp_path):
+        _write_output(tmp_path, "documenter", [_result(0.1, 10, 1), _result(0.1, 10, 1)])
+        engine.refresh(ADW_ID)
+
+        # A retry truncates raw_output.jsonl and starts a new session
+        _write_output(tmp_path, "documenter", [_result(0.3, 30, 3)], session="s2")
+        kpis = engine.refresh(ADW_ID)
+
+        document = _stage(kpis, "document")
+        assert document["agent_runs"] == 3
+        assert document["input_tokens"] == 50
+
+    def test_rewrite_detected_when_first_line_is_long(self, engine, tmp_path):
+        long_result = {**_result(0.1, 10, 1), "result": "x" * 5000}
+        path = tmp_path / "agents" / ADW_ID / "reviewer" / "raw_output.jsonl"
+        path.parent.mkdir(parents=True)
+        path.write_text(json.dumps(long_result) + "\n")
+        engine.refresh(ADW_ID)
+
+        path.write_text(json.dumps({**long_result, "result": "y" * 5000}) + "\n")
+        kpis = engine.refresh(ADW_ID)
+
+        assert _stage(kpis, "review")["agent_runs"] == 2
+
+    def test_missing_activity_log_table_is_ignored(self, tmp_path):
+        engine = KpiEngine(db_path=tmp_path / "empty.db", agents_dir=tmp_path / "agents")
+
+        assert engine.refresh(ADW_ID) == {"adw_id": ADW_ID, "stages": [], "totals": {
+            "cycle_time_seconds": 0, "retries": 0, "errors": 0, "agent_runs": 0, "input_tokens": 0,
+            "output_tokens": 0, "cache_creation_tokens": 0, "cache_read_tokens": 0, "cost_usd": 0,
+        }}
+
+    def test_stage_for_agent(self):
+        assert stage_for_agent("sdlc_implementor_committer") == "build"
+        assert stage_for_agent("review_patch_planner") == "review"
+        assert stage_for_agent("patch_planner") == "patch"
+        assert stage_for_agent("mystery") == "other"
@@ -0,0 +1,231 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["pytest"]
+# ///
+
+"""
+Unit tests for workflow heartbeats and the liveness monitor.
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from adw_modules.db_paths import ensure_tables
+from adw_modules.heartbeat import WorkflowHeartbeat, process_start_time, register_launch
+from adw_modules.liveness_monitor import LivenessMonitor, probe_process
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    db_path = tmp_path / "adw.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE adw_states (
+            adw_id TEXT PRIMARY KEY,
+            workflow_name TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            is_stuck BOOLEAN NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            deleted_at TIMESTAMP
+        );
+    """)
+    ensure_tables(conn, "adw_heartbeats")
+    conn.close()
+    return db_path
+
+
+def _add_adw(db_path, adw_id, status="in_progress", updated_at=None):
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        "INSERT INTO adw_states (adw_id, workflow_name, status, updated_at) VALUES (?, 'adw_sdlc_iso', ?, COALESCE(?, CURRENT_TIMESTAMP))",
+        (adw_id, status, updated_at)
+    )
+    conn.commit()
+    conn.close()
+
+
+def _is_stuck(db_path, adw_id):
+    conn = sqlite3.connect(str(db_path))
+    row = conn.execute("SELECT is_stuck FROM adw_states WHERE adw_id = ?", (adw_id,)).fetchone()
+    conn.close()
+    return bool(row[0])
+
+
+def _heartbeat_row(db_path, adw_id, pid):
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    row = conn.execute("SELECT * FROM adw_heartbeats WHERE adw_id = ? AND pid = ?", (adw_id, pid)).fetchone()
+    conn.close()
+    return row
+
+
+def _beat(db_path, adw_id, pid, age, role="workflow", process_start=None):
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        "INSERT INTO adw_heartbeats (adw_id, pid, role, workflow_name, started_at, process_start, last_heartbeat) VALUES (?, ?, ?, 'adw_build_iso', ?, ?, ?)",
+        (adw_id, pid, role, time.time() - age, process_start, time.time() - age)
+    )
+    conn.commit()
+    conn.close()
+
+
+def _probe(states):
+    """Fake probe: pid -> (alive, exit_code); unknown pids are alive."""
+    return lambda pid: states.get(pid, (True, None))
+
+
+@pytest.fixture
+def monitor(db_path):
+    return LivenessMonitor(db_path=db_path, heartbeat_timeout=30, probe=_probe({}))
+
+
+class TestWorkflowHeartbeat:
+    """Test cases for WorkflowHeartbeat and register_launch."""
+
+    def test_lifecycle(self, db_path):
+        heartbeat = WorkflowHeartbeat("adw00001", "adw_build_iso", db_path=db_path, interval=0.05)
+        heartbeat.start()
+        first = _heartbeat_row(db_path, "adw00001", os.getpid())["last_heartbeat"]
+        time.sleep(0.2)
+        heartbeat.stop()
+
+        row = _heartbeat_row(db_path, "adw00001", os.getpid())
+        assert row["role"] == "workflow"
+        assert row["process_start"] == process_start_time(os.getpid())
+        assert row["last_heartbeat"] > first
+        assert row["exited_at"] is not None
+
+    def test_register_launch_clears_stuck_flag(self, db_path):
+        _add_adw(db_path, "adw00002")
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("UPDATE adw_states SET is_stuck = 1")
+        conn.commit()
+        conn.close()
+
+        register_launch("adw00002", 4242, "adw_sdlc_iso", db_path=db_path)
+
+        assert _heartbeat_row(db_path, "adw00002", 4242)["role"] == "launcher"
+        assert not _is_stuck(db_path, "adw00002")
+
+
+class TestLivenessMonitor:
+    """Test cases for LivenessMonitor."""
+
+    def test_dead_workflow_is_flagged_once(self, db_path, monitor):
+        _add_adw(db_path, "adw00001")
+        _beat(db_path, "adw00001", 111, age=1)
+        monitor.probe = _probe({111: (False, None)})
+
+        flagged = monitor.check()
+
+        assert [entry["adw_id"] for entry in flagged] == ["adw00001"]
+        assert "died without exiting cleanly" in flagged[0]["reason"]
+        assert _is_stuck(db_path, "adw00001")
+        assert _heartbeat_row(db_path, "adw00001", 111)["exited_at"] is not None
+        assert monitor.check() == []
+
+    def test_reused_pid_is_flagged(self, db_path, monitor):
+        _add_adw(db_path, "adw00011")
+        _beat(db_path, "adw00011", 111, age=1, process_start=1000)
+        _add_adw(db_path, "adw00012")
+        _beat(db_path, "adw00012", 112, age=1, process_start=1000)
+        monitor.start_time = {111: 2000, 112: 1000}.get
+
+        flagged = monitor.check()
+
+        assert [entry["adw_id"] for entry in flagged] == ["adw00011"]
+        assert "died without exiting cleanly" in flagged[0]["reason"]
+
+    def test_hung_workflow_is_flagged(self, db_path, monitor):
+        _add_adw(db_path, "adw00002")
+        _beat(db_path, "adw00002", 222, age=120)
+
+        flagged = monitor.check()
+
+        assert "has not sent a heartbeat" in flagged[0]["reason"]
+
+    def test_healthy_and_cleanly_exited_workflows_are_left_alone(self, db_path, monitor):
+        _add_adw(db_path, "adw00003")
+        _beat(db_path, "adw00003", 333, age=1)
+        _add_adw(db_path, "adw00004")
+        _beat(db_path, "adw00004", 444, age=120)
+        _beat(db_path, "adw00004", 445, age=120, role="launcher")
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("UPDATE adw_heartbeats SET exited_at = ? WHERE pid = 444", (time.time(),))
+        conn.commit()
+        conn.close()
+        monitor.probe = _probe({444: (False, None), 445: (False, 0)})
+
+        assert monitor.check() == []
+        assert not _is_stuck(db_path, "adw00003")
+        assert _heartbeat_row(db_path, "adw00004", 445)["exit_code"] == 0
+
+    def test_failed_launcher_is_flagged(self, db_path, monitor):
+        _add_adw(db_path, "adw00005")
+        _beat(db_path, "adw00005", 555, age=1, role="launcher")
+        monitor.probe = _probe({555: (False, 2)})
+
+        flagged = monitor.check()
+
+        assert "exited with code 2" in flagged[0]["reason"]
+
+    def test_adws_without_heartbeats_use_idle_time(self, db_path, monitor):
+        _add_adw(db_path, "adw00006", updated_at="2000-01-01 00:00:00")
+        _add_adw(db_path, "adw00007")
+        _add_adw(db_path, "adw00008", status="completed", updated_at="2000-01-01 00:00:00")
+
+        flagged = monitor.check()
+
+        assert [entry["adw_id"] for entry in flagged] == ["adw00006"]
+
+    def test_idle_time_handles_iso_timestamps_and_bad_rows(self, db_path, monitor):
+        _add_adw(db_path, "adw00009", updated_at="2000-01-01T00:00:00Z")
+        _add_adw(db_path, "adw00010", updated_at="not a timestamp")
+
+        flagged = monitor.check()
+
+        assert [entry["adw_id"] for entry in flagged] == ["adw00009"]
+
+    def test_in_progress_adw_with_all_processes_exited_is_flagged(self, db_path, monitor):
+        _add_adw(db_path, "adw00013")
+        _beat(db_path, "adw00013", 131, age=120)
+        _beat(db_path, "adw00013", 132, age=120, role="launcher")
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("UPDATE adw_heartbeats SET exited_at = ?", (time.time() - 100,))
+        conn.commit()
+        conn.close()
+
+        flagged = monitor.check()
+
+        assert [entry["adw_id"] for entry in flagged] == ["adw00013"]
+        assert "All processes exited" in flagged[0]["reason"]
+
+    def test_probe_reaps_child_exit_code(self):
+        process = subprocess.Popen([sys.executable, "-c", "import sys; sys.exit(3)"])
+        deadline = time.time() + 10
+        while (result := probe_process(process.pid))[0] and time.time() < deadline:
+            time.sleep(0.02)
+
+        assert result == (False, 3)
+        assert probe_process(os.getpid()) == (True, None)
+
+    @pytest.mark.skipif(not os.path.exists("/proc/self/stat"), reason="needs /proc")
+    def test_process_start_time(self):
+        process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+        try:
+            started = process_start_time(process.pid)
+            assert started is not None
+            assert started >= process_start_time(os.getpid())
+        finally:
+            process.kill()
+            process.wait()
+
+        assert process_start_time(process.pid) is None
@@ -0,0 +1,241 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["pytest", "boto3"]
+# ///
+
+"""
+Unit tests for R2Uploader.
+
+Uploads go through real boto3 against a small in-process S3-compatible
+server that supports HEAD, PUT and multipart uploads.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from adw_modules.r2_uploader import R2Uploader
+
+BUCKET = "screenshots"
+
+
+class FakeS3:
+    """Object store state shared by the request handlers."""
+
+    def __init__(self, put_delay=0.0):
+        self.objects = {}
+        self.uploads = {}
+        self.requests = []
+        self.put_delay = put_delay
+        self.active_puts = 0
+        self.max_active_puts = 0
+        self.lock = threading.Lock()
+
+
+def _handler(store):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _key(self):
+            parsed = urlparse(self.path)
+            bucket, _, key = unquote(parsed.path).lstrip("/").partition("/")
+            return key, parse_qs(parsed.query, keep_blank_values=True)
+
+        def _reply(self, status, body=b"", headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body and self.command != "HEAD":
+                self.wfile.write(body)
+
+        def _body(self):
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        def do_HEAD(self):
+            key, _ = self._key()
+            store.requests.append(("HEAD", key))
+            if key in store.objects:
+                self._reply(200, headers={"ETag": '"x"', "Content-Length": str(len(store.objects[key]))})
+            else:
+                self._reply(404)
+
+        def do_PUT(self):
+            key, query = self._key()
+            body = self._body()
+            if "partNumber" in query:
+                store.requests.append(("UPLOAD_PART", key))
+                store.uploads[query["uploadId"][0]][int(query["partNumber"][0])] = body
+                self._reply(200, headers={"ETag": f'"{hashlib.md5(body).hexdigest()}"'})
+                return
+
+            store.requests.append(("PUT", key))
+            with store.lock:
+                store.active_puts += 1
+                store.max_active_puts = max(store.max_active_puts, store.active_puts)
+            time.sleep(store.put_delay)
+            with store.lock:
+                store.active_puts -= 1
+                store.objects[key] = body
+            self._reply(200, headers={"ETag": f'"{hashlib.md5(body).hexdigest()}"'})
+
+        def do_POST(self):
+            key, query = self._key()
+            self._body()
+            if "uploads" in query:
+                store.requests.append(("CREATE_MULTIPART", key))
+                upload_id = f"upload-{len(store.uploads)}"
+                store.uploads[upload_id] = {}
+                body = (
+                    f"<InitiateMultipartUploadResult><Bucket>{BUCKET}</Bucket><Key>{key}</Key>"
+                    f"<UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>"
+                ).encode()
+                self._reply(200, body, {"Content-Type": "application/xml"})
+            else:
+                store.requests.append(("COMPLETE_MULTIPART", key))
+                parts = store.uploads.pop(query["uploadId"][0])
+                store.objects[key] = b"".join(parts[n] for n in sorted(parts))
+                body = (
+                    f"<CompleteMultipartUploadResult><Bucket>{BUCKET}</Bucket><Key>{key}</Key>"
+                    f'<ETag>"done"</ETag></CompleteMultipartUploadResult>'
+                ).encode()
+                self._reply(200, body, {"Content-Type": "application/xml"})
+
+    return Handler
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    store = FakeS3()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(store))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setenv("CLOUDFLARE_ACCOUNT_ID", "test-account")
+    monkeypatch.setenv("CLOUDFLARE_R2_ACCESS_KEY_ID", "test-key")
+    monkeypatch.setenv("CLOUDFLARE_R2_SECRET_ACCESS_KEY", "test-secret")
+    monkeypatch.setenv("CLOUDFLARE_R2_BUCKET_NAME", BUCKET)
+    monkeypatch.setenv("CLOUDFLARE_R2_PUBLIC_DOMAIN", "imgs.example.com")
+    monkeypatch.setenv("CLOUDFLARE_R2_ENDPOINT_URL", f"http://127.0.0.1:{server.server_port}")
+    yield store
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def screenshots(tmp_path):
+    paths = []
+    for i in range(6):
+        path = tmp_path / "shots" / f"shot{i}.png"
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(f"png-bytes-{i}".encode() * 100)
+        paths.append(str(path))
+    return paths
+
+
+def _uploader(tmp_path, **kwargs):
+    return R2Uploader(logging.getLogger("test_r2"), manifest_dir=str(tmp_path / "agents"), **kwargs)
+
+
+def _count(store, kind):
+    return sum(1 for request, _ in store.requests if request == kind)
+
+
+class TestR2Uploader:
+    """Test cases for R2Uploader against a local S3 stand-in."""
+
+    def test_uploads_run_concurrently(self, s3, screenshots, tmp_path):
+        s3.put_delay = 0.2
+        uploader = _uploader(tmp_path, max_workers=3)
+
+        start = time.perf_counter()
+        urls = uploader.upload_screenshots(screenshots, "adw12345")
+        elapsed = time.perf_counter() - start
+
+        assert _count(s3, "PUT") == 6
+        assert s3.max_active_puts == 3
+        assert elapsed < 6 * 0.2
+        for path in screenshots:
+            assert urls[path].startswith("https://imgs.example.com/adw/adw12345/review/")
+            assert urls[path].endswith(os.path.basename(path))
+
+    def test_keys_are_content_addressed(self, s3, screenshots, tmp_path):
+        uploader = _uploader(tmp_path)
+        urls = uploader.upload_screenshots(screenshots[:1], "adw12345")
+
+        digest = hashlib.sha256(open(screenshots[0], "rb").read()).hexdigest()
+        key = f"adw/adw12345/review/{digest[:16]}/shot0.png"
+        assert urls[screenshots[0]] == f"https://imgs.example.com/{key}"
+        assert s3.objects[key] == open(screenshots[0], "rb").read()
+
+    def test_retry_skips_uploaded_content_via_manifest(self, s3, screenshots, tmp_path):
+        first = _uploader(tmp_path).upload_screenshots(screenshots, "adw12345")
+        s3.requests.clear()
+
+        second = _uploader(tmp_path).upload_screenshots(screenshots, "adw12345")
+
+        assert second == first
+        assert s3.requests == []
+        manifest = json.loads((tmp_path / "agents" / "adw12345" / "r2_manifest.json").read_text())
+        assert len(manifest["objects"]) == 6
+
+    def test_head_before_put_dedupes_without_manifest(self, s3, screenshots, tmp_path):
+        _uploader(tmp_path).upload_screenshots(screenshots[:2], "adw12345")
+        (tmp_path / "agents" / "adw12345" / "r2_manifest.json").unlink()
+        s3.requests.clear()
+
+        _uploader(tmp_path).upload_screenshots(screenshots[:2], "adw12345")
+
+        assert _count(s3, "HEAD") == 2
+        assert _count(s3, "PUT") == 0
+
+    def test_changed_content_is_uploaded_again(self, s3, screenshots, tmp_path):
+        first = _uploader(tmp_path).upload_screenshots(screenshots[:1], "adw12345")
+        with open(screenshots[0], "wb") as f:
+            f.write(b"different image")
+
+        second = _uploader(tmp_path).upload_screenshots(screenshots[:1], "adw12345")
+
+        assert second[screenshots[0]] != first[screenshots[0]]
+        assert _count(s3, "PUT") == 2
+
+    def test_large_files_use_multipart(self, s3, tmp_path):
+        big = tmp_path / "big.png"
+        big.write_bytes(os.urandom(12 * 1024 * 1024))
+        uploader = _uploader(tmp_path, multipart_threshold=5 * 1024 * 1024)
+
+        urls = uploader.upload_screenshots([str(big)], "adw12345")
+
+        assert _count(s3, "CREATE_MULTIPART") == 1
+        assert _count(s3, "UPLOAD_PART") == 3
+        key = urls[str(big)].split("imgs.example.com/", 1)[1]
+        assert s3.objects[key] == big.read_bytes()
+
+    def test_missing_file_keeps_local_path(self, s3, tmp_path):
+        missing = str(tmp_path / "missing.png")
+
+        urls = _uploader(tmp_path).upload_screenshots([missing], "adw12345")
+
+        assert urls == {missing: missing}
+
+    def test_disabled_without_credentials(self, monkeypatch, screenshots, tmp_path):
+        monkeypatch.delenv("CLOUDFLARE_ACCOUNT_ID", raising=False)
+
+        urls = _uploader(tmp_path).upload_screenshots(screenshots, "adw12345")
+
+        assert urls == {path: path for path in screenshots}
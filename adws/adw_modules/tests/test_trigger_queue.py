@@ -0,0 +1,114 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["pytest", "pytest-asyncio"]
+# ///
+
+"""
+Unit tests for TriggerQueue module.
+
+Tests concurrency across keys, ordering within a key, backpressure and
+error isolation.
+"""
+
+import asyncio
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from adw_modules.trigger_queue import TriggerQueue
+
+
+def _run(coro):
+    """Run a coroutine on a private loop (leaves the global loop untouched)."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestTriggerQueue:
+    """Test cases for TriggerQueue class."""
+
+    def test_different_keys_run_concurrently(self):
+        async def scenario():
+            queue = TriggerQueue(workers=4)
+            running = 0
+            peak = 0
+
+            async def job():
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.02)
+                running -= 1
+
+            for i in range(8):
+                queue.submit(f"adw{i}", job)
+            await queue.join()
+            await queue.stop()
+            return peak
+
+        assert _run(scenario()) == 4
+
+    def test_same_key_runs_in_submission_order(self):
+        async def scenario():
+            queue = TriggerQueue(workers=4)
+            events = []
+
+            def job(n):
+                async def run():
+                    events.append(("start", n))
+                    await asyncio.sleep(0.01 * (3 - n))
+                    events.append(("end", n))
+                return run
+
+            for n in range(3):
+                queue.submit("same", job(n))
+            await queue.join()
+            await queue.stop()
+            return events
+
+        assert _run(scenario()) == [
+            ("start", 0), ("end", 0), ("start", 1), ("end", 1), ("start", 2), ("end", 2)
+        ]
+
+    def test_full_queue_rejects_submit(self):
+        async def scenario():
+            queue = TriggerQueue(workers=1, maxsize=1)
+            gate = asyncio.Event()
+            queue.submit("a", gate.wait)
+            await asyncio.sleep(0)  # worker takes the first job
+            queue.submit("b", gate.wait)
+            with pytest.raises(asyncio.QueueFull):
+                queue.submit("c", gate.wait)
+            gate.set()
+            await queue.join()
+            await queue.stop()
+
+        _run(scenario())
+
+    def test_failing_job_does_not_stop_worker(self):
+        async def scenario():
+            queue = TriggerQueue(workers=1)
+            done = []
+
+            async def boom():
+                raise RuntimeError("boom")
+
+            async def ok():
+                done.append(True)
+
+            queue.submit("a", boom)
+            queue.submit("a", ok)
+            await queue.join()
+            await queue.stop()
+            return done, queue._locks
+
+        done, locks = _run(scenario())
+        assert done == [True]
+        assert locks == {}
@@ -0,0 +1,199 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["pytest"]
+# ///
+
+"""
+Unit tests for the worktree pool.
+
+Runs against a temporary git repository; provisioning is stubbed out.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from adw_modules.worktree_pool import WorktreePool, WorktreePoolError
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _commit(repo, name, content):
+    (repo / name).write_text(content)
+    _git(repo, "add", name)
+    _git(repo, "commit", "-q", "-m", f"Update {name}")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / "project"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    _git(repo, "config", "user.email", "test@example.com")
+    _git(repo, "config", "user.name", "Test")
+    _commit(repo, "package-lock.json", "{}")
+    return repo
+
+
+@pytest.fixture
+def provisioner():
+    provisioner = Mock()
+    provisioner.provision.return_value = Mock(success=True)
+    return provisioner
+
+
+@pytest.fixture
+def pool(repo, provisioner):
+    return WorktreePool(project_root=repo, size=2, provisioner=provisioner, logger=Mock())
+
+
+class TestWorktreePool:
+    """Test cases for WorktreePool."""
+
+    def test_fill_creates_provisioned_slots(self, pool, provisioner):
+        assert pool.fill() == 2
+        assert pool.fill() == 0
+
+        slots = pool.ready_slots()
+        assert len(slots) == 2
+        assert provisioner.provision.call_count == 2
+        assert all(os.path.isdir(slot["path"]) for slot in slots)
+
+    def test_claim_moves_slot_and_creates_branch(self, pool, repo):
+        pool.fill()
+        _commit(repo, "README.md", "newer main")
+
+        path = pool.claim("adw00001", "feat-issue-1-adw-adw00001-x")
+
+        assert path == str(repo / "trees" / "adw00001")
+        assert _git(path, "rev-parse", "--abbrev-ref", "HEAD") == "feat-issue-1-adw-adw00001-x"
+        assert (repo / "trees" / "adw00001" / "README.md").exists()
+        assert len(pool.ready_slots()) == 1
+
+        claim = pool.recent_claims()[-1]
+        assert claim["adw_id"] == "adw00001"
+        assert claim["commits_behind"] == 1
+
+    def test_claim_checks_out_existing_branch(self, pool, repo):
+        _git(repo, "branch", "existing-branch")
+        pool.fill()
+
+        path = pool.claim("adw00002", "existing-branch")
+
+        assert _git(path, "rev-parse", "--abbrev-ref", "HEAD") == "existing-branch"
+
+    def test_claim_survives_failing_cleanup(self, pool, monkeypatch):
+        pool.fill()
+        git = pool._git
+
+        def failing_git(args, cwd=None):
+            if args[0] == "checkout" or args[:2] == ["worktree", "remove"]:
+                raise WorktreePoolError(f"git {args[0]} failed")
+            return git(args, cwd=cwd)
+
+        monkeypatch.setattr(pool, "_git", failing_git)
+
+        assert pool.claim("adw00005", "branch-5") is None
+
+    def test_claim_records_unknown_commits_behind(self, pool, monkeypatch):
+        pool.fill()
+        git = pool._git
+
+        def failing_git(args, cwd=None):
+            if args[0] == "rev-list":
+                raise WorktreePoolError("git rev-list failed")
+            return git(args, cwd=cwd)
+
+        monkeypatch.setattr(pool, "_git", failing_git)
+
+        assert pool.claim("adw00006", "branch-6") is not None
+        assert pool.recent_claims()[-1]["commits_behind"] is None
+
+    def test_venv_entry_point_runs_after_claim(self, pool, provisioner):
+        def install_venv(worktree):
+            # Like a non-relocatable venv: the script's shebang is an absolute path
+            venv = Path(worktree) / "server" / ".venv"
+            subprocess.run([sys.executable, "-m", "venv", "--without-pip", str(venv)], check=True)
+            script = venv / "bin" / "hello"
+            script.write_text(f"#!{venv / 'bin' / 'python'}\nprint('hello')\n")
+            script.chmod(0o755)
+            return Mock(success=True)
+
+        provisioner.provision.side_effect = install_venv
+        provisioner.install_python_dependencies.side_effect = install_venv
+        pool.fill()
+
+        path = pool.claim("adw00007", "branch-7")
+
+        hello = Path(path) / "server" / ".venv" / "bin" / "hello"
+        assert subprocess.run([str(hello)], capture_output=True, text=True).stdout == "hello\n"
+        provisioner.install_python_dependencies.assert_called_once_with(Path(path))
+
+    def test_claim_from_empty_or_disabled_pool(self, pool, repo, provisioner):
+        assert pool.claim("adw00003", "branch-3") is None
+        assert WorktreePool(project_root=repo, size=0, provisioner=provisioner).fill() == 0
+
+    def test_changed_lockfile_makes_slots_stale(self, pool, repo):
+        pool.fill()
+        _commit(repo, "package-lock.json", '{"changed": true}')
+
+        assert pool.claim("adw00004", "branch-4") is None
+        assert pool.ready_slots() == []
+        assert pool.fill() == 2
+
+    def test_old_slots_are_pruned(self, repo, provisioner):
+        pool = WorktreePool(project_root=repo, size=1, max_age_seconds=0.1, provisioner=provisioner)
+        pool.fill()
+        old = pool.ready_slots()[0]["slot_id"]
+        time.sleep(0.2)
+
+        pool.fill()
+
+        assert [slot["slot_id"] for slot in pool.ready_slots()] != [old]
+        assert not (pool.pool_dir / old).exists()
+
+    def test_failed_provisioning_discards_slot(self, pool, provisioner):
+        provisioner.provision.return_value = Mock(success=False, error="npm ci failed")
+
+        assert pool.fill() == 0
+        assert [p for p in pool.pool_dir.iterdir() if p.is_dir()] == []
+
+    def test_concurrent_claims_get_distinct_slots(self, pool):
+        pool.fill()
+        results = {}
+
+        def claim(adw_id):
+            results[adw_id] = pool.claim(adw_id, f"branch-{adw_id}")
+
+        threads = [threading.Thread(target=claim, args=(f"conc000{i}",)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        claimed = [path for path in results.values() if path]
+        assert len(claimed) == 2
+        assert len(set(claimed)) == 2
+
+    def test_stats(self, pool):
+        pool.fill()
+        pool.claim("adw00005", "branch-5")
+
+        stats = pool.stats()
+
+        assert stats["enabled"] is True
+        assert (stats["target_size"], stats["ready"]) == (2, 1)
+        assert stats["avg_claim_latency_seconds"] is not None
+        assert json.dumps(stats)
@@ -0,0 +1,113 @@
+"""
+Trigger Queue - Run workflow trigger jobs off the WebSocket receive loop.
+
+Handling a trigger (loading/saving ADW state, cleaning up old worktrees,
+spawning the workflow process) takes anywhere from milliseconds to seconds.
+Running it inline in a connection's receive loop stalls that client's other
+messages until it finishes. The trigger server instead acknowledges the
+request immediately and submits the work here; a small pool of worker
+coroutines drains the queue.
+
+Jobs submitted with the same key (the ADW ID) run one at a time in
+submission order, so two quick drags of the same card can't race on its
+state. Jobs for different keys run concurrently, up to the worker count.
+
+Usage:
+    queue = TriggerQueue(workers=4)
+    queue.submit(adw_id, lambda: process_trigger(request, websocket, adw_id))
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[None]]
+
+
+class TriggerQueue:
+    """Bounded asyncio job queue with per-key ordering."""
+
+    def __init__(self, workers: int = 4, maxsize: int = 200):
+        """
+        Initialize the queue.
+
+        Args:
+            workers: Number of jobs processed concurrently
+            maxsize: Maximum queued jobs before submit() rejects new ones
+        """
+        self.workers = workers
+        self.maxsize = maxsize
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._key_refs: Dict[str, int] = {}
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue else 0
+
+    def _ensure_workers(self) -> None:
+        # Created lazily so the queue binds to the server's running loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._worker_tasks = [t for t in self._worker_tasks if not t.done()]
+        while len(self._worker_tasks) < self.workers:
+            self._worker_tasks.append(asyncio.get_running_loop().create_task(self._worker()))
+
+    def submit(self, key: str, job: Job) -> int:
+        """
+        Queue a job.
+
+        Args:
+            key: Ordering key - jobs with the same key never overlap
+            job: Zero-argument callable returning the coroutine to run
+
+        Returns:
+            Number of jobs queued ahead of this one
+
+        Raises:
+            asyncio.QueueFull: If the queue is at maxsize
+        """
+        self._ensure_workers()
+        ahead = self._queue.qsize()
+        self._queue.put_nowait((key, job))
+        # Reserve the key's lock at submit time so same-key jobs keep their order
+        self._key_refs[key] = self._key_refs.get(key, 0) + 1
+        self._locks.setdefault(key, asyncio.Lock())
+        return ahead
+
+    async def _worker(self) -> None:
+        while True:
+            key, job = await self._queue.get()
+            try:
+                async with self._locks[key]:
+                    await job()
+            except Exception as e:
+                logger.error(f"Trigger job for {key} failed: {e}", exc_info=True)
+            finally:
+                self._release_key(key)
+                self._queue.task_done()
+
+    def _release_key(self, key: str) -> None:
+        self._key_refs[key] -= 1
+        if self._key_refs[key] == 0:
+            del self._key_refs[key]
+            del self._locks[key]
+
+    async def join(self) -> None:
+        """Wait until every queued job has finished."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        """Cancel the workers. Queued jobs that haven't started are dropped."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
+        self._locks.clear()
+        self._key_refs.clear()
@@ -64,6 +64,9 @@ class WebSocketManager:
         self.active_connections: Set[WebSocket] = set()
         self.connection_metadata: Dict[int, Dict[str, Any]] = {}
         self.logger = logging.getLogger("WebSocketManager")
+        # Optional EventLog (server/core/event_log.py) that sequences broadcasts;
+        # the trigger server shares its own so both managers use one sequence
+        self.event_log = None
 
     async def connect(self, websocket: WebSocket, client_id: Optional[str] = None):
         """
@@ -143,13 +146,17 @@ class WebSocketManager:
             data: The data to broadcast (will be JSON serialized)
             exclude: Optional WebSocket connection to exclude from broadcast
         """
-        if not self.active_connections:
-            return
-
         # Add timestamp if not present
         if "timestamp" not in data:
             data["timestamp"] = datetime.utcnow().isoformat() + "Z"
 
+        # Sequence and retain the event even with no clients, so they can resume
+        if self.event_log is not None and data.get("type") not in self.event_log.unsequenced_event_types:
+            self.event_log.append(data)
+
+        if not self.active_connections:
+            return
+
         disconnected = set()
         for connection in self.active_connections:
             if exclude and connection == exclude:
@@ -6,6 +6,7 @@ import logging
 import os
 import subprocess
 import re
+import sqlite3
 from typing import Tuple, Optional
 from adw_modules.data_types import (
     AgentTemplateRequest,
@@ -19,6 +20,7 @@ from adw_modules.github import ADW_BOT_IDENTIFIER
 from adw_modules.state import ADWState
 from adw_modules.utils import parse_json
 from adw_modules.kanban_mode import is_kanban_mode, get_kanban_output_path
+from adw_modules.artifact_index import ArtifactIndex, PLAN
 
 
 # Branch name pattern: <type>-issue-<number>-adw-<id>-<concise-name>
@@ -1011,7 +1013,7 @@ def create_or_find_branch(
 
 
 def find_spec_file(state: ADWState, logger: logging.Logger) -> Optional[str]:
-    """Find the spec file from state or by examining git diff.
+    """Find the spec file from state, the artifact index, or by examining git diff.
 
     For isolated workflows, automatically uses worktree_path from state.
     """
@@ -1029,6 +1031,18 @@ def find_spec_file(state: ADWState, logger: logging.Logger) -> Optional[str]:
             logger.info(f"Using spec file from state: {spec_file}")
             return spec_file
 
+    # Then the artifact index, populated when the planner wrote the file
+    adw_id = state.get("adw_id")
+    if adw_id:
+        try:
+            indexed = ArtifactIndex().latest(adw_id, PLAN)
+        except sqlite3.Error as e:
+            logger.warning(f"Artifact index lookup failed: {e}")
+            indexed = None
+        if indexed:
+            logger.info(f"Using spec file from artifact index: {indexed['path']}")
+            return indexed["path"]
+
     # Otherwise, try to find it from git diff
     logger.info("Looking for spec file in git diff")
     result = subprocess.run(
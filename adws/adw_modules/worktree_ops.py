@@ -23,8 +23,10 @@ import logging
 import socket
 import shutil
 import warnings
+from pathlib import Path
 from typing import Tuple, Optional
 from adw_modules.state import ADWState
+from adw_modules.worktree_pool import WorktreePool, WorktreePoolError
 
 # Import shared Caddy utilities
 from adw_modules.caddy_utils import (
@@ -65,6 +67,15 @@ def create_worktree(adw_id: str, branch_name: str, logger: logging.Logger) -> Tu
         logger.warning(f"Worktree already exists at {worktree_path}")
         return worktree_path, None
     
+    # A pre-warmed worktree from the pool skips the fetch, checkout and install
+    try:
+        pooled_path = WorktreePool(project_root=Path(project_root), logger=logger).claim(adw_id, branch_name)
+    except (OSError, WorktreePoolError) as e:
+        logger.warning(f"Worktree pool unavailable: {e}")
+        pooled_path = None
+    if pooled_path:
+        return pooled_path, None
+
     # First, fetch latest changes from origin
     logger.info("Fetching latest changes from origin")
     fetch_result = subprocess.run(
@@ -184,7 +195,7 @@ def setup_worktree_environment(worktree_path: str, websocket_port: int, frontend
         dynamically via Caddy reverse proxy.
 
     The actual environment setup (copying .env files, installing dependencies) is handled
-    by the install_worktree.md command which runs inside the worktree.
+    by adw_modules.worktree_provisioner (or the install_worktree.md command as a fallback).
 
     Args:
         worktree_path: Path to the worktree
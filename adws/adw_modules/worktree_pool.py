@@ -0,0 +1,369 @@
+"""
+Worktree Pool - Pre-warmed, provisioned worktrees for fast ADW startup.
+
+Keeps ADW_WORKTREE_POOL_SIZE detached worktrees of ``main`` under
+trees/.pool/, each already provisioned by the WorktreeProvisioner. Claiming
+one for an ADW is a ``git worktree move`` to trees/{adw_id} plus a branch
+checkout from the latest ``main``, instead of a fetch, a full checkout and a
+dependency install.
+
+Each ready slot has a metadata file next to it (trees/.pool/{slot_id}.json).
+A claim renames that file first, which is atomic, so two ADWs starting at
+once can never take the same slot. Filling is serialized by a lock file and
+runs in the background (the trigger server refills every
+ADW_WORKTREE_POOL_REFILL_SECONDS).
+
+Slots older than ADW_WORKTREE_POOL_MAX_AGE_SECONDS, or whose lockfiles no
+longer match ``main``, are discarded rather than claimed. A claimed slot
+whose commit is behind ``main`` is simply checked out forward. Python venvs
+are created relocatable; one that isn't (from a slot filled before that, or
+without uv) has absolute paths into the old slot, so it is reinstalled after
+the move.
+
+Claims are appended to trees/.pool/claims.jsonl; ``stats()`` reports pool
+size, slot ages and recent claim latencies.
+
+Usage:
+    worktree_path = WorktreePool().claim(adw_id, branch_name)  # None if empty
+"""
+
+import fcntl
+import json
+import logging
+import os
+import shutil
+import subprocess
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from adw_modules.db_paths import get_project_root
+from adw_modules.worktree_provisioner import (
+    JS_PROJECTS,
+    PYTHON_REQUIREMENTS,
+    ProvisioningError,
+    WorktreeProvisioner,
+    venv_is_relocatable,
+)
+
+# Files whose change on main invalidates a slot's installed dependencies
+DEPENDENCY_FILES = tuple(os.path.normpath(os.path.join(rel, "package-lock.json")) for rel in JS_PROJECTS) + PYTHON_REQUIREMENTS
+
+# A claim marker older than this belongs to a claim that crashed
+CLAIM_TIMEOUT_SECONDS = 600
+
+RECENT_CLAIMS = 50
+
+
+class WorktreePoolError(Exception):
+    """Raised when a git operation on the pool fails."""
+
+
+class WorktreePool:
+    """Pool of provisioned worktrees on the latest main."""
+
+    def __init__(
+        self,
+        project_root: Optional[Path] = None,
+        size: Optional[int] = None,
+        max_age_seconds: Optional[float] = None,
+        provisioner: Optional[WorktreeProvisioner] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        self.project_root = Path(project_root or get_project_root())
+        self.pool_dir = self.project_root / "trees" / ".pool"
+        self.size = size if size is not None else int(os.getenv("ADW_WORKTREE_POOL_SIZE", "0"))
+        self.max_age_seconds = (
+            max_age_seconds if max_age_seconds is not None
+            else float(os.getenv("ADW_WORKTREE_POOL_MAX_AGE_SECONDS", "86400"))
+        )
+        self.logger = logger or logging.getLogger(__name__)
+        self.provisioner = provisioner or WorktreeProvisioner(project_root=self.project_root, logger=self.logger)
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def _git(self, args: List[str], cwd: Optional[Path] = None) -> str:
+        result = subprocess.run(
+            ["git", *args], cwd=cwd or self.project_root, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise WorktreePoolError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+        return result.stdout.strip()
+
+    def _meta_path(self, slot_id: str) -> Path:
+        return self.pool_dir / f"{slot_id}.json"
+
+    def ready_slots(self) -> List[Dict[str, Any]]:
+        """Unclaimed, provisioned slots, newest first."""
+        slots = []
+        for meta_path in self.pool_dir.glob("*.json"):
+            try:
+                slots.append(json.loads(meta_path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return sorted(slots, key=lambda slot: slot["created_at"], reverse=True)
+
+    def _is_stale(self, slot: Dict[str, Any], main_commit: str) -> bool:
+        if time.time() - slot["created_at"] > self.max_age_seconds:
+            return True
+        if slot["commit"] == main_commit:
+            return False
+        # Dependencies installed for the slot's commit no longer match main's
+        changed = subprocess.run(
+            ["git", "diff", "--quiet", slot["commit"], main_commit, "--", *DEPENDENCY_FILES],
+            cwd=self.project_root, capture_output=True
+        )
+        return changed.returncode != 0
+
+    def _remove_slot(self, slot_id: str) -> None:
+        path = self.pool_dir / slot_id
+        try:
+            self._git(["worktree", "remove", "--force", str(path)])
+        except WorktreePoolError as e:
+            self.logger.warning(f"{e}; deleting {path} directly")
+            shutil.rmtree(path, ignore_errors=True)
+            subprocess.run(["git", "worktree", "prune"], cwd=self.project_root, capture_output=True)
+        for suffix in (".json", ".claimed"):
+            self._meta_path(slot_id).with_suffix(suffix).unlink(missing_ok=True)
+
+    @contextmanager
+    def _fill_lock(self) -> Iterator[bool]:
+        self.pool_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.pool_dir / ".fill.lock", "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _create_slot(self) -> bool:
+        slot_id = uuid.uuid4().hex[:8]
+        path = self.pool_dir / slot_id
+        start = time.perf_counter()
+        try:
+            self._git(["worktree", "add", "--detach", str(path), "main"])
+            commit = self._git(["rev-parse", "HEAD"], cwd=path)
+        except WorktreePoolError as e:
+            self.logger.error(f"Could not create pool worktree: {e}")
+            return False
+
+        result = self.provisioner.provision(str(path))
+        if not result.success:
+            self.logger.error(f"Could not provision pool worktree {slot_id}: {result.error}")
+            self._remove_slot(slot_id)
+            return False
+
+        meta = {
+            "slot_id": slot_id,
+            "path": str(path),
+            "commit": commit,
+            "created_at": time.time(),
+            "fill_seconds": round(time.perf_counter() - start, 3),
+        }
+        # Written last and renamed into place: a slot is claimable only once complete
+        tmp = self.pool_dir / f".{slot_id}.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self._meta_path(slot_id))
+        self.logger.info(f"Added worktree {slot_id} to pool in {meta['fill_seconds']:.1f}s")
+        return True
+
+    def prune(self) -> int:
+        """
+        Remove stale slots and leftovers of interrupted fills or claims.
+
+        Must be called with the fill lock held.
+
+        Returns:
+            Number of slots removed
+        """
+        main_commit = self._git(["rev-parse", "main"])
+        removed = 0
+        for slot in self.ready_slots():
+            if self._is_stale(slot, main_commit):
+                try:
+                    os.rename(self._meta_path(slot["slot_id"]), self._meta_path(slot["slot_id"]).with_suffix(".claimed"))
+                except FileNotFoundError:
+                    continue  # Claimed meanwhile
+                self._remove_slot(slot["slot_id"])
+                removed += 1
+
+        for path in self.pool_dir.iterdir():
+            if not path.is_dir() or self._meta_path(path.name).exists():
+                continue
+            marker = self._meta_path(path.name).with_suffix(".claimed")
+            if marker.exists() and time.time() - marker.stat().st_mtime < CLAIM_TIMEOUT_SECONDS:
+                continue  # Being claimed right now
+            self._remove_slot(path.name)
+            removed += 1
+        return removed
+
+    def fill(self) -> int:
+        """
+        Top the pool up to its configured size.
+
+        Returns immediately if another process is already filling.
+
+        Returns:
+            Number of worktrees added
+        """
+        if not self.enabled:
+            return 0
+        with self._fill_lock() as acquired:
+            if not acquired:
+                return 0
+
+            fetch = subprocess.run(["git", "fetch", "origin"], cwd=self.project_root, capture_output=True, text=True)
+            if fetch.returncode != 0:
+                self.logger.warning(f"Failed to fetch from origin: {fetch.stderr}")
+            try:
+                self.prune()
+            except WorktreePoolError as e:
+                self.logger.error(f"Could not prune worktree pool: {e}")
+                return 0
+
+            added = 0
+            while len(self.ready_slots()) < self.size and self._create_slot():
+                added += 1
+            return added
+
+    def claim(self, adw_id: str, branch_name: str) -> Optional[str]:
+        """
+        Take a pooled worktree for an ADW.
+
+        Moves it to trees/{adw_id} and checks out branch_name, created from
+        main if it doesn't exist yet.
+
+        Returns:
+            The worktree path, or None if no usable slot was available
+        """
+        if not self.enabled or not self.pool_dir.exists():
+            return None
+
+        start = time.perf_counter()
+        target = self.project_root / "trees" / adw_id
+        try:
+            main_commit = self._git(["rev-parse", "main"])
+        except WorktreePoolError as e:
+            self.logger.warning(f"Worktree pool unavailable: {e}")
+            return None
+
+        for slot in self.ready_slots():
+            slot_id = slot["slot_id"]
+            marker = self._meta_path(slot_id).with_suffix(".claimed")
+            try:
+                os.rename(self._meta_path(slot_id), marker)
+            except FileNotFoundError:
+                continue  # Another ADW got it first
+
+            if self._is_stale(slot, main_commit):
+                self.logger.info(f"Discarding stale pool worktree {slot_id}")
+                self._remove_slot(slot_id)
+                continue
+
+            try:
+                self._git(["worktree", "move", slot["path"], str(target)])
+            except WorktreePoolError as e:
+                self.logger.warning(f"Could not move pool worktree {slot_id}: {e}")
+                self._remove_slot(slot_id)
+                continue
+            marker.unlink(missing_ok=True)
+            self._reinstall_moved_venvs(target)
+
+            try:
+                self._checkout_branch(target, branch_name)
+            except WorktreePoolError as e:
+                self.logger.error(f"Could not check out {branch_name} in claimed worktree: {e}")
+                try:
+                    self._git(["worktree", "remove", "--force", str(target)])
+                except WorktreePoolError as e:
+                    self.logger.warning(f"Could not remove claimed worktree {target}: {e}")
+                return None
+
+            latency = time.perf_counter() - start
+            try:
+                commits_behind = int(self._git(["rev-list", "--count", f"{slot['commit']}..{main_commit}"]))
+            except WorktreePoolError:
+                commits_behind = None
+            self._record_claim({
+                "adw_id": adw_id,
+                "slot_id": slot_id,
+                "claimed_at": time.time(),
+                "latency_seconds": round(latency, 3),
+                "age_seconds": round(time.time() - slot["created_at"], 1),
+                "commits_behind": commits_behind,
+            })
+            self.logger.info(f"Claimed pool worktree {slot_id} for {adw_id} in {latency:.2f}s")
+            return str(target)
+
+        self.logger.info("Worktree pool is empty")
+        return None
+
+    def _reinstall_moved_venvs(self, worktree: Path) -> None:
+        """Replace venvs whose scripts still point into the pool slot."""
+        stale = False
+        for rel in PYTHON_REQUIREMENTS:
+            venv = (worktree / rel).parent / ".venv"
+            if venv.is_dir() and not venv_is_relocatable(venv):
+                shutil.rmtree(venv, ignore_errors=True)
+                stale = True
+        if not stale:
+            return
+        try:
+            self.provisioner.install_python_dependencies(worktree)
+        except (ProvisioningError, OSError, subprocess.SubprocessError) as e:
+            # Without its venv the worktree is provisioned again on setup
+            self.logger.warning(f"Could not reinstall Python dependencies in {worktree}: {e}")
+
+    def _checkout_branch(self, worktree: Path, branch_name: str) -> None:
+        try:
+            self._git(["checkout", "-b", branch_name, "main"], cwd=worktree)
+        except WorktreePoolError as e:
+            if "already exists" not in str(e):
+                raise
+            self._git(["checkout", branch_name], cwd=worktree)
+
+    def _record_claim(self, claim: Dict[str, Any]) -> None:
+        try:
+            with open(self.pool_dir / "claims.jsonl", "a") as f:
+                f.write(json.dumps(claim) + "\n")
+        except OSError as e:
+            self.logger.warning(f"Could not record pool claim: {e}")
+
+    def recent_claims(self, limit: int = RECENT_CLAIMS) -> List[Dict[str, Any]]:
+        try:
+            lines = (self.pool_dir / "claims.jsonl").read_text().splitlines()
+        except OSError:
+            return []
+        return [json.loads(line) for line in lines[-limit:] if line.strip()]
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, slot ages and recent claim latencies."""
+        now = time.time()
+        slots = self.ready_slots() if self.pool_dir.exists() else []
+        claims = self.recent_claims()
+        latencies = [claim["latency_seconds"] for claim in claims]
+        return {
+            "enabled": self.enabled,
+            "target_size": self.size,
+            "ready": len(slots),
+            "max_age_seconds": self.max_age_seconds,
+            "slots": [
+                {
+                    "slot_id": slot["slot_id"],
+                    "commit": slot["commit"],
+                    "age_seconds": round(now - slot["created_at"], 1),
+                    "fill_seconds": slot.get("fill_seconds"),
+                }
+                for slot in slots
+            ],
+            "recent_claims": claims[-10:],
+            "avg_claim_latency_seconds": round(sum(latencies) / len(latencies), 3) if latencies else None,
+        }
@@ -0,0 +1,352 @@
+"""
+Worktree Provisioner - Deterministic environment setup for ADW worktrees.
+
+Replaces the /install_worktree agent session with three steps:
+
+- copy the .env files from the main checkout
+- restore node_modules from a cache keyed by the hash of package-lock.json
+  (and the node version), hardlinking every file into the worktree; a cache
+  miss runs ``npm ci`` once and stores the result for the next worktree
+- install server/requirements.txt into server/.venv with uv, using a shared
+  uv cache in hardlink mode (the cache holds the unpacked wheels rather than
+  the environment itself); the venv is created relocatable, so a pooled
+  worktree keeps working after it is moved into place
+
+Hardlinked files share their inode with the cache, so cached files are made
+read-only: an in-place write in a worktree fails instead of changing every
+other worktree's copy. Packages with install scripts (hasInstallScript in
+the lockfile) may rebuild themselves in place, so they are copied instead of
+linked. Hardlinks also fall back to copies when the cache and the worktree
+are on different filesystems. Each step is timed and the report is written to
+agents/{adw_id}/provisioning.json, so provisioning time can be compared
+across ADWs and with the agent path (ADW_WORKTREE_PROVISIONER=agent).
+
+Usage:
+    result = WorktreeProvisioner(logger=logger).provision(worktree_path)
+    write_provisioning_report(adw_id, result.to_dict())
+"""
+
+import hashlib
+import json
+import logging
+import os
+import platform
+import shutil
+import stat
+import subprocess
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Collection, Dict, List, Optional, Set, Tuple
+
+from adw_modules.db_paths import get_project_root
+from adw_modules.utils import get_safe_subprocess_env
+
+# Files copied from the main checkout, relative to the project root
+ENV_FILES = (".env", "server/.env", "adws/.env")
+
+# Directories with a package-lock.json, relative to the project root
+JS_PROJECTS = (".",)
+
+# requirements.txt files installed into a .venv next to them
+PYTHON_REQUIREMENTS = ("server/requirements.txt",)
+
+NPM_INSTALL = ["npm", "ci", "--no-audit", "--no-fund"]
+
+INSTALL_TIMEOUT_SECONDS = 900
+
+# Written into a venv once its requirements are installed
+VENV_MARKER = ".adw-requirements-hash"
+
+
+def get_default_cache_dir() -> Path:
+    """Shared dependency cache (ADW_DEPS_CACHE_DIR, or .adw_cache/deps in the main project)."""
+    configured = os.getenv("ADW_DEPS_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    return get_project_root() / ".adw_cache" / "deps"
+
+
+def write_provisioning_report(adw_id: str, report: Dict[str, Any], agents_dir: Optional[Path] = None) -> Path:
+    """Write a provisioning report to agents/{adw_id}/provisioning.json."""
+    agents_dir = Path(agents_dir or get_project_root() / "agents")
+    path = agents_dir / adw_id / "provisioning.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+    return path
+
+
+def venv_is_relocatable(venv: Path) -> bool:
+    """Whether a venv's scripts use relative paths (``uv venv --relocatable``)."""
+    try:
+        config = (venv / "pyvenv.cfg").read_text()
+    except OSError:
+        return False
+    return any(
+        line.partition("=")[0].strip() == "relocatable" and line.partition("=")[2].strip() == "true"
+        for line in config.splitlines()
+    )
+
+
+def content_key(*paths: Path, extra: str = "") -> str:
+    """Hash of the given files' contents plus the platform and any extra tag."""
+    digest = hashlib.sha256(f"{platform.system()}-{platform.machine()}-{extra}".encode())
+    for path in paths:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:32]
+
+
+def scripted_packages(lockfile: Path) -> Set[str]:
+    """
+    Directories, relative to node_modules, of packages with install scripts.
+
+    Read from the hasInstallScript flags of an npm v2/v3 lockfile.
+    """
+    try:
+        packages = json.loads(lockfile.read_text()).get("packages", {})
+    except (OSError, ValueError):
+        return set()
+    prefix = "node_modules/"
+    return {
+        path[len(prefix):] for path, meta in packages.items()
+        if path.startswith(prefix) and meta.get("hasInstallScript")
+    }
+
+
+def _copy_writable(source: Path, target: Path) -> None:
+    shutil.copy2(source, target)
+    os.chmod(target, os.stat(target).st_mode | stat.S_IWUSR)
+
+
+def make_read_only(root: Path) -> None:
+    """Clear the write bits of every regular file under root."""
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            path = Path(dirpath) / name
+            if not path.is_symlink():
+                mode = os.stat(path).st_mode
+                os.chmod(path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+
+def link_tree(src: Path, dst: Path, copy: Collection[str] = ()) -> int:
+    """
+    Recreate src at dst, hardlinking files (copying across filesystems).
+
+    Args:
+        src: Directory to recreate
+        dst: Where to recreate it
+        copy: Directories, relative to src, whose files are copied (and
+            writable) rather than linked
+
+    Returns:
+        Number of files linked or copied
+    """
+    count = 0
+    copy = tuple(os.path.normpath(path) for path in copy)
+    for root, dirs, files in os.walk(src):
+        rel = os.path.normpath(os.path.relpath(root, src))
+        target_dir = dst / rel
+        target_dir.mkdir(parents=True, exist_ok=True)
+        copied = any(rel == path or rel.startswith(path + os.sep) for path in copy)
+
+        # os.walk lists symlinked directories but doesn't descend into them
+        for name in dirs:
+            source = Path(root) / name
+            if source.is_symlink():
+                os.symlink(os.readlink(source), target_dir / name)
+
+        for name in files:
+            source = Path(root) / name
+            target = target_dir / name
+            if source.is_symlink():
+                os.symlink(os.readlink(source), target)
+            elif copied:
+                _copy_writable(source, target)
+            else:
+                try:
+                    os.link(source, target)
+                except OSError:
+                    _copy_writable(source, target)
+            count += 1
+    return count
+
+
+@dataclass
+class ProvisionStep:
+    """Timing and outcome of one provisioning step."""
+    name: str
+    seconds: float
+    cache_hit: Optional[bool] = None
+    detail: str = ""
+
+
+@dataclass
+class ProvisionResult:
+    """Outcome of provisioning a worktree."""
+    success: bool
+    steps: List[ProvisionStep] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def seconds(self) -> float:
+        return sum(step.seconds for step in self.steps)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "method": "native",
+            "success": self.success,
+            "seconds": round(self.seconds, 3),
+            "steps": [asdict(step) for step in self.steps],
+            "error": self.error,
+        }
+
+
+class ProvisioningError(Exception):
+    """Raised when a provisioning step fails."""
+
+
+class WorktreeProvisioner:
+    """Provisions worktrees from a content-addressed dependency cache."""
+
+    def __init__(
+        self,
+        project_root: Optional[Path] = None,
+        cache_dir: Optional[Path] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        self.project_root = Path(project_root or get_project_root())
+        self.cache_dir = Path(cache_dir or get_default_cache_dir())
+        self.logger = logger or logging.getLogger(__name__)
+
+    def provision(self, worktree_path: str) -> ProvisionResult:
+        """Copy env files and install JS and Python dependencies into a worktree."""
+        worktree = Path(worktree_path)
+        result = ProvisionResult(success=True)
+
+        for name, step in (
+            ("env_files", self.copy_env_files),
+            ("js_dependencies", self.install_js_dependencies),
+            ("python_dependencies", self.install_python_dependencies),
+        ):
+            start = time.perf_counter()
+            try:
+                cache_hit, detail = step(worktree)
+            except (ProvisioningError, OSError, subprocess.SubprocessError) as e:
+                result.steps.append(ProvisionStep(name, time.perf_counter() - start, detail=str(e)))
+                result.success = False
+                result.error = f"{name}: {e}"
+                self.logger.error(f"Provisioning step {name} failed: {e}")
+                break
+            result.steps.append(ProvisionStep(name, time.perf_counter() - start, cache_hit, detail))
+            self.logger.info(f"Provisioning step {name} took {result.steps[-1].seconds:.2f}s ({detail})")
+
+        return result
+
+    def copy_env_files(self, worktree: Path) -> Tuple[Optional[bool], str]:
+        """Copy .env files the worktree doesn't have yet from the main checkout."""
+        copied = []
+        for rel in ENV_FILES:
+            source = self.project_root / rel
+            target = worktree / rel
+            if source.is_file() and not target.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(source, target)
+                copied.append(rel)
+        return None, f"copied {', '.join(copied) or 'nothing'}"
+
+    def install_js_dependencies(self, worktree: Path) -> Tuple[Optional[bool], str]:
+        """Link node_modules from the cache, installing and caching on a miss."""
+        hits = []
+        for rel in JS_PROJECTS:
+            project = worktree / rel
+            lockfile = project / "package-lock.json"
+            node_modules = project / "node_modules"
+            if not lockfile.is_file() or node_modules.exists():
+                continue
+
+            key = content_key(lockfile, extra=self._tool_version(["node", "--version"]))
+            entry = self.cache_dir / "npm" / key / "node_modules"
+            scripted = scripted_packages(lockfile)
+            if entry.is_dir():
+                files = link_tree(entry, node_modules, copy=scripted)
+                self.logger.info(f"Linked {files} cached files into {node_modules}")
+                hits.append(True)
+                continue
+
+            self._run(NPM_INSTALL, project)
+            self._store(node_modules, entry, scripted)
+            hits.append(False)
+
+        if not hits:
+            return None, "no JS projects to install"
+        return all(hits), f"{hits.count(True)}/{len(hits)} from cache"
+
+    def install_python_dependencies(self, worktree: Path) -> Tuple[Optional[bool], str]:
+        """Install requirements into a .venv through uv's shared, hardlinked cache."""
+        uv = shutil.which("uv")
+        hits = []
+        for rel in PYTHON_REQUIREMENTS:
+            requirements = worktree / rel
+            if not requirements.is_file():
+                continue
+            if uv is None:
+                # ADW scripts run through `uv run`, which installs on demand
+                return None, "uv not found, skipped"
+
+            key = content_key(requirements)
+            venv = requirements.parent / ".venv"
+            marker = venv / VENV_MARKER
+            if marker.is_file() and marker.read_text() == key:
+                hits.append(True)
+                continue
+
+            # Seen means uv's cache already holds every wheel for this key
+            seen = self.cache_dir / "python" / key
+            env = {**get_safe_subprocess_env(), "UV_CACHE_DIR": str(self.cache_dir / "uv"), "UV_LINK_MODE": "hardlink"}
+            self._run([uv, "venv", "--relocatable", str(venv)], requirements.parent, env)
+            self._run([uv, "pip", "install", "--python", str(venv), "-r", str(requirements)], requirements.parent, env)
+            marker.write_text(key)
+            hits.append(seen.exists())
+            seen.parent.mkdir(parents=True, exist_ok=True)
+            seen.touch()
+
+        if not hits:
+            return None, "no Python requirements to install"
+        return all(hits), f"{hits.count(True)}/{len(hits)} from cache"
+
+    def _store(self, node_modules: Path, entry: Path, scripted: Collection[str] = ()) -> None:
+        """Add a freshly installed node_modules to the cache, read-only."""
+        staging = entry.parent.parent / f".tmp-{uuid.uuid4().hex}"
+        try:
+            # Packages with install scripts get their own copy, so the
+            # worktree that installed them can still rebuild them in place
+            link_tree(node_modules, staging / "node_modules", copy=scripted)
+            make_read_only(staging)
+            # Atomic publish; a concurrent ADW may have stored the same key
+            os.rename(staging, entry.parent)
+        except OSError as e:
+            self.logger.warning(f"Could not cache {node_modules}: {e}")
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _run(self, cmd: List[str], cwd: Path, env: Optional[Dict[str, str]] = None) -> None:
+        self.logger.info(f"Running {' '.join(cmd)} in {cwd}")
+        result = subprocess.run(
+            cmd,
+            cwd=cwd,
+            env=env or get_safe_subprocess_env(),
+            capture_output=True,
+            text=True,
+            timeout=INSTALL_TIMEOUT_SECONDS,
+        )
+        if result.returncode != 0:
+            raise ProvisioningError(f"{' '.join(cmd)} failed: {result.stderr.strip()[-500:]}")
+
+    @staticmethod
+    def _tool_version(cmd: List[str]) -> str:
+        try:
+            return subprocess.run(cmd, capture_output=True, text=True, timeout=10).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ""
@@ -42,6 +42,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from adw_modules.workflow_ops import ensure_adw_id
 from adw_modules.state import ADWState
 from adw_modules.utils import setup_logger
+from adw_modules.heartbeat import start_heartbeat
 from adw_modules.websocket_client import WebSocketNotifier
 
 from orchestrator.registry import StageRegistry
@@ -83,6 +84,7 @@ class ADWOrchestrator:
         self.config = config
         self.orchestrator_config = orchestrator_config
         self.logger = setup_logger(adw_id, "orchestrator")
+        start_heartbeat(adw_id, "adw_orchestrator")
 
         # Initialize stage registry
         self.registry = StageRegistry()
@@ -40,6 +40,7 @@ from adw_modules.github import (
 )
 from adw_modules.workflow_ops import format_issue_message
 from adw_modules.utils import setup_logger, check_env_vars
+from adw_modules.heartbeat import start_heartbeat
 from adw_modules.worktree_ops import validate_worktree
 
 # Agent name constant
@@ -212,6 +213,7 @@ def main():
     # Set up logger with ADW ID
     logger = setup_logger(adw_id, "adw_ship_iso")
     logger.info(f"ADW Ship Iso starting - ID: {adw_id}, Issue: {issue_number}")
+    start_heartbeat(adw_id, "adw_ship_iso")
     
     # Validate environment
     check_env_vars(logger)
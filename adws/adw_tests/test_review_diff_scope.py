@@ -0,0 +1,252 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["pytest", "pytest-asyncio"]
+# ///
+"""Tests for diff-scoped review tool runs.
+
+Verifies that:
+1. Changed files are computed against the merge base with main
+2. Each runner builds a command scoped to the files it understands
+3. Runners skip entirely when none of their files changed
+4. The orchestrator falls back to a full scan when the diff is unavailable
+"""
+
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.changed_files import ChangedFiles, get_changed_files
+from tools.base_runner import BaseToolRunner
+from tools.bearer_runner import BearerRunner
+from tools.eslint_runner import ESLintRunner
+from tools.ruff_runner import RuffRunner
+from tools.semgrep_runner import SemgrepRunner
+from stages.review_modes import ReviewMode, ReviewFinding, IssueSeverity
+from schemas.review_config import ReviewConfig
+
+
+def _run(coro):
+    """Run a coroutine on a private loop (leaves the global loop untouched)."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+class TestGetChangedFiles(unittest.TestCase):
+    """Tests for merge-base diff computation."""
+
+    def setUp(self):
+        self.repo = tempfile.mkdtemp()
+        _git(self.repo, "init", "-q", "-b", "main")
+        _git(self.repo, "config", "user.email", "test@example.com")
+        _git(self.repo, "config", "user.name", "Test")
+        for name in ("app.py", "old.js", "README.md"):
+            with open(os.path.join(self.repo, name), "w") as f:
+                f.write("initial\n")
+        _git(self.repo, "add", ".")
+        _git(self.repo, "commit", "-q", "-m", "initial")
+        _git(self.repo, "checkout", "-q", "-b", "feature")
+
+    def tearDown(self):
+        shutil.rmtree(self.repo, ignore_errors=True)
+
+    def test_includes_committed_uncommitted_and_untracked(self):
+        with open(os.path.join(self.repo, "app.py"), "a") as f:
+            f.write("committed\n")
+        _git(self.repo, "commit", "-qam", "change app")
+        with open(os.path.join(self.repo, "README.md"), "a") as f:
+            f.write("uncommitted\n")
+        with open(os.path.join(self.repo, "new.ts"), "w") as f:
+            f.write("untracked\n")
+
+        changed = get_changed_files(self.repo)
+
+        self.assertIsNotNone(changed)
+        self.assertEqual(changed.base_branch, "main")
+        self.assertEqual(sorted(changed.files), ["README.md", "app.py", "new.ts"])
+
+    def test_excludes_deleted_files(self):
+        _git(self.repo, "rm", "-q", "old.js")
+        _git(self.repo, "commit", "-qm", "delete")
+
+        changed = get_changed_files(self.repo)
+
+        self.assertEqual(changed.files, [])
+
+    def test_returns_none_without_base_branch(self):
+        self.assertIsNone(get_changed_files(self.repo, base_branch="does-not-exist"))
+
+    def test_select_filters_extensions_and_excludes(self):
+        changed = ChangedFiles(
+            base_branch="main",
+            merge_base="abc123",
+            files=["a.py", "b.ts", "vendor/c.py", "d.md"],
+        )
+        self.assertEqual(changed.select((".py",), ["vendor/"]), ["a.py"])
+        self.assertEqual(changed.select(None, None), changed.files)
+
+
+class TestScopedBuildCommand(unittest.TestCase):
+    """Tests for runner commands in diff-scoped mode."""
+
+    def test_file_list_replaces_worktree_target(self):
+        files = ["src/a.py", "src/b.py"]
+        for runner in (RuffRunner(), SemgrepRunner(), ESLintRunner()):
+            cmd = runner.build_command("/wt", files)
+            self.assertNotIn("/wt", cmd, runner.tool_name)
+            for path in files:
+                self.assertIn(path, cmd)
+
+    def test_full_scan_still_targets_worktree(self):
+        for runner in (RuffRunner(), SemgrepRunner(), ESLintRunner(), BearerRunner()):
+            self.assertIn("/wt", runner.build_command("/wt"))
+
+    def test_bearer_uses_differential_scan(self):
+        runner = BearerRunner()
+        changed = ChangedFiles(base_branch="main", merge_base="abc123", files=["a.py"])
+
+        self.assertIn("--diff", runner.build_command("/wt", ["a.py"]))
+        self.assertNotIn("--diff", runner.build_command("/wt"))
+        self.assertEqual(runner.build_env(changed)["DIFF_BASE_COMMIT"], "abc123")
+        self.assertEqual(runner.build_env(None), {})
+
+
+class _EchoRunner(BaseToolRunner):
+    """Runner that echoes canned output instead of running a real tool."""
+
+    file_extensions = (".py",)
+
+    def __init__(self, findings):
+        super().__init__()
+        self.config.severity_threshold = "info"
+        self._findings = findings
+        self.built_files = "unset"
+
+    @property
+    def tool_name(self):
+        return "echo"
+
+    @property
+    def mode(self):
+        return ReviewMode.CODE_QUALITY
+
+    @property
+    def command(self):
+        return "echo"
+
+    def build_command(self, worktree_path, files=None):
+        self.built_files = files
+        return ["echo", "ok"]
+
+    def parse_output(self, raw_output):
+        return list(self._findings)
+
+
+class TestScopedExecute(unittest.TestCase):
+    """Tests for BaseToolRunner.execute with a changed file set."""
+
+    def setUp(self):
+        self.worktree = tempfile.mkdtemp()
+        self.findings = [
+            ReviewFinding(IssueSeverity.LOW, "style", "in scope", file_path="a.py"),
+            ReviewFinding(IssueSeverity.LOW, "style", "absolute", file_path=os.path.join(self.worktree, "a.py")),
+            ReviewFinding(IssueSeverity.LOW, "style", "out of scope", file_path="other.py"),
+            ReviewFinding(IssueSeverity.LOW, "style", "no path"),
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.worktree, ignore_errors=True)
+
+    def test_skips_when_no_relevant_files(self):
+        runner = _EchoRunner(self.findings)
+        changed = ChangedFiles(base_branch="main", merge_base="abc", files=["README.md"])
+
+        result = _run(runner.execute(self.worktree, changed))
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.scope, "changed")
+        self.assertEqual(result.files_scanned, 0)
+        self.assertEqual(result.findings, [])
+        self.assertEqual(runner.built_files, "unset")
+
+    def test_passes_files_and_filters_findings(self):
+        runner = _EchoRunner(self.findings)
+        changed = ChangedFiles(base_branch="main", merge_base="abc", files=["a.py", "README.md"])
+
+        result = _run(runner.execute(self.worktree, changed))
+
+        self.assertTrue(result.success)
+        self.assertEqual(runner.built_files, ["a.py"])
+        self.assertEqual(result.files_scanned, 1)
+        self.assertEqual(
+            [f.message for f in result.findings],
+            ["in scope", "absolute", "no path"],
+        )
+        self.assertGreaterEqual(result.duration_ms, 0)
+
+    def test_full_scan_keeps_all_findings(self):
+        runner = _EchoRunner(self.findings)
+
+        result = _run(runner.execute(self.worktree))
+
+        self.assertEqual(result.scope, "full")
+        self.assertIsNone(result.files_scanned)
+        self.assertIsNone(runner.built_files)
+        self.assertEqual(len(result.findings), 4)
+
+
+class TestOrchestratorScope(unittest.TestCase):
+    """Tests for scope resolution in ReviewOrchestrator."""
+
+    def setUp(self):
+        self.worktree = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.worktree, ignore_errors=True)
+
+    def _orchestrator(self, **config_kwargs):
+        from utils.review_v2 import ReviewOrchestrator
+
+        config = ReviewConfig.quick()
+        for key, value in config_kwargs.items():
+            setattr(config, key, value)
+        return ReviewOrchestrator(
+            adw_id="scope-test",
+            worktree_path=self.worktree,
+            config=config,
+            output_dir=os.path.join(self.worktree, "results"),
+        )
+
+    def test_full_scope_skips_diff(self):
+        orchestrator = self._orchestrator(scope="full")
+        with patch("utils.review_v2.get_changed_files") as mock_diff:
+            self.assertIsNone(_run(orchestrator._resolve_changed_files()))
+        mock_diff.assert_not_called()
+
+    def test_falls_back_to_full_scan_outside_git(self):
+        orchestrator = self._orchestrator(scope="changed")
+        self.assertIsNone(_run(orchestrator._resolve_changed_files()))
+
+    def test_config_round_trip(self):
+        config = ReviewConfig.from_dict({"scope": "full", "base_branch": "develop"})
+        self.assertEqual(config.scope, "full")
+        self.assertEqual(config.to_dict()["base_branch"], "develop")
+        self.assertEqual(ReviewConfig().scope, "changed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env -S uv run
+# /// script
+# dependencies = ["pytest", "pytest-asyncio"]
+# ///
+"""Tests for streaming, bounded-memory capture of review tool output.
+
+Verifies that:
+1. The incremental JSON parser yields the same items as json.loads
+2. Runner iter_findings streaming matches parse_output
+3. execute() spills stdout to disk, caps stderr and filters while parsing
+"""
+
+import asyncio
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.json_stream import iter_json_items
+from tools.base_runner import BaseToolRunner
+from tools.bearer_runner import BearerRunner
+from tools.eslint_runner import ESLintRunner
+from tools.ruff_runner import RuffRunner
+from tools.semgrep_runner import SemgrepRunner
+from stages.review_modes import ReviewMode, ReviewFinding, IssueSeverity
+
+
+def _run(coro):
+    """Run a coroutine on a private loop (leaves the global loop untouched)."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _semgrep_report(count):
+    return {
+        "version": "1.0",
+        "errors": [{"message": "nested \"results\": [] should be ignored"}],
+        "results": [
+            {
+                "check_id": f"python.sql-injection-{i}",
+                "path": f"src/file_{i % 3}.py",
+                "start": {"line": i + 1, "col": 1},
+                "extra": {"severity": "ERROR" if i % 2 else "INFO", "message": "x" * 50},
+            }
+            for i in range(count)
+        ],
+        "paths": {"scanned": ["src/file_0.py"]},
+    }
+
+
+class TestIterJsonItems(unittest.TestCase):
+    """Tests for the incremental JSON parser."""
+
+    def test_streams_keyed_array_across_chunk_boundaries(self):
+        report = _semgrep_report(200)
+        text = json.dumps(report, indent=2)
+
+        for chunk_size in (1, 7, 64, 4096):
+            items = [item for _, item in iter_json_items(io.StringIO(text), ("results",), chunk_size)]
+            self.assertEqual(items, report["results"], f"chunk_size={chunk_size}")
+
+    def test_streams_top_level_array_with_scalars(self):
+        text = '[1, 22, 333, "s", {"a": [true, null]}, 4.5e3]'
+        items = [item for _, item in iter_json_items(io.StringIO(text), chunk_size=2)]
+        self.assertEqual(items, json.loads(text))
+
+    def test_multiple_keys_report_their_key(self):
+        text = json.dumps({"high": [{"id": 1}], "skip": {"x": 1}, "low": [{"id": 2}]})
+        items = list(iter_json_items(io.StringIO(text), ("high", "low")))
+        self.assertEqual(items, [("high", {"id": 1}), ("low", {"id": 2})])
+
+    def test_empty_containers(self):
+        self.assertEqual(list(iter_json_items(io.StringIO("[]"))), [])
+        self.assertEqual(list(iter_json_items(io.StringIO("{}"), ("results",))), [])
+
+    def test_invalid_shape_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_items(io.StringIO("Scanning... {}"), ("results",)))
+        with self.assertRaises(ValueError):
+            list(iter_json_items(io.StringIO('{"results": [1, 2'), ("results",)))
+
+
+class TestRunnerIterFindings(unittest.TestCase):
+    """Streaming parsers must agree with the full-payload parsers."""
+
+    def _assert_same(self, runner, raw_output):
+        expected = [f.to_dict() for f in runner.parse_output(raw_output)]
+        streamed = [f.to_dict() for f in runner.iter_findings(io.StringIO(raw_output))]
+        self.assertTrue(expected)
+        self.assertEqual(streamed, expected)
+
+    def test_semgrep(self):
+        self._assert_same(SemgrepRunner(), json.dumps(_semgrep_report(10)))
+
+    def test_ruff(self):
+        self._assert_same(RuffRunner(), json.dumps([
+            {"code": "F401", "message": "unused", "filename": "a.py", "location": {"row": 1, "column": 1}},
+            {"code": "E501", "message": "long", "filename": "b.py", "location": {"row": 2, "column": 80}},
+        ]))
+
+    def test_eslint(self):
+        self._assert_same(ESLintRunner(), json.dumps([
+            {"filePath": "/a.js", "messages": [{"ruleId": "no-unused-vars", "severity": 2, "line": 1}]},
+            {"filePath": "/b.js", "messages": []},
+            {"filePath": "/c.js", "messages": [{"ruleId": "semi", "severity": 1, "line": 3}]},
+        ]))
+
+    def test_bearer(self):
+        self._assert_same(BearerRunner(), json.dumps({
+            "high": [{"rule_id": "sql_injection", "title": "SQL", "filename": "a.py", "line_number": 3}],
+            "low": [{"rule_id": "logger_leak", "title": "Leak", "filename": "b.py"}],
+        }))
+
+
+class _ScriptRunner(BaseToolRunner):
+    """Runner whose "tool" is a Python one-liner writing to stdout/stderr."""
+
+    def __init__(self, script, timeout_seconds=30):
+        super().__init__()
+        self.config.severity_threshold = "medium"
+        self.config.exclude_paths = ["vendor/"]
+        self.config.timeout_seconds = timeout_seconds
+        self.script = script
+        self.streamed = False
+
+    @property
+    def tool_name(self):
+        return "script"
+
+    @property
+    def mode(self):
+        return ReviewMode.SECURITY
+
+    @property
+    def command(self):
+        return sys.executable
+
+    def build_command(self, worktree_path, files=None):
+        return [sys.executable, "-c", self.script]
+
+    def parse_output(self, raw_output):
+        data = json.loads(raw_output[raw_output.index("{"):])
+        return [self._finding(item) for item in data["results"]]
+
+    def iter_findings(self, output):
+        self.streamed = True
+        for _, item in iter_json_items(output, ("results",)):
+            yield self._finding(item)
+
+    @staticmethod
+    def _finding(item):
+        return ReviewFinding(
+            severity=IssueSeverity(item["severity"]),
+            category="test",
+            message=item["message"],
+            file_path=item["path"],
+        )
+
+
+class TestStreamingExecute(unittest.TestCase):
+    """Tests for BaseToolRunner.execute output handling."""
+
+    def setUp(self):
+        self.worktree = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.worktree, ignore_errors=True)
+
+    def _report_script(self, count, preamble=""):
+        return (
+            "import json, sys\n"
+            "sys.stderr.write('e' * 100000)\n"
+            f"sys.stdout.write({preamble!r})\n"
+            "json.dump({'results': ["
+            f"{{'severity': ['high', 'low'][i % 2], 'message': 'm' * 200, "
+            f"'path': ['src/a.py', 'vendor/b.py'][i % 3 == 0]}} for i in range({count})"
+            "]}, sys.stdout)\n"
+        )
+
+    def test_filters_while_streaming_and_truncates_preview(self):
+        runner = _ScriptRunner(self._report_script(3000))
+
+        result = _run(runner.execute(self.worktree))
+
+        self.assertTrue(result.success, result.error)
+        self.assertTrue(runner.streamed)
+        # Only "high" findings outside vendor/ survive
+        expected = sum(1 for i in range(3000) if i % 2 == 0 and i % 3 != 0)
+        self.assertEqual(len(result.findings), expected)
+        self.assertTrue(all(f.severity == IssueSeverity.HIGH for f in result.findings))
+        self.assertEqual(len(result.raw_output), BaseToolRunner.RAW_OUTPUT_PREVIEW_CHARS + 3)
+
+    def test_falls_back_to_parse_output_on_preamble(self):
+        runner = _ScriptRunner(self._report_script(4, preamble="Scanning...\n"))
+
+        result = _run(runner.execute(self.worktree))
+
+        self.assertTrue(result.success, result.error)
+        self.assertEqual(len(result.findings), 1)
+
+    def test_timeout_kills_process_and_reports_stderr_tail(self):
+        script = "import sys, time\nsys.stderr.write('x' * 50000 + 'END')\nsys.stderr.flush()\ntime.sleep(30)\n"
+        runner = _ScriptRunner(script, timeout_seconds=1)
+
+        result = _run(runner.execute(self.worktree))
+
+        self.assertFalse(result.success)
+        self.assertIn("timed out", result.error)
+        self.assertTrue(result.error.endswith("END"))
+        self.assertLess(len(result.error), BaseToolRunner.STDERR_TAIL_BYTES + 200)
+
+    def test_read_tail_keeps_last_bytes(self):
+        async def fill():
+            stream = asyncio.StreamReader()
+            stream.feed_data(b"a" * 20000)
+            stream.feed_data(b"b" * 100)
+            stream.feed_eof()
+            tail = bytearray()
+            await BaseToolRunner._read_tail(stream, tail)
+            return tail
+
+        tail = _run(fill())
+        self.assertEqual(len(tail), BaseToolRunner.STDERR_TAIL_BYTES)
+        self.assertTrue(tail.endswith(b"b" * 100))
+
+
+if __name__ == "__main__":
+    unittest.main()
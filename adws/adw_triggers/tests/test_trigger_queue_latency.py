@@ -0,0 +1,78 @@
+"""Latency benchmark for queued workflow triggers on the WebSocket server."""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+# Add parent directories to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi.testclient import TestClient
+
+from adw_triggers import trigger_websocket
+from adw_triggers.websocket_models import WorkflowTriggerResponse
+
+DRAGS = 50
+TRIGGER_SECONDS = 0.2  # Simulated state save + cleanup + spawn per trigger
+
+
+async def _slow_trigger(request, websocket, adw_id=None):
+    """Stand-in for trigger_workflow doing blocking work in a thread."""
+    await asyncio.to_thread(time.sleep, TRIGGER_SECONDS)
+    return WorkflowTriggerResponse(
+        status="accepted",
+        adw_id=adw_id,
+        workflow_name=request.workflow_type,
+        message="started",
+        logs_path="",
+    )
+
+
+class TestQueuedTriggerLatency:
+    """50 simultaneous card drags are acknowledged without waiting on each other."""
+
+    def test_fifty_simultaneous_drags(self):
+        with patch.object(trigger_websocket, "trigger_workflow", _slow_trigger), \
+                patch.object(trigger_websocket.manager, "max_triggers_per_minute", DRAGS), \
+                TestClient(trigger_websocket.app) as client, \
+                client.websocket_connect("/ws/trigger") as ws:
+            start = time.perf_counter()
+            for i in range(DRAGS):
+                ws.send_text(json.dumps({
+                    "type": "trigger_workflow",
+                    "data": {"workflow_type": "adw_plan_iso", "issue_number": str(1000 + i)},
+                }))
+
+            ack_latencies = []
+            final = set()
+            acked = set()
+            while len(final) < DRAGS:
+                message = json.loads(ws.receive_text())
+                if message["type"] != "trigger_response":
+                    continue
+                adw_id = message["data"]["adw_id"]
+                if adw_id not in acked:
+                    acked.add(adw_id)
+                    ack_latencies.append(time.perf_counter() - start)
+                    assert message["data"]["status"] == "queued"
+                else:
+                    assert message["data"]["status"] == "accepted"
+                    final.add(adw_id)
+            total = time.perf_counter() - start
+
+        # Acks don't wait for trigger processing (inline handling would take
+        # DRAGS * TRIGGER_SECONDS before the last ack)
+        assert len(acked) == DRAGS
+        assert max(ack_latencies) < TRIGGER_SECONDS
+        # Workers overlap the blocking work
+        assert total < DRAGS * TRIGGER_SECONDS / 2
+
+        ack_latencies.sort()
+        print(
+            f"\n{DRAGS} drags: ack p50 {ack_latencies[DRAGS // 2] * 1000:.1f}ms, "
+            f"max {ack_latencies[-1] * 1000:.1f}ms; all triggers done in {total:.2f}s "
+            f"(inline: ~{DRAGS * TRIGGER_SECONDS:.0f}s)"
+        )
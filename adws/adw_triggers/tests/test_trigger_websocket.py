@@ -1025,3 +1025,60 @@ class TestDeleteADWProtectsMainServer:
         )
         assert kill_8505_attempted, \
             "delete_adw SHOULD attempt to kill processes on non-colliding port 8505"
+
+
+class TestEventLogSequencing:
+    """Tests that the trigger server sequences its broadcasts."""
+
+    def test_manager_has_event_log(self):
+        """The shared EventLog must import, or trigger broadcasts can't be resumed."""
+        from adw_triggers import trigger_websocket
+
+        assert trigger_websocket.EventLog is not None
+        assert trigger_websocket.manager.event_log is not None
+
+    def test_heartbeats_are_not_sequenced(self):
+        """Both managers skip connection-health events."""
+        import asyncio
+        from adw_triggers import trigger_websocket
+
+        ws_manager = trigger_websocket.get_websocket_manager()
+        seq = ws_manager.event_log.seq
+        asyncio.run(ws_manager.broadcast({"type": "heartbeat"}))
+        assert ws_manager.event_log.seq == seq
+        asyncio.run(ws_manager.broadcast({"type": "system_log", "data": {}}))
+        assert ws_manager.event_log.seq == seq + 1
+
+
+class TestBackgroundJobs:
+    """Tests for the trigger server's periodic background jobs."""
+
+    def test_periodic_job_repeats_until_shutdown(self, monkeypatch):
+        """A job keeps running after a failure, a zero interval disables it, and shutdown stops it."""
+        import asyncio
+        import time
+        from adw_triggers import trigger_websocket
+
+        calls = []
+
+        def job():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                raise RuntimeError("first run fails")
+
+        async def run():
+            monkeypatch.setenv("ADW_TEST_JOB_SECONDS", "0.01")
+            monkeypatch.setenv("ADW_DISABLED_JOB_SECONDS", "0")
+            trigger_websocket._start_periodic("Test job", "ADW_TEST_JOB_SECONDS", 60, job)
+            trigger_websocket._start_periodic("Disabled job", "ADW_DISABLED_JOB_SECONDS", 60, job)
+            assert "Disabled job" not in trigger_websocket._periodic_tasks
+            await asyncio.sleep(0.2)
+            await trigger_websocket.stop_background_jobs()
+            assert trigger_websocket._periodic_tasks == {}
+
+        asyncio.run(run())
+
+        runs = len(calls)
+        assert runs >= 2
+        time.sleep(0.05)
+        assert len(calls) == runs
@@ -16,6 +16,10 @@ This script polls GitHub every 20 seconds to detect:
 2. Issues where the latest comment contains 'adw'
 
 When a qualifying issue is found, it triggers the existing manual workflow script.
+
+Only issues updated since the previous cycle are inspected (see
+adw_modules/issue_poller.py); the watermark and processed issues are stored
+in the ADW database, so restarts don't re-scan every open issue.
 """
 
 import os
@@ -24,7 +28,7 @@ import subprocess
 import sys
 import time
 from pathlib import Path
-from typing import Dict, Set, Optional
+from typing import Optional
 
 import schedule
 from dotenv import load_dotenv
@@ -33,7 +37,8 @@ from dotenv import load_dotenv
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from adw_modules.utils import get_safe_subprocess_env
 
-from adw_modules.github import fetch_open_issues, fetch_issue_comments, get_repo_url, extract_repo_path
+from adw_modules.github import get_repo_url, extract_repo_path
+from adw_modules.issue_poller import IssuePoller, PollStateStore
 
 # Load environment variables from current or parent directories
 load_dotenv()
@@ -49,11 +54,6 @@ except ValueError as e:
     print(f"ERROR: {e}")
     sys.exit(1)
 
-# Track processed issues
-processed_issues: Set[int] = set()
-# Track issues with their last processed comment ID
-issue_last_comment: Dict[int, Optional[int]] = {}
-
 # Graceful shutdown flag
 shutdown_requested = False
 
@@ -65,36 +65,6 @@ def signal_handler(signum, frame):
     shutdown_requested = True
 
 
-def should_process_issue(issue_number: int) -> bool:
-    """Determine if an issue should be processed based on comments."""
-    comments = fetch_issue_comments(REPO_PATH, issue_number)
-    
-    # If no comments, it's a new issue - process it
-    if not comments:
-        print(f"INFO: Issue #{issue_number} has no comments - marking for processing")
-        return True
-    
-    # Get the latest comment
-    latest_comment = comments[-1]
-    comment_body = latest_comment.get("body", "").lower()
-    comment_id = latest_comment.get("id")
-    
-    # Check if we've already processed this comment
-    last_processed_comment = issue_last_comment.get(issue_number)
-    if last_processed_comment == comment_id:
-        # DEBUG level - not printing
-        return False
-    
-    # Check if latest comment is exactly 'adw' (after stripping whitespace)
-    if comment_body.strip() == "adw":
-        print(f"INFO: Issue #{issue_number} - latest comment is 'adw' - marking for processing")
-        issue_last_comment[issue_number] = comment_id
-        return True
-    
-    # DEBUG level - not printing
-    return False
-
-
 def trigger_adw_workflow(issue_number: int) -> bool:
     """Trigger the ADW plan and build workflow for a specific issue."""
     try:
@@ -131,6 +101,10 @@ def trigger_adw_workflow(issue_number: int) -> bool:
         return False
 
 
+# Created in main() so importing this module doesn't touch the database
+poller: Optional[IssuePoller] = None
+
+
 def check_and_process_issues():
     """Main function that checks for issues and processes qualifying ones."""
     if shutdown_requested:
@@ -141,51 +115,23 @@ def check_and_process_issues():
     print("INFO: Starting issue check cycle")
     
     try:
-        # Fetch all open issues
-        issues = fetch_open_issues(REPO_PATH)
-        
-        if not issues:
-            print("INFO: No open issues found")
+        stats = poller.poll(should_stop=lambda: shutdown_requested)
+
+        if not stats["fetched"]:
+            print("INFO: No updated open issues found")
             return
-        
-        # Track newly qualified issues
-        new_qualifying_issues = []
-        
-        # Check each issue
-        for issue in issues:
-            issue_number = issue.number
-            if not issue_number:
-                continue
-            
-            # Skip if already processed in this session
-            if issue_number in processed_issues:
-                continue
-            
-            # Check if issue should be processed
-            if should_process_issue(issue_number):
-                new_qualifying_issues.append(issue_number)
-        
-        # Process qualifying issues
-        if new_qualifying_issues:
-            print(f"INFO: Found {len(new_qualifying_issues)} new qualifying issues: {new_qualifying_issues}")
-            
-            for issue_number in new_qualifying_issues:
-                if shutdown_requested:
-                    print("INFO: Shutdown requested, stopping issue processing")
-                    break
-                
-                # Trigger the workflow
-                if trigger_adw_workflow(issue_number):
-                    processed_issues.add(issue_number)
-                else:
-                    print(f"WARNING: Failed to process issue #{issue_number}, will retry in next cycle")
+
+        if stats["qualifying"]:
+            print(
+                f"INFO: Found {stats['qualifying']} new qualifying issues, "
+                f"triggered {stats['triggered']}"
+            )
         else:
             print("INFO: No new qualifying issues found")
         
         # Log performance metrics
         cycle_time = time.time() - start_time
-        print(f"INFO: Check cycle completed in {cycle_time:.2f} seconds")
-        print(f"INFO: Total processed issues in session: {len(processed_issues)}")
+        print(f"INFO: Check cycle completed in {cycle_time:.2f} seconds ({stats['fetched']} issues inspected)")
         
     except Exception as e:
         print(f"ERROR: Error during check cycle: {e}")
@@ -198,6 +144,9 @@ def main():
     print("INFO: Starting ADW cron trigger")
     print(f"INFO: Repository: {REPO_PATH}")
     print("INFO: Polling interval: 20 seconds")
+
+    global poller
+    poller = IssuePoller(REPO_PATH, PollStateStore(), trigger_adw_workflow)
     
     # Set up signal handlers
     signal.signal(signal.SIGINT, signal_handler)
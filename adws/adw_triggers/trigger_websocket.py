@@ -18,18 +18,22 @@ Environment Requirements:
 """
 
 import argparse
+import asyncio
+import inspect
 import json
 import logging
 import os
 import re
 import shutil
 import signal
+import sqlite3
 import subprocess
 import sys
 import time
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Set, Optional, Dict, Any
+from typing import Any, Callable, Dict, Optional, Set
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -49,6 +53,22 @@ from adw_modules.websocket_client import WebSocketNotifier
 from adw_modules.websocket_manager import get_websocket_manager
 from adw_modules.agent_directory_monitor import AgentDirectoryMonitor
 from adw_modules.agent_log_streamer import get_agent_log_streamer
+from adw_modules.health_monitor import HealthMonitor
+from adw_modules.trigger_queue import TriggerQueue
+from adw_modules.db_paths import get_default_db_path
+from adw_modules.artifact_index import ArtifactIndex, index_artifact, PLAN as ARTIFACT_PLAN
+from adw_modules.worktree_pool import WorktreePool
+from adw_modules.heartbeat import register_launch
+from adw_modules.liveness_monitor import LivenessMonitor
+from adw_modules.activity_retention import ActivityRetention
+from utils.merge.queue import MergeQueue
+from adw_modules.health_checks import (
+    CheckResult,
+    check_env_vars,
+    check_git_repo,
+    check_github_cli,
+    check_claude_code,
+)
 from adw_triggers.websocket_models import (
     WorkflowTriggerRequest,
     WorkflowTriggerResponse,
@@ -67,7 +87,7 @@ try:
     _server_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "server")
     if _server_path not in sys.path:
         sys.path.insert(0, _server_path)
-    from core.database import get_db_manager
+    from core.database import adw_list_query, get_db_manager
     from models.adw_db_models import ADWStateCreate, ADWStateUpdate
     DB_AVAILABLE = True
 except ImportError as e:
@@ -77,6 +97,14 @@ except ImportError as e:
     ADWStateCreate = None
     ADWStateUpdate = None
 
+# Sequenced, replayable broadcast events (shared with the server package)
+try:
+    from core.event_log import EventLog, UNSEQUENCED_EVENT_TYPES
+except ImportError as e:
+    EventLog = None
+    UNSEQUENCED_EVENT_TYPES = set()
+    print(f"Event log not available, broadcasts will not be resumable: {e}")
+
 # Load environment variables from current working directory
 # This ensures we load from the worktree's .env when running in worktree mode
 load_dotenv(dotenv_path=os.path.join(os.getcwd(), '.env'), override=False)
@@ -121,6 +149,8 @@ active_connections: Set[WebSocket] = set()
 total_workflows_triggered = 0
 server_start_time = time.time()
 active_monitors: Dict[str, AgentDirectoryMonitor] = {}  # Track active directory monitors by adw_id
+# Workflow triggers are processed here, off the WebSocket receive loop
+trigger_queue = TriggerQueue(workers=int(os.getenv("ADW_TRIGGER_WORKERS", "4")))
 
 # Create FastAPI app
 app = FastAPI(
@@ -252,9 +282,10 @@ def read_adw_state(adw_dir: Path) -> Dict[str, Any]:
 class ConnectionManager:
     """Manages WebSocket connections and broadcasting with enhanced reliability."""
 
-    def __init__(self):
+    def __init__(self, event_log=None):
         self.active_connections: Set[WebSocket] = set()
         self.connection_metadata: dict = {}  # Track metadata per connection
+        self.event_log = event_log  # Sequences broadcasts for client resume (optional)
         self.connection_timeout = 300  # 5 minutes of idle time before considering stale
         self.last_cleanup_time = time.time()
         self.cleanup_interval = 60  # Check for stale connections every 60 seconds
@@ -448,6 +479,11 @@ class ConnectionManager:
             message: The message to broadcast
             deduplicate_by_session: If True, only send to one connection per unique client session
         """
+        # Sequence and retain the event even with no clients, so they can resume
+        if (self.event_log is not None and isinstance(message, dict)
+                and message.get("type") not in UNSEQUENCED_EVENT_TYPES):
+            self.event_log.append(message)
+
         if not self.active_connections:
             return
 
@@ -500,7 +536,19 @@ class ConnectionManager:
         return self.connection_metadata.get(conn_id)
 
 
-manager = ConnectionManager()
+def create_event_log():
+    """Event log for broadcast events, spilling to the ADW database."""
+    if EventLog is None:
+        return None
+    capacity = int(os.getenv("WS_EVENT_LOG_CAPACITY", "1000"))
+    try:
+        return EventLog(source="trigger", capacity=capacity, db_path=get_default_db_path())
+    except Exception as e:
+        print(f"Event log persistence unavailable, keeping events in memory only: {e}")
+        return EventLog(source="trigger", capacity=capacity)
+
+
+manager = ConnectionManager(event_log=create_event_log())
 
 # Sync the new WebSocketManager with the old ConnectionManager connections
 # This ensures both managers can broadcast to the same clients
@@ -510,6 +558,7 @@ def sync_websocket_managers():
     # Share the connection set so both managers broadcast to the same clients
     ws_manager.active_connections = manager.active_connections
     ws_manager.connection_metadata = manager.connection_metadata
+    ws_manager.event_log = manager.event_log
 
 # Call sync after manager is created
 sync_websocket_managers()
@@ -609,14 +658,8 @@ def cleanup_old_adw_resources(old_adw_id: str, logger) -> None:
     logger.info(f"Completed cleanup of old ADW resources for: {old_adw_id}")
 
 
-async def trigger_workflow(request: WorkflowTriggerRequest, websocket: WebSocket) -> WorkflowTriggerResponse:
-    """Trigger an ADW workflow and return response."""
-    global total_workflows_triggered
-
-    # Use provided ADW ID or generate a new one
-    adw_id = request.adw_id or make_adw_id()
-
-    # Create or update state
+def prepare_trigger_state(request: WorkflowTriggerRequest, adw_id: str) -> ADWState:
+    """Create or update the ADW state for a trigger request (blocking: SQLite + Caddy)."""
     if request.adw_id:
         # Try to load existing state first
         state = ADWState.load(request.adw_id)
@@ -685,6 +728,35 @@ async def trigger_workflow(request: WorkflowTriggerRequest, websocket: WebSocket
         state.update(**update_data)
         state.save("websocket_trigger")
 
+    return state
+
+
+async def trigger_workflow(
+    request: WorkflowTriggerRequest,
+    websocket: WebSocket,
+    adw_id: Optional[str] = None
+) -> WorkflowTriggerResponse:
+    """
+    Trigger an ADW workflow and return response.
+
+    Blocking steps (state persistence, old worktree cleanup, process spawn,
+    stage notifications) run in worker threads so the event loop keeps
+    serving other clients while a trigger is processed.
+
+    Args:
+        request: Validated trigger request
+        websocket: Client to send status updates to
+        adw_id: ADW ID already handed to the client (defaults to the
+            request's ADW ID or a new one)
+    """
+    global total_workflows_triggered
+
+    # Use provided ADW ID or generate a new one
+    adw_id = adw_id or request.adw_id or make_adw_id()
+
+    # Create or update state
+    await asyncio.to_thread(prepare_trigger_state, request, adw_id)
+
     # Set up logger
     logger = setup_logger(adw_id, "websocket_trigger")
     data_source = "kanban" if (request.issue_json or request.issue_type) else "github"
@@ -714,8 +786,8 @@ async def trigger_workflow(request: WorkflowTriggerRequest, websocket: WebSocket
                     f"old_adw_id={old_adw_id}, new_adw_id={adw_id}"
                 )
 
-                # Clean up old ADW resources
-                cleanup_old_adw_resources(old_adw_id, logger)
+                # Clean up old ADW resources (git worktree remove + rmtree)
+                await asyncio.to_thread(cleanup_old_adw_resources, old_adw_id, logger)
             else:
                 logger.info(
                     f"Workflow restart detected but no valid old_adw_id found "
@@ -782,7 +854,8 @@ async def trigger_workflow(request: WorkflowTriggerRequest, websocket: WebSocket
 
     # Launch in background using Popen with filtered environment
     try:
-        subprocess.Popen(
+        process = await asyncio.to_thread(
+            subprocess.Popen,
             cmd,
             cwd=repo_root,  # Run from repository root where .claude/commands/ is located
             env=get_safe_subprocess_env(env_file_path),  # Pass .env file path for explicit loading
@@ -791,6 +864,12 @@ async def trigger_workflow(request: WorkflowTriggerRequest, websocket: WebSocket
 
         total_workflows_triggered += 1
 
+        # Record the PID for the liveness monitor
+        try:
+            await asyncio.to_thread(register_launch, adw_id, process.pid, request.workflow_type)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not register workflow process {process.pid}: {e}")
+
         logs_path = f"agents/{adw_id}/{request.workflow_type}/"
 
         print(f"Background process started for ADW ID: {adw_id}")
@@ -806,6 +885,7 @@ async def trigger_workflow(request: WorkflowTriggerRequest, websocket: WebSocket
         )
 
         # Start agent directory monitoring for real-time updates
+        # (stays on the loop thread - the monitor captures the running loop)
         start_agent_directory_monitoring(adw_id)
 
         # Force stage transition if this is a restart
@@ -833,7 +913,8 @@ async def trigger_workflow(request: WorkflowTriggerRequest, websocket: WebSocket
                 if old_adw_id:
                     transition_msg += f" (cleaned up old ADW: {old_adw_id})"
 
-                notifier.notify_stage_transition(
+                await asyncio.to_thread(
+                    notifier.notify_stage_transition,
                     workflow_name=request.workflow_type,
                     from_stage=from_stage,
                     to_stage=target_stage,
@@ -889,6 +970,47 @@ async def trigger_workflow(request: WorkflowTriggerRequest, websocket: WebSocket
         )
 
 
+async def process_workflow_trigger(
+    request: WorkflowTriggerRequest,
+    websocket: WebSocket,
+    adw_id: str,
+    acked: Optional[asyncio.Event] = None
+) -> None:
+    """
+    Trigger queue job: run the trigger and send the final trigger_response.
+
+    Waits for acked (set once the "queued" ack is sent) so status updates
+    and the final response never reach the client ahead of the ack.
+    """
+    if acked is not None:
+        await acked.wait()
+
+    try:
+        response = await trigger_workflow(request, websocket, adw_id)
+    except Exception as e:
+        logger.error(f"Workflow trigger for {adw_id} failed: {e}", exc_info=True)
+        await send_status_update(
+            adw_id,
+            request.workflow_type,
+            "failed",
+            f"Failed to start workflow: {str(e)}",
+            websocket
+        )
+        response = WorkflowTriggerResponse(
+            status="error",
+            adw_id=adw_id,
+            workflow_name=request.workflow_type,
+            message="Failed to trigger workflow",
+            logs_path="",
+            error=str(e)
+        )
+
+    await manager.send_personal_message({
+        "type": "trigger_response",
+        "data": response.model_dump()
+    }, websocket)
+
+
 def start_agent_directory_monitoring(adw_id: str) -> Optional[AgentDirectoryMonitor]:
     """
     Start monitoring agent directory for real-time changes using AgentLogStreamer.
@@ -1119,14 +1241,42 @@ async def websocket_endpoint(websocket: WebSocket):
                         }, websocket)
                         continue
 
-                    # Trigger the workflow
-                    response = await trigger_workflow(validated_request, websocket)
+                    # Acknowledge immediately with a "queued" trigger_response
+                    # and process the trigger off the receive loop; progress
+                    # follows as status_update events and a final
+                    # trigger_response ("accepted" or "error")
+                    adw_id = validated_request.adw_id or make_adw_id()
+                    acked = asyncio.Event()
+                    try:
+                        ahead = trigger_queue.submit(
+                            adw_id,
+                            partial(process_workflow_trigger, validated_request, websocket, adw_id, acked)
+                        )
+                    except asyncio.QueueFull:
+                        error_response = WebSocketError(
+                            error_type="server_busy",
+                            message="Too many workflow triggers queued, please retry shortly"
+                        )
+                        await manager.send_personal_message({
+                            "type": "error",
+                            "data": error_response.model_dump()
+                        }, websocket)
+                        continue
 
-                    # Send response
-                    await manager.send_personal_message({
-                        "type": "trigger_response",
-                        "data": response.model_dump()
-                    }, websocket)
+                    ack = WorkflowTriggerResponse(
+                        status="queued",
+                        adw_id=adw_id,
+                        workflow_name=validated_request.workflow_type,
+                        message=f"ADW {validated_request.workflow_type} queued ({ahead} ahead)",
+                        logs_path=f"agents/{adw_id}/{validated_request.workflow_type}/"
+                    )
+                    try:
+                        await manager.send_personal_message({
+                            "type": "trigger_response",
+                            "data": ack.model_dump()
+                        }, websocket)
+                    finally:
+                        acked.set()
 
                 elif message_type == "ping":
                     # Handle ping/pong for connection keepalive
@@ -1147,6 +1297,18 @@ async def websocket_endpoint(websocket: WebSocket):
 
                     await manager.send_personal_message(pong_response, websocket)
 
+                elif message_type == "resume":
+                    # Replay broadcasts missed since the client's last sequence,
+                    # or tell it to reload when they are no longer retained
+                    resume_data = message.get("data", {})
+                    if manager.event_log is not None:
+                        reply = manager.event_log.resume(
+                            resume_data.get("last_seq"), resume_data.get("epoch")
+                        )
+                    else:
+                        reply = {"type": "snapshot_required", "data": {"reason": "resume_unavailable"}}
+                    await manager.send_personal_message(reply, websocket)
+
                 elif message_type == "register_session":
                     # Handle session registration for deduplication
                     session_data = message.get("data", {})
@@ -1559,102 +1721,181 @@ async def receive_spec_created(request_data: dict):
         )
 
 
-@app.get("/health")
-async def health():
-    """Health check endpoint - runs comprehensive system health check."""
-    try:
-        # Run the health check script
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        # Health check is in adw_tests, not adw_triggers
-        health_check_script = os.path.join(
-            os.path.dirname(script_dir), "adw_tests", "health_check.py"
+def _check_claude_code():
+    """Claude Code check, skipped when there is no API key to test with."""
+    if not os.getenv("ANTHROPIC_API_KEY"):
+        return CheckResult(
+            success=False,
+            details={"skipped": True, "reason": "ANTHROPIC_API_KEY not set"},
         )
+    return check_claude_code()
+
+
+# Cheap checks refresh on a schedule; the Claude Code check sends a real
+# prompt, so it only runs on /health/deep
+health_monitor = HealthMonitor(
+    checks={
+        "environment": check_env_vars,
+        "git_repository": check_git_repo,
+        "github_cli": check_github_cli,
+    },
+    deep_checks={"claude_code": _check_claude_code},
+    interval_seconds=float(os.getenv("ADW_HEALTH_CHECK_INTERVAL", "60")),
+)
 
-        # Run health check with timeout
-        result = subprocess.run(
-            ["uv", "run", health_check_script],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            cwd=os.path.dirname(script_dir),  # Run from adws directory
-        )
 
-        # Print the health check output for debugging
-        print("=== Health Check Output ===")
-        print(result.stdout)
-        if result.stderr:
-            print("=== Health Check Errors ===")
-            print(result.stderr)
+@app.on_event("startup")
+async def start_health_monitor():
+    """Start background health check refreshes."""
+    health_monitor.start()
 
-        # Parse the output - look for the overall status
-        output_lines = result.stdout.strip().split("\n")
-        is_healthy = result.returncode == 0
 
-        # Extract key information from output
-        warnings = []
-        errors = []
+# Background jobs, each re-run every interval; setting its interval
+# variable to 0 disables a job (the ADW test suites disable all of them)
+_periodic_tasks: Dict[str, asyncio.Task] = {}
 
-        capturing_warnings = False
-        capturing_errors = False
 
-        for line in output_lines:
-            if "⚠️  Warnings:" in line:
-                capturing_warnings = True
-                capturing_errors = False
-                continue
-            elif "❌ Errors:" in line:
-                capturing_errors = True
-                capturing_warnings = False
-                continue
-            elif "📝 Next Steps:" in line:
-                break
-
-            if capturing_warnings and line.strip().startswith("-"):
-                warnings.append(line.strip()[2:])
-            elif capturing_errors and line.strip().startswith("-"):
-                errors.append(line.strip()[2:])
-
-        # Calculate uptime
-        uptime_seconds = time.time() - server_start_time
-
-        response = HealthCheckResponse(
-            status="healthy" if is_healthy else "unhealthy",
-            service="adw-websocket-trigger",
-            active_connections=len(manager.active_connections),
-            total_workflows_triggered=total_workflows_triggered,
-            uptime_seconds=uptime_seconds,
-            health_check={
-                "success": is_healthy,
-                "warnings": warnings,
-                "errors": errors,
-                "details": "Run health_check.py directly for full report",
-            } if is_healthy else None,
-            error=f"Health check failed with {len(errors)} errors" if not is_healthy else None
-        )
+def _start_periodic(
+    name: str,
+    interval_env: str,
+    default_seconds: float,
+    fn: Callable[[], Any]
+) -> None:
+    """
+    Run fn every interval_env seconds until shutdown.
 
-        return JSONResponse(content=response.model_dump())
+    Plain functions run in a worker thread so they don't block the event
+    loop; coroutine functions are awaited. The interval is read when the
+    server starts.
+    """
+    interval = float(os.getenv(interval_env, str(default_seconds)))
+    if interval <= 0:
+        return
 
-    except subprocess.TimeoutExpired:
-        response = HealthCheckResponse(
-            status="unhealthy",
-            service="adw-websocket-trigger",
-            active_connections=len(manager.active_connections),
-            total_workflows_triggered=total_workflows_triggered,
-            uptime_seconds=time.time() - server_start_time,
-            error="Health check timed out"
-        )
-        return JSONResponse(content=response.model_dump())
+    async def run_forever():
+        while True:
+            try:
+                if inspect.iscoroutinefunction(fn):
+                    await fn()
+                else:
+                    await asyncio.to_thread(fn)
+            except Exception as e:
+                logger.error(f"{name} failed: {e}")
+            await asyncio.sleep(interval)
 
-    except Exception as e:
-        response = HealthCheckResponse(
-            status="unhealthy",
-            service="adw-websocket-trigger",
-            active_connections=len(manager.active_connections),
-            total_workflows_triggered=total_workflows_triggered,
-            uptime_seconds=time.time() - server_start_time,
-            error=f"Health check failed: {str(e)}"
+    _periodic_tasks[name] = asyncio.get_running_loop().create_task(run_forever())
+
+
+def _backfill_artifact_index():
+    """Index plans and screenshots written before the artifact index existed."""
+    indexed = ArtifactIndex().backfill_if_empty()
+    if indexed:
+        logger.info(f"Artifact index backfilled with {indexed} files")
+
+
+# Pre-warmed worktrees claimed by new ADWs (ADW_WORKTREE_POOL_SIZE=0 disables)
+worktree_pool = WorktreePool(logger=logger)
+
+
+def _refill_worktree_pool():
+    """Top the worktree pool up after claims."""
+    added = worktree_pool.fill()
+    if added:
+        logger.info(f"Added {added} worktrees to the pool")
+
+
+# Flags dead and hung workflows within seconds
+liveness_monitor = LivenessMonitor()
+
+
+async def _check_liveness():
+    """Check running workflows off the event loop and push the stuck ones to clients."""
+    flagged = await asyncio.to_thread(liveness_monitor.check)
+    for entry in flagged:
+        update = WorkflowStatusUpdate(
+            adw_id=entry["adw_id"],
+            workflow_name=entry["workflow_name"],
+            # Still in_progress in the database; the card is marked, not moved
+            status="in_progress",
+            message=f"Workflow appears stuck: {entry['reason']}",
+            timestamp=datetime.utcnow().isoformat() + "Z",
+            is_stuck=True,
         )
-        return JSONResponse(content=response.model_dump())
+        await manager.broadcast({"type": "status_update", "data": update.model_dump()})
+
+
+# Archives and rolls up old activity logs, in small write batches
+activity_retention = ActivityRetention()
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    """Start the periodic background jobs."""
+    _start_periodic("Artifact index backfill", "ADW_ARTIFACT_BACKFILL_INTERVAL_SECONDS", 3600, _backfill_artifact_index)
+    if worktree_pool.enabled:
+        _start_periodic("Worktree pool refill", "ADW_WORKTREE_POOL_REFILL_SECONDS", 30, _refill_worktree_pool)
+    _start_periodic("Liveness check", "ADW_LIVENESS_CHECK_SECONDS", 5, _check_liveness)
+    _start_periodic("Activity retention", "ADW_ACTIVITY_RETENTION_INTERVAL_SECONDS", 3600, activity_retention.run)
+
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    """Stop the periodic background jobs; activity retention stops after its current batch."""
+    activity_retention.stop()
+    for task in _periodic_tasks.values():
+        task.cancel()
+    _periodic_tasks.clear()
+
+
+@app.get("/api/worktree-pool")
+async def get_worktree_pool_stats():
+    """Pool size, slot ages and recent claim latencies."""
+    return await asyncio.to_thread(worktree_pool.stats)
+
+
+@app.get("/api/merge-queue")
+async def get_merge_queue_stats():
+    """Merges waiting in the queue and recent outcomes."""
+    return await asyncio.to_thread(lambda: MergeQueue(logger=logger).stats())
+
+
+@app.on_event("shutdown")
+async def stop_health_monitor():
+    """Stop background health check refreshes."""
+    await health_monitor.stop()
+
+
+@app.on_event("shutdown")
+async def stop_trigger_queue():
+    """Stop trigger queue workers."""
+    await trigger_queue.stop()
+
+
+def _health_response(snapshot: Dict[str, Any]) -> JSONResponse:
+    """Build the health endpoint response from a monitor snapshot."""
+    is_healthy = snapshot["success"]
+    response = HealthCheckResponse(
+        status="healthy" if is_healthy else "unhealthy",
+        service="adw-websocket-trigger",
+        active_connections=len(manager.active_connections),
+        total_workflows_triggered=total_workflows_triggered,
+        uptime_seconds=time.time() - server_start_time,
+        health_check=snapshot,
+        error=f"Health check failed with {len(snapshot['errors'])} errors" if not is_healthy else None
+    )
+    return JSONResponse(content=response.model_dump())
+
+
+@app.get("/health")
+async def health():
+    """Health check endpoint - returns the cached results of the background health checks."""
+    return _health_response(health_monitor.snapshot())
+
+
+@app.get("/health/deep")
+async def health_deep():
+    """Deep health check endpoint - runs every check (including Claude Code) now."""
+    return _health_response(await health_monitor.refresh(deep=True))
 
 
 def get_adws_directory() -> Path:
@@ -2147,28 +2388,8 @@ async def list_adws_database(
     try:
         db_manager = get_db_manager()
 
-        # Build query with filters
-        query = "SELECT * FROM adw_states WHERE 1=1"
-        params = []
-
-        if not include_deleted:
-            query += " AND deleted_at IS NULL"
-
-        if status:
-            query += " AND status = ?"
-            params.append(status)
-
-        if stage:
-            query += " AND current_stage = ?"
-            params.append(stage)
-
-        if is_stuck is not None:
-            query += " AND is_stuck = ?"
-            params.append(1 if is_stuck else 0)
-
-        query += " ORDER BY created_at DESC"
-
-        results = db_manager.execute_query(query, tuple(params))
+        query, params = adw_list_query(status, stage, is_stuck, include_deleted)
+        results = db_manager.execute_query(query, params)
 
         # Transform results to match expected format
         adws = []
@@ -2964,6 +3185,126 @@ async def open_worktree(adw_id: str):
         )
 
 
+def _search_plan_file(adw_id: str) -> Optional[Path]:
+    """Find an ADW's plan by crawling the specs directories of the project and its worktrees.
+
+    Only needed for plans the artifact index hasn't recorded.
+    """
+    # Get current file path to determine if we're in a worktree
+    current_file = Path(__file__).resolve()
+    current_root = current_file.parent.parent.parent
+
+    # Build list of directories to search
+    specs_directories = []
+
+    # Add main project specs directory
+    main_specs_dir = get_specs_directory()
+    specs_directories.append(main_specs_dir)
+
+    # If we're in a worktree, also check the worktree's local specs directory
+    path_parts = current_root.parts
+    if 'trees' in path_parts:
+        worktree_specs_dir = current_root / "specs"
+        if worktree_specs_dir.exists():
+            specs_directories.append(worktree_specs_dir)
+            logger.info(f"Also searching worktree specs directory: {worktree_specs_dir}")
+
+    # Check if there's a worktree for this specific ADW ID and search its specs
+    # This handles nested worktrees where plan files are created inside trees/{adw_id}/specs/
+    trees_index = path_parts.index('trees') if 'trees' in path_parts else None
+    if trees_index is not None:
+        main_project_root = Path(*path_parts[:trees_index])
+    else:
+        main_project_root = current_root
+
+    # Search in trees/{adw_id}/specs/ directory
+    adw_worktree_specs = main_project_root / "trees" / adw_id / "specs"
+    if adw_worktree_specs.exists() and adw_worktree_specs not in specs_directories:
+        specs_directories.append(adw_worktree_specs)
+        logger.info(f"Also searching ADW worktree specs directory: {adw_worktree_specs}")
+
+    # Also search nested worktrees (trees/X/trees/{adw_id}/specs/)
+    trees_dir = main_project_root / "trees"
+    if trees_dir.exists():
+        for parent_worktree in trees_dir.iterdir():
+            if parent_worktree.is_dir():
+                nested_adw_specs = parent_worktree / "trees" / adw_id / "specs"
+                if nested_adw_specs.exists() and nested_adw_specs not in specs_directories:
+                    specs_directories.append(nested_adw_specs)
+                    logger.info(f"Also searching nested worktree specs directory: {nested_adw_specs}")
+
+    logger.info(f"Searching for plan files in {len(specs_directories)} directories")
+
+    # Search for plan files matching the pattern: issue-*-adw-{adw_id}-sdlc_planner-*.md
+    pattern = f"issue-*-adw-{adw_id}-sdlc_planner-*.md"
+    matching_files = []
+
+    for specs_dir in specs_directories:
+        if specs_dir.exists():
+            logger.info(f"Searching in: {specs_dir}")
+            files = list(specs_dir.glob(pattern))
+            matching_files.extend(files)
+            logger.info(f"Found {len(files)} files in {specs_dir}")
+
+    logger.info(f"Total files found matching pattern '{pattern}': {len(matching_files)}")
+
+    # If multiple files found, use the most recently modified one
+    plan_file = None
+    if matching_files:
+        # Sort by modification time (most recent first)
+        matching_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+        plan_file = matching_files[0]
+        if len(matching_files) > 1:
+            logger.warning(f"Multiple plan files found for ADW ID {adw_id}, using most recent: {plan_file.name}")
+        else:
+            logger.info(f"Found plan file: {plan_file.name}")
+
+    # Fallback: If no plan file found by ADW ID, try to find by checking ADW state
+    if not plan_file:
+        logger.info("No plan file found by ADW ID pattern, attempting fallback search")
+
+        # Try to get issue number from ADW state
+        agents_dir = get_agents_directory()
+        adw_dir = agents_dir / adw_id
+
+        if adw_dir.exists():
+            adw_state = read_adw_state(adw_dir)
+            if adw_state and 'issue_number' in adw_state:
+                issue_number = adw_state['issue_number']
+                logger.info(f"Found issue number {issue_number} from ADW state, searching for plan files")
+
+                # Search by issue number pattern in main specs directory
+                fallback_pattern = f"issue-{issue_number}-adw-*-sdlc_planner-*.md"
+                fallback_files = list(main_specs_dir.glob(fallback_pattern))
+
+                if fallback_files:
+                    # Sort by modification time and use most recent
+                    fallback_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+                    plan_file = fallback_files[0]
+                    logger.info(f"Found plan file via fallback search: {plan_file.name}")
+
+    return plan_file
+
+
+def _find_plan_file(adw_id: str) -> Optional[Path]:
+    """Find an ADW's plan, from the artifact index when it has recorded one."""
+    try:
+        index = ArtifactIndex()
+        indexed = index.latest(adw_id, ARTIFACT_PLAN)
+    except sqlite3.Error as e:
+        logger.warning(f"Artifact index lookup failed for {adw_id}: {e}")
+        index, indexed = None, None
+    if indexed:
+        logger.info(f"Found plan file in artifact index: {indexed['path']}")
+        return Path(indexed["path"])
+
+    plan_file = _search_plan_file(adw_id)
+    if plan_file and index is not None:
+        # Later lookups for this ADW skip the crawl
+        index_artifact(adw_id, ARTIFACT_PLAN, plan_file, logger)
+    return plan_file
+
+
 @app.get("/api/adws/{adw_id}/plan")
 async def get_adw_plan(adw_id: str):
     """Get plan file content for a specific ADW ID.
@@ -2977,104 +3318,13 @@ async def get_adw_plan(adw_id: str):
     try:
         logger.info(f"Fetching plan for ADW ID: {adw_id}")
 
-        # Get current file path to determine if we're in a worktree
-        current_file = Path(__file__).resolve()
-        current_root = current_file.parent.parent.parent
-
-        # Build list of directories to search
-        specs_directories = []
-
-        # Add main project specs directory
-        main_specs_dir = get_specs_directory()
-        specs_directories.append(main_specs_dir)
-
-        # If we're in a worktree, also check the worktree's local specs directory
-        path_parts = current_root.parts
-        if 'trees' in path_parts:
-            worktree_specs_dir = current_root / "specs"
-            if worktree_specs_dir.exists():
-                specs_directories.append(worktree_specs_dir)
-                logger.info(f"Also searching worktree specs directory: {worktree_specs_dir}")
-
-        # Check if there's a worktree for this specific ADW ID and search its specs
-        # This handles nested worktrees where plan files are created inside trees/{adw_id}/specs/
-        trees_index = path_parts.index('trees') if 'trees' in path_parts else None
-        if trees_index is not None:
-            main_project_root = Path(*path_parts[:trees_index])
-        else:
-            main_project_root = current_root
+        plan_file = _find_plan_file(adw_id)
 
-        # Search in trees/{adw_id}/specs/ directory
-        adw_worktree_specs = main_project_root / "trees" / adw_id / "specs"
-        if adw_worktree_specs.exists() and adw_worktree_specs not in specs_directories:
-            specs_directories.append(adw_worktree_specs)
-            logger.info(f"Also searching ADW worktree specs directory: {adw_worktree_specs}")
-
-        # Also search nested worktrees (trees/X/trees/{adw_id}/specs/)
-        trees_dir = main_project_root / "trees"
-        if trees_dir.exists():
-            for parent_worktree in trees_dir.iterdir():
-                if parent_worktree.is_dir():
-                    nested_adw_specs = parent_worktree / "trees" / adw_id / "specs"
-                    if nested_adw_specs.exists() and nested_adw_specs not in specs_directories:
-                        specs_directories.append(nested_adw_specs)
-                        logger.info(f"Also searching nested worktree specs directory: {nested_adw_specs}")
-
-        logger.info(f"Searching for plan files in {len(specs_directories)} directories")
-
-        # Search for plan files matching the pattern: issue-*-adw-{adw_id}-sdlc_planner-*.md
-        pattern = f"issue-*-adw-{adw_id}-sdlc_planner-*.md"
-        matching_files = []
-
-        for specs_dir in specs_directories:
-            if specs_dir.exists():
-                logger.info(f"Searching in: {specs_dir}")
-                files = list(specs_dir.glob(pattern))
-                matching_files.extend(files)
-                logger.info(f"Found {len(files)} files in {specs_dir}")
-
-        logger.info(f"Total files found matching pattern '{pattern}': {len(matching_files)}")
-
-        # If multiple files found, use the most recently modified one
-        plan_file = None
-        if matching_files:
-            # Sort by modification time (most recent first)
-            matching_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-            plan_file = matching_files[0]
-            if len(matching_files) > 1:
-                logger.warning(f"Multiple plan files found for ADW ID {adw_id}, using most recent: {plan_file.name}")
-            else:
-                logger.info(f"Found plan file: {plan_file.name}")
-
-        # Fallback: If no plan file found by ADW ID, try to find by checking ADW state
-        if not plan_file:
-            logger.info("No plan file found by ADW ID pattern, attempting fallback search")
-
-            # Try to get issue number from ADW state
-            agents_dir = get_agents_directory()
-            adw_dir = agents_dir / adw_id
-
-            if adw_dir.exists():
-                adw_state = read_adw_state(adw_dir)
-                if adw_state and 'issue_number' in adw_state:
-                    issue_number = adw_state['issue_number']
-                    logger.info(f"Found issue number {issue_number} from ADW state, searching for plan files")
-
-                    # Search by issue number pattern in main specs directory
-                    fallback_pattern = f"issue-{issue_number}-adw-*-sdlc_planner-*.md"
-                    fallback_files = list(main_specs_dir.glob(fallback_pattern))
-
-                    if fallback_files:
-                        # Sort by modification time and use most recent
-                        fallback_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-                        plan_file = fallback_files[0]
-                        logger.info(f"Found plan file via fallback search: {plan_file.name}")
-
-        # If still no plan file found, return 404
+        # If no plan file found, return 404
         if not plan_file:
             logger.error(f"No plan file found for ADW ID '{adw_id}'")
             # List available plan files for debugging
-            all_plan_files = list(main_specs_dir.glob("issue-*-sdlc_planner-*.md"))
+            all_plan_files = list(get_specs_directory().glob("issue-*-sdlc_planner-*.md"))
             if all_plan_files:
                 logger.info(f"Available plan files in specs directory: {[f.name for f in all_plan_files[:5]]}")
             return JSONResponse(
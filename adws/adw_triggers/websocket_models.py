@@ -41,7 +41,7 @@ class WorkflowTriggerRequest(BaseModel):
 class WorkflowTriggerResponse(BaseModel):
     """Response after triggering an ADW workflow."""
 
-    status: Literal["accepted", "error", "ignored"]
+    status: Literal["queued", "accepted", "error", "ignored"]  # queued: ack only, a final response follows
     adw_id: str  # ADW ID for the triggered workflow (generated or provided)
     workflow_name: str  # Name of the workflow that was triggered
     message: str  # Human-readable message about the trigger result
@@ -59,6 +59,7 @@ class WorkflowStatusUpdate(BaseModel):
     timestamp: str  # ISO timestamp of the update
     progress_percent: Optional[int] = None  # Optional progress percentage (0-100)
     current_step: Optional[str] = None  # Current step being executed
+    is_stuck: Optional[bool] = None  # Set when the liveness monitor flags the workflow
 
 
 class WebSocketError(BaseModel):
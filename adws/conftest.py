@@ -0,0 +1,29 @@
+"""Shared pytest configuration for the ADW test suites."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _no_comment_outbox(monkeypatch):
+    """Post comments synchronously (through mocked subprocess calls) instead of
+    queueing them in the project database and flushing them with gh at exit."""
+    monkeypatch.setenv("ADW_COMMENT_OUTBOX", "0")
+
+
+@pytest.fixture(autouse=True)
+def _no_heartbeats(monkeypatch):
+    """Keep workflow heartbeats out of the project database."""
+    monkeypatch.setenv("ADW_HEARTBEAT_INTERVAL_SECONDS", "0")
+
+
+@pytest.fixture(autouse=True)
+def _no_trigger_background_jobs(monkeypatch):
+    """Keep the trigger server's periodic jobs (artifact backfill, liveness
+    checks, activity retention) from touching the project database when a
+    test starts its app."""
+    for name in (
+        "ADW_ARTIFACT_BACKFILL_INTERVAL_SECONDS",
+        "ADW_LIVENESS_CHECK_SECONDS",
+        "ADW_ACTIVITY_RETENTION_INTERVAL_SECONDS",
+    ):
+        monkeypatch.setenv(name, "0")
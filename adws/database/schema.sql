@@ -5,6 +5,10 @@
 -- Enable foreign key constraints
 PRAGMA foreign_keys = ON;
 
+-- Let activity retention hand freed pages back with PRAGMA incremental_vacuum
+-- (only takes effect before the first table is created)
+PRAGMA auto_vacuum = INCREMENTAL;
+
 -- Schema migrations tracking table
 CREATE TABLE IF NOT EXISTS schema_migrations (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -55,12 +59,23 @@ CREATE TABLE IF NOT EXISTS adw_states (
 -- Indexes for adw_states
 CREATE INDEX IF NOT EXISTS idx_adw_states_adw_id ON adw_states(adw_id);
 CREATE INDEX IF NOT EXISTS idx_adw_states_issue_number ON adw_states(issue_number);
-CREATE INDEX IF NOT EXISTS idx_adw_states_status ON adw_states(status);
-CREATE INDEX IF NOT EXISTS idx_adw_states_current_stage ON adw_states(current_stage);
-CREATE INDEX IF NOT EXISTS idx_adw_states_is_stuck ON adw_states(is_stuck);
 CREATE INDEX IF NOT EXISTS idx_adw_states_created_at ON adw_states(created_at);
 CREATE INDEX IF NOT EXISTS idx_adw_states_updated_at ON adw_states(updated_at);
-CREATE INDEX IF NOT EXISTS idx_adw_states_deleted_at ON adw_states(deleted_at);
+-- Running ADWs only, for the liveness monitor's frequent checks
+CREATE INDEX IF NOT EXISTS idx_adw_states_in_progress ON adw_states(is_stuck)
+    WHERE status = 'in_progress' AND deleted_at IS NULL;
+-- Kanban board listings (non-deleted ADWs, newest first, optionally filtered);
+-- each index serves both the filter and the ORDER BY, so no sort is needed
+CREATE INDEX IF NOT EXISTS idx_adw_states_active_created ON adw_states(created_at DESC)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_adw_states_active_updated ON adw_states(updated_at DESC)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_adw_states_active_status ON adw_states(status, created_at)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_adw_states_active_stage ON adw_states(current_stage, created_at)
+    WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_adw_states_stuck ON adw_states(created_at DESC)
+    WHERE is_stuck = 1 AND deleted_at IS NULL;
 
 -- ADW Activity Logs table - Complete audit trail of state changes
 CREATE TABLE IF NOT EXISTS adw_activity_logs (
@@ -91,10 +106,23 @@ CREATE TABLE IF NOT EXISTS adw_activity_logs (
 );
 
 -- Indexes for adw_activity_logs
-CREATE INDEX IF NOT EXISTS idx_activity_logs_adw_id ON adw_activity_logs(adw_id);
+-- (adw_id, timestamp, id) serves per-ADW lookups and ordered history pages
+CREATE INDEX IF NOT EXISTS idx_activity_logs_adw_id_timestamp ON adw_activity_logs(adw_id, timestamp DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_activity_logs_event_type ON adw_activity_logs(event_type);
 CREATE INDEX IF NOT EXISTS idx_activity_logs_timestamp ON adw_activity_logs(timestamp);
 
+-- ADW Activity Daily table - Per-ADW daily event counts for activity rolled
+-- out of adw_activity_logs by adws/adw_modules/activity_retention.py
+CREATE TABLE IF NOT EXISTS adw_activity_daily (
+    adw_id TEXT NOT NULL,
+    day TEXT NOT NULL,  -- YYYY-MM-DD (UTC)
+    event_type TEXT NOT NULL,
+    event_count INTEGER NOT NULL,
+    first_at TIMESTAMP NOT NULL,
+    last_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (adw_id, day, event_type)
+);
+
 -- Issue Tracker table - Sequential issue number allocation
 CREATE TABLE IF NOT EXISTS issue_tracker (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -114,6 +142,155 @@ CREATE INDEX IF NOT EXISTS idx_issue_tracker_issue_number ON issue_tracker(issue
 CREATE INDEX IF NOT EXISTS idx_issue_tracker_adw_id ON issue_tracker(adw_id);
 CREATE INDEX IF NOT EXISTS idx_issue_tracker_deleted_at ON issue_tracker(deleted_at);
 
+-- Issue Counters table - Sequence used to allocate issue numbers atomically
+-- (bumped under BEGIN IMMEDIATE instead of SELECT MAX + INSERT)
+CREATE TABLE IF NOT EXISTS issue_counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO issue_counters (name, value) VALUES ('issue_number', 0);
+
+-- GitHub Poll Watermarks table - Last issue updatedAt seen by the cron trigger per repo
+CREATE TABLE IF NOT EXISTS github_poll_watermarks (
+    repo_path TEXT PRIMARY KEY,  -- owner/repo
+    updated_at TEXT NOT NULL,  -- ISO 8601 UTC issue updatedAt watermark
+    polled_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- GitHub Issue Poll State table - Per-issue cron trigger bookkeeping (survives restarts)
+CREATE TABLE IF NOT EXISTS github_issue_poll_state (
+    repo_path TEXT NOT NULL,
+    issue_number INTEGER NOT NULL,
+    last_comment_id TEXT,  -- Latest comment already acted on
+    processed_at TIMESTAMP,  -- When a workflow was triggered for this issue
+
+    PRIMARY KEY (repo_path, issue_number)
+);
+
+-- GitHub Comment Outbox table - Issue comments queued for the background sender
+CREATE TABLE IF NOT EXISTS github_comment_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    repo_path TEXT NOT NULL,  -- owner/repo
+    issue_id TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'sending', 'sent', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,  -- Unix time of the next retry
+    claim_token TEXT,  -- Sender batch currently posting this row
+    claimed_at REAL,  -- Unix time of the claim (lease for crashed senders)
+    last_error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    sent_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_github_comment_outbox_status ON github_comment_outbox(status, next_attempt_at);
+
+-- KPI tables - Per-stage agentic KPIs aggregated incrementally by adw_modules/kpi_engine.py
+CREATE TABLE IF NOT EXISTS adw_kpi_stage_metrics (
+    adw_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    entries INTEGER NOT NULL DEFAULT 0,  -- Times the ADW entered this stage (stage transitions)
+    time_in_stage_seconds REAL NOT NULL DEFAULT 0,  -- Summed from stage transitions
+    errors INTEGER NOT NULL DEFAULT 0,  -- error_occurred / workflow_failed events while in this stage
+    attempts INTEGER NOT NULL DEFAULT 0,  -- Orchestrator attempts
+    stage_status TEXT,  -- Orchestrator stage status
+    started_at TEXT,
+    completed_at TEXT,
+    duration_seconds REAL,  -- Orchestrator completed_at - started_at
+    agent_runs INTEGER NOT NULL DEFAULT 0,  -- Agent sessions (raw_output.jsonl result messages)
+    num_turns INTEGER NOT NULL DEFAULT 0,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    cache_creation_tokens INTEGER NOT NULL DEFAULT 0,
+    cache_read_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (adw_id, stage)
+);
+
+-- Activity log cursor per ADW (last row consumed and the stage being timed)
+CREATE TABLE IF NOT EXISTS adw_kpi_cursors (
+    adw_id TEXT PRIMARY KEY,
+    last_activity_id INTEGER NOT NULL DEFAULT 0,
+    current_stage TEXT,
+    stage_entered_at TEXT,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Read position in each agent's raw_output.jsonl
+CREATE TABLE IF NOT EXISTS adw_kpi_usage_offsets (
+    adw_id TEXT NOT NULL,
+    agent_name TEXT NOT NULL,
+    head_digest TEXT,  -- sha256 of the first line, to detect a rewritten file
+    byte_offset INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (adw_id, agent_name)
+);
+
+-- WebSocket Event Log - Broadcast events evicted from the in-memory ring, for client resume
+CREATE TABLE IF NOT EXISTS websocket_event_log (
+    source TEXT NOT NULL,  -- server, trigger
+    epoch TEXT NOT NULL,  -- Per-process log identifier
+    seq INTEGER NOT NULL,
+    event TEXT NOT NULL,  -- JSON event as broadcast
+    PRIMARY KEY (source, epoch, seq)
+);
+
+-- ADW Artifacts table - Index of plans, specs and screenshots produced by ADWs
+CREATE TABLE IF NOT EXISTS adw_artifacts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    adw_id TEXT NOT NULL,
+    artifact_type TEXT NOT NULL,  -- plan, patch, spec, screenshot
+    path TEXT NOT NULL,  -- Absolute path
+    size_bytes INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    content_hash TEXT NOT NULL,  -- SHA-256 of the file
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (adw_id, path)
+);
+
+CREATE INDEX IF NOT EXISTS idx_adw_artifacts_lookup ON adw_artifacts(adw_id, artifact_type, mtime DESC);
+
+-- ADW Merge Queue table - Branches waiting to be merged into main
+CREATE TABLE IF NOT EXISTS adw_merge_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    adw_id TEXT NOT NULL,
+    branch_name TEXT NOT NULL,
+    merge_method TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',  -- queued, merging, merged, failed, conflict
+    attempts INTEGER NOT NULL DEFAULT 0,
+    batch_id TEXT,  -- Validation batch the entry was last merged in
+    merged_commit TEXT,
+    error TEXT,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_adw_merge_queue_status ON adw_merge_queue(status, id);
+
+-- ADW JSON Imports table - adw_state.json mtimes seen by migrate_json_to_db.py
+CREATE TABLE IF NOT EXISTS adw_json_imports (
+    adw_id TEXT PRIMARY KEY,  -- agents/ directory name
+    source_mtime REAL,  -- mtime of adw_state.json when last imported
+    imported_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ADW Heartbeats table - Workflow processes and their liveness
+CREATE TABLE IF NOT EXISTS adw_heartbeats (
+    adw_id TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    role TEXT NOT NULL DEFAULT 'workflow' CHECK (role IN ('launcher', 'workflow')),  -- launcher: spawned by the trigger server
+    workflow_name TEXT,
+    started_at REAL NOT NULL,
+    process_start INTEGER,  -- Kernel start time of pid (/proc/<pid>/stat), tells a reused PID apart
+    last_heartbeat REAL NOT NULL,
+    exited_at REAL,  -- Clean exit, or when the monitor found the process gone
+    exit_code INTEGER,  -- Known only for launchers reaped by the trigger server
+    PRIMARY KEY (adw_id, pid)
+);
+
 -- ADW Deletions table - Audit trail for deleted ADWs
 CREATE TABLE IF NOT EXISTS adw_deletions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -133,9 +310,12 @@ CREATE INDEX IF NOT EXISTS idx_deletions_adw_id ON adw_deletions(adw_id);
 CREATE INDEX IF NOT EXISTS idx_deletions_deleted_at ON adw_deletions(deleted_at);
 
 -- Trigger to update updated_at timestamp on adw_states
+-- Writers set updated_at = CURRENT_TIMESTAMP themselves; this only fires for
+-- updates that didn't, so normal saves write the row once
 CREATE TRIGGER IF NOT EXISTS trg_adw_states_updated_at
 AFTER UPDATE ON adw_states
 FOR EACH ROW
+WHEN NEW.updated_at IS NOT CURRENT_TIMESTAMP
 BEGIN
     UPDATE adw_states SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
 END;
@@ -4,6 +4,7 @@ Review Configuration Schema - Pydantic models for review stage configuration.
 Supports:
 - Per-tool configuration (enable/disable, severity thresholds, custom rules)
 - Mode selection (ui, code, security, docs, comprehensive)
+- Scan scope (only files changed on the ADW branch, or the full worktree)
 - Failure thresholds (fail on blockers, max issues)
 - UI validation settings
 - AI review settings
@@ -87,6 +88,7 @@ class ReviewConfig:
 
     This configuration controls how the review stage behaves:
     - Which modes to run (ui, code, security, docs, or comprehensive)
+    - Which files the tools scan (changed files only, or the full worktree)
     - Tool-specific settings (Bearer, Semgrep, ESLint, Ruff)
     - Failure conditions (when to fail the review)
     - UI validation settings
@@ -100,6 +102,11 @@ class ReviewConfig:
     # Mode selection
     modes: list[str] = field(default_factory=lambda: ["comprehensive"])
 
+    # Scan scope - "changed" limits tools to files changed since the merge
+    # base with base_branch, "full" scans the whole worktree
+    scope: Literal["changed", "full"] = "changed"
+    base_branch: str = "main"
+
     # Tool configurations
     tools: dict[str, ReviewToolConfig] = field(default_factory=lambda: {
         "bearer": ReviewToolConfig(enabled=True),
@@ -130,6 +137,8 @@ class ReviewConfig:
             "skip_review": self.skip_review,
             "skip_on_no_changes": self.skip_on_no_changes,
             "modes": self.modes,
+            "scope": self.scope,
+            "base_branch": self.base_branch,
             "tools": {k: v.to_dict() for k, v in self.tools.items()},
             "fail_on_critical": self.fail_on_critical,
             "fail_on_high": self.fail_on_high,
@@ -154,6 +163,10 @@ class ReviewConfig:
             config.skip_on_no_changes = data["skip_on_no_changes"]
         if "modes" in data:
             config.modes = data["modes"]
+        if "scope" in data:
+            config.scope = data["scope"]
+        if "base_branch" in data:
+            config.base_branch = data["base_branch"]
         if "fail_on_critical" in data:
             config.fail_on_critical = data["fail_on_critical"]
         if "fail_on_high" in data:
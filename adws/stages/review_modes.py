@@ -73,6 +73,8 @@ class ReviewModeResult:
     duration_ms: int = 0
     error: str | None = None
     raw_output: str | None = None
+    scope: str = "full"  # "full" (whole worktree) or "changed" (diff-scoped)
+    files_scanned: int | None = None  # Number of files passed in diff-scoped runs
 
     @property
     def finding_counts(self) -> dict[str, int]:
@@ -95,6 +97,8 @@ class ReviewModeResult:
             "tool": self.tool_name,
             "findings": [f.to_dict() for f in self.findings],
             "duration_ms": self.duration_ms,
+            "scope": self.scope,
+            "files_scanned": self.files_scanned,
             "error": self.error,
             "summary": self.finding_counts,
             "has_blockers": self.has_blockers,
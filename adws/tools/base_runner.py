@@ -1,9 +1,13 @@
 """Base Tool Runner - Abstract base class for review tool runners."""
 
 import asyncio
+import io
+import os
 import shutil
+import tempfile
 import time
 from abc import ABC, abstractmethod
+from typing import BinaryIO, Callable, Iterator, TextIO
 
 from stages.review_modes import (
     ReviewMode,
@@ -12,6 +16,7 @@ from stages.review_modes import (
     IssueSeverity,
 )
 from schemas.review_config import ReviewToolConfig
+from tools.changed_files import ChangedFiles
 
 
 class BaseToolRunner(ABC):
@@ -22,8 +27,24 @@ class BaseToolRunner(ABC):
     - Checking if the tool is available
     - Running the tool and capturing output
     - Parsing output into ReviewFinding objects
+
+    Tool output is spilled to a temp file and parsed from there; runners with
+    large JSON reports override ``iter_findings`` to stream findings instead
+    of loading the whole report.
+
+    Runners can be scoped to a list of changed files instead of the whole
+    worktree; ``file_extensions`` declares which files a tool understands.
     """
 
+    # File extensions this tool scans (None = any file)
+    file_extensions: tuple[str, ...] | None = None
+
+    # Bytes of stderr kept for error messages
+    STDERR_TAIL_BYTES = 8 * 1024
+
+    # Characters of stdout kept in ReviewModeResult.raw_output
+    RAW_OUTPUT_PREVIEW_CHARS = 10000
+
     def __init__(self, config: ReviewToolConfig | None = None):
         self.config = config or ReviewToolConfig()
 
@@ -51,17 +72,23 @@ class BaseToolRunner(ABC):
         return shutil.which(cmd) is not None
 
     @abstractmethod
-    def build_command(self, worktree_path: str) -> list[str]:
+    def build_command(self, worktree_path: str, files: list[str] | None = None) -> list[str]:
         """Build the command to run the tool.
 
         Args:
             worktree_path: Path to the worktree to scan
+            files: Optional list of files (relative to the worktree) to scan
+                instead of the whole worktree
 
         Returns:
             List of command arguments
         """
         ...
 
+    def build_env(self, changed_files: ChangedFiles | None = None) -> dict[str, str]:
+        """Extra environment variables for the tool process (none by default)."""
+        return {}
+
     @abstractmethod
     def parse_output(self, raw_output: str) -> list[ReviewFinding]:
         """Parse the raw tool output into findings.
@@ -74,16 +101,36 @@ class BaseToolRunner(ABC):
         """
         ...
 
-    async def execute(self, worktree_path: str) -> ReviewModeResult:
+    def iter_findings(self, output: TextIO) -> Iterator[ReviewFinding]:
+        """Yield findings from the tool's output file.
+
+        The default reads the whole output and delegates to ``parse_output``.
+        Streaming implementations should raise ValueError if the output is
+        not in the expected shape, so the caller can fall back to
+        ``parse_output``.
+
+        Args:
+            output: Text stream positioned at the start of the tool output
+        """
+        yield from self.parse_output(output.read())
+
+    async def execute(
+        self,
+        worktree_path: str,
+        changed_files: ChangedFiles | None = None,
+    ) -> ReviewModeResult:
         """Execute the tool and return results.
 
         Args:
             worktree_path: Path to the worktree to scan
+            changed_files: If given, only scan these files (diff-scoped review).
+                None means a full scan of the worktree.
 
         Returns:
             ReviewModeResult with findings
         """
         start_time = time.time()
+        scope = "changed" if changed_files is not None else "full"
 
         # Check if tool is available
         if not self.is_available():
@@ -93,54 +140,83 @@ class BaseToolRunner(ABC):
                 tool_name=self.tool_name,
                 error=f"{self.tool_name} is not installed or not in PATH",
                 duration_ms=0,
+                scope=scope,
             )
 
+        files = None
+        if changed_files is not None:
+            files = changed_files.select(self.file_extensions, self.config.exclude_paths)
+            if not files:
+                # Nothing this tool understands was touched - skip the run
+                return ReviewModeResult(
+                    mode=self.mode,
+                    success=True,
+                    tool_name=self.tool_name,
+                    duration_ms=int((time.time() - start_time) * 1000),
+                    scope=scope,
+                    files_scanned=0,
+                )
+
         # Build and run command
+        process = None
+        stderr_tail = bytearray()
         try:
-            cmd = self.build_command(worktree_path)
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=worktree_path,
-            )
-
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=self.config.timeout_seconds,
-            )
-
-            raw_output = stdout.decode("utf-8", errors="replace")
-            stderr.decode("utf-8", errors="replace")
-
-            # Some tools output results even with non-zero exit codes
-            # (e.g., ESLint exits 1 when there are lint errors)
-            findings = self.parse_output(raw_output)
+            cmd = self.build_command(worktree_path, files)
+            extra_env = self.build_env(changed_files)
+
+            # stdout is spilled to a temp file rather than buffered in memory;
+            # stderr is only kept as a bounded tail for error messages
+            with tempfile.TemporaryFile() as stdout_file:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=stdout_file,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=worktree_path,
+                    env={**os.environ, **extra_env} if extra_env else None,
+                )
+
+                await asyncio.wait_for(
+                    asyncio.gather(
+                        process.wait(),
+                        self._read_tail(process.stderr, stderr_tail),
+                    ),
+                    timeout=self.config.timeout_seconds,
+                )
+
+                # Some tools output results even with non-zero exit codes
+                # (e.g., ESLint exits 1 when there are lint errors).
+                # Parsing a large report is CPU-bound, keep it off the loop.
+                findings, raw_output = await asyncio.to_thread(
+                    self._collect_findings, stdout_file, files, worktree_path
+                )
 
             duration_ms = int((time.time() - start_time) * 1000)
 
-            # Filter by severity threshold
-            findings = self._filter_by_severity(findings)
-
-            # Filter by exclude paths
-            findings = self._filter_by_paths(findings)
-
             return ReviewModeResult(
                 mode=self.mode,
                 success=True,
                 tool_name=self.tool_name,
                 findings=findings,
                 duration_ms=duration_ms,
-                raw_output=raw_output if len(raw_output) < 10000 else raw_output[:10000] + "...",
+                raw_output=raw_output,
+                scope=scope,
+                files_scanned=len(files) if files is not None else None,
             )
 
         except asyncio.TimeoutError:
+            if process is not None and process.returncode is None:
+                process.kill()
+                await process.wait()
+            error = f"{self.tool_name} timed out after {self.config.timeout_seconds}s"
+            if stderr_tail:
+                error += f": {self._decode_tail(stderr_tail)}"
             return ReviewModeResult(
                 mode=self.mode,
                 success=False,
                 tool_name=self.tool_name,
-                error=f"{self.tool_name} timed out after {self.config.timeout_seconds}s",
+                error=error,
                 duration_ms=int((time.time() - start_time) * 1000),
+                scope=scope,
             )
         except Exception as e:
             return ReviewModeResult(
@@ -149,37 +225,120 @@ class BaseToolRunner(ABC):
                 tool_name=self.tool_name,
                 error=str(e),
                 duration_ms=int((time.time() - start_time) * 1000),
+                scope=scope,
             )
 
-    def _filter_by_severity(self, findings: list[ReviewFinding]) -> list[ReviewFinding]:
-        """Filter findings by severity threshold."""
+    def _collect_findings(
+        self,
+        stdout_file: BinaryIO,
+        files: list[str] | None,
+        worktree_path: str,
+    ) -> tuple[list[ReviewFinding], str]:
+        """Parse the spilled stdout, filtering findings as they are produced.
+
+        Returns:
+            Tuple of (kept findings, raw output preview)
+        """
+        stdout_file.seek(0)
+        text = io.TextIOWrapper(stdout_file, encoding="utf-8", errors="replace")
+        try:
+            preview = text.read(self.RAW_OUTPUT_PREVIEW_CHARS + 1)
+            if len(preview) > self.RAW_OUTPUT_PREVIEW_CHARS:
+                preview = preview[:self.RAW_OUTPUT_PREVIEW_CHARS] + "..."
+
+            in_files = self._in_files(files, worktree_path) if files is not None else None
+
+            def keep(finding: ReviewFinding) -> bool:
+                if not self._meets_severity(finding) or self._is_excluded(finding):
+                    return False
+                # Tools that scan a directory even in diff mode may report
+                # findings outside the changed set
+                return in_files is None or in_files(finding)
+
+            text.seek(0)
+            try:
+                findings = [f for f in self.iter_findings(text) if keep(f)]
+            except ValueError:
+                # Not streamable (e.g. text before the JSON) - use the full parser
+                text.seek(0)
+                findings = [f for f in self.parse_output(text.read()) if keep(f)]
+
+            return findings, preview
+        finally:
+            text.detach()
+
+    @classmethod
+    async def _read_tail(cls, stream: asyncio.StreamReader, tail: bytearray) -> None:
+        """Drain a stream, keeping only the last STDERR_TAIL_BYTES bytes."""
+        while True:
+            chunk = await stream.read(64 * 1024)
+            if not chunk:
+                return
+            tail += chunk
+            if len(tail) > cls.STDERR_TAIL_BYTES:
+                del tail[:-cls.STDERR_TAIL_BYTES]
+
+    @staticmethod
+    def _decode_tail(tail: bytearray) -> str:
+        return bytes(tail).decode("utf-8", errors="replace").strip()
+
+    def _meets_severity(self, finding: ReviewFinding) -> bool:
+        """Check a finding against the severity threshold."""
         severity_order = ["critical", "high", "medium", "low", "info"]
         threshold = self.config.severity_threshold
 
         if threshold not in severity_order:
             threshold = "info"  # Include all by default
 
-        threshold_idx = severity_order.index(threshold)
+        return severity_order.index(finding.severity.value) <= severity_order.index(threshold)
+
+    def _is_excluded(self, finding: ReviewFinding) -> bool:
+        """Check whether a finding comes from an excluded path."""
+        if not self.config.exclude_paths or not finding.file_path:
+            return False
+        return any(pattern in finding.file_path for pattern in self.config.exclude_paths)
 
-        return [
-            f for f in findings
-            if severity_order.index(f.severity.value) <= threshold_idx
-        ]
+    def _filter_by_severity(self, findings: list[ReviewFinding]) -> list[ReviewFinding]:
+        """Filter findings by severity threshold."""
+        return [f for f in findings if self._meets_severity(f)]
 
     def _filter_by_paths(self, findings: list[ReviewFinding]) -> list[ReviewFinding]:
         """Filter out findings from excluded paths."""
-        if not self.config.exclude_paths:
-            return findings
-
-        def is_excluded(file_path: str | None) -> bool:
-            if not file_path:
-                return False
-            for pattern in self.config.exclude_paths:
-                if pattern in file_path:
-                    return True
-            return False
+        return [f for f in findings if not self._is_excluded(f)]
+
+    @staticmethod
+    def _in_files(files: list[str], worktree_path: str) -> Callable[[ReviewFinding], bool]:
+        """Build a predicate that keeps only findings located in the given files.
 
-        return [f for f in findings if not is_excluded(f.file_path)]
+        Tools report paths either relative to the worktree or absolute, so both
+        forms are matched. Findings without a file path are kept.
+        """
+        root = os.path.abspath(worktree_path)
+        allowed = set()
+        for path in files:
+            allowed.add(os.path.normpath(path))
+            allowed.add(os.path.join(root, os.path.normpath(path)))
+
+        def in_scope(finding: ReviewFinding) -> bool:
+            if not finding.file_path:
+                return True
+            normalized = os.path.normpath(finding.file_path)
+            if normalized in allowed:
+                return True
+            return os.path.normpath(os.path.join(root, normalized)) in allowed
+
+        return in_scope
+
+    @classmethod
+    def _filter_by_files(
+        cls,
+        findings: list[ReviewFinding],
+        files: list[str],
+        worktree_path: str,
+    ) -> list[ReviewFinding]:
+        """Keep only findings located in the given files."""
+        in_scope = cls._in_files(files, worktree_path)
+        return [f for f in findings if in_scope(f)]
 
     @staticmethod
     def map_severity(severity_str: str) -> IssueSeverity:
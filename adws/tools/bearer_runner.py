@@ -10,10 +10,16 @@ Installation:
 
 Usage:
     bearer scan . --format json
+
+Bearer only accepts a single target directory, so diff-scoped reviews use its
+differential scan (``--diff`` with ``DIFF_BASE_COMMIT``) instead of a file list.
 """
 
 import json
+from typing import Iterator, TextIO
 from tools.base_runner import BaseToolRunner
+from tools.json_stream import iter_json_items
+from tools.changed_files import ChangedFiles
 from stages.review_modes import ReviewMode, ReviewFinding
 from schemas.review_config import ReviewToolConfig
 
@@ -36,7 +42,7 @@ class BearerRunner(BaseToolRunner):
     def command(self) -> str:
         return "bearer"
 
-    def build_command(self, worktree_path: str) -> list[str]:
+    def build_command(self, worktree_path: str, files: list[str] | None = None) -> list[str]:
         """Build Bearer scan command."""
         cmd = [
             "bearer",
@@ -46,6 +52,10 @@ class BearerRunner(BaseToolRunner):
             "--quiet",  # Reduce noise in output
         ]
 
+        # Differential scan - only report findings introduced since the base
+        if files:
+            cmd.append("--diff")
+
         # Add custom rules if configured
         if self.config.custom_rules:
             for rule in self.config.custom_rules:
@@ -53,6 +63,15 @@ class BearerRunner(BaseToolRunner):
 
         return cmd
 
+    def build_env(self, changed_files: ChangedFiles | None = None) -> dict[str, str]:
+        """Point Bearer's differential scan at the merge base."""
+        if changed_files is None:
+            return {}
+        return {
+            "DIFF_BASE_BRANCH": changed_files.base_branch,
+            "DIFF_BASE_COMMIT": changed_files.merge_base,
+        }
+
     def parse_output(self, raw_output: str) -> list[ReviewFinding]:
         """Parse Bearer JSON output into findings."""
         findings = []
@@ -89,6 +108,17 @@ class BearerRunner(BaseToolRunner):
 
         return findings
 
+    def iter_findings(self, output: TextIO) -> Iterator[ReviewFinding]:
+        """Stream findings from the Bearer report's findings/severity arrays."""
+        keys = ("findings", "critical", "high", "medium", "low", "warning")
+        for key, finding_data in iter_json_items(output, keys):
+            if key == "findings":
+                finding = self._parse_finding(finding_data)
+            else:
+                finding = self._parse_finding(finding_data, key)
+            if finding:
+                yield finding
+
     def _parse_finding(
         self,
         finding_data: dict,
@@ -0,0 +1,118 @@
+"""Changed Files - Compute the set of files an ADW branch touched.
+
+Review tools normally scan the whole worktree. For diff-scoped reviews the
+orchestrator computes the changed file list once (against the merge base with
+the base branch) and hands it to every runner, so each tool only looks at the
+files the ADW actually modified.
+"""
+
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class ChangedFiles:
+    """Files changed on a branch relative to its merge base."""
+
+    base_branch: str
+    merge_base: str
+    files: list[str] = field(default_factory=list)  # Relative to worktree root
+
+    def select(
+        self,
+        extensions: tuple[str, ...] | None = None,
+        exclude_paths: list[str] | None = None,
+    ) -> list[str]:
+        """Return the subset of changed files a tool should scan.
+
+        Args:
+            extensions: File extensions the tool understands (None = all files)
+            exclude_paths: Substring patterns to drop (same semantics as
+                ReviewToolConfig.exclude_paths)
+
+        Returns:
+            Filtered list of relative file paths
+        """
+        selected = []
+        for path in self.files:
+            if extensions and not path.endswith(extensions):
+                continue
+            if exclude_paths and any(pattern in path for pattern in exclude_paths):
+                continue
+            selected.append(path)
+        return selected
+
+
+def _run_git(args: list[str], cwd: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        ["git", *args],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+    )
+
+
+def find_merge_base(worktree_path: str, base_branch: str = "main") -> str | None:
+    """Find the merge base between HEAD and the base branch.
+
+    Tries the local branch first, then the ``origin/`` remote-tracking branch
+    (worktrees created from ``origin/main`` may not have a local ``main``).
+
+    Returns:
+        Merge base commit SHA, or None if it cannot be determined
+    """
+    for ref in (base_branch, f"origin/{base_branch}"):
+        result = _run_git(["merge-base", "HEAD", ref], worktree_path)
+        if result.returncode == 0 and result.stdout.strip():
+            return result.stdout.strip()
+    return None
+
+
+def get_changed_files(worktree_path: str, base_branch: str = "main") -> ChangedFiles | None:
+    """Compute files changed on the current branch since it forked from base.
+
+    Includes committed changes since the merge base, uncommitted working tree
+    changes and untracked (non-ignored) files. Deleted files are excluded since
+    there is nothing left to scan.
+
+    Args:
+        worktree_path: Path to the worktree
+        base_branch: Branch the ADW branch was created from
+
+    Returns:
+        ChangedFiles, or None if the diff could not be computed (callers
+        should fall back to a full scan)
+    """
+    merge_base = find_merge_base(worktree_path, base_branch)
+    if not merge_base:
+        return None
+
+    diff = _run_git(
+        ["diff", "--name-only", "--diff-filter=ACMR", "-z", merge_base],
+        worktree_path,
+    )
+    if diff.returncode != 0:
+        return None
+
+    untracked = _run_git(
+        ["ls-files", "--others", "--exclude-standard", "-z"],
+        worktree_path,
+    )
+
+    files = [p for p in diff.stdout.split("\0") if p]
+    if untracked.returncode == 0:
+        files.extend(p for p in untracked.stdout.split("\0") if p)
+
+    # De-duplicate while keeping order, and drop anything no longer on disk
+    root = Path(worktree_path)
+    seen = set()
+    existing = []
+    for path in files:
+        if path in seen:
+            continue
+        seen.add(path)
+        if (root / path).is_file():
+            existing.append(path)
+
+    return ChangedFiles(base_branch=base_branch, merge_base=merge_base, files=existing)
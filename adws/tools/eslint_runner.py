@@ -15,7 +15,9 @@ Usage:
 
 import json
 import shutil
+from typing import Iterator, TextIO
 from tools.base_runner import BaseToolRunner
+from tools.json_stream import iter_json_items
 from stages.review_modes import ReviewMode, ReviewFinding, IssueSeverity
 from schemas.review_config import ReviewToolConfig
 
@@ -23,6 +25,8 @@ from schemas.review_config import ReviewToolConfig
 class ESLintRunner(BaseToolRunner):
     """Runner for ESLint JavaScript/TypeScript linter."""
 
+    file_extensions = (".js", ".jsx", ".ts", ".tsx", ".vue", ".mjs", ".cjs")
+
     def __init__(self, config: ReviewToolConfig | None = None):
         super().__init__(config)
 
@@ -42,18 +46,18 @@ class ESLintRunner(BaseToolRunner):
         """Check if npx and eslint are available."""
         return shutil.which("npx") is not None
 
-    def build_command(self, worktree_path: str) -> list[str]:
+    def build_command(self, worktree_path: str, files: list[str] | None = None) -> list[str]:
         """Build ESLint command."""
         cmd = [
             "npx",
             "eslint",
-            worktree_path,
+            *(files or [worktree_path]),
             "--format", "json",
             "--no-error-on-unmatched-pattern",  # Don't fail if no JS/TS files
         ]
 
         # Add extensions to check
-        cmd.extend(["--ext", ".js,.jsx,.ts,.tsx,.vue,.mjs,.cjs"])
+        cmd.extend(["--ext", ",".join(self.file_extensions)])
 
         # Add default ignore patterns
         default_ignores = [
@@ -102,6 +106,15 @@ class ESLintRunner(BaseToolRunner):
 
         return findings
 
+    def iter_findings(self, output: TextIO) -> Iterator[ReviewFinding]:
+        """Stream findings one file result at a time from ESLint's JSON array."""
+        for _, file_result in iter_json_items(output):
+            file_path = file_result.get("filePath")
+            for message in file_result.get("messages", []):
+                finding = self._parse_message(message, file_path)
+                if finding:
+                    yield finding
+
     def _parse_message(self, message: dict, file_path: str) -> ReviewFinding | None:
         """Parse a single ESLint message."""
         if not message:
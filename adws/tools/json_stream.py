@@ -0,0 +1,142 @@
+"""JSON Stream - Incremental parsing of large tool JSON reports.
+
+Semgrep and ESLint reports on big repositories can be hundreds of MB. These
+helpers decode the items of the report's findings array one at a time from a
+file, so runners can turn each item into a ReviewFinding (and drop it if it is
+filtered out) without ever holding the whole payload in memory.
+
+Only the array being streamed is decoded item by item; other members of a
+top-level object are decoded and discarded.
+"""
+
+import json
+from typing import Any, Iterator, TextIO
+
+_WHITESPACE = " \t\n\r"
+_DECODER = json.JSONDecoder()
+
+
+class _StreamReader:
+    """Buffered reader that decodes one JSON value at a time."""
+
+    def __init__(self, fp: TextIO, chunk_size: int = 64 * 1024):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, min_size: int) -> bool:
+        """Read at least min_size more characters. Returns False at EOF."""
+        if self.eof:
+            return False
+        # Drop consumed prefix so the buffer only holds unparsed data
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        chunk = self.fp.read(max(self.chunk_size, min_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill(self.chunk_size):
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume the given structural character."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        want = self.chunk_size
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Value is split across reads - grow geometrically so huge
+                # values don't cost quadratic re-parsing
+                if not self._fill(want):
+                    raise
+                want *= 2
+                continue
+            # A scalar touching the end of the buffer may be truncated ("12" of "123")
+            if end == len(self.buf) and not self.eof and self._fill(self.chunk_size):
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_array(reader: _StreamReader) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.decode()
+        sep = reader.peek()
+        reader.pos += 1
+        if sep == "]":
+            return
+        if sep != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, found {sep!r}")
+
+
+def iter_json_items(
+    fp: TextIO,
+    keys: tuple[str, ...] | None = None,
+    chunk_size: int = 64 * 1024,
+) -> Iterator[tuple[str | None, Any]]:
+    """Stream items out of a JSON report.
+
+    Args:
+        fp: Text file positioned at the start of the report
+        keys: None if the report is a top-level array; otherwise the
+            top-level object keys whose array values should be streamed
+        chunk_size: Characters read from the file per refill
+
+    Yields:
+        (key, item) tuples - key is None for top-level arrays
+
+    Raises:
+        ValueError: If the stream is not valid JSON of the expected shape
+            (json.JSONDecodeError is a ValueError subclass)
+    """
+    reader = _StreamReader(fp, chunk_size)
+
+    if keys is None:
+        for item in _iter_array(reader):
+            yield None, item
+        return
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.decode()
+        if not isinstance(key, str):
+            raise ValueError("Expected string key in JSON object")
+        reader.expect(":")
+        if key in keys and reader.peek() == "[":
+            for item in _iter_array(reader):
+                yield key, item
+        else:
+            reader.decode()  # Skip members we don't stream
+        sep = reader.peek()
+        reader.pos += 1
+        if sep == "}":
+            return
+        if sep != ",":
+            raise ValueError(f"Expected ',' or '}}' in JSON object, found {sep!r}")
@@ -15,7 +15,9 @@ Usage:
 """
 
 import json
+from typing import Iterator, TextIO
 from tools.base_runner import BaseToolRunner
+from tools.json_stream import iter_json_items
 from stages.review_modes import ReviewMode, ReviewFinding, IssueSeverity
 from schemas.review_config import ReviewToolConfig
 
@@ -23,6 +25,8 @@ from schemas.review_config import ReviewToolConfig
 class RuffRunner(BaseToolRunner):
     """Runner for Ruff Python linter."""
 
+    file_extensions = (".py", ".pyi")
+
     def __init__(self, config: ReviewToolConfig | None = None):
         super().__init__(config)
 
@@ -38,12 +42,12 @@ class RuffRunner(BaseToolRunner):
     def command(self) -> str:
         return "ruff"
 
-    def build_command(self, worktree_path: str) -> list[str]:
+    def build_command(self, worktree_path: str, files: list[str] | None = None) -> list[str]:
         """Build Ruff check command."""
         cmd = [
             "ruff",
             "check",
-            worktree_path,
+            *(files or [worktree_path]),
             "--output-format", "json",
         ]
 
@@ -92,6 +96,13 @@ class RuffRunner(BaseToolRunner):
 
         return findings
 
+    def iter_findings(self, output: TextIO) -> Iterator[ReviewFinding]:
+        """Stream findings from Ruff's top-level JSON array."""
+        for _, issue in iter_json_items(output):
+            finding = self._parse_issue(issue)
+            if finding:
+                yield finding
+
     def _parse_issue(self, issue: dict) -> ReviewFinding | None:
         """Parse a single Ruff issue."""
         if not issue:
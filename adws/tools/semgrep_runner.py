@@ -15,7 +15,9 @@ Usage:
 """
 
 import json
+from typing import Iterator, TextIO
 from tools.base_runner import BaseToolRunner
+from tools.json_stream import iter_json_items
 from stages.review_modes import ReviewMode, ReviewFinding, IssueSeverity
 from schemas.review_config import ReviewToolConfig
 
@@ -38,12 +40,12 @@ class SemgrepRunner(BaseToolRunner):
     def command(self) -> str:
         return "semgrep"
 
-    def build_command(self, worktree_path: str) -> list[str]:
+    def build_command(self, worktree_path: str, files: list[str] | None = None) -> list[str]:
         """Build Semgrep scan command."""
         cmd = [
             "semgrep",
             "scan",
-            worktree_path,
+            *(files or [worktree_path]),
             "--json",
             "--config", "auto",  # Use recommended rules
             "--metrics=off",  # Don't send telemetry
@@ -90,6 +92,13 @@ class SemgrepRunner(BaseToolRunner):
 
         return findings
 
+    def iter_findings(self, output: TextIO) -> Iterator[ReviewFinding]:
+        """Stream findings from the "results" array of a Semgrep report."""
+        for _, result in iter_json_items(output, ("results",)):
+            finding = self._parse_result(result)
+            if finding:
+                yield finding
+
     def _parse_result(self, result: dict) -> ReviewFinding | None:
         """Parse a single Semgrep result."""
         if not result:
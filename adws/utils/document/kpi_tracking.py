@@ -2,90 +2,50 @@
 
 import sys
 import os
-import json
-from datetime import datetime
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from adw_modules.data_types import AgentTemplateRequest, GitHubIssue, GitHubUser
-from adw_modules.agent import execute_template
-from adw_modules.workflow_ops import format_issue_message, create_commit
+from adw_modules.kpi_engine import KpiEngine
+from adw_modules.workflow_ops import format_issue_message
 from adw_modules.github import make_issue_comment
 
 from .types import DocumentInitContext
 
 
+def format_kpi_summary(kpis: dict) -> str:
+    """Format KPI totals as a one-line issue comment body."""
+    totals = kpis["totals"]
+    return (
+        f"📊 Agentic KPIs: {len(kpis['stages'])} stages, "
+        f"{totals['cycle_time_seconds'] / 60:.1f} min cycle time, "
+        f"{totals['retries']} retries, "
+        f"{totals['input_tokens'] + totals['output_tokens']:,} tokens, "
+        f"${totals['cost_usd']:.2f}"
+    )
+
+
 def track_kpis(ctx: DocumentInitContext) -> None:
     """Track agentic KPIs - never fails the main workflow.
 
+    KPIs are aggregated natively from activity logs, orchestrator state and
+    agent usage (see adw_modules.kpi_engine), so no agent run or commit is
+    needed.
+
     Args:
         ctx: Document initialization context
     """
     try:
         ctx.logger.info("Tracking agentic KPIs...")
-        make_issue_comment(
-            ctx.issue_number,
-            format_issue_message(ctx.adw_id, "ops", "📊 Updating agentic KPIs"),
-        )
-
-        # Execute the track_agentic_kpis prompt
-        kpi_request = AgentTemplateRequest(
-            agent_name="kpi_tracker",
-            slash_command="/track_agentic_kpis",
-            args=[json.dumps(ctx.state.data, indent=2)],
-            adw_id=ctx.adw_id,
-            working_dir=ctx.worktree_path,
-        )
 
         try:
-            kpi_response = execute_template(kpi_request)
-
-            if kpi_response.success:
-                ctx.logger.info("Successfully updated agentic KPIs")
-
-                # Commit the KPI changes
-                try:
-                    commit_msg, error = create_commit(
-                        "kpi_tracker",
-                        GitHubIssue(
-                            number=int(ctx.issue_number),
-                            title="Update agentic KPIs",
-                            body="Tracking ADW performance metrics",
-                            state="open",
-                            author=GitHubUser(login="system"),
-                            created_at=datetime.now(),
-                            updated_at=datetime.now(),
-                            url="",
-                        ),
-                        "/chore",
-                        ctx.adw_id,
-                        ctx.logger,
-                        ctx.worktree_path,
-                    )
-                    if commit_msg and not error:
-                        ctx.logger.info(f"Committed KPI update: {commit_msg}")
-                        make_issue_comment(
-                            ctx.issue_number,
-                            format_issue_message(
-                                ctx.adw_id, "kpi_tracker", "✅ Agentic KPIs updated"
-                            ),
-                        )
-                    elif error:
-                        ctx.logger.warning(f"Failed to create KPI commit: {error}")
-                except Exception as e:
-                    ctx.logger.warning(f"Failed to commit KPI update: {e}")
-            else:
-                ctx.logger.warning("Failed to update agentic KPIs - continuing anyway")
-                make_issue_comment(
-                    ctx.issue_number,
-                    format_issue_message(
-                        ctx.adw_id,
-                        "kpi_tracker",
-                        "⚠️ Failed to update agentic KPIs - continuing anyway",
-                    ),
-                )
+            kpis = KpiEngine().refresh(ctx.adw_id, ctx.state.data.get("orchestrator"))
+            ctx.logger.info(f"Updated agentic KPIs: {kpis['totals']}")
+            make_issue_comment(
+                ctx.issue_number,
+                format_issue_message(ctx.adw_id, "kpi_tracker", format_kpi_summary(kpis)),
+            )
         except Exception as e:
-            ctx.logger.warning(f"Error executing KPI template: {e}")
+            ctx.logger.warning(f"Error computing agentic KPIs: {e}")
             make_issue_comment(
                 ctx.issue_number,
                 format_issue_message(
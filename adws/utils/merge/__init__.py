@@ -10,6 +10,7 @@ Usage:
         execute_merge,
         cleanup_worktree_and_branch,
         finalize_merge,
+        MergeQueue,
     )
 """
 
@@ -40,6 +41,7 @@ from .conflicts import (
 from .config import restore_config_files
 from .testing import run_validation_tests
 from .merge import execute_merge
+from .queue import MergeQueue, MergeQueueError
 from .cleanup import cleanup_worktree_and_branch
 from .finalization import (
     post_merge_status,
@@ -77,6 +79,9 @@ __all__ = [
     "run_validation_tests",
     # Functions - merge
     "execute_merge",
+    # Merge queue
+    "MergeQueue",
+    "MergeQueueError",
     # Functions - cleanup
     "cleanup_worktree_and_branch",
     # Functions - finalization
@@ -4,12 +4,13 @@ import json
 import subprocess
 import os
 import logging
-from typing import List
+from typing import List, Optional
 
 from .types import MergeConfigContext
 
 
-def restore_config_files(repo_root: str, logger: logging.Logger) -> MergeConfigContext:
+def restore_config_files(repo_root: str, logger: logging.Logger,
+                         main_root: Optional[str] = None) -> MergeConfigContext:
     """Restore config files that may have been modified in worktree.
 
     This fixes the issue where worktrees modify .mcp.json and playwright-mcp-config.json
@@ -18,10 +19,13 @@ def restore_config_files(repo_root: str, logger: logging.Logger) -> MergeConfigC
     Args:
         repo_root: Repository root directory
         logger: Logger instance
+        main_root: Main repository the paths should point to, when repo_root
+            is a scratch checkout of it (defaults to repo_root)
 
     Returns:
         MergeConfigContext with restoration results
     """
+    main_root = main_root or repo_root
     logger.info("Restoring configuration files to main repository paths...")
 
     config_files_fixed: List[str] = []
@@ -39,7 +43,7 @@ def restore_config_files(repo_root: str, logger: logging.Logger) -> MergeConfigC
                 for i, arg in enumerate(args):
                     if isinstance(arg, str) and 'trees/' in arg and 'playwright-mcp-config.json' in arg:
                         # Fix the path to point to main repo
-                        correct_path = os.path.join(repo_root, "playwright-mcp-config.json")
+                        correct_path = os.path.join(main_root, "playwright-mcp-config.json")
                         args[i] = correct_path
                         config_files_fixed.append('.mcp.json')
                         logger.info(f"  Fixed .mcp.json playwright config path: {correct_path}")
@@ -66,7 +70,7 @@ def restore_config_files(repo_root: str, logger: logging.Logger) -> MergeConfigC
 
                 if 'trees/' in video_dir:
                     # Fix the path to point to main repo
-                    correct_path = os.path.join(repo_root, "videos")
+                    correct_path = os.path.join(main_root, "videos")
                     playwright_config['browser']['contextOptions']['recordVideo']['dir'] = correct_path
                     config_files_fixed.append('playwright-mcp-config.json')
                     logger.info(f"  Fixed playwright-mcp-config.json videos directory: {correct_path}")
@@ -8,6 +8,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from adw_modules.state import ADWState
 from adw_modules.utils import setup_logger, check_env_vars
+from adw_modules.heartbeat import start_heartbeat
 from adw_modules.websocket_client import WebSocketNotifier
 
 from .types import MergeInitContext
@@ -77,6 +78,7 @@ def initialize_merge_workflow(
     # Set up logger
     logger = setup_logger(adw_id, workflow_name)
     logger.info(f"ADW Merge ISO starting - ID: {adw_id}, Method: {merge_method}")
+    start_heartbeat(adw_id, workflow_name)
 
     # Validate environment
     check_env_vars(logger)
@@ -0,0 +1,452 @@
+"""Serialized merge queue with batched, speculative validation.
+
+Merging used to happen in the main checkout: check out main, pull, merge,
+test, push, with the user's changes stashed around it. Two merges at once
+corrupted each other, and every merge paid for a full validation run.
+
+The queue instead merges in a dedicated scratch worktree
+(trees/.merge_queue) that is detached at origin/main, so the user's
+checkout is never touched beyond fast-forwarding local main to each pushed
+head (a fast-forward merge if main is checked out there). Entries live in
+the adw_merge_queue table. Only one process runs the queue at a time,
+guarded by a lock file; every other caller enqueues and waits for its entry
+to finish.
+
+The runner takes up to ADW_MERGE_QUEUE_BATCH_SIZE queued entries and
+merges them on top of each other, then validates the combined result once.
+If the tests pass, the batch is pushed to origin/main in one push. If they
+fail, the batch is bisected: the first half is retried on the same base and
+pushed if green, then the second half on top of it. Only the entries that
+actually break the build are failed, and N healthy merges cost one test
+run instead of N.
+
+An entry that conflicts with main or with an earlier entry in its batch is
+marked as conflicted and dropped from the batch; resolving it is left to
+the caller.
+
+Usage:
+    entry = MergeQueue(logger=logger).merge(adw_id, branch_name, "squash")
+    if entry["status"] == MERGED: ...
+"""
+
+import fcntl
+import logging
+import os
+import sqlite3
+import subprocess
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from adw_modules.db_paths import ensure_tables, get_default_db_path, get_project_root
+from adw_modules.worktree_provisioner import WorktreeProvisioner
+
+from .config import restore_config_files
+from .conflicts import check_merge_conflicts
+from .testing import run_validation_tests
+from .types import MergeTestContext
+
+
+# Entry statuses
+QUEUED = "queued"
+MERGING = "merging"
+MERGED = "merged"
+FAILED = "failed"
+CONFLICT = "conflict"
+
+FINISHED_STATUSES = (MERGED, FAILED, CONFLICT)
+
+# A rejected push (main moved outside the queue) requeues an entry this often
+MAX_ATTEMPTS = 3
+
+class MergeQueueError(Exception):
+    """Raised when the queue cannot run (git failure, timeout)."""
+
+
+class _PushRejected(Exception):
+    """origin/main moved while a batch was being validated."""
+
+
+class _FetchFailed(Exception):
+    """origin could not be fetched (network or remote unavailable)."""
+
+
+Validator = Callable[[str, logging.Logger], MergeTestContext]
+
+
+class MergeQueue:
+    """Queue of ADW branches waiting to be merged into main."""
+
+    def __init__(
+        self,
+        project_root: Optional[Path] = None,
+        db_path: Optional[Path] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        validate: Optional[Validator] = None,
+        provisioner: Optional[WorktreeProvisioner] = None,
+        logger: Optional[logging.Logger] = None
+    ):
+        self.db_path = Path(db_path or get_default_db_path())
+        self.project_root = Path(project_root or get_project_root())
+        self.worktree = self.project_root / "trees" / ".merge_queue"
+        self.batch_size = batch_size if batch_size is not None else int(os.getenv("ADW_MERGE_QUEUE_BATCH_SIZE", "4"))
+        self.poll_interval = (
+            poll_interval if poll_interval is not None
+            else float(os.getenv("ADW_MERGE_QUEUE_POLL_SECONDS", "5"))
+        )
+        self.validate = validate or run_validation_tests
+        self.logger = logger or logging.getLogger(__name__)
+        self.provisioner = provisioner or WorktreeProvisioner(project_root=self.project_root, logger=self.logger)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        ensure_tables(self.db_path, "adw_merge_queue")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _git(self, args: List[str], cwd: Optional[Path] = None) -> str:
+        result = subprocess.run(
+            ["git", *args], cwd=cwd or self.worktree, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise MergeQueueError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+        return result.stdout.strip()
+
+    # Queue entries
+
+    def enqueue(self, adw_id: str, branch_name: str, merge_method: str) -> int:
+        """
+        Add a branch to the queue.
+
+        An ADW that is already queued or merging keeps its existing entry.
+
+        Returns:
+            The entry id
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id FROM adw_merge_queue WHERE adw_id = ? AND status IN (?, ?)",
+                (adw_id, QUEUED, MERGING)
+            ).fetchone()
+            if row:
+                return row["id"]
+            cursor = conn.execute(
+                """
+                INSERT INTO adw_merge_queue (adw_id, branch_name, merge_method, status, enqueued_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (adw_id, branch_name, merge_method, QUEUED, time.time())
+            )
+            self.logger.info(f"Queued {branch_name} for merge (entry {cursor.lastrowid})")
+            return cursor.lastrowid
+
+    def get(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM adw_merge_queue WHERE id = ?", (entry_id,)).fetchone()
+        return dict(row) if row else None
+
+    def entries(self, statuses: Tuple[str, ...] = (QUEUED, MERGING), limit: int = 100) -> List[Dict[str, Any]]:
+        placeholders = ", ".join("?" for _ in statuses)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM adw_merge_queue WHERE status IN ({placeholders}) ORDER BY id LIMIT ?",
+                (*statuses, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def _finish(self, entry: Dict[str, Any], status: str, error: Optional[str] = None,
+                merged_commit: Optional[str] = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE adw_merge_queue SET status = ?, error = ?, merged_commit = ?, finished_at = ? WHERE id = ?",
+                (status, error, merged_commit, time.time(), entry["id"])
+            )
+        self.logger.info(f"Merge queue entry {entry['id']} ({entry['branch_name']}): {status}")
+
+    def _requeue(self, entries: List[Dict[str, Any]], reason: str) -> None:
+        for entry in entries:
+            if entry["attempts"] >= MAX_ATTEMPTS:
+                self._finish(entry, FAILED, f"Gave up after {entry['attempts']} attempts: {reason}")
+                continue
+            with self._connect() as conn:
+                conn.execute(
+                    "UPDATE adw_merge_queue SET status = ?, batch_id = NULL WHERE id = ?",
+                    (QUEUED, entry["id"])
+                )
+
+    def _release(self, entries: List[Dict[str, Any]]) -> None:
+        """Put entries back in the queue without counting the attempt."""
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE adw_merge_queue SET status = ?, batch_id = NULL, attempts = attempts - 1 WHERE id = ?",
+                [(QUEUED, entry["id"]) for entry in entries]
+            )
+
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        batch_id = uuid.uuid4().hex[:8]
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM adw_merge_queue WHERE status = ? ORDER BY id LIMIT ?",
+                (QUEUED, max(self.batch_size, 1))
+            ).fetchall()
+            conn.executemany(
+                """
+                UPDATE adw_merge_queue
+                SET status = ?, batch_id = ?, attempts = attempts + 1, started_at = ?
+                WHERE id = ?
+                """,
+                [(MERGING, batch_id, time.time(), row["id"]) for row in rows]
+            )
+        batch = [dict(row) for row in rows]
+        for entry in batch:
+            entry["attempts"] += 1
+        return batch
+
+    # Running the queue
+
+    @contextmanager
+    def _run_lock(self) -> Iterator[bool]:
+        self.worktree.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.worktree.parent / ".merge_queue.lock", "w") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def process(self) -> int:
+        """
+        Merge everything in the queue, batch by batch.
+
+        Returns immediately if another process is already running the queue.
+
+        Returns:
+            Number of entries finished
+        """
+        with self._run_lock() as acquired:
+            if not acquired:
+                return 0
+
+            # Holding the lock, any entry still merging belongs to a runner that died
+            self._requeue(self.entries((MERGING,)), "merge queue runner exited")
+
+            finished = 0
+            while True:
+                batch = self._next_batch()
+                if not batch:
+                    return finished
+                try:
+                    self._land(batch, self._prepare())
+                except _FetchFailed as e:
+                    # Nothing can land until origin is reachable again; the next run retries
+                    self.logger.warning(f"Could not fetch origin, requeueing batch: {e}")
+                    self._release(self.entries((MERGING,)))
+                    return finished
+                except _PushRejected as e:
+                    self.logger.warning(f"Push rejected, requeueing batch: {e}")
+                    self._requeue(self.entries((MERGING,)), str(e))
+                except MergeQueueError as e:
+                    self.logger.error(f"Merge queue batch failed: {e}")
+                    for entry in self.entries((MERGING,)):
+                        self._finish(entry, FAILED, str(e))
+                finished += sum(1 for entry in batch if self.get(entry["id"])["status"] in FINISHED_STATUSES)
+
+    def _prepare(self) -> str:
+        """Fetch and return origin/main, creating the scratch worktree if needed."""
+        try:
+            self._git(["fetch", "origin"], cwd=self.project_root)
+        except MergeQueueError as e:
+            raise _FetchFailed(str(e)) from e
+        base = self._git(["rev-parse", "origin/main"], cwd=self.project_root)
+
+        if not (self.worktree / ".git").exists():
+            self._git(["worktree", "prune"], cwd=self.project_root)
+            self._git(["worktree", "add", "--detach", str(self.worktree), base], cwd=self.project_root)
+            result = self.provisioner.provision(str(self.worktree))
+            if not result.success:
+                self.logger.warning(f"Could not provision merge queue worktree: {result.error}")
+        return base
+
+    def _reset(self, base: str) -> None:
+        subprocess.run(["git", "merge", "--abort"], cwd=self.worktree, capture_output=True)
+        self._git(["checkout", "--detach", "--force", base])
+        self._git(["reset", "--hard", base])
+        # Ignored files (node_modules, .venv) survive so validation stays warm
+        self._git(["clean", "-fd"])
+
+    def _land(self, batch: List[Dict[str, Any]], base: str) -> str:
+        """
+        Merge a batch onto base, validate it and push it, bisecting on failure.
+
+        Returns:
+            The new base: the pushed head, or base if nothing landed
+        """
+        self._reset(base)
+        applied = []
+        for entry in batch:
+            commit, status, error = self._apply(entry)
+            if commit is None:
+                self._finish(entry, status, error)
+            else:
+                applied.append((entry, commit))
+        if not applied:
+            return base
+
+        names = ", ".join(entry["branch_name"] for entry, _ in applied)
+        self.logger.info(f"Validating {len(applied)} merge(s) on {base[:8]}: {names}")
+        test_ctx = self.validate(str(self.worktree), self.logger)
+        if test_ctx.success:
+            head = applied[-1][1]
+            self._push(head)
+            for entry, commit in applied:
+                self._finish(entry, MERGED, merged_commit=commit)
+            return head
+
+        if len(applied) == 1:
+            self._finish(applied[0][0], FAILED, f"Validation tests failed: {test_ctx.error}")
+            return base
+
+        # Something in the batch breaks the build: find it by halves
+        middle = len(applied) // 2
+        base = self._land([entry for entry, _ in applied[:middle]], base)
+        return self._land([entry for entry, _ in applied[middle:]], base)
+
+    def _merge_ref(self, branch_name: str) -> Optional[str]:
+        for ref in (f"origin/{branch_name}", branch_name):
+            result = subprocess.run(
+                ["git", "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"],
+                cwd=self.worktree, capture_output=True, text=True
+            )
+            if result.returncode == 0:
+                return ref
+        return None
+
+    def _apply(self, entry: Dict[str, Any]) -> Tuple[Optional[str], str, Optional[str]]:
+        """
+        Merge one entry on top of the scratch worktree's HEAD.
+
+        Returns:
+            (commit, status, error); commit is None if the entry was not applied
+        """
+        branch_name, merge_method = entry["branch_name"], entry["merge_method"]
+        ref = self._merge_ref(branch_name)
+        if ref is None:
+            return None, FAILED, f"Branch {branch_name} not found"
+
+        message = f"Merge branch '{branch_name}' via ADW Merge ISO ({merge_method})"
+        if merge_method in ("squash", "squash-rebase"):
+            commands = [["merge", "--squash", ref]]
+        elif merge_method == "rebase":
+            # Fast-forward when possible, as _perform_merge does
+            ff = subprocess.run(["git", "merge", "--ff-only", ref], cwd=self.worktree, capture_output=True)
+            commands = [] if ff.returncode == 0 else [["merge", "--no-ff", "-m", message, ref]]
+        else:
+            commands = [["merge", "--no-ff", "-m", message, ref]]
+
+        for command in commands:
+            result = subprocess.run(["git", *command], cwd=self.worktree, capture_output=True, text=True)
+            if result.returncode == 0:
+                continue
+            has_conflicts, conflict_files = check_merge_conflicts(str(self.worktree), self.logger)
+            subprocess.run(["git", "merge", "--abort"], cwd=self.worktree, capture_output=True)
+            self._git(["reset", "--hard", "HEAD"])
+            if has_conflicts:
+                return None, CONFLICT, f"Conflicts in {', '.join(conflict_files)}"
+            return None, FAILED, f"git {command[0]} failed: {result.stderr.strip() or result.stdout.strip()}"
+
+        staged = subprocess.run(["git", "diff", "--cached", "--quiet"], cwd=self.worktree)
+        if staged.returncode != 0:
+            self._git(["commit", "-m", message])
+        # Undo worktree-specific paths in .mcp.json etc.; amends the merge commit
+        restore_config_files(str(self.worktree), self.logger, main_root=str(self.project_root))
+        return self._git(["rev-parse", "HEAD"]), MERGED, None
+
+    def _push(self, head: str) -> None:
+        result = subprocess.run(
+            ["git", "push", "origin", f"{head}:refs/heads/main"],
+            cwd=self.worktree, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise _PushRejected(result.stderr.strip())
+        self.logger.info(f"Pushed {head[:8]} to origin/main")
+        self._advance_local_main(head)
+
+    def _advance_local_main(self, head: str) -> None:
+        """Fast-forward local main, which new worktrees and the reconciler start from."""
+        try:
+            old = self._git(["rev-parse", "--verify", "refs/heads/main"], cwd=self.project_root)
+            if old == head:
+                return
+            self._git(["merge-base", "--is-ancestor", old, head], cwd=self.project_root)
+            checked_out = subprocess.run(
+                ["git", "symbolic-ref", "-q", "HEAD"], cwd=self.project_root, capture_output=True, text=True
+            ).stdout.strip() == "refs/heads/main"
+            if checked_out:
+                # Moves the checkout along; refused if it would overwrite local changes
+                self._git(["merge", "--ff-only", "-q", head], cwd=self.project_root)
+            else:
+                self._git(["update-ref", "refs/heads/main", head, old], cwd=self.project_root)
+        except MergeQueueError as e:
+            self.logger.warning(f"Pushed, but could not fast-forward local main: {e}")
+
+    # Callers
+
+    def merge(self, adw_id: str, branch_name: str, merge_method: str,
+              timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Enqueue a branch and wait until it has been merged or rejected.
+
+        Runs the queue itself whenever no other process is running it.
+
+        Returns:
+            The finished queue entry
+
+        Raises:
+            MergeQueueError: If the entry doesn't finish within timeout
+        """
+        timeout = timeout if timeout is not None else float(os.getenv("ADW_MERGE_QUEUE_TIMEOUT_SECONDS", "3600"))
+        entry_id = self.enqueue(adw_id, branch_name, merge_method)
+        deadline = time.monotonic() + timeout
+        while True:
+            self.process()
+            entry = self.get(entry_id)
+            if entry["status"] in FINISHED_STATUSES:
+                return entry
+            if time.monotonic() > deadline:
+                raise MergeQueueError(f"Timed out after {timeout:.0f}s waiting for merge queue")
+            time.sleep(self.poll_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue length, waiting entries and recent outcomes."""
+        with self._connect() as conn:
+            counts = {
+                row["status"]: row["count"]
+                for row in conn.execute("SELECT status, COUNT(*) AS count FROM adw_merge_queue GROUP BY status")
+            }
+            recent = conn.execute(
+                """
+                SELECT adw_id, branch_name, status, batch_id, attempts, error,
+                       finished_at - enqueued_at AS wait_seconds
+                FROM adw_merge_queue WHERE status IN (?, ?, ?)
+                ORDER BY finished_at DESC LIMIT 10
+                """,
+                FINISHED_STATUSES
+            ).fetchall()
+        return {
+            "batch_size": self.batch_size,
+            "counts": counts,
+            "pending": self.entries(),
+            "recent": [dict(row) for row in recent],
+        }
+
@@ -0,0 +1,254 @@
+"""Tests for the merge queue.
+
+Runs against a temporary clone of a bare origin; validation is replaced by a
+stand-in that fails whenever a BROKEN file is present.
+"""
+
+import json
+import os
+import subprocess
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from utils.merge.queue import CONFLICT, FAILED, MERGED, QUEUED, MergeQueue
+from utils.merge.types import MergeTestContext
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    origin = tmp_path / "origin.git"
+    _git(tmp_path, "init", "-q", "--bare", "-b", "main", str(origin))
+    repo = tmp_path / "project"
+    _git(tmp_path, "clone", "-q", str(origin), str(repo))
+    _git(repo, "config", "user.email", "test@example.com")
+    _git(repo, "config", "user.name", "Test")
+    _git(repo, "checkout", "-q", "-b", "main")
+    (repo / "README.md").write_text("base\n")
+    _git(repo, "add", "README.md")
+    _git(repo, "commit", "-q", "-m", "Initial commit")
+    _git(repo, "push", "-q", "origin", "main")
+    return repo
+
+
+def _branch(repo, name, files):
+    _git(repo, "branch", name, "origin/main")
+    worktree = repo.parent / f"wt-{name}"
+    _git(repo, "worktree", "add", "-q", str(worktree), name)
+    for path, content in files.items():
+        (worktree / path).write_text(content)
+        _git(worktree, "add", path)
+    _git(worktree, "commit", "-q", "-m", f"Work on {name}")
+    return name
+
+
+def _origin_files(repo):
+    _git(repo, "fetch", "-q", "origin")
+    return set(_git(repo, "ls-tree", "--name-only", "origin/main").splitlines())
+
+
+class FakeValidator:
+    """Counts runs; fails when the merged tree contains BROKEN."""
+
+    def __init__(self):
+        self.runs = []
+
+    def __call__(self, repo_root, logger):
+        files = sorted(os.listdir(repo_root))
+        self.runs.append(files)
+        if "BROKEN" in files:
+            return MergeTestContext(success=False, test_output="", error="1 failed")
+        return MergeTestContext(success=True, test_output="", error=None)
+
+
+@pytest.fixture
+def validator():
+    return FakeValidator()
+
+
+@pytest.fixture
+def queue(repo, tmp_path, validator, mock_logger):
+    return MergeQueue(
+        project_root=repo,
+        db_path=tmp_path / "queue.db",
+        batch_size=4,
+        poll_interval=0.05,
+        validate=validator,
+        provisioner=Mock(),
+        logger=mock_logger,
+    )
+
+
+class TestMergeQueue:
+    """Tests for MergeQueue."""
+
+    def test_batch_is_validated_once_and_pushed(self, queue, repo, validator):
+        ids = [queue.enqueue(f"adw0000{i}", _branch(repo, f"feat-{i}", {f"f{i}.txt": "x"}), "squash") for i in range(3)]
+
+        assert queue.process() == 3
+
+        assert len(validator.runs) == 1
+        assert [queue.get(i)["status"] for i in ids] == [MERGED] * 3
+        assert {"f0.txt", "f1.txt", "f2.txt"} <= _origin_files(repo)
+        assert _git(repo, "rev-parse", "origin/main") == queue.get(ids[-1])["merged_commit"]
+
+    def test_local_main_is_fast_forwarded(self, queue, repo):
+        entry = queue.enqueue("adw00001", _branch(repo, "feat-ff", {"ff.txt": "f"}), "squash")
+
+        queue.process()
+
+        assert _git(repo, "rev-parse", "main") == queue.get(entry)["merged_commit"]
+        assert (repo / "ff.txt").read_text() == "f"
+
+    def test_local_main_ref_is_advanced_when_not_checked_out(self, queue, repo):
+        _git(repo, "checkout", "-q", "-b", "my-work")
+        entry = queue.enqueue("adw00001", _branch(repo, "feat-ref", {"ref.txt": "r"}), "squash")
+
+        queue.process()
+
+        assert _git(repo, "rev-parse", "main") == queue.get(entry)["merged_commit"]
+        assert not (repo / "ref.txt").exists()
+
+    def test_failing_entry_is_bisected_out(self, queue, repo, validator):
+        ids = [
+            queue.enqueue("adw00001", _branch(repo, "good-1", {"a.txt": "a"}), "squash"),
+            queue.enqueue("adw00002", _branch(repo, "good-2", {"b.txt": "b"}), "squash"),
+            queue.enqueue("adw00003", _branch(repo, "bad-3", {"BROKEN": "x"}), "squash"),
+            queue.enqueue("adw00004", _branch(repo, "good-4", {"d.txt": "d"}), "squash"),
+        ]
+
+        queue.process()
+
+        statuses = [queue.get(i)["status"] for i in ids]
+        assert statuses == [MERGED, MERGED, FAILED, MERGED]
+        assert "Validation tests failed" in queue.get(ids[2])["error"]
+        files = _origin_files(repo)
+        assert {"a.txt", "b.txt", "d.txt"} <= files
+        assert "BROKEN" not in files
+        # Full batch, left half, right half, then each entry of the right half
+        assert len(validator.runs) == 5
+
+    def test_conflicting_entry_is_dropped_from_batch(self, queue, repo):
+        first = queue.enqueue("adw00001", _branch(repo, "edit-1", {"README.md": "one\n"}), "squash")
+        second = queue.enqueue("adw00002", _branch(repo, "edit-2", {"README.md": "two\n"}), "squash")
+
+        queue.process()
+
+        assert queue.get(first)["status"] == MERGED
+        assert queue.get(second)["status"] == CONFLICT
+        assert "README.md" in queue.get(second)["error"]
+
+    def test_merge_methods(self, queue, repo):
+        ids = [
+            queue.enqueue("adw00001", _branch(repo, "via-merge", {"m.txt": "m"}), "merge"),
+            queue.enqueue("adw00002", _branch(repo, "via-rebase", {"r.txt": "r"}), "rebase"),
+        ]
+
+        queue.process()
+
+        assert [queue.get(i)["status"] for i in ids] == [MERGED, MERGED]
+        assert {"m.txt", "r.txt"} <= _origin_files(repo)
+
+    def test_user_checkout_is_untouched(self, queue, repo):
+        _git(repo, "checkout", "-q", "-b", "my-work")
+        (repo / "wip.txt").write_text("uncommitted")
+        queue.enqueue("adw00001", _branch(repo, "feat-wip", {"f.txt": "f"}), "squash")
+
+        queue.process()
+
+        assert _git(repo, "rev-parse", "--abbrev-ref", "HEAD") == "my-work"
+        assert (repo / "wip.txt").read_text() == "uncommitted"
+        assert _git(repo, "stash", "list") == ""
+
+    def test_rejected_push_requeues_batch(self, queue, repo, tmp_path):
+        entry = queue.enqueue("adw00001", _branch(repo, "feat-race", {"race.txt": "r"}), "squash")
+        other = tmp_path / "other"
+        _git(tmp_path, "clone", "-q", str(tmp_path / "origin.git"), str(other))
+
+        def validate_while_main_moves(repo_root, logger):
+            if not queue.get(entry)["attempts"] > 1:
+                (other / "other.txt").write_text("o")
+                _git(other, "add", "other.txt")
+                _git(other, "-c", "user.name=T", "-c", "user.email=t@example.com", "commit", "-q", "-m", "Other")
+                _git(other, "push", "-q", "origin", "HEAD:main")
+            return MergeTestContext(success=True, test_output="", error=None)
+
+        queue.validate = validate_while_main_moves
+        queue.process()
+
+        assert queue.get(entry)["status"] == MERGED
+        assert queue.get(entry)["attempts"] == 2
+        assert {"race.txt", "other.txt"} <= _origin_files(repo)
+
+    def test_unreachable_origin_requeues_without_spending_attempts(self, queue, repo, tmp_path):
+        entry = queue.enqueue("adw00001", _branch(repo, "feat-offline", {"o.txt": "o"}), "squash")
+        _git(repo, "remote", "set-url", "origin", str(tmp_path / "missing.git"))
+
+        assert queue.process() == 0
+        assert queue.get(entry)["status"] == QUEUED
+        assert queue.get(entry)["attempts"] == 0
+
+        _git(repo, "remote", "set-url", "origin", str(tmp_path / "origin.git"))
+        queue.process()
+        assert queue.get(entry)["status"] == MERGED
+
+    def test_worktree_config_paths_are_restored(self, queue, repo):
+        mcp = {"mcpServers": {"playwright": {"args": ["--config", "/x/trees/adw00001/playwright-mcp-config.json"]}}}
+        entry = queue.enqueue("adw00001", _branch(repo, "feat-mcp", {".mcp.json": json.dumps(mcp)}), "squash")
+
+        queue.process()
+
+        assert queue.get(entry)["status"] == MERGED
+        merged = json.loads(_git(repo, "show", "origin/main:.mcp.json"))
+        assert merged["mcpServers"]["playwright"]["args"][1] == str(repo / "playwright-mcp-config.json")
+        assert _git(repo, "rev-parse", "origin/main") == queue.get(entry)["merged_commit"]
+
+    def test_enqueue_is_idempotent_per_adw(self, queue):
+        first = queue.enqueue("adw00001", "feat-1", "squash")
+
+        assert queue.enqueue("adw00001", "feat-1", "squash") == first
+        assert [entry["status"] for entry in queue.entries()] == [QUEUED]
+
+    def test_concurrent_callers_are_serialized(self, queue, repo, validator):
+        branches = [_branch(repo, f"conc-{i}", {f"c{i}.txt": "c"}) for i in range(3)]
+        results = {}
+
+        def merge(i):
+            results[i] = queue.merge(f"conc000{i}", branches[i], "squash", timeout=30)
+
+        threads = [threading.Thread(target=merge, args=(i,)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [results[i]["status"] for i in range(3)] == [MERGED] * 3
+        assert {"c0.txt", "c1.txt", "c2.txt"} <= _origin_files(repo)
+        assert len(validator.runs) <= 3
+
+    def test_missing_branch_fails(self, queue):
+        entry = queue.enqueue("adw00001", "does-not-exist", "squash")
+
+        queue.process()
+
+        assert queue.get(entry)["status"] == FAILED
+        assert "not found" in queue.get(entry)["error"]
+
+    def test_stats(self, queue, repo):
+        queue.enqueue("adw00001", _branch(repo, "feat-s", {"s.txt": "s"}), "squash")
+        queue.enqueue("adw00002", "feat-missing", "squash")
+        queue.process()
+
+        stats = queue.stats()
+
+        assert stats["counts"] == {MERGED: 1, FAILED: 1}
+        assert stats["pending"] == []
+        assert len(stats["recent"]) == 2
@@ -8,6 +8,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from adw_modules.state import ADWState
 from adw_modules.utils import setup_logger
+from adw_modules.heartbeat import start_heartbeat
 from adw_modules.workflow_ops import ensure_adw_id
 from adw_modules.websocket_client import WebSocketNotifier
 from adw_modules.kanban_mode import log_mode_status
@@ -83,6 +84,7 @@ def initialize_workflow(
     # Setup logger with ADW ID
     logger = setup_logger(adw_id, workflow_name)
     logger.info(f"{workflow_name} starting - ID: {adw_id}, Issue: {issue_number}")
+    start_heartbeat(adw_id, workflow_name)
 
     # Initialize WebSocket notifier for real-time updates
     notifier = WebSocketNotifier(adw_id)
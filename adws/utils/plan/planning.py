@@ -11,6 +11,7 @@ from adw_modules.websocket_client import WebSocketNotifier
 from adw_modules.data_types import GitHubIssue, IssueClassSlashCommand
 from adw_modules.workflow_ops import build_plan as workflow_build_plan, format_issue_message, AGENT_PLANNER
 from adw_modules.github import make_issue_comment_safe
+from adw_modules.artifact_index import index_artifact, PLAN
 
 from .types import PlanContext
 
@@ -103,6 +104,7 @@ def build_plan(
 
     state.update(plan_file=plan_file_path)
     state.save("adw_plan_iso")
+    index_artifact(adw_id, PLAN, worktree_plan_path, logger)
     logger.info(f"Plan file created: {plan_file_path}")
     make_issue_comment_safe(
         issue_number,
@@ -2,13 +2,20 @@
 
 import pytest
 import logging
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
 
+@pytest.fixture(autouse=True)
+def mock_index_artifact():
+    """Keep workflow tests from indexing artifacts in the project database."""
+    with patch('utils.plan.planning.index_artifact') as mock:
+        yield mock
+
+
 @pytest.fixture
 def mock_logger():
     """Create a mock logger."""
@@ -14,7 +14,7 @@ class TestBuildPlan:
     @patch('utils.plan.planning.workflow_build_plan')
     @patch('utils.plan.planning.make_issue_comment_safe')
     @patch('os.path.exists')
-    def test_builds_and_validates_plan(self, mock_exists, mock_comment, mock_build):
+    def test_builds_and_validates_plan(self, mock_exists, mock_comment, mock_build, mock_index_artifact):
         """Should build plan and validate file exists."""
         from utils.plan.planning import build_plan
         from utils.plan.types import PlanContext
@@ -43,6 +43,9 @@ class TestBuildPlan:
         assert isinstance(ctx, PlanContext)
         assert ctx.plan_file_path == "specs/issue-999-plan.md"
         mock_state.update.assert_called_with(plan_file="specs/issue-999-plan.md")
+        mock_index_artifact.assert_called_once_with(
+            "test1234", "plan", "/path/to/worktree/specs/issue-999-plan.md", mock_logger
+        )
 
     @patch('utils.plan.planning.workflow_build_plan')
     @patch('utils.plan.planning.make_issue_comment_safe')
@@ -100,18 +100,22 @@ class TestCreateWorktreeEnv:
 
     @patch('utils.plan.worktree.create_worktree')
     @patch('utils.plan.worktree.setup_worktree_environment')
+    @patch('utils.plan.worktree.WorktreeProvisioner')
+    @patch('utils.plan.worktree.write_provisioning_report')
     @patch('utils.plan.worktree.execute_template')
     @patch('utils.plan.worktree.make_issue_comment_safe')
     def test_creates_worktree_successfully(
-        self, mock_comment, mock_execute, mock_setup_env, mock_create_wt
+        self, mock_comment, mock_execute, mock_report, mock_provisioner, mock_setup_env, mock_create_wt
     ):
-        """Should create worktree and setup environment."""
+        """Should create worktree and provision it without an agent session."""
         from utils.plan.worktree import create_worktree_env
         from utils.plan.types import WorktreeContext
 
         # Setup mocks
         mock_create_wt.return_value = ("/path/to/worktree", None)
-        mock_execute.return_value = Mock(success=True, output="OK")
+        mock_provisioner.return_value.provision.return_value.to_dict.return_value = {
+            "method": "native", "success": True, "seconds": 1.5, "steps": [], "error": None
+        }
 
         mock_state = Mock()
         mock_state.update = Mock()
@@ -136,9 +140,43 @@ class TestCreateWorktreeEnv:
         assert result == "/path/to/worktree"
         mock_create_wt.assert_called_once()
         mock_setup_env.assert_called_once()
-        mock_execute.assert_called_once()
+        mock_provisioner.return_value.provision.assert_called_once_with("/path/to/worktree")
+        mock_execute.assert_not_called()
+        mock_report.assert_called_once()
+        assert mock_report.call_args[0][1]["method"] == "native"
         mock_state.update.assert_called()
 
+    @pytest.mark.parametrize("env,native_success", [({}, False), ({"ADW_WORKTREE_PROVISIONER": "agent"}, True)])
+    @patch('utils.plan.worktree.create_worktree')
+    @patch('utils.plan.worktree.setup_worktree_environment')
+    @patch('utils.plan.worktree.WorktreeProvisioner')
+    @patch('utils.plan.worktree.write_provisioning_report')
+    @patch('utils.plan.worktree.execute_template')
+    @patch('utils.plan.worktree.make_issue_comment_safe')
+    def test_uses_install_worktree_agent(
+        self, mock_comment, mock_execute, mock_report, mock_provisioner, mock_setup_env, mock_create_wt,
+        env, native_success
+    ):
+        """Should use /install_worktree when configured or when native provisioning fails."""
+        from utils.plan.worktree import create_worktree_env
+        from utils.plan.types import WorktreeContext
+
+        mock_create_wt.return_value = ("/path/to/worktree", None)
+        mock_provisioner.return_value.provision.return_value.success = native_success
+        mock_execute.return_value = Mock(success=True, output="OK")
+
+        with patch.dict(os.environ, env):
+            create_worktree_env(
+                "test1234", "feat-branch",
+                WorktreeContext(worktree_path=None, websocket_port=8080, frontend_port=3000, is_valid=False),
+                Mock(), Mock(), "999", Mock()
+            )
+
+        assert mock_provisioner.called is not native_success
+        mock_execute.assert_called_once()
+        assert mock_execute.call_args[0][0].slash_command == "/install_worktree"
+        assert mock_report.call_args[0][1]["method"] == "agent"
+
     @patch('utils.plan.worktree.create_worktree')
     @patch('utils.plan.worktree.make_issue_comment_safe')
     def test_exits_on_worktree_creation_failure(self, mock_comment, mock_create_wt):
@@ -3,6 +3,7 @@
 import sys
 import os
 import logging
+import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
@@ -20,6 +21,7 @@ from adw_modules.workflow_ops import format_issue_message
 from adw_modules.github import make_issue_comment_safe
 from adw_modules.data_types import AgentTemplateRequest
 from adw_modules.agent import execute_template
+from adw_modules.worktree_provisioner import WorktreeProvisioner, write_provisioning_report
 
 from .types import WorktreeContext
 
@@ -138,38 +140,82 @@ def create_worktree_env(
     # Setup worktree environment (create .ports.env)
     setup_worktree_environment(worktree_path, ctx.websocket_port, ctx.frontend_port, logger)
 
-    # Run install_worktree command to set up the isolated environment
     logger.info("Setting up isolated environment with custom ports")
     notifier.notify_log("adw_plan_iso", f"Setting up environment (ports: WebSocket {ctx.websocket_port}/Frontend {ctx.frontend_port})", "INFO")
 
-    install_request = AgentTemplateRequest(
-        agent_name="ops",
-        slash_command="/install_worktree",
-        args=[worktree_path, str(ctx.websocket_port), str(ctx.frontend_port)],
-        adw_id=adw_id,
-        working_dir=worktree_path,
-    )
-
-    install_response = execute_template(install_request)
-
-    if not install_response.success:
-        logger.error(f"Error setting up worktree: {install_response.output}")
-        notifier.notify_error("adw_plan_iso", f"Error setting up worktree: {install_response.output}", "Setting up worktree")
+    provisioning = None
+    if os.getenv("ADW_WORKTREE_PROVISIONER", "native") != "agent":
+        result = WorktreeProvisioner(logger=logger).provision(worktree_path)
+        provisioning = result.to_dict()
+        if not result.success:
+            logger.warning(f"Native provisioning failed ({result.error}), falling back to /install_worktree")
+            provisioning = None
+
+    if provisioning is None:
+        provisioning = install_worktree_with_agent(adw_id, worktree_path, ctx, logger)
+
+    if not provisioning["success"]:
+        error = provisioning["error"]
+        logger.error(f"Error setting up worktree: {error}")
+        notifier.notify_error("adw_plan_iso", f"Error setting up worktree: {error}", "Setting up worktree")
         make_issue_comment_safe(
             issue_number,
-            format_issue_message(adw_id, "ops", f"Error setting up worktree: {install_response.output}"),
+            format_issue_message(adw_id, "ops", f"Error setting up worktree: {error}"),
             state
         )
         sys.exit(1)
 
+    # Kept per ADW to compare provisioning time across ADWs and methods
+    try:
+        write_provisioning_report(adw_id, provisioning)
+    except OSError as e:
+        logger.warning(f"Could not write provisioning report: {e}")
+    logger.info(f"Provisioned worktree via {provisioning['method']} in {provisioning['seconds']:.1f}s")
+
     logger.info("Worktree environment setup complete")
     notifier.notify_log("adw_plan_iso", "Worktree environment ready", "SUCCESS")
 
     make_issue_comment_safe(
         issue_number,
         format_issue_message(adw_id, "ops", f"Working in isolated worktree: {worktree_path}\n"
-                           f"Ports - WebSocket: {ctx.websocket_port}, Frontend: {ctx.frontend_port}"),
+                           f"Ports - WebSocket: {ctx.websocket_port}, Frontend: {ctx.frontend_port}\n"
+                           f"Provisioned via {provisioning['method']} in {provisioning['seconds']:.1f}s"),
         state
     )
 
     return worktree_path
+
+
+def install_worktree_with_agent(
+    adw_id: str,
+    worktree_path: str,
+    ctx: WorktreeContext,
+    logger: logging.Logger
+) -> dict:
+    """Set up the worktree environment with the /install_worktree agent.
+
+    Used when ADW_WORKTREE_PROVISIONER=agent (to benchmark against the native
+    provisioner) or when native provisioning fails.
+
+    Returns:
+        Provisioning summary in the same shape as ProvisionResult.to_dict()
+    """
+    start = time.perf_counter()
+    install_request = AgentTemplateRequest(
+        agent_name="ops",
+        slash_command="/install_worktree",
+        args=[worktree_path, str(ctx.websocket_port), str(ctx.frontend_port)],
+        adw_id=adw_id,
+        working_dir=worktree_path,
+    )
+
+    install_response = execute_template(install_request)
+    seconds = time.perf_counter() - start
+
+    return {
+        "method": "agent",
+        "success": install_response.success,
+        "seconds": round(seconds, 3),
+        "steps": [{"name": "install_worktree", "seconds": seconds, "cache_hit": None, "detail": ""}],
+        "error": None if install_response.success else install_response.output,
+    }
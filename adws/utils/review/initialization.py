@@ -9,6 +9,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 
 from adw_modules.state import ADWState
 from adw_modules.utils import setup_logger, check_env_vars
+from adw_modules.heartbeat import start_heartbeat
 from adw_modules.github import make_issue_comment
 from adw_modules.worktree_ops import validate_worktree
 from adw_modules.workflow_ops import format_issue_message, find_spec_file
@@ -98,6 +99,7 @@ def initialize_review_workflow(
     # Set up logger with ADW ID from command line
     logger = setup_logger(adw_id, workflow_name)
     logger.info(f"ADW Review Iso starting - ID: {adw_id}, Issue: {issue_number}, Skip Resolution: {skip_resolution}")
+    start_heartbeat(adw_id, workflow_name)
 
     # Validate environment
     check_env_vars(logger)
@@ -8,6 +8,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 import logging
 from adw_modules.data_types import ReviewResult
 from adw_modules.r2_uploader import R2Uploader
+from adw_modules.artifact_index import index_artifact, SCREENSHOT
 
 
 def upload_review_screenshots(
@@ -34,7 +35,7 @@ def upload_review_screenshots(
     logger.info(f"Uploading {len(review_result.screenshots)} screenshots")
     uploader = R2Uploader(logger)
 
-    screenshot_urls = []
+    existing = []
     for local_path in review_result.screenshots:
         # Convert relative path to absolute path within worktree
         abs_path = os.path.join(worktree_path, local_path)
@@ -42,12 +43,17 @@ def upload_review_screenshots(
         if not os.path.exists(abs_path):
             logger.warning(f"Screenshot not found: {abs_path}")
             continue
+        existing.append((local_path, abs_path))
+        index_artifact(adw_id, SCREENSHOT, abs_path, logger)
+
+    # Uploads run concurrently and skip content already in R2
+    uploaded = uploader.upload_screenshots([abs_path for _, abs_path in existing], adw_id)
 
-        # Upload with a nice path
-        remote_path = f"adw/{adw_id}/review/{os.path.basename(local_path)}"
-        url = uploader.upload_file(abs_path, remote_path)
+    screenshot_urls = []
+    for local_path, abs_path in existing:
+        url = uploaded.get(abs_path)
 
-        if url:
+        if url and url != abs_path:
             screenshot_urls.append(url)
             logger.info(f"Uploaded screenshot to: {url}")
         else:
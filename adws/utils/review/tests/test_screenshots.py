@@ -38,10 +38,10 @@ class TestUploadReviewScreenshots:
         mock_exists.return_value = True
 
         mock_uploader = Mock()
-        mock_uploader.upload_file = Mock(side_effect=[
+        mock_uploader.upload_screenshots = Mock(side_effect=lambda paths, adw_id: dict(zip(paths, [
             "https://r2.example.com/screenshot1.png",
             "https://r2.example.com/screenshot2.png"
-        ])
+        ])))
         mock_uploader_class.return_value = mock_uploader
 
         result = ReviewResult(
@@ -57,7 +57,8 @@ class TestUploadReviewScreenshots:
         assert len(result.screenshot_urls) == 2
         assert result.screenshot_urls[0] == "https://r2.example.com/screenshot1.png"
         assert result.screenshot_urls[1] == "https://r2.example.com/screenshot2.png"
-        assert mock_uploader.upload_file.call_count == 2
+        mock_uploader.upload_screenshots.assert_called_once()
+        assert len(mock_uploader.upload_screenshots.call_args.args[0]) == 2
 
     @patch('utils.review.screenshots.R2Uploader')
     @patch('os.path.exists')
@@ -93,7 +94,8 @@ class TestUploadReviewScreenshots:
         mock_exists.return_value = True
 
         mock_uploader = Mock()
-        mock_uploader.upload_file = Mock(return_value=None)  # Upload fails
+        # Upload fails: the uploader maps the path back to itself
+        mock_uploader.upload_screenshots = Mock(side_effect=lambda paths, adw_id: {p: p for p in paths})
         mock_uploader_class.return_value = mock_uploader
 
         result = ReviewResult(
@@ -120,7 +122,9 @@ class TestUploadReviewScreenshots:
         mock_exists.return_value = True
 
         mock_uploader = Mock()
-        mock_uploader.upload_file = Mock(return_value="https://r2.example.com/screenshot1.png")
+        mock_uploader.upload_screenshots = Mock(
+            side_effect=lambda paths, adw_id: {p: "https://r2.example.com/screenshot1.png" for p in paths}
+        )
         mock_uploader_class.return_value = mock_uploader
 
         issue = ReviewIssue(
@@ -156,7 +160,9 @@ class TestUploadReviewScreenshots:
         mock_join.return_value = f"{mock_worktree_path}/screenshots/issue1.png"
 
         mock_uploader = Mock()
-        mock_uploader.upload_file = Mock(return_value="https://r2.example.com/screenshot1.png")
+        mock_uploader.upload_screenshots = Mock(
+            side_effect=lambda paths, adw_id: {p: "https://r2.example.com/screenshot1.png" for p in paths}
+        )
         mock_uploader_class.return_value = mock_uploader
 
         result = ReviewResult(
@@ -7,7 +7,9 @@ This orchestrator coordinates multiple review modes:
 - UI validation (Playwright)
 - AI review (Claude)
 
-It runs tools in parallel where possible and aggregates results.
+It runs tools in parallel where possible and aggregates results. By default
+tools only scan the files changed on the ADW branch (computed once against the
+merge base with the base branch); set ``scope="full"`` to scan the worktree.
 """
 
 import asyncio
@@ -30,6 +32,7 @@ from tools.bearer_runner import BearerRunner
 from tools.semgrep_runner import SemgrepRunner
 from tools.eslint_runner import ESLintRunner
 from tools.ruff_runner import RuffRunner
+from tools.changed_files import ChangedFiles, get_changed_files
 
 
 class ReviewOrchestrator:
@@ -185,11 +188,13 @@ class ReviewOrchestrator:
             if "ruff" in self.runners:
                 runners_to_run.append(self.runners["ruff"])
 
+        changed_files = await self._resolve_changed_files() if runners_to_run else None
+
         # Check availability and create tasks
         for runner in runners_to_run:
             if runner.is_available():
                 self.logger.info(f"Running {runner.tool_name}...")
-                tasks.append(runner.execute(self.worktree_path))
+                tasks.append(runner.execute(self.worktree_path, changed_files))
             else:
                 self.logger.warning(f"{runner.tool_name} is not available, skipping")
                 # Add a "not available" result
@@ -218,6 +223,35 @@ class ReviewOrchestrator:
 
         return processed_results
 
+    async def _resolve_changed_files(self) -> ChangedFiles | None:
+        """Compute the diff-scoped file list once for all runners.
+
+        Returns:
+            ChangedFiles for a diff-scoped review, or None for a full scan
+            (configured, or the merge base could not be determined)
+        """
+        if self.config.scope != "changed":
+            self.logger.info("Review scope: full worktree scan")
+            return None
+
+        start = datetime.now()
+        changed_files = await asyncio.to_thread(
+            get_changed_files, self.worktree_path, self.config.base_branch
+        )
+        elapsed_ms = int((datetime.now() - start).total_seconds() * 1000)
+
+        if changed_files is None:
+            self.logger.warning(
+                f"Could not diff against {self.config.base_branch}, falling back to full scan"
+            )
+            return None
+
+        self.logger.info(
+            f"Review scope: {len(changed_files.files)} changed files since "
+            f"{changed_files.merge_base[:8]} ({elapsed_ms}ms to compute)"
+        )
+        return changed_files
+
     async def _not_available_result(self, runner) -> ReviewModeResult:
         """Create a result for unavailable tool."""
         return ReviewModeResult(
@@ -309,6 +343,18 @@ class ReviewOrchestrator:
         for severity, count in result.total_finding_counts.items():
             lines.append(f"| {severity.capitalize()} | {count} |")
 
+        if result.mode_results:
+            lines.extend([
+                "",
+                "### Tool Timings",
+                "",
+                "| Tool | Scope | Files | Duration |",
+                "|------|-------|-------|----------|",
+            ])
+            for r in result.mode_results:
+                files = r.files_scanned if r.files_scanned is not None else "all"
+                lines.append(f"| {r.tool_name} | {r.scope} | {files} | {r.duration_ms}ms |")
+
         lines.extend([
             "",
             "## Detailed Findings",
@@ -8,6 +8,7 @@ sys.path.insert(0, __file__.rsplit('/', 3)[0])
 
 from adw_modules.state import ADWState
 from adw_modules.utils import setup_logger
+from adw_modules.heartbeat import start_heartbeat
 from adw_modules.websocket_client import WebSocketNotifier
 from adw_modules.github import make_issue_comment
 
@@ -84,6 +85,7 @@ def initialize_test_workflow(
     # Set up logger
     logger = setup_logger(adw_id, workflow_name)
     logger.info(f"ADW Test Iso starting - ID: {adw_id}, Issue: {issue_number}, Skip E2E: {skip_e2e}")
+    start_heartbeat(adw_id, workflow_name)
 
     # Initialize WebSocket notifier
     notifier = WebSocketNotifier(adw_id)
@@ -124,6 +124,12 @@ if ! kill -0 $WEBSOCKET_PID 2>/dev/null; then
     exit 1
 fi
 
+# Complete ADWs as soon as their branches land on main (main project only)
+if [ -z "$ADWID" ]; then
+    echo -e "${GREEN}Starting merged-branch reconciler...${NC}"
+    uv run server/scripts/detect_merged_worktrees.py --watch &
+fi
+
 # Start frontend
 echo -e "${GREEN}Starting frontend server on port $CLIENT_PORT...${NC}"
 cd "$PROJECT_ROOT"
@@ -4,15 +4,19 @@ ADW Database API endpoints.
 Provides CRUD operations for ADW states backed by SQLite database.
 """
 
+import heapq
 import json
 import logging
+import sqlite3
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from itertools import islice
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Literal, Tuple
 from fastapi import APIRouter, HTTPException, Request, Query
 from pydantic import BaseModel
 
 try:
-    from ..core.database import get_db_manager
+    from ..core.database import adw_list_query, get_db_manager
     from ..models.adw_db_models import (
         ADWStateCreate,
         ADWStateUpdate,
@@ -21,10 +25,12 @@ try:
         ADWActivityLogCreate,
         ADWActivityLogResponse,
         ADWActivityHistoryResponse,
+        ADWKpiResponse,
+        ADWStageKpis,
         HealthCheckResponse,
     )
 except ImportError:
-    from core.database import get_db_manager
+    from core.database import adw_list_query, get_db_manager
     from models.adw_db_models import (
         ADWStateCreate,
         ADWStateUpdate,
@@ -33,11 +39,38 @@ except ImportError:
         ADWActivityLogCreate,
         ADWActivityLogResponse,
         ADWActivityHistoryResponse,
+        ADWKpiResponse,
+        ADWStageKpis,
         HealthCheckResponse,
     )
 
 logger = logging.getLogger(__name__)
 
+# Approximate activity counts stop scanning after this many rows
+ACTIVITY_COUNT_APPROXIMATE_LIMIT = 10000
+
+# Per-stage KPIs derived from adw_kpi_stage_metrics (kept in step with
+# adws/adw_modules/kpi_engine.py). Orchestrator duration and attempts win
+# over values reconstructed from stage transitions.
+STAGE_KPIS_QUERY = """
+    SELECT
+        adw_id,
+        stage,
+        stage_status AS status,
+        COALESCE(duration_seconds, time_in_stage_seconds) AS cycle_time_seconds,
+        MAX(attempts, entries) AS attempts,
+        MAX(MAX(attempts, entries) - 1, 0) AS retries,
+        errors, agent_runs, num_turns, input_tokens, output_tokens,
+        cache_creation_tokens, cache_read_tokens, cost_usd,
+        started_at
+    FROM adw_kpi_stage_metrics
+"""
+
+KPI_SUM_FIELDS = (
+    "attempts", "retries", "errors", "agent_runs", "num_turns", "input_tokens",
+    "output_tokens", "cache_creation_tokens", "cache_read_tokens", "cost_usd",
+)
+
 router = APIRouter()
 
 
@@ -108,73 +141,86 @@ async def create_adw(adw_data: ADWStateCreate, request: Request):
     db_manager = get_db_manager()
 
     try:
-        # Check if ADW ID already exists
-        existing = db_manager.execute_query(
-            "SELECT id FROM adw_states WHERE adw_id = ?",
-            (adw_data.adw_id,)
-        )
-        if existing:
-            raise HTTPException(
-                status_code=409,
-                detail=f"ADW with ID {adw_data.adw_id} already exists"
-            )
+        # Prepare JSON fields
+        issue_json_str = json.dumps(adw_data.issue_json) if adw_data.issue_json else None
+        orchestrator_state_str = json.dumps(adw_data.orchestrator_state) if adw_data.orchestrator_state else None
 
-        # Validate issue_number uniqueness if provided
-        if adw_data.issue_number is not None:
-            # Check if issue_number already exists in issue_tracker
-            existing_issue = db_manager.execute_query(
-                "SELECT id FROM issue_tracker WHERE issue_number = ? AND deleted_at IS NULL",
-                (adw_data.issue_number,)
-            )
-            if existing_issue:
+        # Checks, issue number allocation and inserts share one write lock, so
+        # concurrent creations can neither both pass a check nor reuse a number
+        with db_manager.immediate_transaction() as conn:
+            # Check if ADW ID already exists
+            existing = conn.execute(
+                "SELECT id FROM adw_states WHERE adw_id = ?",
+                (adw_data.adw_id,)
+            ).fetchone()
+            if existing:
                 raise HTTPException(
                     status_code=409,
-                    detail=f"Issue number {adw_data.issue_number} already exists in issue_tracker"
+                    detail=f"ADW with ID {adw_data.adw_id} already exists"
                 )
 
-        # Prepare JSON fields
-        issue_json_str = json.dumps(adw_data.issue_json) if adw_data.issue_json else None
-        orchestrator_state_str = json.dumps(adw_data.orchestrator_state) if adw_data.orchestrator_state else None
-
-        # Insert ADW state
-        query = """
-            INSERT INTO adw_states (
-                adw_id, issue_number, issue_title, issue_body, issue_class,
-                branch_name, worktree_path, current_stage, status,
-                workflow_name, model_set, data_source, issue_json,
-                orchestrator_state, backend_port, websocket_port, frontend_port
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
+            issue_number = adw_data.issue_number
+            if issue_number is not None:
+                # Validate issue_number uniqueness
+                existing_issue = conn.execute(
+                    "SELECT id FROM issue_tracker WHERE issue_number = ? AND deleted_at IS NULL",
+                    (issue_number,)
+                ).fetchone()
+                if existing_issue:
+                    raise HTTPException(
+                        status_code=409,
+                        detail=f"Issue number {issue_number} already exists in issue_tracker"
+                    )
+            elif adw_data.allocate_issue_number:
+                # Linked to the ADW once its row exists (foreign key)
+                issue_number = db_manager.allocate_issue_numbers(
+                    [{"issue_title": adw_data.issue_title or adw_data.adw_id}], conn
+                )[0]
+
+            # Insert ADW state
+            query = """
+                INSERT INTO adw_states (
+                    adw_id, issue_number, issue_title, issue_body, issue_class,
+                    branch_name, worktree_path, current_stage, status,
+                    workflow_name, model_set, data_source, issue_json,
+                    orchestrator_state, backend_port, websocket_port, frontend_port
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """
 
-        params = (
-            adw_data.adw_id,
-            adw_data.issue_number,
-            adw_data.issue_title,
-            adw_data.issue_body,
-            adw_data.issue_class,
-            adw_data.branch_name,
-            adw_data.worktree_path,
-            adw_data.current_stage,
-            adw_data.status,
-            adw_data.workflow_name,
-            adw_data.model_set,
-            adw_data.data_source,
-            issue_json_str,
-            orchestrator_state_str,
-            adw_data.backend_port,
-            adw_data.websocket_port,
-            adw_data.frontend_port
-        )
+            params = (
+                adw_data.adw_id,
+                issue_number,
+                adw_data.issue_title,
+                adw_data.issue_body,
+                adw_data.issue_class,
+                adw_data.branch_name,
+                adw_data.worktree_path,
+                adw_data.current_stage,
+                adw_data.status,
+                adw_data.workflow_name,
+                adw_data.model_set,
+                adw_data.data_source,
+                issue_json_str,
+                orchestrator_state_str,
+                adw_data.backend_port,
+                adw_data.websocket_port,
+                adw_data.frontend_port
+            )
 
-        row_id = db_manager.execute_insert(query, params)
+            row_id = conn.execute(query, params).lastrowid
+            if issue_number is not None and adw_data.issue_number is None:
+                conn.execute(
+                    "UPDATE issue_tracker SET adw_id = ? WHERE issue_number = ?",
+                    (adw_data.adw_id, issue_number)
+                )
 
-        # Log creation activity
-        log_query = """
-            INSERT INTO adw_activity_logs (adw_id, event_type, event_data)
-            VALUES (?, ?, ?)
-        """
-        log_data = json.dumps({"created_from": "api", "timestamp": datetime.utcnow().isoformat()})
-        db_manager.execute_insert(log_query, (adw_data.adw_id, "workflow_started", log_data))
+            # Log creation activity
+            log_query = """
+                INSERT INTO adw_activity_logs (adw_id, event_type, event_data)
+                VALUES (?, ?, ?)
+            """
+            log_data = json.dumps({"created_from": "api", "timestamp": datetime.utcnow().isoformat()})
+            conn.execute(log_query, (adw_data.adw_id, "workflow_started", log_data))
 
         # Fetch the created ADW
         created_adw = db_manager.execute_query(
@@ -192,7 +238,7 @@ async def create_adw(adw_data: ADWStateCreate, request: Request):
                     context={
                         "adw_id": adw_data.adw_id,
                         "event_type": "adw_created",
-                        "issue_number": adw_data.issue_number
+                        "issue_number": issue_number
                     }
                 )
             except Exception as e:
@@ -233,28 +279,8 @@ async def list_adws(
     db_manager = get_db_manager()
 
     try:
-        # Build query with filters
-        query = "SELECT * FROM adw_states WHERE 1=1"
-        params = []
-
-        if not include_deleted:
-            query += " AND deleted_at IS NULL"
-
-        if status:
-            query += " AND status = ?"
-            params.append(status)
-
-        if stage:
-            query += " AND current_stage = ?"
-            params.append(stage)
-
-        if is_stuck is not None:
-            query += " AND is_stuck = ?"
-            params.append(1 if is_stuck else 0)
-
-        query += " ORDER BY created_at DESC"
-
-        results = db_manager.execute_query(query, tuple(params))
+        query, params = adw_list_query(status, stage, is_stuck, include_deleted)
+        results = db_manager.execute_query(query, params)
 
         adws = [dict_to_adw_response(row) for row in results]
 
@@ -408,6 +434,9 @@ async def update_adw(adw_id: str, update_data: ADWStateUpdate, request: Request)
             # No fields to update, just return current state
             return dict_to_adw_response(existing[0])
 
+        # Set updated_at here so the updated_at trigger doesn't rewrite the row
+        update_fields.append("updated_at = CURRENT_TIMESTAMP")
+
         # Execute update
         query = f"UPDATE adw_states SET {', '.join(update_fields)} WHERE adw_id = ?"
         params.append(adw_id)
@@ -513,19 +542,148 @@ async def log_activity(adw_id: str, activity_data: ADWActivityLogCreate):
         )
 
 
+def _open_activity_archive(db_path: Path) -> Optional[sqlite3.Connection]:
+    """
+    Read-only connection to the activity archive next to db_path.
+
+    adws/adw_modules/activity_retention.py moves the activity of finished and
+    deleted ADWs there.
+
+    Returns:
+        The connection, or None if nothing has been archived yet
+    """
+    archive_path = db_path.with_name(f"{db_path.stem}_archive{db_path.suffix}")
+    if not archive_path.exists():
+        return None
+    conn = sqlite3.connect(f"{archive_path.resolve().as_uri()}?mode=ro", uri=True, timeout=10.0)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _activity_page(
+    sources: List[sqlite3.Connection],
+    adw_id: str,
+    page: int,
+    page_size: int,
+    before_id: Optional[int],
+    count: str
+) -> Tuple[List[Dict[str, Any]], Optional[int], bool]:
+    """
+    One page of an ADW's adw_activity_logs rows across sources, newest first.
+
+    Each source is read in (timestamp, id) order and the results are merged,
+    so rows split between the live database and the archive page as one
+    history (activity ids are unique across both).
+
+    Returns:
+        (rows, total_count, total_count_is_approximate); rows holds one
+        extra row when another page exists
+    """
+    total_count = None
+    total_count_is_approximate = False
+    if count == "exact":
+        total_count = sum(
+            conn.execute(
+                "SELECT COUNT(*) as count FROM adw_activity_logs WHERE adw_id = ?",
+                (adw_id,)
+            ).fetchone()['count']
+            for conn in sources
+        )
+    elif count == "approximate":
+        total_count = min(ACTIVITY_COUNT_APPROXIMATE_LIMIT, sum(
+            conn.execute(
+                """
+                SELECT COUNT(*) as count FROM (
+                    SELECT 1 FROM adw_activity_logs WHERE adw_id = ? LIMIT ?
+                )
+                """,
+                (adw_id, ACTIVITY_COUNT_APPROXIMATE_LIMIT)
+            ).fetchone()['count']
+            for conn in sources
+        ))
+        total_count_is_approximate = total_count >= ACTIVITY_COUNT_APPROXIMATE_LIMIT
+
+    # Fetch one extra row to know whether another page exists
+    offset = 0
+    if before_id is not None:
+        cursor_row = None
+        for conn in sources:
+            cursor_row = conn.execute(
+                "SELECT timestamp, id FROM adw_activity_logs WHERE id = ? AND adw_id = ?",
+                (before_id, adw_id)
+            ).fetchone()
+            if cursor_row:
+                break
+        if not cursor_row:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Activity {before_id} not found for ADW {adw_id}"
+            )
+        query = """
+            SELECT * FROM adw_activity_logs
+            WHERE adw_id = ? AND (timestamp, id) < (?, ?)
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ? OFFSET ?
+        """
+        params = (adw_id, cursor_row['timestamp'], cursor_row['id'])
+    else:
+        query = """
+            SELECT * FROM adw_activity_logs
+            WHERE adw_id = ?
+            ORDER BY timestamp DESC, id DESC
+            LIMIT ? OFFSET ?
+        """
+        params = (adw_id,)
+        offset = (page - 1) * page_size
+
+    if len(sources) == 1:
+        return (
+            [dict(row) for row in sources[0].execute(query, (*params, page_size + 1, offset)).fetchall()],
+            total_count,
+            total_count_is_approximate
+        )
+
+    # Any source may hold every row up to the end of the page
+    runs = [
+        [dict(row) for row in conn.execute(query, (*params, offset + page_size + 1, 0)).fetchall()]
+        for conn in sources
+    ]
+    merged = heapq.merge(*runs, key=lambda row: (row['timestamp'], row['id']), reverse=True)
+    results = list(islice(merged, offset, offset + page_size + 1))
+    return results, total_count, total_count_is_approximate
+
+
 @router.get("/adws/{adw_id}/activity", response_model=ADWActivityHistoryResponse)
 async def get_activity_history(
     adw_id: str,
     page: int = Query(1, ge=1),
-    page_size: int = Query(100, ge=1, le=1000)
+    page_size: int = Query(100, ge=1, le=1000),
+    before_id: Optional[int] = Query(
+        None, description="Keyset cursor: return activities older than this activity ID"
+    ),
+    count: Literal["exact", "approximate", "none"] = Query(
+        "exact", description="How to compute total_count"
+    )
 ):
     """
     Get activity history for an ADW with pagination.
 
+    Pass the previous response's next_before_id as before_id to page through
+    history with a keyset cursor; each page is then an index range scan on
+    (adw_id, timestamp, id) instead of an OFFSET that walks every skipped row.
+    page is ignored when before_id is given.
+
+    Activity archived for finished or deleted ADWs (see
+    adws/adw_modules/activity_retention.py) is merged in from the archive
+    database, ordered and paginated together with the live rows.
+
     Args:
         adw_id: ADW identifier
-        page: Page number (1-indexed)
+        page: Page number (1-indexed), for offset pagination
         page_size: Number of items per page
+        before_id: Activity ID cursor for keyset pagination
+        count: "exact" counts every row, "approximate" stops counting at
+            ACTIVITY_COUNT_APPROXIMATE_LIMIT, "none" skips the count
 
     Returns:
         Paginated activity history
@@ -533,34 +691,32 @@ async def get_activity_history(
     db_manager = get_db_manager()
 
     try:
-        # Verify ADW exists
-        existing = db_manager.execute_query(
-            "SELECT id FROM adw_states WHERE adw_id = ?",
-            (adw_id,)
-        )
-        if not existing:
-            raise HTTPException(
-                status_code=404,
-                detail=f"ADW {adw_id} not found"
-            )
-
-        # Get total count
-        count_result = db_manager.execute_query(
-            "SELECT COUNT(*) as count FROM adw_activity_logs WHERE adw_id = ?",
-            (adw_id,)
-        )
-        total_count = count_result[0]['count']
+        with db_manager.get_connection() as conn:
+            # Verify ADW exists
+            existing = conn.execute(
+                "SELECT id FROM adw_states WHERE adw_id = ?",
+                (adw_id,)
+            ).fetchone()
+            if not existing:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"ADW {adw_id} not found"
+                )
 
-        # Get paginated activities
-        offset = (page - 1) * page_size
-        query = """
-            SELECT * FROM adw_activity_logs
-            WHERE adw_id = ?
-            ORDER BY timestamp DESC
-            LIMIT ? OFFSET ?
-        """
+            # Finished and deleted ADWs have their history in the archive
+            # database; activity logged after archiving is still in this one
+            archive = _open_activity_archive(Path(db_manager.db_path))
+            try:
+                results, total_count, total_count_is_approximate = _activity_page(
+                    [conn, archive] if archive is not None else [conn],
+                    adw_id, page, page_size, before_id, count
+                )
+            finally:
+                if archive is not None:
+                    archive.close()
 
-        results = db_manager.execute_query(query, (adw_id, page_size, offset))
+        has_more = len(results) > page_size
+        results = results[:page_size]
 
         activities = []
         for row in results:
@@ -592,8 +748,11 @@ async def get_activity_history(
             adw_id=adw_id,
             activities=activities,
             total_count=total_count,
+            total_count_is_approximate=total_count_is_approximate,
             page=page,
-            page_size=page_size
+            page_size=page_size,
+            has_more=has_more,
+            next_before_id=activities[-1].id if has_more else None
         )
 
     except HTTPException:
@@ -606,6 +765,160 @@ async def get_activity_history(
         )
 
 
+@router.get("/adws/{adw_id}/activity/daily")
+async def get_activity_daily(adw_id: str):
+    """
+    Get daily event counts for activity rolled out of the per-event log.
+
+    Activity older than ADW_ACTIVITY_ROLLUP_DAYS is kept only as these counts
+    (adws/adw_modules/activity_retention.py); the full history of archived
+    ADWs lives in the archive database instead.
+
+    Args:
+        adw_id: ADW identifier
+
+    Returns:
+        Daily counts per event type, newest day first
+    """
+    db_manager = get_db_manager()
+
+    try:
+        rows = db_manager.execute_query(
+            """
+            SELECT day, event_type, event_count, first_at, last_at
+            FROM adw_activity_daily
+            WHERE adw_id = ?
+            ORDER BY day DESC, event_type
+            """,
+            (adw_id,)
+        )
+        return {"adw_id": adw_id, "days": rows}
+
+    except Exception as e:
+        logger.error(f"Error getting daily activity for ADW {adw_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
+def _sum_stage_kpis(stage: str, rows: List[Dict[str, Any]]) -> ADWStageKpis:
+    """Sum KPI rows into one ADWStageKpis."""
+    totals = {field: sum(row[field] for row in rows) for field in KPI_SUM_FIELDS}
+    totals['cost_usd'] = round(totals['cost_usd'], 6)
+    return ADWStageKpis(
+        stage=stage,
+        cycle_time_seconds=round(sum(row['cycle_time_seconds'] for row in rows), 3),
+        **totals
+    )
+
+
+@router.get("/adws/{adw_id}/kpis", response_model=ADWKpiResponse)
+async def get_adw_kpis(adw_id: str):
+    """
+    Get per-stage KPIs for an ADW.
+
+    KPIs (cycle time, attempts, retries, token usage and cost) are aggregated
+    incrementally by the ADW workflows' KPI engine; this endpoint only reads
+    the aggregates.
+
+    Args:
+        adw_id: ADW identifier
+
+    Returns:
+        Per-stage KPIs and their totals
+    """
+    db_manager = get_db_manager()
+
+    try:
+        with db_manager.get_connection() as conn:
+            existing = conn.execute(
+                "SELECT id FROM adw_states WHERE adw_id = ?",
+                (adw_id,)
+            ).fetchone()
+            if not existing:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"ADW {adw_id} not found"
+                )
+
+            rows = [dict(row) for row in conn.execute(
+                STAGE_KPIS_QUERY + " WHERE adw_id = ? ORDER BY started_at IS NULL, started_at, stage",
+                (adw_id,)
+            ).fetchall()]
+
+        return ADWKpiResponse(
+            adw_id=adw_id,
+            adw_count=1 if rows else 0,
+            stages=[ADWStageKpis(**row) for row in rows],
+            totals=_sum_stage_kpis("total", rows)
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting KPIs for ADW {adw_id}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
+@router.get("/kpis", response_model=ADWKpiResponse)
+async def get_kpi_summary(
+    since: Optional[datetime] = Query(
+        None, description="Only include ADWs created at or after this time"
+    )
+):
+    """
+    Get KPIs summed per stage across ADWs (deleted ADWs excluded).
+
+    cycle_time_seconds is the mean per ADW that ran the stage; the other
+    counters are sums.
+
+    Args:
+        since: Optional lower bound on ADW creation time
+
+    Returns:
+        Per-stage KPI summary and totals
+    """
+    db_manager = get_db_manager()
+
+    try:
+        query = STAGE_KPIS_QUERY + """
+            WHERE adw_id IN (SELECT adw_id FROM adw_states WHERE deleted_at IS NULL AND created_at >= ?)
+        """
+        since_value = since.strftime('%Y-%m-%d %H:%M:%S') if since else '0'
+        with db_manager.get_connection() as conn:
+            rows = [dict(row) for row in conn.execute(query, (since_value,)).fetchall()]
+
+        by_stage: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_stage.setdefault(row['stage'], []).append(row)
+
+        stages = []
+        for stage, stage_rows in sorted(by_stage.items()):
+            summary = _sum_stage_kpis(stage, stage_rows)
+            summary.adw_count = len(stage_rows)
+            summary.cycle_time_seconds = round(summary.cycle_time_seconds / len(stage_rows), 3)
+            stages.append(summary)
+
+        adw_count = len({row['adw_id'] for row in rows})
+        totals = _sum_stage_kpis("total", rows)
+        totals.adw_count = adw_count
+        if adw_count:
+            totals.cycle_time_seconds = round(totals.cycle_time_seconds / adw_count, 3)
+
+        return ADWKpiResponse(adw_count=adw_count, stages=stages, totals=totals)
+
+    except Exception as e:
+        logger.error(f"Error getting KPI summary: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
 @router.get("/health", response_model=HealthCheckResponse)
 async def health_check():
     """
@@ -625,9 +938,10 @@ async def detect_stuck_workflows(adw_id: Optional[str] = None):
     """
     Detect and flag stuck workflows.
 
-    Flags workflows as stuck if:
-    - In same stage for > 30 minutes with no activity
-    - Last activity shows error
+    Flags workflows as stuck if they are in progress with no activity for
+    > 30 minutes. ADWs whose processes report heartbeats are skipped: the
+    trigger server's liveness monitor checks those continuously
+    (adws/adw_modules/liveness_monitor.py).
 
     Args:
         adw_id: Optional specific ADW ID to check (if None, checks all)
@@ -648,8 +962,10 @@ async def detect_stuck_workflows(adw_id: Optional[str] = None):
                 SET is_stuck = 1
                 WHERE adw_id = ?
                 AND status = 'in_progress'
+                AND deleted_at IS NULL
                 AND updated_at < ?
                 AND is_stuck = 0
+                AND adw_id NOT IN (SELECT adw_id FROM adw_heartbeats)
             """
             params = (adw_id, threshold_time.isoformat())
         else:
@@ -658,8 +974,10 @@ async def detect_stuck_workflows(adw_id: Optional[str] = None):
                 UPDATE adw_states
                 SET is_stuck = 1
                 WHERE status = 'in_progress'
+                AND deleted_at IS NULL
                 AND updated_at < ?
                 AND is_stuck = 0
+                AND adw_id NOT IN (SELECT adw_id FROM adw_heartbeats)
             """
             params = (threshold_time.isoformat(),)
 
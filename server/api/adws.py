@@ -32,6 +32,17 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Board listing of all non-deleted ADWs, newest first
+LIST_ADWS_SQL = """
+    SELECT adw_id, issue_number, issue_class, issue_title,
+           branch_name, status, current_stage, workflow_name,
+           patch_history, orchestrator_state,
+           CASE WHEN completed_at IS NOT NULL THEN 1 ELSE 0 END as completed
+    FROM adw_states
+    WHERE deleted_at IS NULL
+    ORDER BY created_at DESC
+"""
+
 def get_agents_directory() -> Path:
     """
     Get the path to the agents directory.
@@ -112,15 +123,7 @@ def _list_adws_from_database() -> List[Dict[str, Any]]:
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
-        cursor.execute("""
-            SELECT adw_id, issue_number, issue_class, issue_title,
-                   branch_name, status, current_stage, workflow_name,
-                   patch_history, orchestrator_state,
-                   CASE WHEN completed_at IS NOT NULL THEN 1 ELSE 0 END as completed
-            FROM adw_states
-            WHERE deleted_at IS NULL
-            ORDER BY created_at DESC
-        """)
+        cursor.execute(LIST_ADWS_SQL)
         rows = cursor.fetchall()
         conn.close()
 
@@ -487,6 +490,35 @@ async def get_adw_details(adw_id: str):
             detail=f"Internal server error: {str(e)}"
         )
 
+def _get_indexed_artifact(adw_id: str, artifact_type: str) -> Optional[Path]:
+    """Most recently modified existing artifact of a type from the adw_artifacts index."""
+    db_path = _get_db_path()
+    if not db_path:
+        return None
+
+    try:
+        conn = sqlite3.connect(str(db_path), timeout=5.0)
+        rows = conn.execute(
+            """
+            SELECT path FROM adw_artifacts
+            WHERE adw_id = ? AND artifact_type = ?
+            ORDER BY mtime DESC
+            """,
+            (adw_id, artifact_type)
+        ).fetchall()
+        conn.close()
+    except sqlite3.Error as e:
+        # The table is created by the ADW workflows or migration 009
+        logger.debug(f"Artifact index unavailable: {e}")
+        return None
+
+    for (path,) in rows:
+        if Path(path).exists():
+            logger.info(f"Found {artifact_type} for {adw_id} in artifact index: {path}")
+            return Path(path)
+    return None
+
+
 @router.get("/adws/{adw_id}/plan")
 async def get_adw_plan(adw_id: str):
     """
@@ -510,50 +542,54 @@ async def get_adw_plan(adw_id: str):
     try:
         logger.info(f"Fetching plan for ADW ID: {adw_id}")
 
-        # Get current file path to determine if we're in a worktree
-        current_file = Path(__file__).resolve()
-        current_root = current_file.parent.parent.parent
-
-        # Build list of directories to search
-        specs_directories = []
+        # Plans recorded by the planner are an indexed lookup; the crawl
+        # below covers plans written before the artifact index existed
+        plan_file = _get_indexed_artifact(adw_id, "plan")
 
-        # Add main project specs directory
-        main_specs_dir = get_specs_directory()
-        specs_directories.append(main_specs_dir)
-
-        # If we're in a worktree, also check the worktree's local specs directory
-        path_parts = current_root.parts
-        if 'trees' in path_parts:
-            worktree_specs_dir = current_root / "specs"
-            if worktree_specs_dir.exists():
-                specs_directories.append(worktree_specs_dir)
-                logger.info(f"Also searching worktree specs directory: {worktree_specs_dir}")
-
-        logger.info(f"Searching for plan files in {len(specs_directories)} directories")
-
-        # Search for plan files matching the pattern: issue-*-adw-{adw_id}-sdlc_planner-*.md
-        pattern = f"issue-*-adw-{adw_id}-sdlc_planner-*.md"
-        matching_files = []
-
-        for specs_dir in specs_directories:
-            if specs_dir.exists():
-                logger.info(f"Searching in: {specs_dir}")
-                files = list(specs_dir.glob(pattern))
-                matching_files.extend(files)
-                logger.info(f"Found {len(files)} files in {specs_dir}")
-
-        logger.info(f"Total files found matching pattern '{pattern}': {len(matching_files)}")
-
-        # If multiple files found, use the most recently modified one
-        plan_file = None
-        if matching_files:
-            # Sort by modification time (most recent first)
-            matching_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-            plan_file = matching_files[0]
-            if len(matching_files) > 1:
-                logger.warning(f"Multiple plan files found for ADW ID {adw_id}, using most recent: {plan_file.name}")
-            else:
-                logger.info(f"Found plan file: {plan_file.name}")
+        if not plan_file:
+            # Get current file path to determine if we're in a worktree
+            current_file = Path(__file__).resolve()
+            current_root = current_file.parent.parent.parent
+
+            # Build list of directories to search
+            specs_directories = []
+
+            # Add main project specs directory
+            main_specs_dir = get_specs_directory()
+            specs_directories.append(main_specs_dir)
+
+            # If we're in a worktree, also check the worktree's local specs directory
+            path_parts = current_root.parts
+            if 'trees' in path_parts:
+                worktree_specs_dir = current_root / "specs"
+                if worktree_specs_dir.exists():
+                    specs_directories.append(worktree_specs_dir)
+                    logger.info(f"Also searching worktree specs directory: {worktree_specs_dir}")
+
+            logger.info(f"Searching for plan files in {len(specs_directories)} directories")
+
+            # Search for plan files matching the pattern: issue-*-adw-{adw_id}-sdlc_planner-*.md
+            pattern = f"issue-*-adw-{adw_id}-sdlc_planner-*.md"
+            matching_files = []
+
+            for specs_dir in specs_directories:
+                if specs_dir.exists():
+                    logger.info(f"Searching in: {specs_dir}")
+                    files = list(specs_dir.glob(pattern))
+                    matching_files.extend(files)
+                    logger.info(f"Found {len(files)} files in {specs_dir}")
+
+            logger.info(f"Total files found matching pattern '{pattern}': {len(matching_files)}")
+
+            # If multiple files found, use the most recently modified one
+            if matching_files:
+                # Sort by modification time (most recent first)
+                matching_files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+                plan_file = matching_files[0]
+                if len(matching_files) > 1:
+                    logger.warning(f"Multiple plan files found for ADW ID {adw_id}, using most recent: {plan_file.name}")
+                else:
+                    logger.info(f"Found plan file: {plan_file.name}")
 
         # Fallback: If no plan file found by ADW ID, try to find by checking ADW state
         if not plan_file:
@@ -4,6 +4,7 @@ Issue Tracker API endpoints.
 Provides sequential issue number allocation and management.
 """
 
+import asyncio
 import logging
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Query
@@ -13,14 +14,18 @@ try:
     from ..models.adw_db_models import (
         IssueTrackerCreate,
         IssueTrackerResponse,
-        IssueAllocationResponse
+        IssueAllocationResponse,
+        IssueBatchAllocationRequest,
+        IssueBatchAllocationResponse
     )
 except ImportError:
     from core.database import get_db_manager
     from models.adw_db_models import (
         IssueTrackerCreate,
         IssueTrackerResponse,
-        IssueAllocationResponse
+        IssueAllocationResponse,
+        IssueBatchAllocationRequest,
+        IssueBatchAllocationResponse
     )
 
 logger = logging.getLogger(__name__)
@@ -33,8 +38,9 @@ async def allocate_issue_number(issue_data: IssueTrackerCreate):
     """
     Allocate the next sequential issue number with transaction safety.
 
-    Uses row-level locking to prevent race conditions during concurrent allocations.
-    Retries up to 3 times on unique constraint violations.
+    The number comes from the issue_counters sequence, bumped and inserted in
+    a single BEGIN IMMEDIATE transaction, so concurrent allocations queue on
+    the write lock instead of colliding and retrying.
 
     Args:
         issue_data: Issue creation data
@@ -43,76 +49,73 @@ async def allocate_issue_number(issue_data: IssueTrackerCreate):
         Allocated issue number and details
     """
     db_manager = get_db_manager()
-    max_retries = 3
-
-    for attempt in range(max_retries):
-        try:
-            with db_manager.transaction() as conn:
-                # Use SELECT FOR UPDATE to acquire row-level lock
-                # This prevents concurrent transactions from allocating the same number
-                query = """
-                    SELECT COALESCE(MAX(issue_number), 0) as max_number
-                    FROM issue_tracker
-                """
-                cursor = conn.execute(query)
-                result = cursor.fetchone()
-                next_number = result['max_number'] + 1
-
-                # Insert the new issue within the same transaction
-                insert_query = """
-                    INSERT INTO issue_tracker (issue_number, issue_title, project_id, adw_id)
-                    VALUES (?, ?, ?, ?)
-                """
-
-                params = (
-                    next_number,
-                    issue_data.issue_title,
-                    issue_data.project_id,
-                    issue_data.adw_id
-                )
-
-                conn.execute(insert_query, params)
-
-            logger.info(f"Allocated issue number {next_number} for '{issue_data.issue_title}'")
-
-            return IssueAllocationResponse(
-                issue_number=next_number,
-                issue_title=issue_data.issue_title,
-                adw_id=issue_data.adw_id,
-                message=f"Issue number {next_number} allocated successfully"
-            )
 
-        except Exception as e:
-            import sqlite3
-            # Check if this is a unique constraint violation
-            if isinstance(e, sqlite3.IntegrityError) and "UNIQUE constraint failed" in str(e):
-                logger.warning(
-                    f"Unique constraint violation on attempt {attempt + 1}/{max_retries}: {e}"
-                )
-                if attempt < max_retries - 1:
-                    # Retry on constraint violation
-                    import time
-                    time.sleep(0.1 * (attempt + 1))  # Exponential backoff
-                    continue
-                else:
-                    # Max retries exceeded
-                    logger.error(f"Failed to allocate issue number after {max_retries} attempts")
-                    raise HTTPException(
-                        status_code=409,
-                        detail="Unable to allocate unique issue number after multiple retries"
-                    )
-            else:
-                # Other errors - don't retry
-                logger.error(f"Error allocating issue number: {e}", exc_info=True)
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Internal server error: {str(e)}"
-                )
-
-    # Should never reach here, but just in case
-    raise HTTPException(
-        status_code=500,
-        detail="Failed to allocate issue number"
+    try:
+        # SQLite waits on the write lock - keep it off the event loop
+        numbers = await asyncio.to_thread(
+            db_manager.allocate_issue_numbers, [issue_data.model_dump()]
+        )
+    except Exception as e:
+        logger.error(f"Error allocating issue number: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+    next_number = numbers[0]
+    logger.info(f"Allocated issue number {next_number} for '{issue_data.issue_title}'")
+
+    return IssueAllocationResponse(
+        issue_number=next_number,
+        issue_title=issue_data.issue_title,
+        adw_id=issue_data.adw_id,
+        message=f"Issue number {next_number} allocated successfully"
+    )
+
+
+@router.post("/issues/allocate/batch", response_model=IssueBatchAllocationResponse, status_code=201)
+async def allocate_issue_numbers_batch(request: IssueBatchAllocationRequest):
+    """
+    Allocate a contiguous block of issue numbers in one transaction.
+
+    Intended for bulk card imports: one sequence update and one multi-row
+    insert instead of one round trip per card.
+
+    Args:
+        request: Issues to create, in the order numbers should be assigned
+
+    Returns:
+        First and last allocated numbers plus per-issue allocations
+    """
+    db_manager = get_db_manager()
+
+    try:
+        numbers = await asyncio.to_thread(
+            db_manager.allocate_issue_numbers,
+            [issue.model_dump() for issue in request.issues]
+        )
+    except Exception as e:
+        logger.error(f"Error allocating issue number block: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+    logger.info(f"Allocated issue numbers {numbers[0]}-{numbers[-1]} ({len(numbers)} issues)")
+
+    return IssueBatchAllocationResponse(
+        first_issue_number=numbers[0],
+        last_issue_number=numbers[-1],
+        allocations=[
+            IssueAllocationResponse(
+                issue_number=number,
+                issue_title=issue.issue_title,
+                adw_id=issue.adw_id,
+                message=f"Issue number {number} allocated successfully"
+            )
+            for number, issue in zip(numbers, request.issues)
+        ],
+        message=f"Allocated {len(numbers)} issue numbers"
     )
 
 
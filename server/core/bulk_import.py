@@ -0,0 +1,154 @@
+"""
+Bulk import helpers for the maintenance scripts.
+
+The JSON-to-database migration and the merged-worktree reconciliation used
+to read one file, open one connection and commit one transaction per ADW,
+which takes minutes once agents/ holds thousands of historical ADWs. These
+helpers let them:
+
+- read many files concurrently (file IO releases the GIL, so a thread pool
+  overlaps the reads)
+- write rows with ``executemany`` in chunks, one transaction per chunk,
+  falling back to row-by-row inserts only for a chunk that fails so one bad
+  row doesn't sink its neighbours
+- report progress and throughput while they run
+
+Usage:
+    progress = ProgressReporter(len(paths), "state files")
+    for path, data in read_parallel(paths, load_json):
+        progress.advance()
+    stats = write_chunked(db_manager.transaction, [(INSERT_SQL, rows)], chunk_size=500)
+"""
+
+import logging
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, Iterable, Iterator, List, Sequence, Tuple, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+DEFAULT_CHUNK_SIZE = 500
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def read_parallel(
+    items: Iterable[T],
+    reader: Callable[[T], R],
+    max_workers: int = DEFAULT_WORKERS
+) -> Iterator[Tuple[T, R]]:
+    """
+    Apply reader to every item on a thread pool, yielding in input order.
+
+    reader should handle its own errors; an exception propagates to the caller.
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield item, reader(item)
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from zip(items, executor.map(reader, items))
+
+
+class ProgressReporter:
+    """Logs progress and throughput at most every interval seconds."""
+
+    def __init__(self, total: int, label: str, interval: float = 2.0, log: logging.Logger = logger):
+        self.total = total
+        self.label = label
+        self.interval = interval
+        self.log = log
+        self.done = 0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def per_second(self) -> float:
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    def advance(self, count: int = 1) -> None:
+        self.done += count
+        now = time.perf_counter()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self.log.info(
+                f"Processed {self.done}/{self.total} {self.label} ({self.per_second:.0f}/s)"
+            )
+
+    def summary(self) -> Dict[str, float]:
+        return {"seconds": round(self.elapsed, 3), "per_second": round(self.per_second, 1)}
+
+
+@contextmanager
+def sqlite_transaction(db_path: Union[str, Path]) -> Iterator[sqlite3.Connection]:
+    """Open a connection for one transaction: commit on success, roll back on error."""
+    conn = sqlite3.connect(str(db_path), timeout=30.0)
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def write_chunked(
+    transaction: Callable[[], ContextManager[sqlite3.Connection]],
+    statements: List[Tuple[str, Sequence[tuple]]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_row_error: Callable[[int, Exception], None] = lambda index, error: None
+) -> Dict[str, int]:
+    """
+    Execute parallel row lists with executemany, one transaction per chunk.
+
+    transaction opens a transaction and yields its connection, e.g.
+    db_manager.transaction or lambda: sqlite_transaction(db_path).
+
+    statements pairs each SQL statement with its parameter rows; all row
+    lists have the same length and row i of every list belongs to the same
+    record, so a chunk always commits a record's rows together. If a chunk
+    fails, its records are retried one at a time and the failures reported
+    through on_row_error(index, error).
+
+    Returns:
+        {"written": records committed, "errors": records that failed}
+    """
+    lengths = {len(rows) for _, rows in statements}
+    if len(lengths) > 1:
+        raise ValueError("All statements need the same number of rows")
+    total = lengths.pop() if lengths else 0
+
+    written = errors = 0
+    for start in range(0, total, max(chunk_size, 1)):
+        end = min(start + chunk_size, total)
+        try:
+            with transaction() as conn:
+                for sql, rows in statements:
+                    conn.executemany(sql, rows[start:end])
+            written += end - start
+            continue
+        except sqlite3.Error as e:
+            logger.warning(f"Chunk of {end - start} rows failed ({e}), retrying row by row")
+
+        for index in range(start, end):
+            try:
+                with transaction() as conn:
+                    for sql, rows in statements:
+                        conn.execute(sql, rows[index])
+                written += 1
+            except sqlite3.Error as e:
+                errors += 1
+                on_row_error(index, e)
+
+    return {"written": written, "errors": errors}
@@ -8,13 +8,86 @@ transaction support, and schema initialization.
 import sqlite3
 import os
 import logging
+import re
 from pathlib import Path
 from contextlib import contextmanager
-from typing import Optional, Any, Dict, List
+from typing import Optional, Any, Dict, List, Tuple
 from threading import Lock
 
 logger = logging.getLogger(__name__)
 
+# schema.sql of this checkout (server/core/database.py -> root)
+SCHEMA_FILE = Path(__file__).resolve().parent.parent.parent / "adws" / "database" / "schema.sql"
+
+
+def schema_table_statements(tables: List[str], schema_file: Optional[Path] = None) -> List[str]:
+    """
+    CREATE TABLE and CREATE INDEX statements for tables, from schema.sql.
+
+    Lets migrations and modules that create their own tables do so without
+    repeating the table definitions.
+
+    Raises:
+        ValueError: If a table is not defined in schema.sql
+    """
+    if not tables:
+        return []
+    with open(schema_file or SCHEMA_FILE, 'r', encoding='utf-8') as f:
+        schema_sql = re.sub(r"--[^\n]*", "", f.read())
+
+    creates: Dict[str, str] = {}
+    indexes: List[str] = []
+    for statement in re.split(r";\s*\n", schema_sql):
+        statement = statement.strip()
+        table = re.match(r"CREATE TABLE IF NOT EXISTS (\w+)\s*\(", statement)
+        index = re.match(r"CREATE (?:UNIQUE )?INDEX IF NOT EXISTS \w+\s+ON (\w+)\s*\(", statement)
+        if table and table.group(1) in tables:
+            creates[table.group(1)] = statement
+        elif index and index.group(1) in tables:
+            indexes.append(statement)
+
+    missing = set(tables) - set(creates)
+    if missing:
+        raise ValueError(f"Tables not defined in schema.sql: {sorted(missing)}")
+    return [creates[table] for table in tables] + indexes
+
+
+def adw_list_query(
+    status: Optional[str] = None,
+    stage: Optional[str] = None,
+    is_stuck: Optional[bool] = None,
+    include_deleted: bool = False
+) -> Tuple[str, Tuple[Any, ...]]:
+    """
+    The Kanban board's filtered adw_states listing (GET /api/adws).
+
+    Each filter combination is served by one of the partial indexes on
+    adw_states, newest first, without sorting the whole table.
+
+    Returns:
+        (query, params)
+    """
+    query = "SELECT * FROM adw_states WHERE 1=1"
+    params: List[Any] = []
+
+    if not include_deleted:
+        query += " AND deleted_at IS NULL"
+
+    if status:
+        query += " AND status = ?"
+        params.append(status)
+
+    if stage:
+        query += " AND current_stage = ?"
+        params.append(stage)
+
+    if is_stuck is not None:
+        # Inlined rather than bound so SQLite can match the partial index on is_stuck = 1
+        query += " AND is_stuck = 1" if is_stuck else " AND is_stuck = 0"
+
+    query += " ORDER BY created_at DESC"
+    return query, tuple(params)
+
 
 class DatabaseManager:
     """
@@ -101,16 +174,14 @@ class DatabaseManager:
             self._initialized = True
             logger.info("Database initialization complete")
 
-    def _create_schema(self) -> None:
-        """Create database schema from schema.sql file."""
+    def _schema_file(self) -> Path:
+        """Locate schema.sql next to the database, or in this worktree."""
         schema_file = self.db_path.parent / "schema.sql"
 
         # If schema file doesn't exist in main project, try worktree location
         if not schema_file.exists():
             # Try worktree schema.sql
-            current_file = Path(__file__).resolve()
-            worktree_root = current_file.parent.parent.parent  # server/core/database.py -> root
-            worktree_schema = worktree_root / "adws" / "database" / "schema.sql"
+            worktree_schema = SCHEMA_FILE
 
             if worktree_schema.exists():
                 schema_file = worktree_schema
@@ -118,6 +189,12 @@ class DatabaseManager:
             else:
                 raise FileNotFoundError(f"Schema file not found: {schema_file} or {worktree_schema}")
 
+        return schema_file
+
+    def _create_schema(self) -> None:
+        """Create database schema from schema.sql file."""
+        schema_file = self._schema_file()
+
         # Read schema SQL
         with open(schema_file, 'r', encoding='utf-8') as f:
             schema_sql = f.read()
@@ -156,7 +233,7 @@ class DatabaseManager:
             self._run_migrations()
 
     def _run_migrations(self) -> None:
-        """Run database migrations to add missing columns."""
+        """Run database migrations to add missing columns and tables."""
         migrations = [
             # Migration 001: Add plan_file and all_adws columns
             {
@@ -166,8 +243,154 @@ class DatabaseManager:
                     ("adw_states", "all_adws", "TEXT"),
                 ],
             },
+            # Migration 002: Issue number sequence, seeded from existing issues
+            {
+                "version": "002_add_issue_counters",
+                "description": "Added issue_counters sequence table",
+                "tables": ["issue_counters"],
+                "statements": [
+                    """
+                    INSERT OR IGNORE INTO issue_counters (name, value)
+                    SELECT 'issue_number', COALESCE(MAX(issue_number), 0) FROM issue_tracker
+                    """,
+                ],
+            },
+            # Migration 003: Composite index for ordered activity history
+            {
+                "version": "003_activity_logs_adw_id_timestamp_index",
+                "description": "Replaced idx_activity_logs_adw_id with (adw_id, timestamp, id) index",
+                "statements": [
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_activity_logs_adw_id_timestamp
+                    ON adw_activity_logs(adw_id, timestamp DESC, id DESC)
+                    """,
+                    "DROP INDEX IF EXISTS idx_activity_logs_adw_id",
+                ],
+            },
+            # Migration 004: Only touch updated_at when the writer didn't set it
+            {
+                "version": "004_guard_updated_at_trigger",
+                "description": "Skip trg_adw_states_updated_at when updated_at is already current",
+                "statements": [
+                    "DROP TRIGGER IF EXISTS trg_adw_states_updated_at",
+                    """
+                    CREATE TRIGGER trg_adw_states_updated_at
+                    AFTER UPDATE ON adw_states
+                    FOR EACH ROW
+                    WHEN NEW.updated_at IS NOT CURRENT_TIMESTAMP
+                    BEGIN
+                        UPDATE adw_states SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+                    END
+                    """,
+                ],
+            },
+            # Migration 005: Persistent polling state for the GitHub cron trigger
+            {
+                "version": "005_add_github_poll_state",
+                "description": "Added github_poll_watermarks and github_issue_poll_state tables",
+                "tables": ["github_poll_watermarks", "github_issue_poll_state"],
+            },
+            # Migration 006: Durable outbox for GitHub issue comments
+            {
+                "version": "006_add_github_comment_outbox",
+                "description": "Added github_comment_outbox table",
+                "tables": ["github_comment_outbox"],
+            },
+            # Migration 007: Incrementally aggregated agentic KPIs
+            {
+                "version": "007_add_kpi_tables",
+                "description": "Added adw_kpi_stage_metrics, adw_kpi_cursors and adw_kpi_usage_offsets tables",
+                "tables": ["adw_kpi_stage_metrics", "adw_kpi_cursors", "adw_kpi_usage_offsets"],
+            },
+            # Migration 008: Spill table for resumable WebSocket events
+            {
+                "version": "008_add_websocket_event_log",
+                "description": "Added websocket_event_log table",
+                "tables": ["websocket_event_log"],
+            },
+            # Migration 009: Index of plans, specs and screenshots
+            {
+                "version": "009_add_artifact_index",
+                "description": "Added adw_artifacts table",
+                "tables": ["adw_artifacts"],
+            },
+            # Migration 010: Merge queue
+            {
+                "version": "010_add_merge_queue",
+                "description": "Added adw_merge_queue table",
+                "tables": ["adw_merge_queue"],
+            },
+            # Migration 011: JSON import bookkeeping for migrate_json_to_db.py
+            {
+                "version": "011_add_json_imports",
+                "description": "Added adw_json_imports table",
+                "tables": ["adw_json_imports"],
+            },
+            # Migration 012: Process heartbeats for the liveness monitor
+            {
+                "version": "012_add_heartbeats",
+                "description": "Added adw_heartbeats table and in_progress partial index",
+                "tables": ["adw_heartbeats"],
+                "statements": [
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_adw_states_in_progress ON adw_states(adw_id)
+                    WHERE status = 'in_progress' AND deleted_at IS NULL
+                    """,
+                ],
+            },
+            # Migration 013: Partial composite indexes for the Kanban board listings
+            {
+                "version": "013_add_board_indexes",
+                "description": "Replaced single-column adw_states indexes with partial composite indexes",
+                "statements": [
+                    "DROP INDEX IF EXISTS idx_adw_states_status",
+                    "DROP INDEX IF EXISTS idx_adw_states_current_stage",
+                    "DROP INDEX IF EXISTS idx_adw_states_is_stuck",
+                    "DROP INDEX IF EXISTS idx_adw_states_deleted_at",
+                    # Lets the liveness check seek on is_stuck = 0
+                    "DROP INDEX IF EXISTS idx_adw_states_in_progress",
+                    """
+                    CREATE INDEX idx_adw_states_in_progress ON adw_states(is_stuck)
+                    WHERE status = 'in_progress' AND deleted_at IS NULL
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_adw_states_active_created ON adw_states(created_at DESC)
+                    WHERE deleted_at IS NULL
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_adw_states_active_updated ON adw_states(updated_at DESC)
+                    WHERE deleted_at IS NULL
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_adw_states_active_status ON adw_states(status, created_at)
+                    WHERE deleted_at IS NULL
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_adw_states_active_stage ON adw_states(current_stage, created_at)
+                    WHERE deleted_at IS NULL
+                    """,
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_adw_states_stuck ON adw_states(created_at DESC)
+                    WHERE is_stuck = 1 AND deleted_at IS NULL
+                    """,
+                ],
+            },
+            # Migration 014: Daily rollups of old activity logs
+            {
+                "version": "014_add_activity_daily",
+                "description": "Added adw_activity_daily table for rolled-up activity logs",
+                "tables": ["adw_activity_daily"],
+            },
+            # Migration 015: Process start times so the liveness monitor can detect PID reuse
+            {
+                "version": "015_add_heartbeat_process_start",
+                "columns": [
+                    ("adw_heartbeats", "process_start", "INTEGER"),
+                ],
+            },
         ]
 
+        schema_file = self._schema_file()
         with self.transaction() as conn:
             for migration in migrations:
                 version = migration["version"]
@@ -190,10 +413,23 @@ class DatabaseManager:
                         logger.info(f"Adding column {column} to {table}")
                         conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
 
+                # Tables (and their indexes) are created from schema.sql
+                for statement in schema_table_statements(migration.get("tables", []), schema_file):
+                    conn.execute(statement)
+
+                # Statements must be idempotent - fresh databases already
+                # have the objects from schema.sql
+                for statement in migration.get("statements", []):
+                    conn.execute(statement)
+
                 # Record migration
+                description = migration.get(
+                    "description",
+                    f"Added columns: {[c[1] for c in migration.get('columns', [])]}"
+                )
                 conn.execute(
                     "INSERT INTO schema_migrations (version, description) VALUES (?, ?)",
-                    (version, f"Added columns: {[c[1] for c in migration.get('columns', [])]}")
+                    (version, description)
                 )
                 logger.info(f"Migration {version} applied successfully")
 
@@ -255,6 +491,28 @@ class DatabaseManager:
                 logger.error(f"Transaction rolled back due to error: {e}")
                 raise
 
+    @contextmanager
+    def immediate_transaction(self):
+        """
+        Context manager for write transactions that take the write lock up front.
+
+        Uses BEGIN IMMEDIATE so concurrent writers queue on SQLite's busy
+        timeout instead of reading stale data under a deferred transaction
+        and failing when they try to upgrade to a write lock.
+
+        Yields:
+            sqlite3.Connection: Database connection with transaction
+        """
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Transaction rolled back due to error: {e}")
+                raise
+
     def execute_query(
         self,
         query: str,
@@ -387,6 +645,86 @@ class DatabaseManager:
         shutil.copy2(self.db_path, backup_file)
         logger.info(f"Database backed up to {backup_file}")
 
+    def _reserve_issue_numbers(self, conn: sqlite3.Connection, count: int) -> int:
+        """
+        Bump the issue number sequence by count within an open write transaction.
+
+        The counter never drops below MAX(issue_number), so numbers inserted
+        outside the allocator (or reassigned by deduplicate_issue_numbers)
+        are never handed out again.
+
+        Args:
+            conn: Connection holding a write transaction
+            count: Number of issue numbers to reserve
+
+        Returns:
+            First issue number of the reserved block
+        """
+        query = """
+            UPDATE issue_counters
+            SET value = MAX(value, (SELECT COALESCE(MAX(issue_number), 0) FROM issue_tracker)) + ?
+            WHERE name = 'issue_number'
+            RETURNING value
+        """
+        row = conn.execute(query, (count,)).fetchone()
+        if row is None:
+            # Counter row missing (e.g. table created by hand) - seed and retry
+            conn.execute(
+                "INSERT OR IGNORE INTO issue_counters (name, value) VALUES ('issue_number', 0)"
+            )
+            row = conn.execute(query, (count,)).fetchone()
+
+        return row['value'] - count + 1
+
+    def allocate_issue_numbers(
+        self,
+        issues: List[Dict[str, Any]],
+        conn: Optional[sqlite3.Connection] = None
+    ) -> List[int]:
+        """
+        Allocate a contiguous block of issue numbers and create their issues.
+
+        Reserves the whole block with a single sequence update and inserts all
+        issue_tracker rows in the same BEGIN IMMEDIATE transaction, so
+        concurrent allocators never read the same value and never collide on
+        the UNIQUE constraint.
+
+        Args:
+            issues: Dicts with issue_title and optional project_id and adw_id
+            conn: Connection holding a BEGIN IMMEDIATE transaction to allocate
+                in, so the caller can insert rows using the numbers atomically
+                (defaults to a transaction of its own)
+
+        Returns:
+            Allocated issue numbers, in the same order as issues
+        """
+        if not issues:
+            return []
+
+        if conn is None:
+            with self.immediate_transaction() as conn:
+                return self.allocate_issue_numbers(issues, conn)
+
+        first_number = self._reserve_issue_numbers(conn, len(issues))
+        numbers = list(range(first_number, first_number + len(issues)))
+
+        conn.executemany(
+            """
+            INSERT INTO issue_tracker (issue_number, issue_title, project_id, adw_id)
+            VALUES (?, ?, ?, ?)
+            """,
+            [
+                (
+                    number,
+                    issue['issue_title'],
+                    issue.get('project_id') or 'default',
+                    issue.get('adw_id'),
+                )
+                for number, issue in zip(numbers, issues)
+            ]
+        )
+        return numbers
+
     def deduplicate_issue_numbers(self) -> Dict[str, Any]:
         """
         Deduplicate issue numbers in the issue_tracker table.
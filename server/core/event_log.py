@@ -0,0 +1,255 @@
+"""
+Event Log for Resumable WebSocket Broadcasts
+
+Stamps every broadcast event with a monotonically increasing sequence number
+and retains recent events so a reconnecting client can resume from the last
+sequence it saw instead of reloading the board and every open log panel.
+
+The newest events live in a bounded in-memory ring. Events evicted from the
+ring spill to an optional SQLite table, itself bounded, so a longer gap can
+still be replayed. Spilled events are written by a background thread, so
+broadcasting never waits on SQLite. Only when the gap reaches past everything retained (or
+the client's epoch belongs to a previous server process) does the client
+need a full snapshot.
+
+Resume protocol (client -> server):
+    {"type": "resume", "data": {"last_seq": 41, "epoch": "3f9c0a1b2c4d"}}
+
+Replies:
+    {"type": "resume_complete", "data": {"epoch", "seq", "events": [...]}}
+    {"type": "snapshot_required", "data": {"epoch", "seq", "reason"}}
+
+Clients should apply the replayed events, then any live events with a
+sequence above data.seq that arrived while the resume was in flight.
+
+A resume without last_seq just returns the current epoch and sequence.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from .database import schema_table_statements
+
+logger = logging.getLogger(__name__)
+
+# Connection-health events are not worth replaying and are not sequenced
+UNSEQUENCED_EVENT_TYPES = frozenset({'ping', 'heartbeat'})
+
+
+class EventLog:
+    """
+    Sequenced, bounded, replayable log of broadcast events.
+
+    Attributes:
+        source: Name of the server whose events these are (servers can share
+            one database)
+        epoch: Identifies this log; sequences from another epoch cannot resume
+        capacity: Events kept in memory
+        max_persisted: Evicted events kept in SQLite (when db_path is set)
+        unsequenced_event_types: UNSEQUENCED_EVENT_TYPES, for callers that
+            can't import this module
+    """
+
+    unsequenced_event_types = UNSEQUENCED_EVENT_TYPES
+
+    def __init__(
+        self,
+        source: str = "server",
+        capacity: int = 1000,
+        db_path: Optional[Union[str, Path]] = None,
+        max_persisted: int = 50000,
+        spill_batch_size: int = 100
+    ):
+        self.source = source
+        self.epoch = uuid.uuid4().hex[:12]
+        self.capacity = capacity
+        self.max_persisted = max_persisted
+        self.spill_batch_size = spill_batch_size
+
+        self._seq = 0
+        self._ring: Deque[Dict[str, Any]] = deque()
+        self._spill: List[Dict[str, Any]] = []
+        # Oldest sequence that can still be replayed
+        self._floor = 1
+        self._lock = threading.Lock()
+
+        # _conn reads replays; the writer thread spills through _writer_conn
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writer_conn: Optional[sqlite3.Connection] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._writing: Optional[Future] = None
+        if db_path:
+            self._conn = sqlite3.connect(str(db_path), timeout=5.0, check_same_thread=False)
+            # Sequences restart with the process, so older epochs can't be resumed
+            with self._conn:
+                for statement in schema_table_statements(["websocket_event_log"]):
+                    self._conn.execute(statement)
+                self._conn.execute(
+                    "DELETE FROM websocket_event_log WHERE source = ? AND epoch != ?",
+                    (self.source, self.epoch)
+                )
+            self._writer_conn = sqlite3.connect(str(db_path), timeout=5.0, check_same_thread=False)
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"event-log-{source}")
+
+    @property
+    def seq(self) -> int:
+        """Sequence of the most recent event (0 before the first)"""
+        return self._seq
+
+    def append(self, event: Dict[str, Any]) -> int:
+        """
+        Stamp an event with the next sequence number and retain it.
+
+        The event dict is modified in place (event['seq']).
+
+        Returns:
+            The event's sequence number
+        """
+        with self._lock:
+            self._seq += 1
+            event['seq'] = self._seq
+            self._ring.append(event)
+            if len(self._ring) > self.capacity:
+                evicted = self._ring.popleft()
+                if self._conn is None:
+                    self._floor = evicted['seq'] + 1
+                else:
+                    self._spill.append(evicted)
+                    self._schedule_spill()
+            return self._seq
+
+    def _schedule_spill(self) -> None:
+        """Hand a full spill to the writer thread (lock held; one write at a time)"""
+        if self._writer is not None and self._writing is None and len(self._spill) >= self.spill_batch_size:
+            self._writing = self._writer.submit(self._write_spill, list(self._spill))
+
+    def _write_spill(self, batch: List[Dict[str, Any]]) -> None:
+        """
+        Persist spilled events and trim the table to max_persisted (writer thread).
+
+        The events stay in _spill, and so replayable, until they are committed.
+        """
+        newest = batch[-1]['seq']
+        with self._lock:
+            # Raised before deleting, so a replay never reads a partly trimmed range
+            self._floor = max(self._floor, newest - self.max_persisted + 1)
+            floor = self._floor
+        failed = False
+        try:
+            with self._writer_conn:
+                self._writer_conn.executemany(
+                    "INSERT OR REPLACE INTO websocket_event_log (source, epoch, seq, event) VALUES (?, ?, ?, ?)",
+                    [(self.source, self.epoch, e['seq'], json.dumps(e, default=str)) for e in batch]
+                )
+                self._writer_conn.execute(
+                    "DELETE FROM websocket_event_log WHERE source = ? AND epoch = ? AND seq < ?",
+                    (self.source, self.epoch, floor)
+                )
+        except sqlite3.Error as e:
+            # Losing the spill only shortens how far back clients can resume
+            logger.error(f"Failed to spill events to SQLite: {e}")
+            failed = True
+        with self._lock:
+            del self._spill[:len(batch)]
+            if failed:
+                self._floor = max(self._floor, newest + 1)
+            self._writing = None
+            self._schedule_spill()
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait until spills handed to the writer thread are in SQLite"""
+        while True:
+            with self._lock:
+                writing = self._writing
+            if writing is None:
+                return
+            writing.result(timeout)
+
+    def since(self, last_seq: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Events after last_seq, oldest first.
+
+        Returns:
+            The missed events, or None if some of them are no longer retained
+        """
+        with self._lock:
+            if last_seq >= self._seq:
+                return []
+            if last_seq + 1 < self._floor:
+                return None
+
+            ring_start = self._ring[0]['seq'] if self._ring else self._seq + 1
+            events: List[Dict[str, Any]] = []
+            if last_seq + 1 < ring_start:
+                events.extend(e for e in self._spill if e['seq'] > last_seq)
+                if self._conn is not None:
+                    rows = self._conn.execute(
+                        """
+                        SELECT event FROM websocket_event_log
+                        WHERE source = ? AND epoch = ? AND seq > ? AND seq < ?
+                        ORDER BY seq
+                        """,
+                        (self.source, self.epoch, last_seq, self._spill[0]['seq'] if self._spill else ring_start)
+                    ).fetchall()
+                    events[:0] = [json.loads(row[0]) for row in rows]
+            events.extend(e for e in self._ring if e['seq'] > last_seq)
+            return events
+
+    def resume(self, last_seq: Optional[int], epoch: Optional[str]) -> Dict[str, Any]:
+        """
+        Build the reply to a client's resume request.
+
+        The missed events travel in one resume_complete message, so live
+        broadcasts can't interleave with the replay.
+
+        Returns:
+            A resume_complete or snapshot_required message
+        """
+        current = {'epoch': self.epoch, 'seq': self._seq}
+        if last_seq is None:
+            return {'type': 'resume_complete', 'data': {**current, 'events': []}}
+
+        if epoch != self.epoch:
+            reason = 'epoch_changed'
+        elif last_seq > self._seq:
+            reason = 'sequence_ahead'
+        else:
+            events = self.since(last_seq)
+            if events is not None:
+                # Events appended while we were reading come through live
+                return {'type': 'resume_complete', 'data': {**current, 'events': events[:current['seq'] - last_seq]}}
+            reason = 'gap_evicted'
+        return {'type': 'snapshot_required', 'data': {**current, 'reason': reason}}
+
+    def stats(self) -> Dict[str, Any]:
+        """Current sequence, retained range and sizes"""
+        return {
+            'epoch': self.epoch,
+            'seq': self._seq,
+            'oldest_seq': self._floor,
+            'in_memory': len(self._ring),
+            'persistent': self._conn is not None,
+        }
+
+    def close(self) -> None:
+        """Close the SQLite tier; only in-memory events stay replayable"""
+        self.flush()
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.shutdown(wait=True)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._writer_conn.close()
+                self._conn = None
+                self._writer_conn = None
+                self._spill = []
+                self._floor = self._ring[0]['seq'] if self._ring else self._seq + 1
@@ -29,6 +29,7 @@ Features:
 - ADW-specific subscriptions for targeted broadcasting
 - Client-specific messaging and error delivery
 - Connection metadata tracking and subscription management
+- Sequenced, replayable events so reconnecting clients can resume (see event_log)
 """
 
 import asyncio
@@ -38,6 +39,8 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 from fastapi import WebSocket, WebSocketDisconnect
 
+from .event_log import EventLog, UNSEQUENCED_EVENT_TYPES
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,10 +52,17 @@ class WebSocketManager:
     clients, enabling live log streaming, status updates, and agent summaries.
     """
 
-    def __init__(self):
-        """Initialize the WebSocket manager with empty connection list."""
+    def __init__(self, event_log: Optional[EventLog] = None):
+        """
+        Initialize the WebSocket manager with empty connection list.
+
+        Args:
+            event_log: Log that sequences and retains broadcast events
+                (defaults to an in-memory log)
+        """
         self.active_connections: List[Dict[str, Any]] = []
         self.connection_counter = 0
+        self.event_log = event_log if event_log is not None else EventLog()
         logger.info("WebSocketManager initialized")
 
     async def connect(self, websocket: WebSocket, client_info: Optional[Dict[str, Any]] = None):
@@ -91,7 +101,9 @@ class WebSocketManager:
             'data': {
                 'connection_id': connection_id,
                 'connected_at': connection_data['connected_at'],
-                'message': 'Connected to AgenticKanban WebSocket server'
+                'message': 'Connected to AgenticKanban WebSocket server',
+                'epoch': self.event_log.epoch,
+                'seq': self.event_log.seq
             }
         })
 
@@ -252,9 +264,15 @@ class WebSocketManager:
         """
         Internal method to broadcast an event to all active connections.
 
+        Events are stamped with a sequence number and retained (even with no
+        clients connected) so reconnecting clients can resume.
+
         Args:
             event: Event dictionary to broadcast
         """
+        if event['type'] not in UNSEQUENCED_EVENT_TYPES:
+            self.event_log.append(event)
+
         if not self.active_connections:
             logger.debug(f"No active connections to broadcast {event['type']} event")
             return
@@ -756,6 +774,34 @@ class WebSocketManager:
         logger.warning(f"Connection {connection_id} not found for direct message")
         return False
 
+    async def resume_connection(
+        self,
+        connection_id: str,
+        last_seq: Optional[int],
+        epoch: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Replay the events a reconnecting client missed.
+
+        Sends resume_complete with the missed events, or snapshot_required
+        when they are no longer retained or the client's epoch is stale.
+
+        Args:
+            connection_id: Connection identifier
+            last_seq: Last sequence the client processed (None on first connect)
+            epoch: Event log epoch the client's sequence belongs to
+
+        Returns:
+            The reply sent to the client
+        """
+        reply = self.event_log.resume(last_seq, epoch)
+        await self.send_to_client_by_id(connection_id, reply)
+        logger.info(
+            f"Resume for {connection_id} from seq {last_seq}: {reply['type']} "
+            f"({len(reply['data'].get('events', []))} events replayed)"
+        )
+        return reply
+
     async def send_error_to_client(
         self,
         connection_id: str,
@@ -119,6 +119,8 @@ class ADWStateCreate(BaseModel):
 
     adw_id: str = Field(..., min_length=8, max_length=8)
     issue_number: Optional[int] = Field(None, gt=0)
+    # Allocate the next issue number for this ADW when issue_number is not given
+    allocate_issue_number: bool = False
     issue_title: Optional[str] = None
     issue_body: Optional[str] = None
     issue_class: Optional[str] = None
@@ -310,9 +312,40 @@ class ADWActivityHistoryResponse(BaseModel):
 
     adw_id: str
     activities: List[ADWActivityLogResponse]
-    total_count: int
+    total_count: Optional[int] = None  # None when count="none"
+    total_count_is_approximate: bool = False
     page: int = 1
     page_size: int = 100
+    has_more: bool = False
+    next_before_id: Optional[int] = None  # Cursor for the next (older) page
+
+
+class ADWStageKpis(BaseModel):
+    """KPIs for one stage, as aggregated by adws/adw_modules/kpi_engine.py."""
+
+    stage: str
+    adw_count: Optional[int] = None  # Set in cross-ADW summaries
+    status: Optional[str] = None
+    cycle_time_seconds: float = 0
+    attempts: int = 0
+    retries: int = 0
+    errors: int = 0
+    agent_runs: int = 0
+    num_turns: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_tokens: int = 0
+    cache_read_tokens: int = 0
+    cost_usd: float = 0
+
+
+class ADWKpiResponse(BaseModel):
+    """Response model for KPI queries (one ADW, or summed across ADWs)."""
+
+    adw_id: Optional[str] = None
+    adw_count: int = 0
+    stages: List[ADWStageKpis]
+    totals: ADWStageKpis
 
 
 class HealthCheckResponse(BaseModel):
@@ -333,3 +366,18 @@ class IssueAllocationResponse(BaseModel):
     issue_title: str
     adw_id: Optional[str] = None
     message: str
+
+
+class IssueBatchAllocationRequest(BaseModel):
+    """Request model for allocating a block of issue numbers."""
+
+    issues: List[IssueTrackerCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class IssueBatchAllocationResponse(BaseModel):
+    """Response model for block issue number allocation."""
+
+    first_issue_number: int
+    last_issue_number: int
+    allocations: List[IssueAllocationResponse]
+    message: str
@@ -5,11 +5,15 @@ This package contains specialized modules for workflow execution enhancement:
 - file_tracker: Track file read/write operations and generate git diffs
 - hook_system: Hook infrastructure for pre/post tool execution
 - summarization_service: AI summarization for file changes and events
+- summarization_queue: Debounced, batched, rate-limited file change summarization
+- summary_cache: Bounded LRU/TTL summary cache with optional SQLite persistence
 """
 
 from .file_tracker import FileTracker
 from .hook_system import HookSystem, HookType, HookPriority, Hook, with_hooks
 from .summarization_service import SummarizationService
+from .summarization_queue import SummarizationQueue, TokenBucket
+from .summary_cache import SummaryCache
 
 __all__ = [
     "FileTracker",
@@ -18,5 +22,8 @@ __all__ = [
     "HookPriority",
     "Hook",
     "with_hooks",
-    "SummarizationService"
+    "SummarizationService",
+    "SummarizationQueue",
+    "TokenBucket",
+    "SummaryCache"
 ]
@@ -5,14 +5,83 @@ Tracks file read and write operations during workflow execution.
 Generates git diffs for modified files and prepares data for AI summarization.
 """
 
+import os
 import subprocess
-from typing import Dict, List, Set, Optional, Any
+import threading
+from typing import Dict, Iterable, Iterator, List, Set, Optional, Any, Tuple
 from pathlib import Path
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Diffs longer than this many lines are truncated
+MAX_DIFF_LINES = 1000
+
+
+def _join_diff_lines(lines: List[str], line_count: int) -> str:
+    """Rebuild `git diff` text from its lines, truncating past MAX_DIFF_LINES"""
+    # `git diff` output ends with a newline, which split("\n") counts as a line
+    if line_count + 1 > MAX_DIFF_LINES:
+        return "\n".join(lines[:MAX_DIFF_LINES]) + f"\n... (truncated, showing first {MAX_DIFF_LINES} lines)"
+    return "\n".join(lines) + "\n"
+
+
+def parse_numstat_patch(stream: Iterable[bytes]) -> Iterator[Tuple[str, int, int, str, int]]:
+    """
+    Split `git diff --numstat -p -z` output into per-file results as it streams.
+
+    The output starts with NUL-terminated numstat records ("added\tremoved\tpath"),
+    ends that section with an empty record, then has one patch per record in
+    the same order. Only the first MAX_DIFF_LINES lines of each patch are kept
+    in memory.
+
+    Args:
+        stream: Binary output, e.g. a Popen stdout, read line by line
+
+    Yields:
+        (path, lines_added, lines_removed, diff, diff_line_count) per file;
+        binary files count as 0 lines
+    """
+    stream = iter(stream)
+    header = b""
+    for chunk in stream:
+        header += chunk
+        if b"\0\0" in header:
+            break
+    numstat, _, rest = header.partition(b"\0\0")
+
+    records = []
+    for record in numstat.split(b"\0"):
+        if not record:
+            continue
+        added, removed, path = record.decode("utf-8", errors="replace").split("\t", 2)
+        records.append((
+            path,
+            int(added) if added.isdigit() else 0,
+            int(removed) if removed.isdigit() else 0,
+        ))
+
+    def patch_lines():
+        if rest:
+            yield rest
+        yield from stream
+
+    index = -1
+    lines: List[str] = []
+    line_count = 0
+    for raw in patch_lines():
+        if raw.startswith(b"diff --git ") and index + 1 < len(records):
+            if index >= 0:
+                yield (*records[index], _join_diff_lines(lines, line_count), line_count)
+            index += 1
+            lines, line_count = [], 0
+        line_count += 1
+        if len(lines) <= MAX_DIFF_LINES:
+            lines.append(raw.decode("utf-8", errors="replace").rstrip("\n"))
+    if index >= 0:
+        yield (*records[index], _join_diff_lines(lines, line_count), line_count)
+
 
 class FileTracker:
     """
@@ -22,6 +91,10 @@ class FileTracker:
     git diffs for modified files. It's designed to be instantiated per
     workflow execution (per adw_id) to ensure proper isolation.
 
+    get_file_diffs() diffs many files with a single `git diff --numstat -p`
+    and caches the results by (index blob, working tree blob), so a file is
+    only re-diffed when its content changes.
+
     Attributes:
         adw_id: Workflow execution identifier
         repo_path: Path to git repository root
@@ -29,6 +102,7 @@ class FileTracker:
         _modified_files: Set of file paths that have been modified
         _file_diffs: Cache of generated git diffs per file
         _file_summaries: Cache of file summary metadata
+        _blob_diffs: Batch diff results keyed by (path, index blob, worktree blob)
     """
 
     def __init__(self, adw_id: str, repo_path: Optional[str] = None):
@@ -45,6 +119,7 @@ class FileTracker:
         self._modified_files: Set[str] = set()
         self._file_diffs: Dict[str, str] = {}
         self._file_summaries: Dict[str, Dict[str, Any]] = {}
+        self._blob_diffs: Dict[Tuple[str, Optional[str], str], Dict[str, Any]] = {}
 
         logger.info(f"FileTracker initialized for adw_id={adw_id}, repo_path={self.repo_path}")
 
@@ -73,7 +148,7 @@ class FileTracker:
         Generate git diff for a modified file.
 
         This method uses subprocess to run `git diff` and capture the output.
-        Large diffs (>1000 lines) are truncated to prevent memory issues.
+        Large diffs (>MAX_DIFF_LINES lines) are truncated to prevent memory issues.
 
         Args:
             file_path: Path to the file to diff
@@ -107,8 +182,8 @@ class FileTracker:
 
                 # Truncate large diffs
                 lines = diff.split("\n")
-                if len(lines) > 1000:
-                    diff = "\n".join(lines[:1000]) + "\n... (truncated, showing first 1000 lines)"
+                if len(lines) > MAX_DIFF_LINES:
+                    diff = "\n".join(lines[:MAX_DIFF_LINES]) + f"\n... (truncated, showing first {MAX_DIFF_LINES} lines)"
                     logger.warning(f"[{self.adw_id}] Truncated large diff for {file_path}")
 
                 # Cache the diff
@@ -134,6 +209,149 @@ class FileTracker:
             logger.error(f"[{self.adw_id}] Error generating diff for {file_path}: {str(e)}")
             return f"Error generating diff: {str(e)}"
 
+    def _repo_relative(self, file_path: str) -> Optional[str]:
+        """Path relative to repo_path as git prints it, or None if outside repo_path"""
+        full_path = os.path.realpath(os.path.join(str(self.repo_path), file_path))
+        relative = os.path.relpath(full_path, os.path.realpath(str(self.repo_path)))
+        if relative == ".." or relative.startswith(".." + os.sep):
+            return None
+        return Path(relative).as_posix()
+
+    def _git(self, args: List[str], timeout: int, input_text: Optional[str] = None) -> str:
+        result = subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            text=True,
+            input=input_text,
+            timeout=timeout,
+            cwd=self.repo_path
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"git {args[0]} failed")
+        return result.stdout
+
+    def _blob_keys(self, relative_paths: List[str], timeout: int) -> Dict[str, Tuple[Optional[str], str]]:
+        """Index and working tree blob hashes for each path (two git calls in total)"""
+        worktree = self._git(
+            ["hash-object", "--stdin-paths"], timeout, input_text="\n".join(relative_paths) + "\n"
+        ).split()
+
+        index: Dict[str, str] = {}
+        for entry in self._git(["ls-files", "-s", "-z", "--", *relative_paths], timeout).split("\0"):
+            if entry:
+                meta, path = entry.split("\t", 1)
+                index[path] = meta.split()[1]
+
+        return {path: (index.get(path), blob) for path, blob in zip(relative_paths, worktree)}
+
+    def _batch_diff(self, relative_paths: List[str], timeout: int) -> Dict[str, Dict[str, Any]]:
+        """Diff the paths with one streamed `git diff --numstat -p` call"""
+        cmd = [
+            "git", "-c", "core.quotePath=false", "diff", "--relative",
+            "--numstat", "-p", "-z", "--no-color", "--no-ext-diff", "--", *relative_paths
+        ]
+        process = subprocess.Popen(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=self.repo_path
+        )
+        timer = threading.Timer(timeout, process.kill)
+        timer.start()
+        try:
+            parsed = {
+                path: {"diff": diff, "lines_added": added, "lines_removed": removed, "diff_lines": line_count}
+                for path, added, removed, diff, line_count in parse_numstat_patch(process.stdout)
+            }
+            stderr = process.stderr.read().decode("utf-8", errors="replace")
+            returncode = process.wait()
+        finally:
+            timer.cancel()
+            process.stdout.close()
+            process.stderr.close()
+
+        if returncode != 0:
+            raise RuntimeError(stderr.strip() or f"git diff exited with {returncode}")
+        return parsed
+
+    def get_file_diffs(
+        self,
+        file_paths: Optional[Iterable[str]] = None,
+        timeout: int = 10
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Generate diffs and line counts for many files with one `git diff` call.
+
+        Results are cached by blob hash, so unchanged files are never re-diffed.
+        Files outside repo_path, or all files if the batch call fails, fall
+        back to get_file_diff().
+
+        Args:
+            file_paths: Files to diff (defaults to all modified files)
+            timeout: Maximum seconds to wait for each git command
+
+        Returns:
+            Mapping of file path to {diff, lines_added, lines_removed}, or None
+            for files that don't exist or couldn't be diffed
+        """
+        paths = sorted(set(self._modified_files if file_paths is None else file_paths))
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        by_relative: Dict[str, str] = {}
+
+        for file_path in paths:
+            if not Path(file_path).exists():
+                logger.warning(f"[{self.adw_id}] File not found for diff: {file_path}")
+                results[file_path] = None
+                continue
+            relative = self._repo_relative(file_path)
+            if relative is None:
+                results[file_path] = self._single_diff_entry(file_path, timeout)
+            else:
+                by_relative[relative] = file_path
+
+        if not by_relative:
+            return results
+
+        try:
+            keys = self._blob_keys(list(by_relative), timeout)
+            misses = [rel for rel in by_relative if (rel, *keys[rel]) not in self._blob_diffs]
+            if misses:
+                parsed = self._batch_diff(misses, timeout)
+                for rel in misses:
+                    # Unchanged and untracked files produce no output
+                    entry = parsed.get(rel, {"diff": "", "lines_added": 0, "lines_removed": 0, "diff_lines": 0})
+                    self._blob_diffs[(rel, *keys[rel])] = entry
+                logger.debug(f"[{self.adw_id}] Batch diffed {len(misses)} file(s), {len(by_relative) - len(misses)} cached")
+        except (subprocess.TimeoutExpired, RuntimeError, OSError, ValueError, KeyError) as e:
+            logger.warning(f"[{self.adw_id}] Batch git diff failed, diffing files individually: {e}")
+            for file_path in by_relative.values():
+                results[file_path] = self._single_diff_entry(file_path, timeout)
+            return results
+
+        for rel, file_path in by_relative.items():
+            entry = self._blob_diffs[(rel, *keys[rel])]
+            if entry["diff_lines"] >= MAX_DIFF_LINES:
+                logger.warning(f"[{self.adw_id}] Truncated large diff for {file_path}")
+            self._file_diffs[file_path] = entry["diff"]
+            results[file_path] = {
+                "diff": entry["diff"],
+                "lines_added": entry["lines_added"],
+                "lines_removed": entry["lines_removed"],
+            }
+        return results
+
+    def _single_diff_entry(self, file_path: str, timeout: int) -> Optional[Dict[str, Any]]:
+        diff = self.get_file_diff(file_path, timeout=min(timeout, 5))
+        if diff is None:
+            return None
+        lines_added, lines_removed = self._count_diff_lines(diff)
+        return {"diff": diff, "lines_added": lines_added, "lines_removed": lines_removed}
+
+    @staticmethod
+    def _count_diff_lines(diff: str) -> Tuple[int, int]:
+        # Count added/removed lines (lines starting with + or -, excluding diff markers)
+        lines = diff.split("\n")
+        lines_added = len([line for line in lines if line.startswith("+") and not line.startswith("+++")])
+        lines_removed = len([line for line in lines if line.startswith("-") and not line.startswith("---")])
+        return lines_added, lines_removed
+
     def get_tracked_files(self) -> Dict[str, List[str]]:
         """
         Get all tracked files.
@@ -169,32 +387,47 @@ class FileTracker:
         if file_path in self._file_summaries and diff is None:
             return self._file_summaries[file_path]
 
-        # Generate diff if not provided
         if diff is None:
-            diff = self.get_file_diff(file_path)
-
-        # Handle missing diff
-        if not diff:
-            summary_data = {
-                "file_path": file_path,
-                "lines_added": 0,
-                "lines_removed": 0,
-                "diff": None,
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            self._file_summaries[file_path] = summary_data
-            return summary_data
+            # Diff every modified file still lacking a summary in the same git call
+            pending = {path for path in self._modified_files if path not in self._file_summaries}
+            return self.generate_file_summaries(pending | {file_path})[file_path]
 
-        # Count added/removed lines (lines starting with + or -, excluding diff markers)
-        lines = diff.split("\n")
-        lines_added = len([line for line in lines if line.startswith("+") and not line.startswith("+++")])
-        lines_removed = len([line for line in lines if line.startswith("-") and not line.startswith("---")])
+        lines_added, lines_removed = self._count_diff_lines(diff)
+        return self._store_summary(file_path, diff, lines_added, lines_removed)
+
+    def generate_file_summaries(self, file_paths: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Prepare file change metadata for many files using one batched git diff.
+
+        Args:
+            file_paths: Files to summarize (defaults to all modified files)
 
+        Returns:
+            Mapping of file path to the metadata returned by generate_file_summary
+        """
+        diffs = self.get_file_diffs(file_paths)
+        summaries = {}
+        for file_path, entry in diffs.items():
+            if entry is None:
+                summaries[file_path] = self._store_summary(file_path, None, 0, 0)
+            else:
+                summaries[file_path] = self._store_summary(
+                    file_path, entry["diff"], entry["lines_added"], entry["lines_removed"]
+                )
+        return summaries
+
+    def _store_summary(
+        self,
+        file_path: str,
+        diff: Optional[str],
+        lines_added: int,
+        lines_removed: int
+    ) -> Dict[str, Any]:
         summary_data = {
             "file_path": file_path,
-            "lines_added": lines_added,
-            "lines_removed": lines_removed,
-            "diff": diff,
+            "lines_added": lines_added if diff else 0,
+            "lines_removed": lines_removed if diff else 0,
+            "diff": diff or None,
             "timestamp": datetime.utcnow().isoformat()
         }
 
@@ -203,7 +436,7 @@ class FileTracker:
 
         logger.debug(
             f"[{self.adw_id}] Generated summary for {file_path}: "
-            f"+{lines_added} -{lines_removed}"
+            f"+{summary_data['lines_added']} -{summary_data['lines_removed']}"
         )
 
         return summary_data
@@ -250,6 +483,7 @@ class FileTracker:
         self._modified_files.clear()
         self._file_diffs.clear()
         self._file_summaries.clear()
+        self._blob_diffs.clear()
         logger.info(f"[{self.adw_id}] Cleared all tracking data")
 
     def export_data(self) -> Dict[str, Any]:
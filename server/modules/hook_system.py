@@ -5,11 +5,13 @@ Provides infrastructure for pre/post tool execution hooks, thinking blocks,
 and text blocks. Enables granular workflow event broadcasting.
 """
 
-from typing import Callable, Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Set
 from enum import Enum
 from datetime import datetime
+from itertools import groupby
 import logging
 import asyncio
+import time
 from functools import wraps
 
 logger = logging.getLogger(__name__)
@@ -42,11 +44,13 @@ class Hook:
         self,
         callback: Callable,
         priority: HookPriority = HookPriority.NORMAL,
-        name: Optional[str] = None
+        name: Optional[str] = None,
+        timeout: Optional[float] = None
     ):
         self.callback = callback
         self.priority = priority
         self.name = name or callback.__name__
+        self.timeout = timeout
 
     def __repr__(self):
         return f"Hook(name={self.name}, priority={self.priority.name})"
@@ -60,6 +64,15 @@ class HookSystem:
     events like tool use, thinking blocks, and text blocks. Hooks are executed
     in priority order and support both sync and async callbacks.
 
+    By default execute_hooks_async() runs hooks one at a time in priority
+    order, as hooks may depend on earlier ones' side effects. Systems (or
+    single calls) whose hooks are independent can opt in to running hooks of
+    equal priority concurrently; priority groups still run in order. Async
+    hooks that exceed their timeout, if one is set, are cancelled. Async
+    hooks fired from execute_hooks() run as background tasks the system
+    keeps references to; drain() waits for them. Per-hook call, error,
+    timeout and latency counters are available from get_hook_stats().
+
     Example:
         hook_system = HookSystem()
 
@@ -78,21 +91,35 @@ class HookSystem:
         hook_system.execute_hooks(HookType.POST_TOOL_USE, context)
     """
 
-    def __init__(self):
-        """Initialize HookSystem with empty hook registry"""
+    def __init__(self, hook_timeout: Optional[float] = None, concurrent: bool = False):
+        """
+        Initialize HookSystem with empty hook registry.
+
+        Args:
+            hook_timeout: Default timeout in seconds for async hooks (None for no limit)
+            concurrent: Run equal-priority hooks concurrently in execute_hooks_async
+                (only safe when they don't depend on each other)
+        """
+        self.hook_timeout = hook_timeout
+        self.concurrent = concurrent
         self._hooks: Dict[HookType, List[Hook]] = {
             hook_type: [] for hook_type in HookType
         }
         self._execution_count: Dict[HookType, int] = {
             hook_type: 0 for hook_type in HookType
         }
+        self._hook_stats: Dict[HookType, Dict[str, Dict[str, float]]] = {
+            hook_type: {} for hook_type in HookType
+        }
+        self._background_tasks: Set[asyncio.Task] = set()
 
     def register_hook(
         self,
         hook_type: HookType,
         callback: Callable,
         priority: HookPriority = HookPriority.NORMAL,
-        name: Optional[str] = None
+        name: Optional[str] = None,
+        timeout: Optional[float] = None
     ) -> None:
         """
         Register a callback for a specific hook type.
@@ -102,8 +129,9 @@ class HookSystem:
             callback: Function to call when hook is triggered
             priority: Execution priority (HIGH, NORMAL, LOW)
             name: Optional name for the hook (defaults to function name)
+            timeout: Timeout in seconds for an async callback (defaults to hook_timeout)
         """
-        hook = Hook(callback=callback, priority=priority, name=name)
+        hook = Hook(callback=callback, priority=priority, name=name, timeout=timeout)
         self._hooks[hook_type].append(hook)
 
         # Sort hooks by priority
@@ -162,20 +190,23 @@ class HookSystem:
         results = []
 
         for hook in hooks:
+            # Check if callback is async
+            if asyncio.iscoroutinefunction(hook.callback):
+                # For async callbacks, start a tracked background task but don't wait
+                self._schedule_async_hook(hook_type, hook, context)
+                results.append(None)
+                continue
+
+            start = time.perf_counter()
             try:
-                # Check if callback is async
-                if asyncio.iscoroutinefunction(hook.callback):
-                    # For async callbacks, create task but don't wait
-                    logger.debug(f"Scheduling async hook '{hook.name}'")
-                    asyncio.create_task(hook.callback(context))
-                    results.append(None)
-                else:
-                    # Execute sync callback
-                    result = hook.callback(context)
-                    results.append(result)
-                    logger.debug(f"Executed hook '{hook.name}' successfully")
+                # Execute sync callback
+                result = hook.callback(context)
+                results.append(result)
+                self._record(hook_type, hook, start)
+                logger.debug(f"Executed hook '{hook.name}' successfully")
 
             except Exception as e:
+                self._record(hook_type, hook, start, error=True)
                 logger.error(
                     f"Error executing hook '{hook.name}' for {hook_type.value}: {str(e)}",
                     exc_info=True
@@ -185,22 +216,88 @@ class HookSystem:
 
         return results
 
+    def _schedule_async_hook(self, hook_type: HookType, hook: Hook, context: Dict[str, Any]) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.error(
+                f"Cannot schedule async hook '{hook.name}' for {hook_type.value}: no running event loop"
+            )
+            self._record(hook_type, hook, time.perf_counter(), error=True)
+            return
+
+        logger.debug(f"Scheduling async hook '{hook.name}'")
+        task = loop.create_task(self._run_hook(hook_type, hook, context))
+        # The event loop only keeps weak references to tasks
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _run_hook(self, hook_type: HookType, hook: Hook, context: Dict[str, Any]) -> Any:
+        """Run one hook with its timeout, recording latency; errors are logged and yield None"""
+        start = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(hook.callback):
+                timeout = hook.timeout if hook.timeout is not None else self.hook_timeout
+                result = await asyncio.wait_for(hook.callback(context), timeout)
+            else:
+                result = hook.callback(context)
+            self._record(hook_type, hook, start)
+            logger.debug(f"Executed hook '{hook.name}' successfully")
+            return result
+
+        except asyncio.TimeoutError:
+            self._record(hook_type, hook, start, error=True, timed_out=True)
+            logger.error(f"Hook '{hook.name}' for {hook_type.value} timed out")
+            return None
+
+        except Exception as e:
+            self._record(hook_type, hook, start, error=True)
+            logger.error(
+                f"Error executing hook '{hook.name}' for {hook_type.value}: {str(e)}",
+                exc_info=True
+            )
+            return None
+
+    def _record(
+        self,
+        hook_type: HookType,
+        hook: Hook,
+        start: float,
+        error: bool = False,
+        timed_out: bool = False
+    ) -> None:
+        duration_ms = (time.perf_counter() - start) * 1000
+        stats = self._hook_stats[hook_type].setdefault(
+            hook.name,
+            {"calls": 0, "errors": 0, "timeouts": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        stats["calls"] += 1
+        stats["errors"] += int(error)
+        stats["timeouts"] += int(timed_out)
+        stats["total_ms"] += duration_ms
+        stats["max_ms"] = max(stats["max_ms"], duration_ms)
+
     async def execute_hooks_async(
         self,
         hook_type: HookType,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        concurrent: Optional[bool] = None
     ) -> List[Any]:
         """
         Execute all registered hooks for the given type asynchronously.
 
         Similar to execute_hooks but waits for async callbacks to complete.
+        Priority groups run in order; hooks within a group run one at a time
+        unless concurrency is enabled. A hook that fails or times out
+        contributes None.
 
         Args:
             hook_type: Type of hook to execute
             context: Context data passed to each hook callback
+            concurrent: Override the system's concurrent setting for this call
 
         Returns:
-            List of hook results
+            List of hook results, in priority/registration order
         """
         hooks = self._hooks[hook_type]
 
@@ -211,27 +308,37 @@ class HookSystem:
         self._execution_count[hook_type] += 1
         logger.debug(f"Executing {len(hooks)} hook(s) for {hook_type.value} (async)")
 
+        if concurrent is None:
+            concurrent = self.concurrent
+
         results = []
 
-        for hook in hooks:
-            try:
-                if asyncio.iscoroutinefunction(hook.callback):
-                    result = await hook.callback(context)
-                    results.append(result)
-                else:
-                    result = hook.callback(context)
-                    results.append(result)
+        for _, group in groupby(hooks, key=lambda h: h.priority):
+            group = list(group)
+            if concurrent and len(group) > 1:
+                results.extend(await asyncio.gather(
+                    *(self._run_hook(hook_type, hook, context) for hook in group)
+                ))
+            else:
+                for hook in group:
+                    results.append(await self._run_hook(hook_type, hook, context))
 
-                logger.debug(f"Executed hook '{hook.name}' successfully")
+        return results
 
-            except Exception as e:
-                logger.error(
-                    f"Error executing hook '{hook.name}' for {hook_type.value}: {str(e)}",
-                    exc_info=True
-                )
-                results.append(None)
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for async hooks scheduled by execute_hooks to finish.
 
-        return results
+        Args:
+            timeout: Seconds to wait before cancelling the remaining tasks
+        """
+        tasks = list(self._background_tasks)
+        if not tasks:
+            return
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
 
     def create_tool_use_context(
         self,
@@ -374,6 +481,30 @@ class HookSystem:
         else:
             return sum(self._execution_count.values())
 
+    def get_hook_stats(self, hook_type: Optional[HookType] = None) -> Dict[str, Any]:
+        """
+        Get per-hook call, error, timeout and latency counters.
+
+        Args:
+            hook_type: Specific hook type (None for all, keyed by hook type value)
+
+        Returns:
+            Mapping of hook name to counters, including avg_ms
+        """
+        def with_avg(stats_by_name):
+            return {
+                name: {**stats, "avg_ms": stats["total_ms"] / stats["calls"] if stats["calls"] else 0.0}
+                for name, stats in stats_by_name.items()
+            }
+
+        if hook_type:
+            return with_avg(self._hook_stats[hook_type])
+        return {ht.value: with_avg(self._hook_stats[ht]) for ht in HookType if self._hook_stats[ht]}
+
+    def get_pending_task_count(self) -> int:
+        """Get the number of async hooks still running in the background"""
+        return len(self._background_tasks)
+
     def clear_hooks(self, hook_type: Optional[HookType] = None) -> None:
         """
         Clear registered hooks.
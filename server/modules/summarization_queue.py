@@ -0,0 +1,243 @@
+"""
+Summarization Queue Module
+
+Work queue for file change summaries. A fixed pool of workers drains the
+queue under a token-bucket rate limit, so a build touching hundreds of files
+makes a bounded number of concurrent, rate-limited API calls instead of one
+thread and request per change.
+
+Changes to the same file are debounced: a newer diff replaces the pending
+one and restarts its debounce window. Ready changes are combined into one
+batched prompt, up to a count and diff-size limit.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .summarization_service import SummarizationService
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+
+    Attributes:
+        rate: Tokens added per second
+        capacity: Maximum burst size
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class SummaryJob:
+    """A pending file change summary and where to broadcast it"""
+    file_path: str
+    diff: str
+    operation: str
+    adw_id: str
+    ws_manager: Any
+    related_file: Optional[str]
+    ready_at: float
+
+
+class SummarizationQueue:
+    """
+    Debouncing, batching summarization queue with bounded concurrency.
+
+    Attributes:
+        service: SummarizationService doing the summarizing
+        workers: Concurrent summarization calls
+        debounce_seconds: Quiet period before a file's change is summarized
+        max_batch_size: Maximum changes combined into one prompt
+        max_batch_chars: Maximum combined (truncated) diff size per prompt
+    """
+
+    def __init__(
+        self,
+        service: "SummarizationService",
+        workers: int = 2,
+        rate_per_second: float = 2.0,
+        burst: int = 4,
+        debounce_seconds: float = 0.5,
+        max_batch_size: int = 5,
+        max_batch_chars: int = 4000,
+        max_pending: int = 1000
+    ):
+        self.service = service
+        self.workers = workers
+        self.debounce_seconds = debounce_seconds
+        self.max_batch_size = max_batch_size
+        self.max_batch_chars = max_batch_chars
+        self.max_pending = max_pending
+        self.bucket = TokenBucket(rate_per_second, burst)
+
+        self._pending: "OrderedDict[Tuple[str, str], SummaryJob]" = OrderedDict()
+        self._changed: Optional[asyncio.Event] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._active = 0
+        self._stats = {"submitted": 0, "debounced": 0, "dropped": 0, "batches": 0, "api_calls": 0, "summarized": 0}
+
+    def _ensure_workers(self) -> None:
+        # Created lazily so the queue binds to the server's running loop
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        self._worker_tasks = [t for t in self._worker_tasks if not t.done()]
+        while len(self._worker_tasks) < self.workers:
+            self._worker_tasks.append(asyncio.get_running_loop().create_task(self._worker()))
+
+    def submit(
+        self,
+        file_path: str,
+        diff: str,
+        operation: str,
+        adw_id: str,
+        ws_manager,
+        related_file: Optional[str] = None
+    ) -> None:
+        """
+        Queue a file change for summarization and broadcast.
+
+        A pending change for the same ADW and file is replaced.
+        """
+        self._ensure_workers()
+        self._stats["submitted"] += 1
+        key = (adw_id, file_path)
+        if key in self._pending:
+            self._stats["debounced"] += 1
+            del self._pending[key]
+        elif len(self._pending) >= self.max_pending:
+            _, dropped = self._pending.popitem(last=False)
+            self._stats["dropped"] += 1
+            logger.warning(f"Summarization queue full, dropped pending summary for {dropped.file_path}")
+
+        self._pending[key] = SummaryJob(
+            file_path=file_path,
+            diff=diff or "",
+            operation=operation,
+            adw_id=adw_id,
+            ws_manager=ws_manager,
+            related_file=related_file,
+            ready_at=time.monotonic() + self.debounce_seconds
+        )
+        self._changed.set()
+
+    def _take_batch(self, now: float) -> List[SummaryJob]:
+        batch: List[SummaryJob] = []
+        chars = 0
+        for key, job in list(self._pending.items()):
+            if job.ready_at > now:
+                continue
+            size = min(len(job.diff), self.service.DIFF_PROMPT_CHARS)
+            if batch and (len(batch) >= self.max_batch_size or chars + size > self.max_batch_chars):
+                break
+            batch.append(self._pending.pop(key))
+            chars += size
+        return batch
+
+    async def _next_batch(self) -> List[SummaryJob]:
+        while True:
+            now = time.monotonic()
+            batch = self._take_batch(now)
+            if batch:
+                return batch
+
+            self._changed.clear()
+            timeout = None
+            if self._pending:
+                timeout = max(0.0, min(job.ready_at for job in self._pending.values()) - now)
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _worker(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            self._active += 1
+            try:
+                await self._process(batch)
+            except Exception as e:
+                logger.error(f"Error in async summarization: {str(e)}")
+            finally:
+                self._active -= 1
+                self._changed.set()
+
+    async def _process(self, batch: List[SummaryJob]) -> None:
+        changes = [(job.file_path, job.diff, job.operation) for job in batch]
+        self._stats["batches"] += 1
+
+        cached = self.service.cached_file_summaries(changes)
+        loop = asyncio.get_running_loop()
+
+        def before_api_call() -> None:
+            # Runs in the summarizing thread; cache hits and fallback
+            # summaries don't spend rate limit tokens, every request does
+            asyncio.run_coroutine_threadsafe(self.bucket.acquire(), loop).result()
+            self._stats["api_calls"] += 1
+
+        summaries = await asyncio.to_thread(
+            self.service.summarize_file_changes, changes, cached, before_api_call
+        )
+
+        for job, summary in zip(batch, summaries):
+            try:
+                await job.ws_manager.broadcast_summary_update(
+                    adw_id=job.adw_id,
+                    summary_type="file_change",
+                    content=summary,
+                    related_file=job.related_file or job.file_path
+                )
+                self._stats["summarized"] += 1
+                logger.debug(f"Broadcasted summary for {job.file_path}")
+            except Exception as e:
+                logger.error(f"Error broadcasting summary for {job.file_path}: {str(e)}")
+
+    async def join(self, timeout: Optional[float] = None) -> None:
+        """Wait until nothing is pending or in progress (ignores debounce windows)"""
+        async def _drain():
+            while self._pending or self._active:
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(_drain(), timeout)
+
+    async def stop(self) -> None:
+        """Cancel the workers. Pending changes are dropped."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._pending.clear()
+        self._changed = None
+
+    def stats(self) -> Dict[str, int]:
+        """Queue counters plus current pending and in-progress counts"""
+        return {**self._stats, "pending": len(self._pending), "active": self._active}
@@ -6,11 +6,16 @@ Supports both Anthropic and OpenAI SDK with fire-and-forget async execution.
 """
 
 import os
+import re
+import json
 import asyncio
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, Tuple
 from datetime import datetime
 import logging
 
+from .summary_cache import SummaryCache, content_digest
+from .summarization_queue import SummarizationQueue
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,21 +30,26 @@ class SummarizationService:
     - Session execution
 
     Summaries are generated asynchronously (fire-and-forget) to avoid blocking
-    workflow execution.
+    workflow execution. File change summaries go through a SummarizationQueue
+    that debounces, batches and rate-limits the API calls.
 
     Attributes:
         model: AI model to use for summarization
         max_tokens: Maximum tokens per summary
-        _cache: Cache of generated summaries
+        _cache: Bounded LRU/TTL cache of generated summaries
         _client: AI SDK client (Anthropic or OpenAI)
         _provider: Provider type ('anthropic' or 'openai')
     """
 
+    # Diff characters included in a prompt
+    DIFF_PROMPT_CHARS = 1000
+
     def __init__(
         self,
         api_key: Optional[str] = None,
         model: Optional[str] = None,
-        provider: Optional[str] = None
+        provider: Optional[str] = None,
+        cache: Optional[SummaryCache] = None
     ):
         """
         Initialize SummarizationService.
@@ -48,8 +58,11 @@ class SummarizationService:
             api_key: API key for AI service (defaults to env variable)
             model: Model to use (defaults to claude-3-haiku or gpt-3.5-turbo)
             provider: Provider to use ('anthropic' or 'openai', auto-detect if None)
+            cache: Summary cache (defaults to one configured from SUMMARY_CACHE_*
+                env variables; SUMMARY_CACHE_DB enables the persistent tier)
         """
-        self._cache: Dict[str, str] = {}
+        self._cache = cache if cache is not None else self._cache_from_env()
+        self._queue: Optional[SummarizationQueue] = None
         self._client = None
         self._provider = provider
 
@@ -61,6 +74,38 @@ class SummarizationService:
             f"model={self.model}"
         )
 
+    @staticmethod
+    def _cache_from_env() -> SummaryCache:
+        """Build the default cache from SUMMARY_CACHE_* env variables"""
+        ttl = os.getenv("SUMMARY_CACHE_TTL_SECONDS", str(7 * 24 * 3600))
+        return SummaryCache(
+            max_entries=int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "1000")),
+            ttl_seconds=float(ttl) if float(ttl) > 0 else None,
+            db_path=os.getenv("SUMMARY_CACHE_DB") or None
+        )
+
+    def _queue_from_env(self) -> SummarizationQueue:
+        """Build the file change queue from SUMMARIZATION_* env variables"""
+        return SummarizationQueue(
+            self,
+            workers=int(os.getenv("SUMMARIZATION_WORKERS", "2")),
+            rate_per_second=float(os.getenv("SUMMARIZATION_RATE_PER_SECOND", "2")),
+            burst=int(os.getenv("SUMMARIZATION_BURST", "4")),
+            debounce_seconds=float(os.getenv("SUMMARIZATION_DEBOUNCE_SECONDS", "0.5")),
+            max_batch_size=int(os.getenv("SUMMARIZATION_MAX_BATCH_SIZE", "5"))
+        )
+
+    @property
+    def queue(self) -> SummarizationQueue:
+        """File change summarization queue (created on first use)"""
+        if self._queue is None:
+            self._queue = self._queue_from_env()
+        return self._queue
+
+    def _cache_key(self, kind: str, *parts: str) -> str:
+        """Stable cache key; includes the model so a model change doesn't reuse old summaries"""
+        return f"{kind}:{content_digest(self.model, *parts)}"
+
     def _setup_client(self, api_key: Optional[str], model: Optional[str]):
         """Setup AI client based on available API keys and provider preference"""
 
@@ -130,21 +175,34 @@ class SummarizationService:
             Human-readable summary of the change
         """
         # Check cache
-        cache_key = f"file:{file_path}:{hash(diff)}"
-        if cache_key in self._cache:
+        cache_key = self._file_cache_key(file_path, diff, operation)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
             logger.debug(f"Returning cached summary for {file_path}")
-            return self._cache[cache_key]
+            return cached
+
+        return self._generate_file_summary(file_path, diff, operation)
+
+    def _generate_file_summary(
+        self,
+        file_path: str,
+        diff: str,
+        operation: str,
+        before_api_call: Optional[Callable[[], None]] = None
+    ) -> str:
+        """Summarize an uncached file change and cache the result"""
+        cache_key = self._file_cache_key(file_path, diff, operation)
 
         # Fallback mode
         if not self._client:
             summary = self._fallback_file_summary(file_path, operation)
-            self._cache[cache_key] = summary
+            self._cache.set(cache_key, summary, persist=False)
             return summary
 
         # Generate AI summary
         try:
             # Truncate diff for cost savings
-            truncated_diff = diff[:1000] if diff else ""
+            truncated_diff = diff[:self.DIFF_PROMPT_CHARS] if diff else ""
 
             prompt = f"""Summarize this code change in 1-2 sentences (max 200 chars):
 
@@ -157,6 +215,8 @@ Diff:
 Focus on WHAT changed and WHY (if apparent), not implementation details.
 Be concise and specific."""
 
+            if before_api_call:
+                before_api_call()
             if self._provider == 'anthropic':
                 summary = self._summarize_with_anthropic(prompt)
             elif self._provider == 'openai':
@@ -165,7 +225,7 @@ Be concise and specific."""
                 summary = self._fallback_file_summary(file_path, operation)
 
             # Cache result
-            self._cache[cache_key] = summary
+            self._cache.set(cache_key, summary)
 
             logger.debug(f"Generated summary for {file_path}: {summary}")
             return summary
@@ -174,9 +234,108 @@ Be concise and specific."""
             logger.error(f"Error generating summary for {file_path}: {str(e)}")
             # Fallback to generic summary
             summary = self._fallback_file_summary(file_path, operation)
-            self._cache[cache_key] = summary
+            self._cache.set(cache_key, summary, persist=False)
             return summary
 
+    def _file_cache_key(self, file_path: str, diff: str, operation: str) -> str:
+        return self._cache_key("file", file_path, operation, diff or "")
+
+    def cached_file_summaries(self, changes: List[Tuple[str, str, str]]) -> List[Optional[str]]:
+        """
+        Look up cached summaries, once per change.
+
+        Args:
+            changes: (file_path, diff, operation) tuples
+
+        Returns:
+            Cached summary for each change, None where there is none
+        """
+        return [self._cache.get(self._file_cache_key(*change)) for change in changes]
+
+    def summarize_file_changes(
+        self,
+        changes: List[Tuple[str, str, str]],
+        cached: Optional[List[Optional[str]]] = None,
+        before_api_call: Optional[Callable[[], None]] = None
+    ) -> List[str]:
+        """
+        Summarize several file changes with one batched prompt.
+
+        Cached changes are answered from the cache. If the batched response
+        can't be parsed, the remaining changes are summarized one by one.
+
+        Args:
+            changes: (file_path, diff, operation) tuples
+            cached: Result of cached_file_summaries(changes), if already looked up
+            before_api_call: Called before every request to the AI provider
+                (the queue takes a rate limit token here)
+
+        Returns:
+            Summaries in the same order as changes
+        """
+        summaries = list(cached) if cached is not None else self.cached_file_summaries(changes)
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+
+        if len(missing) > 1 and self._client:
+            if before_api_call:
+                before_api_call()
+            batched = self._summarize_batch([changes[i] for i in missing])
+            if batched is not None:
+                for i, summary in zip(missing, batched):
+                    summaries[i] = summary
+                    self._cache.set(self._file_cache_key(*changes[i]), summary)
+                missing = []
+
+        for i in missing:
+            summaries[i] = self._generate_file_summary(*changes[i], before_api_call=before_api_call)
+        return summaries
+
+    def _summarize_batch(self, changes: List[Tuple[str, str, str]]) -> Optional[List[str]]:
+        """Summarize changes in one prompt; None if the call or the response is unusable"""
+        sections = []
+        for n, (file_path, diff, operation) in enumerate(changes, 1):
+            truncated_diff = diff[:self.DIFF_PROMPT_CHARS] if diff else ""
+            sections.append(f"""Change {n}:
+File: {file_path}
+Operation: {operation}
+
+Diff:
+{truncated_diff}""")
+
+        prompt = f"""Summarize each of these {len(changes)} code changes in 1-2 sentences (max 200 chars each).
+
+{chr(10).join(sections)}
+
+Focus on WHAT changed and WHY (if apparent), not implementation details.
+Be concise and specific. Reply with only a JSON array of {len(changes)} strings,
+one summary per change, in the same order."""
+
+        try:
+            max_tokens = self.max_tokens * len(changes)
+            if self._provider == 'anthropic':
+                response = self._summarize_with_anthropic(prompt, max_tokens=max_tokens)
+            elif self._provider == 'openai':
+                response = self._summarize_with_openai(prompt, max_tokens=max_tokens)
+            else:
+                return None
+
+            match = re.search(r"\[.*\]", response, re.DOTALL)
+            parsed = json.loads(match.group(0)) if match else None
+        except Exception as e:
+            logger.error(f"Error generating batched summary for {len(changes)} files: {str(e)}")
+            return None
+
+        if (
+            not isinstance(parsed, list)
+            or len(parsed) != len(changes)
+            or not all(isinstance(item, str) and item.strip() for item in parsed)
+        ):
+            logger.warning("Unusable batched summary response, summarizing individually")
+            return None
+
+        logger.debug(f"Generated batched summary for {len(changes)} files")
+        return [item.strip() for item in parsed]
+
     def summarize_tool_use(
         self,
         tool_name: str,
@@ -195,15 +354,18 @@ Be concise and specific."""
             Human-readable summary of the tool use
         """
         # Check cache
-        cache_key = f"tool:{tool_name}:{hash(str(input_data))}"
-        if cache_key in self._cache:
+        cache_key = self._cache_key(
+            "tool", tool_name, json.dumps(input_data, sort_keys=True, default=str)
+        )
+        cached = self._cache.get(cache_key)
+        if cached is not None:
             logger.debug(f"Returning cached summary for {tool_name}")
-            return self._cache[cache_key]
+            return cached
 
         # Fallback mode
         if not self._client:
             summary = self._fallback_tool_summary(tool_name, input_data)
-            self._cache[cache_key] = summary
+            self._cache.set(cache_key, summary, persist=False)
             return summary
 
         # Generate AI summary
@@ -227,7 +389,7 @@ Focus on the purpose and outcome, not technical details."""
                 summary = self._fallback_tool_summary(tool_name, input_data)
 
             # Cache result
-            self._cache[cache_key] = summary
+            self._cache.set(cache_key, summary)
 
             logger.debug(f"Generated summary for {tool_name}: {summary}")
             return summary
@@ -235,7 +397,7 @@ Focus on the purpose and outcome, not technical details."""
         except Exception as e:
             logger.error(f"Error generating summary for {tool_name}: {str(e)}")
             summary = self._fallback_tool_summary(tool_name, input_data)
-            self._cache[cache_key] = summary
+            self._cache.set(cache_key, summary, persist=False)
             return summary
 
     def summarize_session(
@@ -302,6 +464,9 @@ Describe what was accomplished in this workflow."""
         """
         Fire-and-forget async file change summarization with WebSocket broadcast.
 
+        The change is queued; the queue debounces repeated changes to the same
+        file, batches and rate-limits the API calls, and broadcasts the result.
+
         Args:
             file_path: Path to the modified file
             diff: Git diff of the changes
@@ -310,31 +475,14 @@ Describe what was accomplished in this workflow."""
             ws_manager: WebSocketManager instance for broadcasting
             related_file: Related file path for broadcast
         """
-        async def _summarize_and_broadcast():
-            try:
-                # Run summarization in thread pool to avoid blocking
-                summary = await asyncio.to_thread(
-                    self.summarize_file_change,
-                    file_path,
-                    diff,
-                    operation
-                )
-
-                # Broadcast summary update
-                await ws_manager.broadcast_summary_update(
-                    adw_id=adw_id,
-                    summary_type="file_change",
-                    content=summary,
-                    related_file=related_file or file_path
-                )
-
-                logger.debug(f"Broadcasted summary for {file_path}")
-
-            except Exception as e:
-                logger.error(f"Error in async summarization: {str(e)}")
-
-        # Create task without awaiting
-        asyncio.create_task(_summarize_and_broadcast())
+        self.queue.submit(
+            file_path=file_path,
+            diff=diff,
+            operation=operation,
+            adw_id=adw_id,
+            ws_manager=ws_manager,
+            related_file=related_file
+        )
 
     def _summarize_with_anthropic(self, prompt: str, max_tokens: Optional[int] = None) -> str:
         """Generate summary using Anthropic SDK"""
@@ -406,6 +554,10 @@ Describe what was accomplished in this workflow."""
         """Get the number of cached summaries"""
         return len(self._cache)
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss/eviction counters and size"""
+        return self._cache.stats()
+
     def get_provider(self) -> str:
         """Get the current AI provider"""
         return self._provider
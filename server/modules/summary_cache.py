@@ -0,0 +1,188 @@
+"""
+Summary Cache Module
+
+Bounded LRU cache with per-entry TTL for generated summaries, with an
+optional SQLite tier so summaries survive server restarts.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summary_cache (
+    cache_key TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+
+def content_digest(*parts: str) -> str:
+    """
+    Stable digest of cache key parts.
+
+    Unlike hash(), this is the same in every process, so keys written to the
+    persistent tier still match after a restart.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        encoded = part.encode("utf-8", errors="surrogatepass")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+        digest.update(len(encoded).to_bytes(8, "big"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class SummaryCache:
+    """
+    Thread-safe LRU cache bounded by entry count and age.
+
+    Lookups that miss in memory fall through to the SQLite tier (if
+    configured) and promote the hit back into memory. Expired entries are
+    dropped lazily on access and from the SQLite tier on open.
+
+    Attributes:
+        max_entries: Maximum entries kept in memory
+        ttl_seconds: Entry lifetime (None for no expiry)
+        db_path: SQLite file for the persistent tier (None to disable)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        db_path: Optional[Union[str, Path]] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = Path(db_path) if db_path else None
+
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "persistent_hits": 0}
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if self.db_path:
+            self._open_persistent_tier()
+
+    def _open_persistent_tier(self) -> None:
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            # Shared across the to_thread workers; every use is under self._lock
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(SUMMARY_CACHE_SCHEMA)
+            if self.ttl_seconds is not None:
+                self._conn.execute(
+                    "DELETE FROM summary_cache WHERE created_at < ?",
+                    (time.time() - self.ttl_seconds,)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Summary cache persistence disabled ({self.db_path}): {e}")
+            self._conn = None
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached summary for key, or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                summary, created_at = entry
+                if not self._expired(created_at, now):
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return summary
+                del self._entries[key]
+                self._stats["expirations"] += 1
+
+            row = self._load(key)
+            if row is not None and not self._expired(row[1], now):
+                self._insert(key, row[0], row[1])
+                self._stats["hits"] += 1
+                self._stats["persistent_hits"] += 1
+                return row[0]
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: str, summary: str, persist: bool = True) -> None:
+        """
+        Cache a summary.
+
+        Args:
+            key: Cache key
+            summary: Summary text
+            persist: Also write to the SQLite tier (skip for cheap fallback summaries)
+        """
+        now = time.time()
+        with self._lock:
+            self._insert(key, summary, now)
+            if persist and self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO summary_cache (cache_key, summary, created_at) VALUES (?, ?, ?)",
+                        (key, summary, now)
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to persist summary: {e}")
+
+    def _insert(self, key: str, summary: str, created_at: float) -> None:
+        self._entries[key] = (summary, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _load(self, key: str) -> Optional[Tuple[str, float]]:
+        if self._conn is None:
+            return None
+        try:
+            return self._conn.execute(
+                "SELECT summary, created_at FROM summary_cache WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read persisted summary: {e}")
+            return None
+
+    def clear(self) -> None:
+        """Drop all entries from memory and the SQLite tier."""
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM summary_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, object]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "persistent": self._conn is not None,
+            }
+
+    def close(self) -> None:
+        """Close the SQLite tier."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
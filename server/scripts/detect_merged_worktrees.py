@@ -1,23 +1,43 @@
 #!/usr/bin/env python3
+# /// script
+# dependencies = ["watchdog"]
+# ///
 """
 Script to detect merged worktrees and update their status in the database.
 
 This script:
 1. Queries the database for ADWs with branch names
 2. Checks which branches have been merged into main
-3. Updates the status of merged ADWs to 'completed' and stage to 'ready-to-merge'
+3. Updates the status of merged ADWs to 'completed' and stage to 'ready-to-merge',
+   in chunked transactions
 4. Logs the update activity for audit trail
+
+With --watch it keeps running instead: it watches main's ref, reflog and
+packed-refs files in the git directory and, whenever main moves, checks only
+the not-yet-completed ADW branches with one batched
+``git for-each-ref --merged`` and updates them in a single transaction.
 """
 
 import os
 import sqlite3
 import subprocess
 import logging
+import sys
+import threading
+import time
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from datetime import datetime, timezone
 import json
 
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.bulk_import import DEFAULT_CHUNK_SIZE, sqlite_transaction, write_chunked
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -84,6 +104,47 @@ def get_merged_branches(project_root: Path, base_branch: str = "main") -> List[s
         return []
 
 
+def get_merged_among(
+    project_root: Path,
+    branch_names: Iterable[str],
+    base_branch: str = "main",
+    batch_size: int = 500
+) -> Set[str]:
+    """
+    Return which of the given branches are merged into the base branch.
+
+    Asks git about the named refs only, batch_size refs per
+    ``git for-each-ref --merged`` call, rather than listing every merged
+    branch in the repository.
+
+    Args:
+        project_root: Path to the git repository root
+        branch_names: Local branch names to check
+        base_branch: The branch to check merges against
+        batch_size: Refs per git invocation (keeps the command line short)
+
+    Returns:
+        The subset of branch_names merged into base_branch
+    """
+    names = sorted(set(branch_names) - {base_branch})
+    merged: Set[str] = set()
+    for start in range(0, len(names), batch_size):
+        batch = names[start:start + batch_size]
+        result = subprocess.run(
+            ["git", "for-each-ref", f"--merged={base_branch}", "--format=%(refname:short)",
+             *[f"refs/heads/{name}" for name in batch]],
+            cwd=str(project_root),
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            logger.error(f"git for-each-ref --merged failed: {result.stderr.strip()}")
+            continue
+        merged.update(line.strip() for line in result.stdout.splitlines())
+    # Patterns also match refs below a name (feat -> feat/x); keep exact matches
+    return merged & set(names)
+
+
 def get_adws_with_branches(db_path: Path) -> List[Tuple[str, str, str, str]]:
     """
     Get ADWs that have branch names and are not yet completed.
@@ -123,6 +184,33 @@ def get_adws_with_branches(db_path: Path) -> List[Tuple[str, str, str, str]]:
         return []
 
 
+COMPLETE_ADW_SQL = """
+    UPDATE adw_states
+    SET current_stage = 'ready-to-merge',
+        status = 'completed',
+        completed_at = ?
+    WHERE adw_id = ?
+"""
+
+# Stage change will be logged by trigger, but add explicit log
+COMPLETION_LOG_SQL = """
+    INSERT INTO adw_activity_logs (adw_id, event_type, field_changed, old_value, new_value, event_data)
+    VALUES (?, 'workflow_completed', 'status', ?, 'completed', ?)
+"""
+
+
+def _completion_rows(adw_id: str, branch_name: str, old_stage: str, old_status: str) -> Tuple[tuple, tuple]:
+    """COMPLETE_ADW_SQL and COMPLETION_LOG_SQL parameters for one ADW."""
+    now = datetime.now(timezone.utc).isoformat()
+    log_data = json.dumps({
+        "reason": "branch_merged_to_main",
+        "branch_name": branch_name,
+        "detected_at": now,
+        "previous_stage": old_stage
+    })
+    return (now, adw_id), (adw_id, old_status, log_data)
+
+
 def update_adw_to_completed(
     db_path: Path,
     adw_id: str,
@@ -144,35 +232,10 @@ def update_adw_to_completed(
         True if successful, False otherwise
     """
     try:
-        conn = sqlite3.connect(str(db_path), timeout=5.0)
-        cursor = conn.cursor()
-
-        # Update the ADW state
-        cursor.execute("""
-            UPDATE adw_states
-            SET current_stage = 'ready-to-merge',
-                status = 'completed',
-                completed_at = ?
-            WHERE adw_id = ?
-        """, (datetime.now(timezone.utc).isoformat(), adw_id))
-
-        # Log the activity (stage change will be logged by trigger, but add explicit log)
-        cursor.execute("""
-            INSERT INTO adw_activity_logs (adw_id, event_type, field_changed, old_value, new_value, event_data)
-            VALUES (?, 'workflow_completed', 'status', ?, 'completed', ?)
-        """, (
-            adw_id,
-            old_status,
-            json.dumps({
-                "reason": "branch_merged_to_main",
-                "branch_name": branch_name,
-                "detected_at": datetime.now(timezone.utc).isoformat(),
-                "previous_stage": old_stage
-            })
-        ))
-
-        conn.commit()
-        conn.close()
+        update_row, log_row = _completion_rows(adw_id, branch_name, old_stage, old_status)
+        with sqlite_transaction(db_path) as conn:
+            conn.execute(COMPLETE_ADW_SQL, update_row)
+            conn.execute(COMPLETION_LOG_SQL, log_row)
 
         logger.info(f"Updated ADW {adw_id} ({branch_name}) to completed")
         return True
@@ -182,12 +245,44 @@ def update_adw_to_completed(
         return False
 
 
-def detect_and_update_merged_worktrees(dry_run: bool = False) -> dict:
+def update_adws_to_completed(
+    db_path: Path,
+    adws: List[Tuple[str, str, str, str]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> dict:
+    """
+    Update many ADWs to completed status, chunk_size ADWs per transaction.
+
+    Args:
+        db_path: Path to the SQLite database
+        adws: Tuples (adw_id, branch_name, old_stage, old_status)
+        chunk_size: ADWs updated per transaction
+
+    Returns:
+        {"written": ADWs updated, "errors": ADWs that failed}
+    """
+    rows = [_completion_rows(*adw) for adw in adws]
+
+    def report(index: int, error: Exception) -> None:
+        logger.error(f"Failed to update ADW {adws[index][0]}: {error}")
+
+    result = write_chunked(
+        lambda: sqlite_transaction(db_path),
+        [(COMPLETE_ADW_SQL, [row[0] for row in rows]), (COMPLETION_LOG_SQL, [row[1] for row in rows])],
+        chunk_size,
+        on_row_error=report
+    )
+    logger.info(f"Updated {result['written']} ADWs to completed")
+    return result
+
+
+def detect_and_update_merged_worktrees(dry_run: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
     """
     Main function to detect merged worktrees and update their status.
 
     Args:
         dry_run: If True, only report what would be updated without making changes
+        chunk_size: ADWs updated per transaction
 
     Returns:
         Dictionary with statistics
@@ -216,21 +311,147 @@ def detect_and_update_merged_worktrees(dry_run: bool = False) -> dict:
     stats["total_adws_with_branches"] = len(adws_with_branches)
 
     # Find ADWs whose branches have been merged
-    for adw_id, branch_name, current_stage, status in adws_with_branches:
-        if branch_name in merged_branches_set:
-            stats["merged_branches_found"] += 1
-
-            if dry_run:
-                logger.info(f"[DRY RUN] Would update ADW {adw_id} ({branch_name}): {current_stage}/{status} -> ready-to-merge/completed")
-            else:
-                if update_adw_to_completed(db_path, adw_id, branch_name, current_stage, status):
-                    stats["adws_updated"] += 1
-                else:
-                    stats["errors"] += 1
+    started = time.perf_counter()
+    merged = [adw for adw in adws_with_branches if adw[1] in merged_branches_set]
+    stats["merged_branches_found"] = len(merged)
+
+    if dry_run:
+        for adw_id, branch_name, current_stage, status in merged:
+            logger.info(f"[DRY RUN] Would update ADW {adw_id} ({branch_name}): {current_stage}/{status} -> ready-to-merge/completed")
+    else:
+        result = update_adws_to_completed(db_path, merged, chunk_size)
+        stats["adws_updated"] = result["written"]
+        stats["errors"] = result["errors"]
 
+    stats["seconds"] = round(time.perf_counter() - started, 3)
     return stats
 
 
+def reconcile_merged_adws(project_root: Path, db_path: Path, base_branch: str = "main") -> Dict[str, int]:
+    """
+    Complete every open ADW whose branch is merged into base_branch.
+
+    One query for the candidates, one batched git pass, one transaction.
+
+    Returns:
+        {"checked": open ADWs with branches, "updated": ADWs completed, "errors": failures}
+    """
+    adws = get_adws_with_branches(db_path)
+    merged_branches = get_merged_among(project_root, (adw[1] for adw in adws), base_branch)
+    merged = [adw for adw in adws if adw[1] in merged_branches]
+
+    result = {"written": 0, "errors": 0}
+    if merged:
+        result = update_adws_to_completed(db_path, merged, chunk_size=len(merged))
+    return {"checked": len(adws), "updated": result["written"], "errors": result["errors"]}
+
+
+class _RefChangeHandler(FileSystemEventHandler):
+    """Sets an event when any of the watched files is written or replaced."""
+
+    def __init__(self, paths: Set[str], changed: threading.Event):
+        self.paths = paths
+        self.changed = changed
+
+    def on_any_event(self, event):
+        # git writes refs to a .lock file and renames it over the ref
+        if event.src_path in self.paths or getattr(event, "dest_path", None) in self.paths:
+            self.changed.set()
+
+
+class MainBranchReconciler:
+    """
+    Long-running reconciler that completes ADWs as soon as main moves.
+
+    Watches the base branch's ref file, its reflog and packed-refs. Events
+    are debounced, and a check also runs every fallback_interval seconds in
+    case an event is missed. A check does nothing unless main's commit
+    changed since the last one.
+    """
+
+    def __init__(
+        self,
+        project_root: Path,
+        db_path: Path,
+        base_branch: str = "main",
+        fallback_interval: float = 300.0,
+        debounce: float = 0.5
+    ):
+        self.project_root = Path(project_root)
+        self.db_path = Path(db_path)
+        self.base_branch = base_branch
+        self.fallback_interval = fallback_interval
+        self.debounce = debounce
+        self.changed = threading.Event()
+        self.stopped = threading.Event()
+        self.last_commit: Optional[str] = None
+
+    def _git(self, *args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=str(self.project_root), capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    def watched_paths(self) -> List[Path]:
+        """Files whose change means the base branch may have moved."""
+        common_dir = Path(self._git("rev-parse", "--git-common-dir"))
+        if not common_dir.is_absolute():
+            common_dir = (self.project_root / common_dir).resolve()
+        ref = self._git("rev-parse", "--symbolic-full-name", self.base_branch)
+        return [common_dir / ref, common_dir / "logs" / ref, common_dir / "packed-refs"]
+
+    def check(self) -> Optional[Dict[str, int]]:
+        """
+        Reconcile if the base branch moved since the last check.
+
+        Returns:
+            reconcile_merged_adws() statistics, or None if main hadn't moved
+        """
+        try:
+            commit = self._git("rev-parse", self.base_branch)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Could not resolve {self.base_branch}: {e.stderr.strip()}")
+            return None
+        if commit == self.last_commit:
+            return None
+
+        start = time.perf_counter()
+        stats = reconcile_merged_adws(self.project_root, self.db_path, self.base_branch)
+        self.last_commit = commit
+        logger.info(
+            f"{self.base_branch} at {commit[:8]}: {stats['updated']}/{stats['checked']} open ADWs merged "
+            f"({time.perf_counter() - start:.2f}s)"
+        )
+        return stats
+
+    def run(self) -> None:
+        """Watch and reconcile until stop() is called."""
+        paths = self.watched_paths()
+        handler = _RefChangeHandler({str(path) for path in paths}, self.changed)
+        observer = Observer()
+        for directory in {path.parent for path in paths if path.parent.is_dir()}:
+            observer.schedule(handler, str(directory), recursive=False)
+        observer.start()
+        logger.info(f"Watching {self.base_branch} for merges ({', '.join(str(p) for p in paths)})")
+
+        try:
+            self.check()
+            while not self.stopped.is_set():
+                self.changed.wait(timeout=self.fallback_interval)
+                if self.stopped.is_set():
+                    break
+                # Let a burst of ref updates (pull, rebase) settle
+                time.sleep(self.debounce)
+                self.changed.clear()
+                self.check()
+        finally:
+            observer.stop()
+            observer.join()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.changed.set()
+
+
 def main():
     """Main entry point for the script."""
     import argparse
@@ -248,12 +469,25 @@ def main():
         action="store_true",
         help="Enable verbose logging"
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and reconcile whenever main moves"
+    )
 
     args = parser.parse_args()
 
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
+    if args.watch:
+        reconciler = MainBranchReconciler(get_project_root(), get_db_path())
+        try:
+            reconciler.run()
+        except KeyboardInterrupt:
+            logger.info("Stopped watching for merges")
+        return
+
     logger.info("=" * 60)
     logger.info("Merged Worktree Detection")
     logger.info("=" * 60)
@@ -269,6 +503,8 @@ def main():
     logger.info(f"Merged branches found:              {stats['merged_branches_found']}")
     logger.info(f"ADWs updated:                       {stats['adws_updated']}")
     logger.info(f"Errors:                             {stats['errors']}")
+    if "seconds" in stats:
+        logger.info(f"Elapsed:                            {stats['seconds']:.2f}s")
     logger.info("=" * 60)
 
     if args.dry_run:
@@ -277,7 +513,6 @@ def main():
         logger.info("Detection complete!")
 
     # Exit with error code if there were errors
-    import sys
     sys.exit(1 if stats['errors'] > 0 else 0)
 
 
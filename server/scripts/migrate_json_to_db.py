@@ -4,9 +4,10 @@ Migration script to import existing JSON-based ADW states into the database.
 
 This script:
 1. Scans the agents/ directory for ADW folders
-2. Reads adw_state.json files
-3. Imports data into the SQLite database
-4. Logs migration results
+2. Reads adw_state.json files in parallel, skipping files unchanged since
+   their last import (mtime recorded in adw_json_imports)
+3. Imports data into the SQLite database in chunked transactions
+4. Logs migration results and throughput
 5. Keeps original JSON files intact for backward compatibility
 """
 
@@ -14,13 +15,14 @@ import os
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime
 
 # Add parent directory to path for imports
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.bulk_import import DEFAULT_CHUNK_SIZE, DEFAULT_WORKERS, ProgressReporter, read_parallel, write_chunked
 from core.database import get_db_manager
 
 # Configure logging
@@ -30,6 +32,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+INSERT_ADW_SQL = """
+    INSERT INTO adw_states (
+        adw_id, issue_number, issue_title, issue_body, issue_class,
+        branch_name, worktree_path, current_stage, status,
+        workflow_name, model_set, data_source, issue_json,
+        orchestrator_state, plan_file, all_adws,
+        patch_file, patch_history, patch_source_mode,
+        backend_port, websocket_port, frontend_port, completed_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_MIGRATION_LOG_SQL = """
+    INSERT INTO adw_activity_logs (adw_id, event_type, event_data)
+    VALUES (?, ?, ?)
+"""
+
+RECORD_IMPORT_SQL = """
+    INSERT INTO adw_json_imports (adw_id, source_mtime) VALUES (?, ?)
+    ON CONFLICT(adw_id) DO UPDATE SET
+        source_mtime = excluded.source_mtime,
+        imported_at = CURRENT_TIMESTAMP
+"""
+
 
 def get_project_root() -> Path:
     """Get the project root directory."""
@@ -107,9 +132,79 @@ def read_adw_state_json(adw_dir: Path) -> Optional[Dict[str, Any]]:
         return None
 
 
+def build_adw_params(adw_data: Dict[str, Any]) -> tuple:
+    """
+    Map ADW state data to an INSERT_ADW_SQL parameter row.
+
+    Args:
+        adw_data: Parsed ADW state data from JSON
+
+    Returns:
+        Parameter tuple for INSERT_ADW_SQL
+    """
+    # Determine current stage and status based on completed flag
+    completed = adw_data.get('completed', False)
+    current_stage = "ready-to-merge" if completed else "backlog"
+    status = "completed" if completed else "pending"
+
+    # Prepare JSON fields
+    issue_json_str = json.dumps(adw_data.get('issue_json')) if adw_data.get('issue_json') else None
+    orchestrator_state_str = json.dumps(adw_data.get('orchestrator')) if adw_data.get('orchestrator') else None
+    patch_history_str = json.dumps(adw_data.get('patch_history', []))
+    all_adws_str = json.dumps(adw_data.get('all_adws', []))
+
+    # Parse issue class (remove leading slash if present)
+    issue_class = adw_data.get('issue_class', '')
+    if issue_class and issue_class.startswith('/'):
+        issue_class = issue_class[1:]
+
+    # Extract issue title from issue_json
+    issue_title = None
+    issue_body = None
+    if adw_data.get('issue_json'):
+        issue_title = adw_data['issue_json'].get('title')
+        issue_body = adw_data['issue_json'].get('body')
+
+    return (
+        adw_data['adw_id'],
+        adw_data.get('issue_number'),
+        issue_title,
+        issue_body,
+        issue_class,
+        adw_data.get('branch_name'),
+        adw_data.get('worktree_path'),
+        current_stage,
+        status,
+        None,  # workflow_name - not in original JSON
+        adw_data.get('model_set', 'base'),
+        adw_data.get('data_source', 'kanban'),
+        issue_json_str,
+        orchestrator_state_str,
+        adw_data.get('plan_file'),
+        all_adws_str,
+        adw_data.get('patch_file'),
+        patch_history_str,
+        adw_data.get('patch_source_mode'),
+        adw_data.get('backend_port'),
+        adw_data.get('websocket_port'),
+        adw_data.get('frontend_port'),
+        datetime.utcnow().isoformat() if completed else None
+    )
+
+
+def build_migration_log_params(adw_id: str) -> tuple:
+    """Activity log row recording that an ADW was imported from JSON."""
+    log_data = json.dumps({
+        "migrated_from": "json",
+        "timestamp": datetime.utcnow().isoformat(),
+        "source_file": "agents/{}/adw_state.json".format(adw_id)
+    })
+    return (adw_id, "workflow_started", log_data)
+
+
 def import_adw_to_database(adw_data: Dict[str, Any], db_manager) -> bool:
     """
-    Import ADW state data into database.
+    Import a single ADW state into the database.
 
     Args:
         adw_data: Parsed ADW state data from JSON
@@ -133,80 +228,9 @@ def import_adw_to_database(adw_data: Dict[str, Any], db_manager) -> bool:
             logger.info(f"ADW {adw_id} already exists in database, skipping")
             return "skipped"
 
-        # Determine current stage and status based on completed flag
-        completed = adw_data.get('completed', False)
-        current_stage = "ready-to-merge" if completed else "backlog"
-        status = "completed" if completed else "pending"
-
-        # Prepare JSON fields
-        issue_json_str = json.dumps(adw_data.get('issue_json')) if adw_data.get('issue_json') else None
-        orchestrator_state_str = json.dumps(adw_data.get('orchestrator')) if adw_data.get('orchestrator') else None
-        patch_history_str = json.dumps(adw_data.get('patch_history', []))
-        all_adws_str = json.dumps(adw_data.get('all_adws', []))
-
-        # Parse issue class (remove leading slash if present)
-        issue_class = adw_data.get('issue_class', '')
-        if issue_class and issue_class.startswith('/'):
-            issue_class = issue_class[1:]
-
-        # Extract issue title from issue_json
-        issue_title = None
-        issue_body = None
-        if adw_data.get('issue_json'):
-            issue_title = adw_data['issue_json'].get('title')
-            issue_body = adw_data['issue_json'].get('body')
-
-        # Insert into database
-        query = """
-            INSERT INTO adw_states (
-                adw_id, issue_number, issue_title, issue_body, issue_class,
-                branch_name, worktree_path, current_stage, status,
-                workflow_name, model_set, data_source, issue_json,
-                orchestrator_state, plan_file, all_adws,
-                patch_file, patch_history, patch_source_mode,
-                backend_port, websocket_port, frontend_port, completed_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-
-        params = (
-            adw_id,
-            adw_data.get('issue_number'),
-            issue_title,
-            issue_body,
-            issue_class,
-            adw_data.get('branch_name'),
-            adw_data.get('worktree_path'),
-            current_stage,
-            status,
-            None,  # workflow_name - not in original JSON
-            adw_data.get('model_set', 'base'),
-            adw_data.get('data_source', 'kanban'),
-            issue_json_str,
-            orchestrator_state_str,
-            adw_data.get('plan_file'),
-            all_adws_str,
-            adw_data.get('patch_file'),
-            patch_history_str,
-            adw_data.get('patch_source_mode'),
-            adw_data.get('backend_port'),
-            adw_data.get('websocket_port'),
-            adw_data.get('frontend_port'),
-            datetime.utcnow().isoformat() if completed else None
-        )
-
-        db_manager.execute_insert(query, params)
-
-        # Log migration activity
-        log_query = """
-            INSERT INTO adw_activity_logs (adw_id, event_type, event_data)
-            VALUES (?, ?, ?)
-        """
-        log_data = json.dumps({
-            "migrated_from": "json",
-            "timestamp": datetime.utcnow().isoformat(),
-            "source_file": "agents/{}/adw_state.json".format(adw_id)
-        })
-        db_manager.execute_insert(log_query, (adw_id, "workflow_started", log_data))
+        with db_manager.transaction() as conn:
+            conn.execute(INSERT_ADW_SQL, build_adw_params(adw_data))
+            conn.execute(INSERT_MIGRATION_LOG_SQL, build_migration_log_params(adw_id))
 
         logger.info(f"Successfully imported ADW {adw_id} to database")
         return True
@@ -216,18 +240,54 @@ def import_adw_to_database(adw_data: Dict[str, Any], db_manager) -> bool:
         return False
 
 
-def migrate_json_to_database(dry_run: bool = False) -> Dict[str, int]:
+def get_state_mtime(adw_dir: Path) -> Optional[float]:
+    """Modification time of an ADW directory's adw_state.json, or None if missing."""
+    try:
+        return (adw_dir / "adw_state.json").stat().st_mtime
+    except OSError:
+        return None
+
+
+def load_import_state(db_manager) -> Tuple[Set[str], Dict[str, float]]:
+    """
+    Load everything needed to decide what to import in two queries.
+
+    Returns:
+        (ADW IDs already in adw_states, adw_state.json mtime recorded per ADW directory)
+    """
+    existing_ids = {
+        row["adw_id"] for row in db_manager.execute_query("SELECT adw_id FROM adw_states")
+    }
+    imported_mtimes = {
+        row["adw_id"]: row["source_mtime"]
+        for row in db_manager.execute_query("SELECT adw_id, source_mtime FROM adw_json_imports")
+    }
+    return existing_ids, imported_mtimes
+
+
+def migrate_json_to_database(
+    dry_run: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Dict[str, Any]:
     """
     Main migration function.
 
+    State files are read on a thread pool, skipping any whose mtime matches
+    the one recorded when it was last imported, and new ADWs are inserted in
+    chunks of chunk_size, one transaction per chunk.
+
     Args:
         dry_run: If True, scan files but don't import to database
+        workers: Threads reading state files
+        chunk_size: ADWs inserted per transaction
 
     Returns:
         Dictionary with migration statistics
     """
     stats = {
         "scanned": 0,
+        "unchanged": 0,
         "valid_json": 0,
         "imported": 0,
         "skipped": 0,
@@ -249,12 +309,29 @@ def migrate_json_to_database(dry_run: bool = False) -> Dict[str, int]:
     adw_dirs = scan_adw_directories(agents_dir)
     stats["scanned"] = len(adw_dirs)
 
-    # Process each ADW directory
-    for adw_dir in adw_dirs:
+    existing_ids, imported_mtimes = load_import_state(db_manager)
+
+    def read_if_changed(adw_dir: Path) -> Tuple[Optional[float], Optional[Dict[str, Any]], bool]:
+        mtime = get_state_mtime(adw_dir)
+        if mtime is not None and imported_mtimes.get(adw_dir.name) == mtime:
+            return mtime, None, True
+        return mtime, read_adw_state_json(adw_dir), False
+
+    adw_rows: List[tuple] = []
+    log_rows: List[tuple] = []
+    import_rows: List[tuple] = []
+    existing_import_rows: List[tuple] = []
+
+    # Read state files in parallel
+    progress = ProgressReporter(len(adw_dirs), "ADW directories", log=logger)
+    for adw_dir, (mtime, adw_data, unchanged) in read_parallel(adw_dirs, read_if_changed, workers):
+        progress.advance()
         adw_id = adw_dir.name
 
-        # Read JSON state
-        adw_data = read_adw_state_json(adw_dir)
+        if unchanged:
+            stats["unchanged"] += 1
+            continue
+
         if adw_data is None:
             logger.warning(f"Skipping {adw_id} - could not read adw_state.json")
             stats["skipped"] += 1
@@ -266,15 +343,42 @@ def migrate_json_to_database(dry_run: bool = False) -> Dict[str, int]:
             logger.info(f"[DRY RUN] Would import ADW {adw_id}")
             continue
 
-        # Import to database
-        result = import_adw_to_database(adw_data, db_manager)
-        if result == "skipped":
+        state_adw_id = adw_data.get('adw_id')
+        if not state_adw_id:
+            logger.error(f"ADW data in {adw_id} missing adw_id field")
+            stats["errors"] += 1
+            continue
+
+        if state_adw_id in existing_ids:
+            logger.debug(f"ADW {state_adw_id} already exists in database, skipping")
             stats["already_exists"] += 1
-        elif result is True:
-            stats["imported"] += 1
-        else:
+            existing_import_rows.append((adw_id, mtime))
+            continue
+
+        try:
+            adw_rows.append(build_adw_params(adw_data))
+        except Exception as e:
+            logger.error(f"Error preparing ADW {state_adw_id} for import: {e}")
             stats["errors"] += 1
+            continue
+        log_rows.append(build_migration_log_params(state_adw_id))
+        import_rows.append((adw_id, mtime))
+        existing_ids.add(state_adw_id)
+
+    # Insert new ADWs in chunked transactions
+    result = write_chunked(
+        db_manager.transaction,
+        [(INSERT_ADW_SQL, adw_rows), (INSERT_MIGRATION_LOG_SQL, log_rows), (RECORD_IMPORT_SQL, import_rows)],
+        chunk_size,
+        on_row_error=lambda index, e: logger.error(f"Error importing ADW {adw_rows[index][0]} to database: {e}")
+    )
+    stats["imported"] = result["written"]
+    stats["errors"] += result["errors"]
 
+    # Remember files of ADWs that were already imported so they aren't read again
+    write_chunked(db_manager.transaction, [(RECORD_IMPORT_SQL, existing_import_rows)], chunk_size)
+
+    stats.update(progress.summary())
     return stats
 
 
@@ -295,6 +399,18 @@ def main():
         action="store_true",
         help="Enable verbose logging"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Threads reading state files (default: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"ADWs inserted per transaction (default: {DEFAULT_CHUNK_SIZE})"
+    )
 
     args = parser.parse_args()
 
@@ -306,7 +422,11 @@ def main():
     logger.info("ADW State Migration: JSON to Database")
     logger.info("=" * 60)
 
-    stats = migrate_json_to_database(dry_run=args.dry_run)
+    stats = migrate_json_to_database(
+        dry_run=args.dry_run,
+        workers=args.workers,
+        chunk_size=args.chunk_size
+    )
 
     # Print summary
     logger.info("")
@@ -314,11 +434,13 @@ def main():
     logger.info("Migration Summary")
     logger.info("=" * 60)
     logger.info(f"ADW directories scanned:  {stats['scanned']}")
+    logger.info(f"Unchanged since import:   {stats['unchanged']}")
     logger.info(f"Valid JSON files found:   {stats['valid_json']}")
     logger.info(f"Newly imported:           {stats['imported']}")
     logger.info(f"Already in database:      {stats['already_exists']}")
     logger.info(f"Skipped (no JSON):        {stats['skipped']}")
     logger.info(f"Errors:                   {stats['errors']}")
+    logger.info(f"Elapsed:                  {stats['seconds']:.2f}s ({stats['per_second']:.0f} ADWs/s)")
     logger.info("=" * 60)
 
     if args.dry_run:
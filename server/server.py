@@ -22,11 +22,13 @@ try:
     # Try relative imports first (when imported as a module)
     from .api import adws, stage_logs, merge, file_operations, agent_state_stream, clarification, adw_db, issue_tracker
     from .core.websocket_manager import WebSocketManager
+    from .core.event_log import EventLog
     from .core.database import get_db_manager
 except ImportError:
     # Fall back to absolute imports (when run as a script from server directory)
     from api import adws, stage_logs, merge, file_operations, agent_state_stream, clarification, adw_db, issue_tracker
     from core.websocket_manager import WebSocketManager
+    from core.event_log import EventLog
     from core.database import get_db_manager
 
 app = FastAPI(
@@ -35,8 +37,19 @@ app = FastAPI(
     version="1.0.0"
 )
 
+
+def create_event_log() -> EventLog:
+    """Event log for broadcast events, spilling to the ADW database when available."""
+    capacity = int(os.getenv("WS_EVENT_LOG_CAPACITY", "1000"))
+    try:
+        return EventLog(source="server", capacity=capacity, db_path=get_db_manager().db_path)
+    except Exception as e:
+        logger.error(f"Event log persistence unavailable, keeping events in memory only: {e}")
+        return EventLog(source="server", capacity=capacity)
+
+
 # Initialize WebSocket manager
-ws_manager = WebSocketManager()
+ws_manager = WebSocketManager(event_log=create_event_log())
 
 # Store ws_manager in app state for access from routes
 app.state.ws_manager = ws_manager
@@ -121,6 +134,14 @@ async def websocket_endpoint(websocket: WebSocket, user_agent: str = None):
                                 "timestamp": datetime.utcnow().isoformat() + "Z"
                             }
                         })
+                    elif message_type == "resume":
+                        # Replay events missed since the client's last sequence
+                        resume_data = message.get("data", {})
+                        await ws_manager.resume_connection(
+                            connection_id,
+                            resume_data.get("last_seq"),
+                            resume_data.get("epoch")
+                        )
                     elif message_type == "subscribe":
                         # Subscribe to specific ADW ID
                         adw_id = message.get("adw_id")
@@ -2,9 +2,18 @@
 Integration tests for concurrent issue allocation.
 
 Simulates real-world scenarios with multiple concurrent ADW creations
-to verify that issue numbers are allocated uniquely without duplicates.
+to verify that issue numbers are allocated uniquely without duplicates,
+and covers the issue_counters sequence behind the allocator:
+- Sequential and block allocation (single and batch endpoints)
+- Counter catching up with rows inserted outside the allocator
+- Migration seeding the counter for existing databases
+- Contention under many concurrent allocators (with throughput report)
 """
 
+import os
+import sqlite3
+import tempfile
+
 import pytest
 import sys
 from pathlib import Path
@@ -16,54 +25,60 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from fastapi.testclient import TestClient
 from server import app
-from server.core.database import get_db_manager, reset_db_manager
+from server.core import database
+from server.core.database import DatabaseManager, get_db_manager, reset_db_manager
 
 client = TestClient(app)
 
 
+def _make_db():
+    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.db', delete=False)
+    temp_file.close()
+    db_manager = DatabaseManager(db_path=temp_file.name)
+    db_manager.initialize()
+    return db_manager
+
+
 @pytest.fixture(autouse=True)
 def setup_teardown():
-    """Setup and teardown for each test."""
-    # Reset database manager before each test
+    """Point the global database manager at a fresh database for each test."""
     reset_db_manager()
+    db_manager = _make_db()
+    database._db_manager = db_manager
     yield
     # Cleanup after test
     reset_db_manager()
+    os.unlink(db_manager.db_path)
+
+
+@pytest.fixture
+def temp_db():
+    """The fresh database behind the API for this test."""
+    return get_db_manager()
+
+
+def _issue(title):
+    return {"issue_title": title, "project_id": "default"}
 
 
 def test_concurrent_adw_creation_with_issue_allocation():
     """
     Test concurrent ADW creation with automatic issue allocation.
 
-    Simulates 10 concurrent ADW creations, each requesting a unique issue number.
-    Verifies that all allocations succeed and no duplicates are created.
+    Simulates 10 concurrent ADW creations, each asking POST /api/adws to
+    allocate its issue number. Verifies that all allocations succeed and no
+    duplicates are created.
     """
     num_concurrent = 10
     results = []
     errors = []
 
     def create_adw_with_issue(index):
-        """Create an ADW by first allocating an issue number."""
+        """Create an ADW, allocating its issue number in the same transaction."""
         try:
-            # Allocate issue number
-            issue_data = {
-                "issue_title": f"Concurrent Test Issue {index}",
-                "project_id": "default"
-            }
-            issue_response = client.post("/api/issues/allocate", json=issue_data)
-
-            if issue_response.status_code != 201:
-                return {
-                    "success": False,
-                    "error": f"Issue allocation failed: {issue_response.json()}"
-                }
-
-            issue_number = issue_response.json()["issue_number"]
-
-            # Create ADW with allocated issue number
             adw_data = {
                 "adw_id": f"test{index:04d}",
-                "issue_number": issue_number,
+                "allocate_issue_number": True,
                 "issue_title": f"Concurrent Test Issue {index}",
                 "current_stage": "backlog",
                 "status": "pending"
@@ -77,6 +92,8 @@ def test_concurrent_adw_creation_with_issue_allocation():
                     "error": f"ADW creation failed: {adw_response.json()}"
                 }
 
+            issue_number = adw_response.json()["issue_number"]
+
             return {
                 "success": True,
                 "issue_number": issue_number,
@@ -213,46 +230,24 @@ def test_mixed_concurrent_operations():
                     return ("error", f"Issue allocation failed: {response.json()}")
 
             elif index % 3 == 1:
-                # Allocate issue and create ADW
-                issue_data = {
-                    "issue_title": f"Mixed Test Issue {index}",
-                    "project_id": "default"
-                }
-                issue_response = client.post("/api/issues/allocate", json=issue_data)
-
-                if issue_response.status_code != 201:
-                    return ("error", f"Issue allocation failed: {issue_response.json()}")
-
-                issue_number = issue_response.json()["issue_number"]
-
+                # Create ADW with an allocated issue number
                 adw_data = {
-                    "adw_id": f"mix{index:04d}",
-                    "issue_number": issue_number,
+                    "adw_id": f"mixd{index:04d}",
+                    "allocate_issue_number": True,
                     "issue_title": f"Mixed Test Issue {index}"
                 }
 
                 adw_response = client.post("/api/adws", json=adw_data)
                 if adw_response.status_code == 201:
-                    return ("adw_creation", issue_number)
+                    return ("adw_creation", adw_response.json()["issue_number"])
                 else:
                     return ("error", f"ADW creation failed: {adw_response.json()}")
 
             else:
-                # Allocate and create, then update
-                issue_data = {
-                    "issue_title": f"Mixed Test Issue {index}",
-                    "project_id": "default"
-                }
-                issue_response = client.post("/api/issues/allocate", json=issue_data)
-
-                if issue_response.status_code != 201:
-                    return ("error", f"Issue allocation failed: {issue_response.json()}")
-
-                issue_number = issue_response.json()["issue_number"]
-
+                # Create ADW with an allocated issue number, then update
                 adw_data = {
-                    "adw_id": f"mix{index:04d}",
-                    "issue_number": issue_number,
+                    "adw_id": f"mixd{index:04d}",
+                    "allocate_issue_number": True,
                     "issue_title": f"Mixed Test Issue {index}"
                 }
 
@@ -260,10 +255,11 @@ def test_mixed_concurrent_operations():
 
                 if adw_response.status_code != 201:
                     return ("error", f"ADW creation failed: {adw_response.json()}")
+                issue_number = adw_response.json()["issue_number"]
 
                 # Update the ADW
                 update_data = {"status": "in_progress"}
-                update_response = client.patch(f"/api/adws/mix{index:04d}", json=update_data)
+                update_response = client.patch(f"/api/adws/mixd{index:04d}", json=update_data)
 
                 if update_response.status_code == 200:
                     return ("adw_creation", issue_number)
@@ -334,3 +330,126 @@ def test_rapid_sequential_allocation():
     # Verify sequential
     assert allocated_numbers == list(range(1, num_allocations + 1)), \
         f"Expected sequential 1-{num_allocations}, got {allocated_numbers}"
+
+
+def test_batch_endpoint_allocates_contiguous_block():
+    """POST /api/issues/allocate/batch reserves one block in request order."""
+    client.post("/api/issues/allocate", json=_issue("first"))
+
+    response = client.post(
+        "/api/issues/allocate/batch",
+        json={"issues": [_issue(f"Card {i}") for i in range(5)]}
+    )
+
+    assert response.status_code == 201, response.json()
+    body = response.json()
+    assert (body["first_issue_number"], body["last_issue_number"]) == (2, 6)
+    assert [a["issue_number"] for a in body["allocations"]] == [2, 3, 4, 5, 6]
+
+
+def test_allocates_sequential_numbers(temp_db):
+    """Single allocations hand out 1, 2, 3... and create issue rows."""
+    numbers = [temp_db.allocate_issue_numbers([_issue(f"Issue {i}")])[0] for i in range(3)]
+
+    assert numbers == [1, 2, 3]
+    rows = temp_db.execute_query("SELECT issue_number, issue_title FROM issue_tracker ORDER BY issue_number")
+    assert [(r['issue_number'], r['issue_title']) for r in rows] == [
+        (1, "Issue 0"), (2, "Issue 1"), (3, "Issue 2")
+    ]
+
+
+def test_block_allocation_is_contiguous(temp_db):
+    """A batch reserves one contiguous block in request order."""
+    temp_db.allocate_issue_numbers([_issue("first")])
+
+    numbers = temp_db.allocate_issue_numbers([_issue(f"Card {i}") for i in range(5)])
+
+    assert numbers == [2, 3, 4, 5, 6]
+    assert temp_db.allocate_issue_numbers([]) == []
+    assert temp_db.allocate_issue_numbers([_issue("next")]) == [7]
+
+
+def test_counter_skips_numbers_inserted_directly(temp_db):
+    """Rows written outside the allocator are never handed out again."""
+    temp_db.allocate_issue_numbers([_issue("first")])
+    temp_db.execute_insert(
+        "INSERT INTO issue_tracker (issue_number, issue_title) VALUES (?, ?)",
+        (40, "Imported")
+    )
+
+    assert temp_db.allocate_issue_numbers([_issue("next")]) == [41]
+
+
+def test_counter_row_recreated_if_missing(temp_db):
+    """Allocation still works if the counter row has been removed."""
+    temp_db.allocate_issue_numbers([_issue("first")])
+    temp_db.execute_update("DELETE FROM issue_counters")
+
+    assert temp_db.allocate_issue_numbers([_issue("second")]) == [2]
+
+
+def test_failed_insert_does_not_consume_numbers(temp_db):
+    """A rolled back allocation leaves the sequence untouched."""
+    with pytest.raises(sqlite3.IntegrityError):
+        temp_db.allocate_issue_numbers([_issue("ok"), {"issue_title": None}])
+
+    assert temp_db.allocate_issue_numbers([_issue("retry")]) == [1]
+
+
+def test_migration_seeds_counter_from_existing_issues(temp_db):
+    """Databases created before issue_counters get a seeded counter on startup."""
+    with temp_db.transaction() as conn:
+        conn.execute("DROP TABLE issue_counters")
+        conn.execute("DELETE FROM schema_migrations WHERE version = '002_add_issue_counters'")
+        conn.execute(
+            "INSERT INTO issue_tracker (issue_number, issue_title) VALUES (17, 'Legacy')"
+        )
+
+    # Re-open as an existing database so migrations run
+    db_manager = DatabaseManager(db_path=str(temp_db.db_path))
+    db_manager.initialize()
+
+    counter = db_manager.execute_query("SELECT value FROM issue_counters WHERE name = 'issue_number'")
+    assert counter[0]['value'] == 17
+    assert db_manager.allocate_issue_numbers([_issue("new")]) == [18]
+    db_manager.close()
+
+
+def test_concurrent_allocation_is_unique_and_gapless(temp_db):
+    """Many threads allocating singles and blocks never collide or leave gaps."""
+    num_workers = 16
+    singles = 200
+    batches = 20
+    batch_size = 10
+
+    def allocate_single(index):
+        return temp_db.allocate_issue_numbers([_issue(f"Single {index}")])
+
+    def allocate_batch(index):
+        return temp_db.allocate_issue_numbers(
+            [_issue(f"Batch {index} card {i}") for i in range(batch_size)]
+        )
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        single_futures = [executor.submit(allocate_single, i) for i in range(singles)]
+        batch_futures = [executor.submit(allocate_batch, i) for i in range(batches)]
+        single_results = [f.result() for f in single_futures]
+        batch_results = [f.result() for f in batch_futures]
+    elapsed = time.perf_counter() - start
+
+    total = singles + batches * batch_size
+    numbers = [n for result in single_results + batch_results for n in result]
+    assert sorted(numbers) == list(range(1, total + 1))
+
+    # Each batch got a contiguous block
+    for result in batch_results:
+        assert result == list(range(result[0], result[0] + batch_size))
+
+    count = temp_db.execute_query("SELECT COUNT(*) AS count FROM issue_tracker")[0]['count']
+    assert count == total
+
+    print(
+        f"\nAllocated {total} issue numbers with {num_workers} workers in "
+        f"{elapsed:.3f}s ({total / elapsed:.0f} issues/s)"
+    )
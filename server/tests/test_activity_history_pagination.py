@@ -0,0 +1,263 @@
+"""
+Tests for activity history pagination.
+
+Tests cover:
+- Keyset (before_id) pagination walking the full history without gaps
+- Exact, approximate and skipped total counts
+- History of archived ADWs served from the archive database, merged with
+  activity logged after archiving
+- Query plans using the (adw_id, timestamp, id) index
+- Offset vs keyset latency on a large activity table (benchmark)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "adws"))
+
+from fastapi.testclient import TestClient
+from server import app
+from server.api import adw_db
+from server.core.database import DatabaseManager
+from adw_modules.activity_retention import ActivityRetention, default_archive_path
+
+client = TestClient(app)
+
+# Rows in the benchmark table; set ACTIVITY_BENCH_ROWS=1000000 for the full run
+BENCH_ROWS = int(os.environ.get("ACTIVITY_BENCH_ROWS", "200000"))
+
+
+def _make_db():
+    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.db', delete=False)
+    temp_file.close()
+    db_manager = DatabaseManager(db_path=temp_file.name)
+    db_manager.initialize()
+    return db_manager
+
+
+def _seed(db_manager, adw_id, rows, other_adw_rows=0):
+    """Insert rows activity logs for adw_id (plus noise for another ADW) in bulk."""
+    with db_manager.transaction() as conn:
+        for aid in (adw_id, "otheradw"):
+            conn.execute(
+                "INSERT INTO adw_states (adw_id, issue_title) VALUES (?, ?)", (aid, aid)
+            )
+        # Several rows share each timestamp so the id tiebreaker matters
+        conn.execute(
+            """
+            WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+            INSERT INTO adw_activity_logs (adw_id, event_type, new_value, timestamp)
+            SELECT ?, 'user_action', n, datetime('2025-01-01', '+' || (n / 3) || ' seconds')
+            FROM seq
+            """,
+            (rows, adw_id)
+        )
+        if other_adw_rows:
+            conn.execute(
+                """
+                WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+                INSERT INTO adw_activity_logs (adw_id, event_type, new_value, timestamp)
+                SELECT 'otheradw', 'user_action', n, datetime('2025-01-01', '+' || n || ' seconds')
+                FROM seq
+                """,
+                (other_adw_rows,)
+            )
+
+
+@pytest.fixture
+def temp_db():
+    """Temporary database wired into the activity endpoint."""
+    db_manager = _make_db()
+    with patch.object(adw_db, "get_db_manager", return_value=db_manager):
+        yield db_manager
+    db_manager.close()
+    try:
+        os.unlink(db_manager.db_path)
+    except OSError:
+        pass
+
+
+def test_keyset_pagination_walks_full_history(temp_db):
+    """Following next_before_id returns every activity once, newest first."""
+    _seed(temp_db, "pageadw1", 25, other_adw_rows=10)
+
+    seen = []
+    params = {"page_size": 7, "count": "none"}
+    while True:
+        response = client.get("/api/adws/pageadw1/activity", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_count"] is None
+        seen.extend(a["new_value"] for a in data["activities"])
+        if not data["has_more"]:
+            assert data["next_before_id"] is None
+            break
+        params["before_id"] = data["next_before_id"]
+
+    assert seen == [str(n) for n in range(25, 0, -1)]
+
+
+def test_offset_pagination_still_supported(temp_db):
+    """page/page_size keep working and agree with keyset ordering."""
+    _seed(temp_db, "pageadw2", 10)
+
+    data = client.get("/api/adws/pageadw2/activity", params={"page": 2, "page_size": 4}).json()
+
+    assert [a["new_value"] for a in data["activities"]] == ["6", "5", "4", "3"]
+    assert data["total_count"] == 10
+    assert data["has_more"] is True
+
+
+def test_approximate_count_is_capped(temp_db):
+    """Approximate counts stop at the limit and flag themselves."""
+    _seed(temp_db, "pageadw3", 30)
+
+    with patch.object(adw_db, "ACTIVITY_COUNT_APPROXIMATE_LIMIT", 20):
+        capped = client.get("/api/adws/pageadw3/activity", params={"count": "approximate"}).json()
+    exact = client.get("/api/adws/pageadw3/activity", params={"count": "approximate"}).json()
+
+    assert capped["total_count"] == 20
+    assert capped["total_count_is_approximate"] is True
+    assert exact["total_count"] == 30
+    assert exact["total_count_is_approximate"] is False
+
+
+def test_cursor_from_another_adw_is_rejected(temp_db):
+    """before_id must belong to the requested ADW."""
+    _seed(temp_db, "pageadw4", 3, other_adw_rows=3)
+    other_id = temp_db.execute_query(
+        "SELECT id FROM adw_activity_logs WHERE adw_id = 'otheradw' LIMIT 1"
+    )[0]['id']
+
+    response = client.get("/api/adws/pageadw4/activity", params={"before_id": other_id})
+
+    assert response.status_code == 400
+
+
+def test_archived_history_is_served_from_archive(temp_db):
+    """Once retention has moved an ADW's activity out, both pagination modes read the archive."""
+    _seed(temp_db, "pageadw5", 9)
+    temp_db.execute_update("UPDATE adw_states SET deleted_at = '2000-01-01' WHERE adw_id = 'pageadw5'")
+    archive_path = default_archive_path(Path(temp_db.db_path))
+    try:
+        assert ActivityRetention(db_path=Path(temp_db.db_path), pause=0).run()["archived_rows"] == 9
+
+        first = client.get("/api/adws/pageadw5/activity", params={"page_size": 5}).json()
+        rest = client.get(
+            "/api/adws/pageadw5/activity", params={"page_size": 5, "before_id": first["next_before_id"]}
+        ).json()
+        assert first["total_count"] == 9
+        assert [a["new_value"] for a in first["activities"] + rest["activities"]] == [
+            str(n) for n in range(9, 0, -1)
+        ]
+        assert client.get("/api/adws/otheradw/activity").json()["total_count"] == 0
+    finally:
+        archive_path.unlink(missing_ok=True)
+
+
+def test_archived_and_live_history_are_paged_together(temp_db):
+    """Activity logged after archiving is ordered and paginated with the archived rows."""
+    _seed(temp_db, "pageadw6", 6)
+    temp_db.execute_update("UPDATE adw_states SET deleted_at = '2000-01-01' WHERE adw_id = 'pageadw6'")
+    archive_path = default_archive_path(Path(temp_db.db_path))
+    try:
+        assert ActivityRetention(db_path=Path(temp_db.db_path), pause=0).run()["archived_rows"] == 6
+        with temp_db.transaction() as conn:
+            for n in range(7, 10):
+                conn.execute(
+                    "INSERT INTO adw_activity_logs (adw_id, event_type, new_value, timestamp) "
+                    "VALUES ('pageadw6', 'user_action', ?, datetime('2025-01-01', '+1 hour'))",
+                    (str(n),)
+                )
+
+        first = client.get("/api/adws/pageadw6/activity", params={"page_size": 5}).json()
+        rest = client.get(
+            "/api/adws/pageadw6/activity", params={"page_size": 5, "before_id": first["next_before_id"]}
+        ).json()
+        second_page = client.get("/api/adws/pageadw6/activity", params={"page": 2, "page_size": 4}).json()
+
+        assert first["total_count"] == 9
+        assert [a["new_value"] for a in first["activities"] + rest["activities"]] == [
+            str(n) for n in range(9, 0, -1)
+        ]
+        assert [a["new_value"] for a in second_page["activities"]] == ["5", "4", "3", "2"]
+        assert second_page["has_more"] is True
+    finally:
+        archive_path.unlink(missing_ok=True)
+
+
+def test_history_queries_use_composite_index(temp_db):
+    """Both pagination modes and the count are served by the composite index."""
+    queries = [
+        "SELECT * FROM adw_activity_logs WHERE adw_id = ? "
+        "ORDER BY timestamp DESC, id DESC LIMIT 10 OFFSET 0",
+        "SELECT * FROM adw_activity_logs WHERE adw_id = ? AND (timestamp, id) < ('2025', 5) "
+        "ORDER BY timestamp DESC, id DESC LIMIT 10",
+        "SELECT COUNT(*) FROM adw_activity_logs WHERE adw_id = ?",
+    ]
+
+    with temp_db.get_connection() as conn:
+        for query in queries:
+            plan = " ".join(row['detail'] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", ("x",)))
+            assert "idx_activity_logs_adw_id_timestamp" in plan, plan
+            assert "TEMP B-TREE" not in plan, plan
+
+
+def test_deep_page_benchmark():
+    """Keyset pages stay flat while deep OFFSET pages grow with depth."""
+    db_manager = _make_db()
+    try:
+        start = time.perf_counter()
+        _seed(db_manager, "benchadw", BENCH_ROWS, other_adw_rows=BENCH_ROWS // 10)
+        seed_time = time.perf_counter() - start
+
+        page_size = 100
+        offset = BENCH_ROWS - page_size
+        with db_manager.get_connection() as conn:
+            cursor_row = conn.execute(
+                """
+                SELECT timestamp, id FROM adw_activity_logs WHERE adw_id = 'benchadw'
+                ORDER BY timestamp DESC, id DESC LIMIT 1 OFFSET ?
+                """,
+                (offset - 1,)
+            ).fetchone()
+
+            start = time.perf_counter()
+            offset_rows = conn.execute(
+                """
+                SELECT * FROM adw_activity_logs WHERE adw_id = 'benchadw'
+                ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?
+                """,
+                (page_size, offset)
+            ).fetchall()
+            offset_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            keyset_rows = conn.execute(
+                """
+                SELECT * FROM adw_activity_logs
+                WHERE adw_id = 'benchadw' AND (timestamp, id) < (?, ?)
+                ORDER BY timestamp DESC, id DESC LIMIT ?
+                """,
+                (cursor_row['timestamp'], cursor_row['id'], page_size)
+            ).fetchall()
+            keyset_time = time.perf_counter() - start
+
+        assert [r['id'] for r in keyset_rows] == [r['id'] for r in offset_rows]
+        assert keyset_time < offset_time
+
+        print(
+            f"\n{BENCH_ROWS} activity rows (seeded in {seed_time:.2f}s): last page "
+            f"OFFSET {offset_time * 1000:.2f}ms vs keyset {keyset_time * 1000:.2f}ms"
+        )
+    finally:
+        db_manager.close()
+        os.unlink(db_manager.db_path)
@@ -256,3 +256,24 @@ def test_create_adw_without_issue_number():
     assert data["adw_id"] == "testadw9"
     # issue_number should be None or null
     assert data["issue_number"] is None
+
+
+def test_create_adw_allocates_issue_number():
+    """Test that allocate_issue_number reserves a tracker row linked to the ADW."""
+    adw_data = {
+        "adw_id": "testadwa",
+        "allocate_issue_number": True,
+        "issue_title": "Test Allocated Issue Number",
+    }
+
+    response = client.post("/api/adws", json=adw_data)
+    assert response.status_code == 201
+    issue_number = response.json()["issue_number"]
+    assert issue_number is not None
+
+    rows = get_db_manager().execute_query(
+        "SELECT adw_id, issue_title FROM issue_tracker WHERE issue_number = ?",
+        (issue_number,)
+    )
+    assert rows[0]["adw_id"] == "testadwa"
+    assert rows[0]["issue_title"] == "Test Allocated Issue Number"
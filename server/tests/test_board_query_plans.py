@@ -0,0 +1,179 @@
+"""
+Tests for the partial composite indexes behind the Kanban board queries.
+
+Tests cover:
+- Query plans for the board listings (/api/adws filters, discovery, liveness)
+  using the partial indexes without a temp B-tree sort
+- Migration replacing the old single-column indexes
+- Time to the first page of each listing, old vs new indexes, on 100k ADWs
+  (benchmark, skipped unless BOARD_BENCH_ROWS is set)
+
+The queries are taken from the modules that run them.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "adws"))
+
+from server.api.adws import LIST_ADWS_SQL
+from server.core.database import DatabaseManager, adw_list_query
+from adw_modules.discovery import DISCOVER_ADWS_SQL
+from adw_modules.liveness_monitor import ACTIVE_ADWS_SQL
+
+# ADWs in the benchmark table; the benchmark only runs when this is set
+BENCH_ROWS = int(os.environ.get("BOARD_BENCH_ROWS", "0"))
+
+OLD_INDEXES = ["status", "current_stage", "is_stuck", "deleted_at"]
+
+NEW_INDEXES = [
+    "idx_adw_states_in_progress",
+    "idx_adw_states_active_created",
+    "idx_adw_states_active_updated",
+    "idx_adw_states_active_status",
+    "idx_adw_states_active_stage",
+    "idx_adw_states_stuck",
+]
+
+# name -> (query, params, indexes any of which may serve it)
+BOARD_QUERIES = {
+    # /api/adws without filters
+    "all": (*adw_list_query(), ["idx_adw_states_active_created"]),
+    # server/api/adws.py listing
+    "list": (LIST_ADWS_SQL, (), ["idx_adw_states_active_created"]),
+    # discovery._discover_from_database
+    "discovery": (DISCOVER_ADWS_SQL, (), ["idx_adw_states_active_updated"]),
+    # /api/adws?status=
+    "status": (*adw_list_query(status="in_progress"), ["idx_adw_states_active_status"]),
+    # /api/adws?stage=
+    "stage": (*adw_list_query(stage="build"), ["idx_adw_states_active_stage"]),
+    # /api/adws?status=&stage=
+    "status_and_stage": (*adw_list_query(status="in_progress", stage="build"),
+                         ["idx_adw_states_active_status", "idx_adw_states_active_stage"]),
+    # /api/adws?is_stuck=true
+    "stuck": (*adw_list_query(is_stuck=True), ["idx_adw_states_stuck"]),
+    # Liveness monitor
+    "liveness": (ACTIVE_ADWS_SQL, (), ["idx_adw_states_in_progress"]),
+}
+
+
+def _make_db():
+    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.db', delete=False)
+    temp_file.close()
+    db_manager = DatabaseManager(db_path=temp_file.name)
+    db_manager.initialize()
+    return db_manager
+
+
+def _seed(db_manager, rows):
+    """Insert rows synthetic ADWs spread over statuses and stages, 5% deleted, 2% stuck."""
+    with db_manager.transaction() as conn:
+        conn.execute(
+            """
+            WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < ?)
+            INSERT INTO adw_states (adw_id, issue_title, status, current_stage, is_stuck,
+                                    created_at, updated_at, deleted_at)
+            SELECT printf('b%07d', n), 'Issue ' || n,
+                   CASE n % 10 WHEN 0 THEN 'in_progress' WHEN 1 THEN 'errored' ELSE 'completed' END,
+                   CASE n % 7 WHEN 0 THEN 'plan' WHEN 1 THEN 'build' WHEN 2 THEN 'test' WHEN 3 THEN 'review'
+                              WHEN 4 THEN 'document' ELSE 'ready-to-merge' END,
+                   n % 50 = 7,
+                   datetime('2025-01-01', '+' || n || ' minutes'),
+                   datetime('2025-01-01', '+' || n || ' minutes'),
+                   CASE WHEN n % 20 = 3 THEN datetime('2025-06-01') END
+            FROM seq
+            """,
+            (rows,)
+        )
+
+
+def _plan(conn, query, params):
+    return " ".join(row['detail'] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params))
+
+
+def _use_old_indexes(db_manager):
+    with db_manager.transaction() as conn:
+        for name in NEW_INDEXES:
+            conn.execute(f"DROP INDEX {name}")
+        for column in OLD_INDEXES:
+            conn.execute(f"CREATE INDEX idx_adw_states_{column} ON adw_states({column})")
+
+
+@pytest.fixture
+def temp_db():
+    db_manager = _make_db()
+    _seed(db_manager, 2000)
+    yield db_manager
+    db_manager.close()
+    try:
+        os.unlink(db_manager.db_path)
+    except OSError:
+        pass
+
+
+@pytest.mark.parametrize("name", BOARD_QUERIES)
+def test_board_query_uses_partial_index(temp_db, name):
+    """Each board query is filtered and ordered by one of its partial indexes."""
+    query, params, indexes = BOARD_QUERIES[name]
+    with temp_db.get_connection() as conn:
+        plan = _plan(conn, query, params)
+
+    assert any(index in plan for index in indexes), plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_migration_replaces_single_column_indexes(temp_db):
+    """Existing databases drop the single-column indexes and get the partial ones."""
+    _use_old_indexes(temp_db)
+    temp_db.execute_update("DELETE FROM schema_migrations WHERE version = '013_add_board_indexes'")
+
+    db_manager = DatabaseManager(db_path=str(temp_db.db_path))
+    db_manager.initialize()
+
+    indexes = {
+        row['name'] for row in db_manager.execute_query(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'adw_states'"
+        )
+    }
+    assert set(NEW_INDEXES) <= indexes
+    assert not {f"idx_adw_states_{column}" for column in OLD_INDEXES} & indexes
+
+
+@pytest.mark.skipif(not BENCH_ROWS, reason="benchmark; set BOARD_BENCH_ROWS (e.g. 100000) to run")
+def test_board_query_benchmark():
+    """Time to the first page of each board listing, old vs new indexes."""
+    db_manager = _make_db()
+    try:
+        start = time.perf_counter()
+        _seed(db_manager, BENCH_ROWS)
+        seed_time = time.perf_counter() - start
+
+        def run():
+            timings = {}
+            with db_manager.get_connection() as conn:
+                for name, (query, params, _) in BOARD_QUERIES.items():
+                    start = time.perf_counter()
+                    first_page = conn.execute(query, params).fetchmany(50)
+                    timings[name] = (time.perf_counter() - start, len(first_page))
+            return timings
+
+        run()  # Warm the page cache
+        new = run()
+        _use_old_indexes(db_manager)
+        old = run()
+
+        assert {name: rows for name, (_, rows) in new.items()} == {name: rows for name, (_, rows) in old.items()}
+
+        print(f"\n{BENCH_ROWS} ADWs (seeded in {seed_time:.2f}s), first 50 rows:")
+        for name in new:
+            print(f"  {name}: old {old[name][0] * 1000:.2f}ms vs new {new[name][0] * 1000:.2f}ms")
+    finally:
+        db_manager.close()
+        os.unlink(db_manager.db_path)
@@ -0,0 +1,148 @@
+"""
+Tests for the sequenced, replayable WebSocket event log.
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from server.core.event_log import EventLog
+from server.core.websocket_manager import WebSocketManager
+
+
+def _last_sent(websocket):
+    return json.loads(websocket.send_text.call_args[0][0])
+
+
+def _fill(log, count):
+    for i in range(count):
+        log.append({"type": "workflow_log", "data": {"n": i}})
+
+
+def test_append_stamps_increasing_sequence():
+    log = EventLog()
+    event = {"type": "status_update"}
+
+    assert log.append(event) == 1
+    assert event["seq"] == 1
+    assert log.append({"type": "status_update"}) == 2
+    assert log.seq == 2
+
+
+def test_resume_replays_missed_events_in_one_message():
+    log = EventLog()
+    _fill(log, 5)
+
+    reply = log.resume(2, log.epoch)
+
+    assert reply["type"] == "resume_complete"
+    assert reply["data"]["seq"] == 5
+    assert [e["seq"] for e in reply["data"]["events"]] == [3, 4, 5]
+    assert log.resume(5, log.epoch)["data"]["events"] == []
+
+
+def test_resume_without_last_seq_returns_position():
+    log = EventLog()
+    _fill(log, 3)
+
+    reply = log.resume(None, None)
+
+    assert reply == {"type": "resume_complete", "data": {"epoch": log.epoch, "seq": 3, "events": []}}
+
+
+@pytest.mark.parametrize("last_seq,epoch,reason", [
+    (1, "otherepoch00", "epoch_changed"),
+    (9, None, "sequence_ahead"),
+])
+def test_resume_requires_snapshot(last_seq, epoch, reason):
+    log = EventLog()
+    _fill(log, 3)
+
+    reply = log.resume(last_seq, epoch or log.epoch)
+
+    assert reply["type"] == "snapshot_required"
+    assert reply["data"]["reason"] == reason
+
+
+def test_evicted_gap_without_database_requires_snapshot():
+    log = EventLog(capacity=3)
+    _fill(log, 10)
+
+    assert log.resume(7, log.epoch)["type"] == "resume_complete"
+    assert log.resume(6, log.epoch)["data"]["reason"] == "gap_evicted"
+
+
+def test_evicted_events_replay_from_sqlite(tmp_path):
+    log = EventLog(capacity=3, db_path=tmp_path / "events.db", spill_batch_size=2)
+    _fill(log, 10)
+
+    events = log.since(0)
+
+    assert [e["seq"] for e in events] == list(range(1, 11))
+    assert events[0]["data"] == {"n": 0}
+    log.close()
+
+
+def test_persisted_events_are_bounded(tmp_path):
+    log = EventLog(capacity=2, db_path=tmp_path / "events.db", max_persisted=4, spill_batch_size=2)
+    _fill(log, 20)
+    log.flush()
+
+    assert log.since(0) is None
+    assert log.since(log.stats()["oldest_seq"] - 1)[-1]["seq"] == 20
+    log.close()
+
+
+def test_spill_is_written_off_the_broadcasting_thread(tmp_path):
+    log = EventLog(capacity=2, db_path=tmp_path / "events.db", spill_batch_size=2)
+    writers = set()
+    log._writer_conn.set_trace_callback(lambda sql: writers.add(threading.current_thread().name))
+    _fill(log, 10)
+    log.flush()
+
+    assert writers and threading.current_thread().name not in writers
+    assert [e["seq"] for e in log.since(0)] == list(range(1, 11))
+    log.close()
+
+
+def test_new_epoch_clears_previous_rows_for_same_source(tmp_path):
+    db_path = tmp_path / "events.db"
+    old = EventLog(source="trigger", capacity=1, db_path=db_path, spill_batch_size=1)
+    other = EventLog(source="server", capacity=1, db_path=db_path, spill_batch_size=1)
+    _fill(old, 3)
+    _fill(other, 3)
+    old.close()
+
+    EventLog(source="trigger", db_path=db_path).close()
+
+    assert other.since(0) is not None
+    assert len(other.since(0)) == 3
+    other.close()
+
+
+@pytest.mark.asyncio
+async def test_manager_sequences_broadcasts_and_resumes():
+    manager = WebSocketManager(event_log=EventLog())
+    websocket = AsyncMock()
+    connection_id = await manager.connect(websocket)
+    ack = _last_sent(websocket)
+    assert ack["data"]["epoch"] == manager.event_log.epoch
+
+    await manager.broadcast_heartbeat()
+    assert "seq" not in _last_sent(websocket)
+
+    await manager.broadcast_system_log("Workflow started")
+    sent = _last_sent(websocket)
+    assert sent["seq"] == 1
+
+    await manager.resume_connection(connection_id, 0, manager.event_log.epoch)
+    reply = _last_sent(websocket)
+    assert reply["type"] == "resume_complete"
+    assert [e["seq"] for e in reply["data"]["events"]] == [1]
@@ -7,7 +7,8 @@ Tests file tracking, git diff generation, and summary data preparation.
 import pytest
 import subprocess
 from pathlib import Path
-from server.modules.file_tracker import FileTracker
+from unittest.mock import patch
+from server.modules.file_tracker import FileTracker, parse_numstat_patch
 
 
 @pytest.fixture
@@ -397,3 +398,116 @@ class TestEdgeCases:
         assert "relative/path/file.py" in tracked["read"]
         assert "/absolute/path/file.py" in tracked["read"]
         assert len(tracked["read"]) == 2
+
+
+def _git_diff_calls(popen):
+    """Commands of the `git diff` processes a wrapped Popen started"""
+    return [call.args[0] for call in popen.call_args_list if "diff" in call.args[0]]
+
+
+class TestBatchDiffs:
+    """Batched git diff tests"""
+
+    @staticmethod
+    def _modify_files(repo_path, count):
+        paths = []
+        for i in range(count):
+            path = repo_path / f"module{i}.py"
+            path.write_text(f"value = {i}\n")
+            paths.append(path)
+        subprocess.run(["git", "add", "."], cwd=repo_path, check=True, capture_output=True)
+        subprocess.run(["git", "commit", "-m", "Add modules"], cwd=repo_path, check=True, capture_output=True)
+        for i, path in enumerate(paths):
+            path.write_text(f"value = {i + 100}\nextra = True\n")
+        return [str(p) for p in paths]
+
+    def test_batch_matches_single_file_diffs(self, temp_git_repo):
+        """Test that batched diffs equal per-file git diff output"""
+        paths = self._modify_files(temp_git_repo, 3)
+        tracker = FileTracker(adw_id="test123", repo_path=str(temp_git_repo))
+
+        batch = tracker.get_file_diffs(paths)
+
+        for path in paths:
+            expected = subprocess.run(
+                ["git", "diff", path], cwd=temp_git_repo, capture_output=True, text=True
+            ).stdout
+            assert batch[path]["diff"] == expected
+            assert batch[path]["lines_added"] == 2
+            assert batch[path]["lines_removed"] == 1
+
+    def test_single_git_diff_invocation(self, temp_git_repo):
+        """Test that many modified files are diffed by one git diff process"""
+        paths = self._modify_files(temp_git_repo, 20)
+        tracker = FileTracker(adw_id="test123", repo_path=str(temp_git_repo))
+        for path in paths:
+            tracker.track_modified(path)
+
+        with patch("subprocess.Popen", wraps=subprocess.Popen) as popen:
+            summaries = [tracker.generate_file_summary(path) for path in paths]
+
+        assert len(_git_diff_calls(popen)) == 1
+        assert all(summary["lines_added"] == 2 for summary in summaries)
+
+    def test_results_cached_by_blob(self, temp_git_repo):
+        """Test that only files whose content changed are re-diffed"""
+        paths = self._modify_files(temp_git_repo, 3)
+        tracker = FileTracker(adw_id="test123", repo_path=str(temp_git_repo))
+        tracker.get_file_diffs(paths)
+
+        with patch("subprocess.Popen", wraps=subprocess.Popen) as popen:
+            tracker.get_file_diffs(paths)
+            assert _git_diff_calls(popen) == []
+
+            Path(paths[1]).write_text("value = 'changed'\n")
+            result = tracker.get_file_diffs(paths)
+
+        diff_calls = _git_diff_calls(popen)
+        assert len(diff_calls) == 1
+        assert diff_calls[0][-1] == "module1.py"
+        assert "+value = 'changed'" in result[paths[1]]["diff"]
+        assert result[paths[1]]["lines_added"] == 1
+
+    def test_unmodified_untracked_and_missing_files(self, temp_git_repo):
+        """Test files with no diff in the batch"""
+        untracked = temp_git_repo / "new.py"
+        untracked.write_text("x = 1\n")
+        tracker = FileTracker(adw_id="test123", repo_path=str(temp_git_repo))
+
+        result = tracker.get_file_diffs([
+            str(temp_git_repo / "test.py"),
+            str(untracked),
+            str(temp_git_repo / "missing.py"),
+        ])
+
+        assert result[str(temp_git_repo / "test.py")]["diff"] == ""
+        assert result[str(untracked)]["diff"] == ""
+        assert result[str(temp_git_repo / "missing.py")] is None
+
+    def test_batch_truncates_large_diffs(self, temp_git_repo):
+        """Test that large diffs are truncated but counted in full"""
+        test_file = temp_git_repo / "large.py"
+        test_file.write_text("\n".join(f"line{i} = {i}" for i in range(2000)))
+        subprocess.run(["git", "add", "."], cwd=temp_git_repo, check=True, capture_output=True)
+        subprocess.run(["git", "commit", "-m", "Add large file"], cwd=temp_git_repo, check=True, capture_output=True)
+        test_file.write_text("\n".join(f"modified_line{i} = {i}" for i in range(2000)))
+
+        tracker = FileTracker(adw_id="test123", repo_path=str(temp_git_repo))
+        entry = tracker.get_file_diffs([str(test_file)])[str(test_file)]
+
+        assert entry["diff"].endswith("... (truncated, showing first 1000 lines)")
+        assert entry["diff"] == tracker.get_file_diff(str(test_file))
+        assert entry["lines_added"] == 2000
+        assert entry["lines_removed"] == 2000
+
+    def test_parse_numstat_patch_binary(self):
+        """Test that binary files parse with zero line counts"""
+        output = (
+            b"-\t-\tlogo.png\x001\t0\tREADME.md\x00\x00"
+            b"diff --git a/logo.png b/logo.png\nBinary files a/logo.png and b/logo.png differ\n"
+            b"diff --git a/README.md b/README.md\n--- a/README.md\n+++ b/README.md\n@@ -0,0 +1 @@\n+hi\n"
+        )
+        parsed = list(parse_numstat_patch(output.splitlines(keepends=True)))
+
+        assert [(p, a, r) for p, a, r, _, _ in parsed] == [("logo.png", 0, 0), ("README.md", 1, 0)]
+        assert parsed[1][3].endswith("+hi\n")
@@ -634,3 +634,153 @@ class TestIntegrationPatterns:
         assert "adw1" in adw_operations
         assert "adw2" in adw_operations
         assert "adw3" in adw_operations
+
+
+class TestConcurrentAsyncHooks:
+    """Concurrent dispatch, timeouts, background tasks, and hook stats"""
+
+    @pytest.mark.asyncio
+    async def test_equal_priority_hooks_run_concurrently(self):
+        """Test that slow hooks of equal priority overlap when concurrency is enabled"""
+        hook_system = HookSystem(concurrent=True)
+
+        async def slow_a(context):
+            await asyncio.sleep(0.1)
+            return "a"
+
+        async def slow_b(context):
+            await asyncio.sleep(0.1)
+            return "b"
+
+        hook_system.register_hook(HookType.POST_TOOL_USE, slow_a)
+        hook_system.register_hook(HookType.POST_TOOL_USE, slow_b)
+
+        start = asyncio.get_running_loop().time()
+        results = await hook_system.execute_hooks_async(HookType.POST_TOOL_USE, {})
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert results == ["a", "b"]
+        assert elapsed < 0.18
+
+    @pytest.mark.asyncio
+    async def test_priority_groups_run_in_order(self):
+        """Test that a lower priority group starts after the higher one finishes"""
+        hook_system = HookSystem(concurrent=True)
+        events = []
+
+        async def high(context):
+            await asyncio.sleep(0.05)
+            events.append("high done")
+
+        async def low(context):
+            events.append("low start")
+
+        hook_system.register_hook(HookType.POST_TOOL_USE, low, HookPriority.LOW)
+        hook_system.register_hook(HookType.POST_TOOL_USE, high, HookPriority.HIGH)
+
+        await hook_system.execute_hooks_async(HookType.POST_TOOL_USE, {})
+
+        assert events == ["high done", "low start"]
+
+    @pytest.mark.asyncio
+    async def test_sequential_by_default(self):
+        """Test that hooks run one at a time unless concurrency is enabled"""
+        hook_system = HookSystem()
+        events = []
+
+        async def first(context):
+            await asyncio.sleep(0.05)
+            events.append("first")
+
+        async def second(context):
+            events.append("second")
+
+        hook_system.register_hook(HookType.POST_TOOL_USE, first)
+        hook_system.register_hook(HookType.POST_TOOL_USE, second)
+
+        await hook_system.execute_hooks_async(HookType.POST_TOOL_USE, {})
+        assert events == ["first", "second"]
+
+        events.clear()
+        await hook_system.execute_hooks_async(HookType.POST_TOOL_USE, {}, concurrent=True)
+        assert events == ["second", "first"]
+
+    @pytest.mark.asyncio
+    async def test_hook_timeout(self):
+        """Test that a hung hook is cut off without losing the others' results"""
+        hook_system = HookSystem(hook_timeout=0.05)
+
+        async def hangs(context):
+            await asyncio.sleep(10)
+
+        async def quick(context):
+            return "ok"
+
+        hook_system.register_hook(HookType.POST_TOOL_USE, hangs)
+        hook_system.register_hook(HookType.POST_TOOL_USE, quick)
+
+        results = await hook_system.execute_hooks_async(HookType.POST_TOOL_USE, {})
+
+        assert results == [None, "ok"]
+        stats = hook_system.get_hook_stats(HookType.POST_TOOL_USE)
+        assert stats["hangs"]["timeouts"] == 1
+        assert stats["hangs"]["errors"] == 1
+        assert stats["quick"]["errors"] == 0
+
+    @pytest.mark.asyncio
+    async def test_per_hook_timeout_override(self):
+        """Test that a hook's own timeout wins over the system default"""
+        hook_system = HookSystem(hook_timeout=0.01)
+
+        async def slowish(context):
+            await asyncio.sleep(0.05)
+            return "done"
+
+        hook_system.register_hook(HookType.POST_TOOL_USE, slowish, timeout=1.0)
+
+        assert await hook_system.execute_hooks_async(HookType.POST_TOOL_USE, {}) == ["done"]
+
+    @pytest.mark.asyncio
+    async def test_background_tasks_are_tracked(self):
+        """Test that async hooks fired from execute_hooks are referenced and drainable"""
+        hook_system = HookSystem()
+        executed = []
+
+        async def async_callback(context):
+            await asyncio.sleep(0.02)
+            executed.append("async")
+
+        hook_system.register_hook(HookType.PRE_TOOL_USE, async_callback)
+        hook_system.execute_hooks(HookType.PRE_TOOL_USE, {})
+
+        assert hook_system.get_pending_task_count() == 1
+        await hook_system.drain(timeout=1)
+
+        assert executed == ["async"]
+        assert hook_system.get_pending_task_count() == 0
+        assert hook_system.get_hook_stats(HookType.PRE_TOOL_USE)["async_callback"]["calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_error_and_latency_stats(self):
+        """Test per-hook counters alongside the execution count"""
+        hook_system = HookSystem()
+
+        def failing(context):
+            raise ValueError("boom")
+
+        async def fine(context):
+            await asyncio.sleep(0.01)
+
+        hook_system.register_hook(HookType.POST_TOOL_USE, failing)
+        hook_system.register_hook(HookType.POST_TOOL_USE, fine)
+
+        for _ in range(3):
+            await hook_system.execute_hooks_async(HookType.POST_TOOL_USE, {})
+
+        stats = hook_system.get_hook_stats()["post_tool_use"]
+        assert hook_system.get_execution_count(HookType.POST_TOOL_USE) == 3
+        assert stats["failing"]["calls"] == 3
+        assert stats["failing"]["errors"] == 3
+        assert stats["fine"]["errors"] == 0
+        assert stats["fine"]["avg_ms"] >= 10
+        assert stats["fine"]["max_ms"] >= stats["fine"]["avg_ms"]
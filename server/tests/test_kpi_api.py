@@ -0,0 +1,106 @@
+"""
+Tests for the KPI endpoints.
+
+Rows are written to adw_kpi_stage_metrics the way the ADW KPI engine stores
+them; the endpoints derive cycle time, attempts and retries and sum them.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+from server import app
+from server.api import adw_db
+from server.core.database import DatabaseManager
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def temp_db():
+    """Temporary database wired into the KPI endpoints."""
+    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.db', delete=False)
+    temp_file.close()
+    db_manager = DatabaseManager(db_path=temp_file.name)
+    db_manager.initialize()
+    with patch.object(adw_db, "get_db_manager", return_value=db_manager):
+        yield db_manager
+    db_manager.close()
+    try:
+        os.unlink(db_manager.db_path)
+    except OSError:
+        pass
+
+
+def _seed(db_manager, adw_id, stages, deleted=False):
+    with db_manager.transaction() as conn:
+        conn.execute(
+            "INSERT INTO adw_states (adw_id, issue_title, deleted_at) VALUES (?, ?, ?)",
+            (adw_id, adw_id, "2026-01-02 00:00:00" if deleted else None)
+        )
+        for stage in stages:
+            columns = ", ".join(stage)
+            conn.execute(
+                f"INSERT INTO adw_kpi_stage_metrics (adw_id, {columns}) VALUES (?, {', '.join('?' * len(stage))})",
+                (adw_id, *stage.values())
+            )
+
+
+def test_adw_kpis(temp_db):
+    """Orchestrator values win over stage-transition values."""
+    _seed(temp_db, "kpiadw01", [
+        {"stage": "plan", "entries": 2, "time_in_stage_seconds": 300.0, "started_at": "2026-01-01T10:00:00",
+         "input_tokens": 100, "output_tokens": 10, "cost_usd": 0.25, "agent_runs": 1},
+        {"stage": "build", "entries": 1, "time_in_stage_seconds": 900.0, "attempts": 3,
+         "duration_seconds": 120.0, "stage_status": "completed", "started_at": "2026-01-01T10:05:00",
+         "input_tokens": 200, "output_tokens": 20, "cost_usd": 0.5, "agent_runs": 3},
+    ])
+
+    response = client.get("/api/adws/kpiadw01/kpis")
+
+    assert response.status_code == 200
+    data = response.json()
+    plan, build = data["stages"]
+    assert (plan["stage"], plan["cycle_time_seconds"], plan["attempts"], plan["retries"]) == ("plan", 300, 2, 1)
+    assert (build["stage"], build["cycle_time_seconds"], build["attempts"], build["retries"]) == ("build", 120, 3, 2)
+    assert build["status"] == "completed"
+    assert data["totals"]["cycle_time_seconds"] == 420
+    assert data["totals"]["retries"] == 3
+    assert data["totals"]["input_tokens"] == 300
+    assert data["totals"]["cost_usd"] == 0.75
+
+
+def test_adw_kpis_empty_and_missing(temp_db):
+    _seed(temp_db, "kpiadw02", [])
+
+    data = client.get("/api/adws/kpiadw02/kpis").json()
+    assert data["stages"] == []
+    assert data["totals"]["cost_usd"] == 0
+
+    assert client.get("/api/adws/nosuchid/kpis").status_code == 404
+
+
+def test_kpi_summary_across_adws(temp_db):
+    _seed(temp_db, "kpiadw03", [{"stage": "test", "duration_seconds": 100.0, "attempts": 2, "cost_usd": 1.0}])
+    _seed(temp_db, "kpiadw04", [{"stage": "test", "duration_seconds": 300.0, "attempts": 1, "cost_usd": 2.0}])
+    _seed(temp_db, "kpiadw05", [{"stage": "test", "duration_seconds": 999.0, "attempts": 5}], deleted=True)
+
+    data = client.get("/api/kpis").json()
+
+    assert data["adw_count"] == 2
+    (test,) = data["stages"]
+    assert test["adw_count"] == 2
+    assert test["cycle_time_seconds"] == 200
+    assert test["retries"] == 1
+    assert test["cost_usd"] == 3.0
+    assert data["totals"]["cycle_time_seconds"] == 200
+
+    assert client.get("/api/kpis", params={"since": "2999-01-01T00:00:00"}).json()["adw_count"] == 0
@@ -0,0 +1,248 @@
+"""
+Tests for Summarization Queue module
+
+Runs the queue against a local fake provider to check batching, debouncing,
+bounded concurrency, and rate limiting.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from server.modules.summarization_queue import SummarizationQueue, TokenBucket
+from server.modules.summarization_service import SummarizationService
+from server.modules.summary_cache import SummaryCache
+
+
+class FakeProvider:
+    """Anthropic-compatible client answering from the prompt's File: lines"""
+
+    def __init__(self, latency=0.01, batch_reply=True):
+        self.latency = latency
+        self.batch_reply = batch_reply
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self.messages = SimpleNamespace(create=self._create)
+
+    def _create(self, model, max_tokens, messages):
+        prompt = messages[0]["content"]
+        with self._lock:
+            self.calls.append(prompt)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.latency)
+            files = re.findall(r"^File: (.+)$", prompt, re.MULTILINE)
+            diffs = re.findall(r"^Diff:\n(.*)$", prompt, re.MULTILINE)
+            summaries = [f"Changed {f} ({d})" for f, d in zip(files, diffs)]
+            if len(files) > 1:
+                text = json.dumps(summaries) if self.batch_reply else "Sorry, I can't help with that."
+            else:
+                text = summaries[0]
+            return SimpleNamespace(content=[SimpleNamespace(text=text)])
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class RecordingBroadcaster:
+    """Stands in for WebSocketManager"""
+
+    def __init__(self):
+        self.updates = []
+
+    async def broadcast_summary_update(self, adw_id, summary_type, content, related_file=None):
+        self.updates.append((adw_id, related_file, content))
+
+
+def _service(provider):
+    with patch.dict('os.environ', {}, clear=True):
+        service = SummarizationService(cache=SummaryCache())
+    service._client = provider
+    service._provider = 'anthropic'
+    service.model = 'fake-model'
+    service.max_tokens = 100
+    return service
+
+
+def _queue(service, **kwargs):
+    options = dict(workers=3, rate_per_second=1000, burst=1000, debounce_seconds=0.01, max_batch_size=5)
+    options.update(kwargs)
+    return SummarizationQueue(service, **options)
+
+
+class TestSummarizationQueue:
+    """SummarizationQueue tests"""
+
+    @pytest.mark.asyncio
+    async def test_many_changes_are_batched_with_bounded_concurrency(self):
+        provider = FakeProvider()
+        queue = _queue(_service(provider))
+        ws = RecordingBroadcaster()
+        try:
+            for i in range(200):
+                queue.submit(f"/src/file{i}.py", f"+line {i}", "modified", "adw1", ws)
+            await queue.join(timeout=10)
+        finally:
+            await queue.stop()
+
+        assert len(ws.updates) == 200
+        assert len(provider.calls) == 40
+        assert provider.max_active <= 3
+        assert ("adw1", "/src/file7.py", "Changed /src/file7.py (+line 7)") in ws.updates
+
+    @pytest.mark.asyncio
+    async def test_same_file_is_debounced(self):
+        provider = FakeProvider()
+        queue = _queue(_service(provider), debounce_seconds=0.05)
+        ws = RecordingBroadcaster()
+        try:
+            for i in range(5):
+                queue.submit("/src/app.py", f"+v{i}", "modified", "adw1", ws)
+            await asyncio.sleep(0.1)
+            await queue.join(timeout=5)
+        finally:
+            await queue.stop()
+
+        assert ws.updates == [("adw1", "/src/app.py", "Changed /src/app.py (+v4)")]
+        assert queue.stats()["debounced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_api_calls_are_rate_limited(self):
+        provider = FakeProvider(latency=0)
+        queue = _queue(_service(provider), rate_per_second=20, burst=1, max_batch_size=1)
+        ws = RecordingBroadcaster()
+        try:
+            start = time.monotonic()
+            for i in range(6):
+                queue.submit(f"/src/file{i}.py", f"+{i}", "modified", "adw1", ws)
+            await queue.join(timeout=5)
+            elapsed = time.monotonic() - start
+        finally:
+            await queue.stop()
+
+        assert len(provider.calls) == 6
+        # One token up front, then one every 50ms
+        assert elapsed >= 0.2
+
+    @pytest.mark.asyncio
+    async def test_cached_changes_skip_provider(self):
+        provider = FakeProvider()
+        service = _service(provider)
+        service.summarize_file_change("/src/app.py", "+x", "modified")
+        provider.calls.clear()
+
+        queue = _queue(service)
+        ws = RecordingBroadcaster()
+        try:
+            queue.submit("/src/app.py", "+x", "modified", "adw1", ws)
+            await queue.join(timeout=5)
+        finally:
+            await queue.stop()
+
+        assert provider.calls == []
+        assert queue.stats()["api_calls"] == 0
+        assert ws.updates == [("adw1", "/src/app.py", "Changed /src/app.py (+x)")]
+
+    @pytest.mark.asyncio
+    async def test_each_change_is_looked_up_once(self):
+        provider = FakeProvider()
+        service = _service(provider)
+        queue = _queue(service, max_batch_size=1)
+        ws = RecordingBroadcaster()
+        try:
+            for i in range(3):
+                queue.submit(f"/src/file{i}.py", f"+{i}", "modified", "adw1", ws)
+            await queue.join(timeout=5)
+        finally:
+            await queue.stop()
+
+        assert service._cache.stats()["misses"] == 3
+        assert service._cache.stats()["hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_single_prompt_fallback_spends_a_token_per_call(self):
+        provider = FakeProvider(batch_reply=False)
+        queue = _queue(_service(provider), burst=1, rate_per_second=1000)
+        ws = RecordingBroadcaster()
+        try:
+            queue.submit("/src/a.py", "+a", "modified", "adw1", ws)
+            queue.submit("/src/b.py", "+b", "modified", "adw1", ws)
+            await queue.join(timeout=5)
+        finally:
+            await queue.stop()
+
+        assert len(provider.calls) == 3
+        assert queue.stats()["api_calls"] == 3
+        assert len(ws.updates) == 2
+
+    @pytest.mark.asyncio
+    async def test_async_summarize_file_change_uses_queue(self):
+        provider = FakeProvider()
+        service = _service(provider)
+        ws = RecordingBroadcaster()
+        with patch.dict('os.environ', {"SUMMARIZATION_DEBOUNCE_SECONDS": "0"}):
+            for i in range(3):
+                await service.async_summarize_file_change(f"/src/f{i}.py", f"+{i}", "created", "adw2", ws)
+        try:
+            await service.queue.join(timeout=5)
+        finally:
+            await service.queue.stop()
+
+        assert sorted(u[1] for u in ws.updates) == ["/src/f0.py", "/src/f1.py", "/src/f2.py"]
+        assert len(provider.calls) == 1
+
+
+class TestBatchedSummaries:
+    """SummarizationService.summarize_file_changes tests"""
+
+    def test_batched_prompt(self):
+        provider = FakeProvider()
+        service = _service(provider)
+
+        summaries = service.summarize_file_changes([
+            ("/a.py", "+a", "modified"),
+            ("/b.py", "+b", "created"),
+        ])
+
+        assert summaries == ["Changed /a.py (+a)", "Changed /b.py (+b)"]
+        assert len(provider.calls) == 1
+        # Results are cached per file
+        assert service.summarize_file_change("/b.py", "+b", "created") == "Changed /b.py (+b)"
+        assert len(provider.calls) == 1
+
+    def test_unparseable_batch_falls_back_to_single_prompts(self):
+        provider = FakeProvider(batch_reply=False)
+        service = _service(provider)
+
+        summaries = service.summarize_file_changes([
+            ("/a.py", "+a", "modified"),
+            ("/b.py", "+b", "created"),
+        ])
+
+        assert summaries == ["Changed /a.py (+a)", "Changed /b.py (+b)"]
+        assert len(provider.calls) == 3
+
+
+class TestTokenBucket:
+    """TokenBucket tests"""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=50, capacity=3)
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        assert time.monotonic() - start < 0.05
+
+        for _ in range(5):
+            await bucket.acquire()
+        assert time.monotonic() - start >= 0.09
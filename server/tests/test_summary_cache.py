@@ -0,0 +1,155 @@
+"""
+Tests for Summary Cache module
+
+Tests LRU eviction, TTL expiry, stable keys, SQLite persistence, and stats.
+"""
+
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from server.modules.summarization_service import SummarizationService
+from server.modules.summary_cache import SummaryCache, content_digest
+
+
+@pytest.fixture
+def cache_db():
+    """Temporary SQLite file for the persistent tier"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir) / "summary_cache.db"
+
+
+def _anthropic_service(cache, text="Added input validation"):
+    """Service wired to a mock Anthropic client"""
+    with patch.dict('os.environ', {}, clear=True):
+        service = SummarizationService(cache=cache)
+    client = Mock()
+    client.messages.create.return_value = Mock(content=[Mock(text=text)])
+    service._client = client
+    service._provider = 'anthropic'
+    service.model = 'claude-3-haiku-20240307'
+    service.max_tokens = 100
+    return service, client
+
+
+class TestSummaryCache:
+    """SummaryCache unit tests"""
+
+    def test_lru_eviction(self):
+        cache = SummaryCache(max_entries=2)
+        cache.set("a", "A")
+        cache.set("b", "B")
+        cache.get("a")  # a is now most recently used
+        cache.set("c", "C")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+        assert len(cache) == 2
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        cache = SummaryCache(ttl_seconds=0.05)
+        cache.set("a", "A")
+        assert cache.get("a") == "A"
+
+        time.sleep(0.1)
+
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_stats(self):
+        cache = SummaryCache()
+        cache.set("a", "A")
+        cache.get("a")
+        cache.get("missing")
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["persistent"] is False
+
+    def test_persistent_tier_survives_restart(self, cache_db):
+        first = SummaryCache(db_path=cache_db)
+        first.set("a", "A")
+        first.set("fallback", "F", persist=False)
+        first.close()
+
+        second = SummaryCache(db_path=cache_db)
+        assert len(second) == 0
+        assert second.get("a") == "A"
+        assert second.get("fallback") is None
+        assert second.stats()["persistent_hits"] == 1
+        # Promoted into memory
+        assert len(second) == 1
+
+    def test_persistent_tier_drops_expired_rows(self, cache_db):
+        first = SummaryCache(db_path=cache_db, ttl_seconds=0.05)
+        first.set("a", "A")
+        first.close()
+        time.sleep(0.1)
+
+        assert SummaryCache(db_path=cache_db, ttl_seconds=0.05).get("a") is None
+
+    def test_clear_removes_persisted_entries(self, cache_db):
+        cache = SummaryCache(db_path=cache_db)
+        cache.set("a", "A")
+        cache.clear()
+
+        assert cache.get("a") is None
+
+    def test_content_digest_is_stable_and_unambiguous(self):
+        assert content_digest("a", "b") == content_digest("a", "b")
+        assert content_digest("ab", "c") != content_digest("a", "bc")
+
+
+class TestServiceCaching:
+    """SummarizationService cache integration"""
+
+    def test_ai_summary_reused_after_restart(self, cache_db):
+        service, client = _anthropic_service(SummaryCache(db_path=cache_db))
+        summary = service.summarize_file_change("/src/app.py", "+validate()", "modified")
+        assert summary == "Added input validation"
+
+        restarted, restarted_client = _anthropic_service(SummaryCache(db_path=cache_db), text="other")
+        assert restarted.summarize_file_change("/src/app.py", "+validate()", "modified") == summary
+        restarted_client.messages.create.assert_not_called()
+
+    def test_repeated_tool_use_hits_cache(self):
+        service, client = _anthropic_service(SummaryCache())
+        service.summarize_tool_use("Read", {"file_path": "/a.py", "limit": 10}, "x")
+        # Same input in a different key order
+        service.summarize_tool_use("Read", {"limit": 10, "file_path": "/a.py"}, "x")
+
+        assert client.messages.create.call_count == 1
+        assert service.get_cache_stats()["hits"] == 1
+
+    def test_cache_is_bounded(self):
+        with patch.dict('os.environ', {}, clear=True):
+            service = SummarizationService(cache=SummaryCache(max_entries=10))
+
+        for i in range(50):
+            service.summarize_file_change(f"/src/file{i}.py", f"diff {i}", "modified")
+
+        assert service.get_cache_size() == 10
+        assert service.get_cache_stats()["evictions"] == 40
+
+    def test_cache_configured_from_env(self, cache_db):
+        env = {
+            "SUMMARY_CACHE_MAX_ENTRIES": "5",
+            "SUMMARY_CACHE_TTL_SECONDS": "0",
+            "SUMMARY_CACHE_DB": str(cache_db),
+        }
+        with patch.dict('os.environ', env, clear=True):
+            service = SummarizationService()
+
+        stats = service.get_cache_stats()
+        assert stats["max_entries"] == 5
+        assert stats["ttl_seconds"] is None
+        assert stats["persistent"] is True
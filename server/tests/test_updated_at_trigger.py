@@ -0,0 +1,135 @@
+"""
+Tests for the guarded adw_states updated_at trigger.
+
+Tests cover:
+- Saves that set updated_at write the row once (no trigger re-update)
+- Updates that don't set updated_at still get it refreshed
+- Migration replacing the old unconditional trigger
+- State save throughput with the old vs guarded trigger (benchmark)
+"""
+
+import os
+import tempfile
+import time
+
+import pytest
+
+from server.core.database import DatabaseManager
+
+OLD_TRIGGER = """
+    CREATE TRIGGER trg_adw_states_updated_at
+    AFTER UPDATE ON adw_states
+    FOR EACH ROW
+    BEGIN
+        UPDATE adw_states SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+    END
+"""
+
+# Mirrors the UPDATE issued by ADWState.save()
+SAVE_QUERY = """
+    UPDATE adw_states SET
+        status = ?,
+        orchestrator_state = ?,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE adw_id = ?
+"""
+
+
+@pytest.fixture
+def temp_db():
+    """Create a temporary database with one ADW."""
+    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.db', delete=False)
+    temp_file.close()
+    db_path = temp_file.name
+
+    db_manager = DatabaseManager(db_path=db_path)
+    db_manager.initialize()
+    db_manager.execute_insert(
+        "INSERT INTO adw_states (adw_id, issue_title, updated_at) VALUES (?, ?, ?)",
+        ("trigadw1", "Trigger test", "2025-01-01 00:00:00")
+    )
+
+    yield db_manager
+
+    db_manager.close()
+    try:
+        os.unlink(db_path)
+    except OSError:
+        pass
+
+
+def _changes(db_manager, query, params):
+    """Rows written by one statement, including trigger writes."""
+    with db_manager.transaction() as conn:
+        before = conn.total_changes
+        conn.execute(query, params)
+        return conn.total_changes - before
+
+
+def _install_old_trigger(db_manager):
+    with db_manager.transaction() as conn:
+        conn.execute("DROP TRIGGER trg_adw_states_updated_at")
+        conn.execute(OLD_TRIGGER)
+
+
+def test_save_setting_updated_at_writes_row_once(temp_db):
+    """Writers that set updated_at don't trigger a second UPDATE."""
+    assert _changes(temp_db, SAVE_QUERY, ("pending", "{}", "trigadw1")) == 1
+
+
+def test_update_without_updated_at_is_still_stamped(temp_db):
+    """Writers that don't set updated_at still get it refreshed."""
+    changes = _changes(
+        temp_db, "UPDATE adw_states SET branch_name = ? WHERE adw_id = ?", ("feat", "trigadw1")
+    )
+
+    assert changes == 2
+    row = temp_db.execute_query(
+        "SELECT updated_at > '2025-01-01 00:00:00' AS bumped FROM adw_states WHERE adw_id = 'trigadw1'"
+    )[0]
+    assert row['bumped'] == 1
+
+
+def test_migration_replaces_unconditional_trigger(temp_db):
+    """Existing databases get the guarded trigger on startup."""
+    _install_old_trigger(temp_db)
+    temp_db.execute_update(
+        "DELETE FROM schema_migrations WHERE version = '004_guard_updated_at_trigger'"
+    )
+    assert _changes(temp_db, SAVE_QUERY, ("pending", "{}", "trigadw1")) == 2
+
+    db_manager = DatabaseManager(db_path=str(temp_db.db_path))
+    db_manager.initialize()
+
+    assert _changes(db_manager, SAVE_QUERY, ("pending", "{}", "trigadw1")) == 1
+
+
+def test_state_save_benchmark(temp_db):
+    """Guarded trigger drops the second row write from every state save."""
+    saves = 2000
+    payload = "x" * 2000
+
+    def run():
+        start = time.perf_counter()
+        with temp_db.get_connection() as conn:
+            before = conn.total_changes
+            for i in range(saves):
+                conn.execute(SAVE_QUERY, (("in_progress", "pending")[i % 2], payload, "trigadw1"))
+                conn.commit()
+            writes = conn.total_changes - before
+        return time.perf_counter() - start, writes
+
+    guarded_time, guarded_writes = run()
+    _install_old_trigger(temp_db)
+    old_time, old_writes = run()
+
+    # Each save is one row update plus one status change log insert; the
+    # old trigger adds a second update of the row on top
+    assert guarded_writes == 2 * saves
+    assert old_writes == 3 * saves
+
+    print(
+        f"\n{saves} state saves: old trigger {old_time:.3f}s ({saves / old_time:.0f}/s, "
+        f"{old_writes} writes), guarded {guarded_time:.3f}s "
+        f"({saves / guarded_time:.0f}/s, {guarded_writes} writes)"
+    )
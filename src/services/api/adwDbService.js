@@ -190,6 +190,8 @@ class AdwDbService {
    * @param {Object} options - Pagination options
    * @param {number} [options.page] - Page number (1-indexed)
    * @param {number} [options.page_size] - Items per page
+   * @param {number} [options.before_id] - Keyset cursor (next_before_id from the previous page)
+   * @param {string} [options.count] - "exact" (default), "approximate" or "none"
    * @returns {Promise<Object>} Activity history with pagination info
    */
   async getActivityHistory(adwId, options = {}) {
@@ -197,6 +199,8 @@ class AdwDbService {
 
     if (options.page) queryParams.append('page', options.page);
     if (options.page_size) queryParams.append('page_size', options.page_size);
+    if (options.before_id) queryParams.append('before_id', options.before_id);
+    if (options.count) queryParams.append('count', options.count);
 
     const queryString = queryParams.toString();
     const endpoint = `/api/adws/${adwId}/activity${queryString ? `?${queryString}` : ''}`;
@@ -236,6 +240,22 @@ class AdwDbService {
     });
   }
 
+  /**
+   * Allocate a contiguous block of issue numbers in one request
+   *
+   * Use this for bulk card imports instead of calling allocateIssueNumber
+   * once per card.
+   *
+   * @param {Array<Object>} issues - Issue data objects (same shape as allocateIssueNumber)
+   * @returns {Promise<Object>} First/last issue numbers and per-issue allocations
+   */
+  async allocateIssueNumbersBatch(issues) {
+    return await this.request('/api/issues/allocate/batch', {
+      method: 'POST',
+      body: JSON.stringify({ issues }),
+    });
+  }
+
   /**
    * Get a specific issue by number
    *
@@ -707,6 +707,50 @@ describe('WebSocketService', () => {
       await expect(triggerPromise).rejects.toThrow('Workflow failed');
     });
 
+    it('should wait past the queued ack for the final response', async () => {
+      const triggerPromise = service.triggerWorkflow({
+        workflow_type: 'adw_plan_iso',
+        issue_json: { title: 'Test' }
+      });
+
+      mockWs.simulateMessage({
+        type: 'trigger_response',
+        data: { status: 'queued', adw_id: 'test-123' }
+      });
+      // Another trigger's final response is not ours
+      mockWs.simulateMessage({
+        type: 'trigger_response',
+        data: { status: 'accepted', adw_id: 'other-456' }
+      });
+      mockWs.simulateMessage({
+        type: 'trigger_response',
+        data: { status: 'accepted', adw_id: 'test-123' }
+      });
+
+      const result = await triggerPromise;
+
+      expect(result.status).toBe('accepted');
+      expect(result.adw_id).toBe('test-123');
+    });
+
+    it('should reject when a queued trigger fails to launch', async () => {
+      const triggerPromise = service.triggerWorkflow({
+        workflow_type: 'adw_plan_iso',
+        issue_json: { title: 'Test' }
+      });
+
+      mockWs.simulateMessage({
+        type: 'trigger_response',
+        data: { status: 'queued', adw_id: 'test-123' }
+      });
+      mockWs.simulateMessage({
+        type: 'trigger_response',
+        data: { status: 'error', adw_id: 'test-123', error: 'ADW test-123 is already running' }
+      });
+
+      await expect(triggerPromise).rejects.toThrow('already running');
+    });
+
     it('should timeout on no response', async () => {
       vi.useFakeTimers();
 
@@ -20,6 +20,11 @@ class WebSocketService {
     this.heartbeatIntervalTime = 15000; // Reduced from 30s to 15s for faster detection
     this.connectionId = null; // Track connection ID for server restart detection
     this.messageQueue = []; // Client-side message queue for disconnection handling
+    // Broadcast sequencing - lets a reconnect resume instead of reloading everything
+    this.lastSeq = null; // Highest broadcast sequence processed
+    this.eventEpoch = null; // Server event log the sequence belongs to
+    this.resumePending = false;
+    this.resumeBuffer = []; // Live events received while a resume is in flight
     this.pendingPromises = new Map(); // Track pending workflow trigger promises
     this.visibilityChangeHandler = null;
     this.onlineHandler = null;
@@ -86,7 +91,10 @@ class WebSocketService {
       startup_connection_failed: [],
       circuit_open: [],
       circuit_closed: [],
-      connection_blocked: []
+      connection_blocked: [],
+      // Resume events
+      resume_complete: [],
+      snapshot_required: []
     };
 
     // Configuration - use centralized API config with auto-detection
@@ -243,6 +251,9 @@ class WebSocketService {
             this.startHeartbeat();
           }
 
+          // Ask for missed broadcasts before anything else
+          this.requestResume();
+
           // Process queued messages after reconnection
           this.processMessageQueue();
 
@@ -414,12 +425,62 @@ class WebSocketService {
     }
   }
 
+  /**
+   * Ask the server for the broadcasts missed since lastSeq
+   */
+  requestResume() {
+    this.resumePending = true;
+    this.resumeBuffer = [];
+    this.sendMessage({
+      type: 'resume',
+      data: { last_seq: this.lastSeq, epoch: this.eventEpoch }
+    });
+  }
+
+  /**
+   * Apply a resume reply: replayed events first, then live events that
+   * arrived while it was in flight. events is null when the server could
+   * not replay the gap and the client must reload instead.
+   */
+  completeResume(data, events = null) {
+    const buffered = this.resumeBuffer;
+    const firstConnect = this.lastSeq === null;
+    this.resumePending = false;
+    this.resumeBuffer = [];
+    this.eventEpoch = data.epoch || null;
+
+    if (events === null) {
+      // The reload covers everything up to data.seq
+      this.lastSeq = data.seq ?? null;
+    }
+    (events || []).forEach(event => this.handleMessage(event));
+    buffered
+      .filter(event => firstConnect || data.seq == null || event.seq > data.seq)
+      .forEach(event => this.handleMessage(event));
+
+    if (data.seq != null) {
+      this.lastSeq = Math.max(this.lastSeq ?? 0, data.seq);
+    }
+  }
+
   /**
    * Handle incoming WebSocket messages
    */
   handleMessage(message) {
     const { type, data } = message;
 
+    // Sequenced broadcasts: hold them during a resume, skip ones already seen
+    if (typeof message.seq === 'number') {
+      if (this.resumePending) {
+        this.resumeBuffer.push(message);
+        return;
+      }
+      if (this.lastSeq !== null && message.seq <= this.lastSeq) {
+        return;
+      }
+      this.lastSeq = message.seq;
+    }
+
     // Only log non-heartbeat messages to reduce console clutter
     if (type !== 'ping' && type !== 'pong') {
       console.log('Received WebSocket message:', type, data);
@@ -483,7 +544,21 @@ class WebSocketService {
           this.emit('workflow_log', logEntry);
         }
         break;
+      case 'resume_complete':
+        this.completeResume(data, data.events || []);
+        this.emit('resume_complete', { epoch: data.epoch, seq: data.seq, replayed: (data.events || []).length });
+        break;
+      case 'snapshot_required':
+        this.completeResume(data);
+        this.emit('snapshot_required', data);
+        break;
       case 'error':
+        // Servers without resume support reject it; fall back to a reload
+        if (this.resumePending && data && typeof data.message === 'string' && data.message.includes('resume')) {
+          this.completeResume({});
+          this.emit('snapshot_required', { reason: 'resume_unsupported' });
+          break;
+        }
         this.emit('error', data);
 
         // Emit error as a log entry too
@@ -695,17 +770,38 @@ class WebSocketService {
 
     return new Promise((resolve, reject) => {
       const promiseId = `workflow_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
+      // The server acks with a 'queued' response, then sends the final
+      // 'accepted' or 'error' response once the workflow has been launched.
+      // Responses for other triggers are ignored once the ack names our ADW.
+      let adwId = request.adw_id || null;
 
-      // Set up timeout for this workflow trigger
-      const timeoutId = setTimeout(() => {
+      const onTimeout = () => {
         this.off('trigger_response', onResponse);
         this.off('error', onError);
         this.pendingPromises.delete(promiseId);
         reject(new Error(`Workflow trigger timed out after ${timeout}ms`));
-      }, timeout);
+      };
+
+      // Set up timeout for this workflow trigger
+      let timeoutId = setTimeout(onTimeout, timeout);
 
       // Set up one-time listeners for this request
       const onResponse = (data) => {
+        if (adwId && data.adw_id !== adwId) {
+          return;
+        }
+        if (data.status === 'queued') {
+          // Still waiting for the launch; restart the clock while queued
+          adwId = data.adw_id;
+          clearTimeout(timeoutId);
+          timeoutId = setTimeout(onTimeout, timeout);
+          const pending = this.pendingPromises.get(promiseId);
+          if (pending) {
+            pending.timeoutId = timeoutId;
+          }
+          return;
+        }
+
         clearTimeout(timeoutId);
         this.off('trigger_response', onResponse);
         this.off('error', onError);
@@ -753,6 +753,23 @@ describe('Kanban Store', () => {
       expect(task.stage).toBe('errored');
     });
 
+    it('should flag a stuck workflow without moving it to errored', () => {
+      act(() => {
+        useKanbanStore.getState().handleWorkflowStatusUpdate({
+          adw_id: 'ADW12345678',
+          workflow_name: 'adw_plan_iso',
+          status: 'in_progress',
+          message: 'Workflow appears stuck: adw_plan_iso (pid 4242) died without exiting cleanly',
+          is_stuck: true
+        });
+      });
+
+      const task = useKanbanStore.getState().tasks[0];
+      expect(task.stage).toBe('plan');
+      expect(task.metadata.is_stuck).toBe(true);
+      expect(task.metadata.workflow_status).toBe('in_progress');
+    });
+
     it('should NOT move to ready-to-merge on completed status (wait for stage_transition)', () => {
       act(() => {
         useKanbanStore.getState().handleWorkflowStatusUpdate({
@@ -771,6 +788,47 @@ describe('Kanban Store', () => {
     });
   });
 
+  describe('Trigger Response Handling', () => {
+    beforeEach(() => {
+      useKanbanStore.setState({
+        tasks: [{ id: 1, title: 'Test Task', stage: 'plan', metadata: { adw_id: 'ADW12345678' } }],
+        tasksByAdwId: { 'ADW12345678': 1 },
+        taskWorkflowMetadata: {},
+        error: null
+      });
+    });
+
+    it('should record a queued ack and then the accepted response', () => {
+      act(() => {
+        useKanbanStore.getState().handleTriggerResponse({
+          adw_id: 'ADW12345678', workflow_name: 'adw_plan_iso', status: 'queued', message: 'queued (0 ahead)'
+        });
+      });
+      expect(useKanbanStore.getState().getWorkflowMetadataForTask(1).status).toBe('queued');
+
+      act(() => {
+        useKanbanStore.getState().handleTriggerResponse({
+          adw_id: 'ADW12345678', workflow_name: 'adw_plan_iso', status: 'accepted', message: 'triggered'
+        });
+      });
+      expect(useKanbanStore.getState().getWorkflowMetadataForTask(1).status).toBe('accepted');
+    });
+
+    it('should surface a trigger that fails after being queued', () => {
+      act(() => {
+        useKanbanStore.getState().handleTriggerResponse({
+          adw_id: 'ADW12345678', workflow_name: 'adw_plan_iso', status: 'error',
+          message: 'Failed to trigger workflow', error: 'worktree creation failed'
+        });
+      });
+
+      const metadata = useKanbanStore.getState().getWorkflowMetadataForTask(1);
+      expect(metadata.status).toBe('error');
+      expect(metadata.error).toBe('worktree creation failed');
+      expect(useKanbanStore.getState().error).toContain('worktree creation failed');
+    });
+  });
+
   describe('Merge Workflow State', () => {
     beforeEach(() => {
       // Set up a task in ready-to-merge stage directly using setState
@@ -1489,10 +1489,13 @@ export const useKanbanStore = create()(
               }, false, 'websocketConnected');
               // Exit startup phase on successful connection
               websocketService.exitStartupPhase();
+              // Missed events are replayed by the resume handshake; a full
+              // stage sync only happens on snapshot_required
+            };
 
-              // Sync task stages from backend on connect/reconnect
-              // This ensures frontend state matches backend after any missed WebSocket events
-              console.log('[KanbanStore] WebSocket connected: Triggering stage sync...');
+            const onSnapshotRequired = (data) => {
+              // The server could not replay the events missed while disconnected
+              console.log('[KanbanStore] Resume not possible, triggering stage sync...', data);
               get().syncTaskStagesFromBackend().catch(error => {
                 console.error('[KanbanStore] Stage sync failed:', error);
               });
@@ -1621,6 +1624,7 @@ export const useKanbanStore = create()(
 
             // Register all listeners with owner tracking for proper cleanup
             websocketService.onWithOwner(KANBAN_STORE_OWNER_ID, 'connect', onConnect);
+            websocketService.onWithOwner(KANBAN_STORE_OWNER_ID, 'snapshot_required', onSnapshotRequired);
             websocketService.onWithOwner(KANBAN_STORE_OWNER_ID, 'disconnect', onDisconnect);
             websocketService.onWithOwner(KANBAN_STORE_OWNER_ID, 'error', onError);
             websocketService.onWithOwner(KANBAN_STORE_OWNER_ID, 'status_update', onStatusUpdate);
@@ -2142,6 +2146,7 @@ export const useKanbanStore = create()(
                 workflow_message: message,
                 workflow_progress: progress_percent,
                 workflow_step: current_step,
+                ...(statusUpdate.is_stuck != null && { is_stuck: statusUpdate.is_stuck }),
               },
               workflowProgress: {
                 status,
@@ -2225,7 +2230,19 @@ export const useKanbanStore = create()(
           // Find task using O(1) index lookup
           const task = get().getTaskByAdwId(adw_id);
 
-          if (task && status === 'accepted') {
+          if (!task) {
+            return;
+          }
+
+          if (status === 'queued') {
+            // Ack only; the final 'accepted' or 'error' response follows
+            get().updateWorkflowMetadata(task.id, {
+              adw_id,
+              workflow_name,
+              status: 'queued',
+              message,
+            });
+          } else if (status === 'accepted') {
             get().updateWorkflowMetadata(task.id, {
               adw_id,
               workflow_name,
@@ -2235,6 +2252,18 @@ export const useKanbanStore = create()(
               plan_file: response.plan_file,
               triggeredAt: new Date().toISOString(),
             });
+          } else if (status === 'error') {
+            // The trigger was queued but failed to launch (e.g. launch error,
+            // duplicate ADW)
+            const error = response.error || message || 'Workflow trigger failed';
+            get().updateWorkflowMetadata(task.id, {
+              adw_id,
+              workflow_name,
+              status: 'error',
+              message,
+              error,
+            });
+            set({ error: `Failed to trigger workflow: ${error}` }, false, 'handleTriggerResponseError');
           }
         },
 
@@ -4,7 +4,10 @@ Unit tests for the detect_merged_worktrees script.
 
 import os
 import sqlite3
+import subprocess
 import tempfile
+import threading
+import time
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -18,7 +21,10 @@ from detect_merged_worktrees import (
     get_merged_branches,
     get_adws_with_branches,
     update_adw_to_completed,
+    update_adws_to_completed,
     detect_and_update_merged_worktrees,
+    get_merged_among,
+    MainBranchReconciler,
 )
 
 
@@ -276,6 +282,34 @@ class TestUpdateAdwToCompleted:
         assert 'branch_merged_to_main' in row[4]
 
 
+class TestUpdateAdwsToCompleted:
+    """Tests for update_adws_to_completed()."""
+
+    def test_updates_all_adws_across_chunks(self, temp_db):
+        """update_adws_to_completed() updates every ADW and logs each one."""
+        conn = sqlite3.connect(str(temp_db))
+        conn.executemany(
+            "INSERT INTO adw_states (adw_id, branch_name, current_stage, status) VALUES (?, ?, 'build', 'in_progress')",
+            [(f"bulk{i:04d}", f"branch-{i}") for i in range(7)]
+        )
+        conn.commit()
+        conn.close()
+
+        result = update_adws_to_completed(
+            temp_db,
+            [(f"bulk{i:04d}", f"branch-{i}", 'build', 'in_progress') for i in range(7)],
+            chunk_size=3
+        )
+
+        assert result == {"written": 7, "errors": 0}
+        conn = sqlite3.connect(str(temp_db))
+        statuses = {row[0] for row in conn.execute("SELECT status FROM adw_states")}
+        log_count = conn.execute("SELECT COUNT(*) FROM adw_activity_logs").fetchone()[0]
+        conn.close()
+        assert statuses == {'completed'}
+        assert log_count == 7
+
+
 class TestDetectAndUpdateMergedWorktrees:
     """Tests for detect_and_update_merged_worktrees()."""
 
@@ -377,5 +411,94 @@ class TestDetectAndUpdateMergedWorktrees:
         assert unmerged_row[0] == 'in_progress'
 
 
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """A repository with a merged branch, an unmerged branch and a ready-to-merge branch."""
+    repo = tmp_path / "project"
+    repo.mkdir()
+    _git(repo, "init", "-q", "-b", "main")
+    _git(repo, "config", "user.email", "test@example.com")
+    _git(repo, "config", "user.name", "Test")
+    _git(repo, "commit", "-q", "--allow-empty", "-m", "Initial commit")
+    for branch in ("merged-branch", "open-branch", "later-branch"):
+        _git(repo, "checkout", "-q", "-b", branch, "main")
+        _git(repo, "commit", "-q", "--allow-empty", "-m", f"Work on {branch}")
+    _git(repo, "checkout", "-q", "main")
+    _git(repo, "merge", "-q", "--no-ff", "-m", "Merge", "merged-branch")
+    return repo
+
+
+def _insert_open_adws(db_path, branches):
+    conn = sqlite3.connect(str(db_path))
+    conn.executemany(
+        "INSERT INTO adw_states (adw_id, branch_name, current_stage, status) VALUES (?, ?, 'build', 'in_progress')",
+        [(f"adw{i:05d}", branch) for i, branch in enumerate(branches)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def _status(db_path, adw_id):
+    conn = sqlite3.connect(str(db_path))
+    row = conn.execute("SELECT status FROM adw_states WHERE adw_id = ?", (adw_id,)).fetchone()
+    conn.close()
+    return row[0]
+
+
+class TestGetMergedAmong:
+    """Tests for get_merged_among()."""
+
+    def test_returns_only_merged_names(self, git_repo):
+        """get_merged_among() checks just the given branches, in batches."""
+        names = ["merged-branch", "open-branch", "later-branch", "missing-branch", "main"]
+
+        assert get_merged_among(git_repo, names, batch_size=2) == {"merged-branch"}
+
+    def test_prefix_does_not_match_nested_branches(self, git_repo):
+        """A name that is only a prefix of merged refs is not reported."""
+        _git(git_repo, "branch", "feat/nested", "main")
+
+        assert get_merged_among(git_repo, ["feat"]) == set()
+
+
+class TestMainBranchReconciler:
+    """Tests for MainBranchReconciler."""
+
+    def test_check_completes_merged_adws_once_per_commit(self, git_repo, temp_db):
+        """check() reconciles when main moves and is a no-op otherwise."""
+        _insert_open_adws(temp_db, ["merged-branch", "open-branch"])
+        reconciler = MainBranchReconciler(git_repo, temp_db)
+
+        assert reconciler.check() == {"checked": 2, "updated": 1, "errors": 0}
+        assert reconciler.check() is None
+        assert _status(temp_db, "adw00000") == 'completed'
+        assert _status(temp_db, "adw00001") == 'in_progress'
+
+    def test_run_picks_up_new_merge(self, git_repo, temp_db):
+        """A merge into main is reconciled without waiting for the fallback interval."""
+        _insert_open_adws(temp_db, ["merged-branch", "later-branch"])
+        reconciler = MainBranchReconciler(git_repo, temp_db, fallback_interval=60, debounce=0.05)
+        thread = threading.Thread(target=reconciler.run)
+        thread.start()
+        try:
+            deadline = time.time() + 10
+            while reconciler.last_commit is None and time.time() < deadline:
+                time.sleep(0.05)
+
+            _git(git_repo, "merge", "-q", "--no-ff", "-m", "Merge later", "later-branch")
+
+            while _status(temp_db, "adw00001") != 'completed' and time.time() < deadline:
+                time.sleep(0.05)
+            assert _status(temp_db, "adw00001") == 'completed'
+        finally:
+            reconciler.stop()
+            thread.join(timeout=10)
+        assert not thread.is_alive()
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
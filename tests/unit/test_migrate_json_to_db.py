@@ -356,7 +356,7 @@ class TestMigrateJsonToDatabase:
         result = migrate_json_to_database(dry_run=False)
 
         assert result['imported'] == 1
-        mock_db.execute_insert.assert_called()
+        mock_db.transaction.assert_called()
 
 
 class TestMigrationIdempotency:
@@ -378,16 +378,100 @@ class TestMigrationIdempotency:
 
         mock_db = MagicMock()
         # Simulate ADW already exists in database
-        mock_db.execute_query.return_value = [{"id": 1}]
+        mock_db.execute_query.return_value = [{"adw_id": "test1234", "source_mtime": None}]
         mock_db_manager.return_value = mock_db
 
         result = migrate_json_to_database(dry_run=False)
 
         # Should show as imported (skipped because exists)
         assert result['valid_json'] == 1
+        assert result['already_exists'] == 1
         # execute_insert should not be called for INSERT
         # (only execute_query to check existence)
 
 
+
+@pytest.fixture
+def real_db_manager(tmp_path):
+    """Database manager on a fresh database created from schema.sql."""
+    from core.database import DatabaseManager
+
+    db_manager = DatabaseManager(db_path=str(tmp_path / "adw.db"))
+    db_manager.initialize()
+    return db_manager
+
+
+def _write_states(agents_dir, count, start=0):
+    for i in range(start, start + count):
+        adw_dir = agents_dir / f"bulk{i:04d}"
+        adw_dir.mkdir()
+        (adw_dir / "adw_state.json").write_text(json.dumps({
+            "adw_id": f"bulk{i:04d}",
+            "issue_number": i + 1,
+            "issue_json": {"title": f"Issue {i}"},
+        }))
+
+
+class TestBulkMigration:
+    """Tests for the chunked, parallel import against a real database."""
+
+    @patch('migrate_json_to_db.get_project_root')
+    @patch('migrate_json_to_db.get_db_manager')
+    def test_imports_in_chunks(self, mock_db_manager, mock_root, temp_agents_dir, real_db_manager):
+        """All ADWs are imported with their activity logs across several chunks."""
+        mock_root.return_value = temp_agents_dir.parent
+        mock_db_manager.return_value = real_db_manager
+        _write_states(temp_agents_dir, 25)
+
+        result = migrate_json_to_database(workers=4, chunk_size=10)
+
+        assert result['imported'] == 25
+        assert result['errors'] == 0
+        assert real_db_manager.execute_query("SELECT COUNT(*) AS n FROM adw_states")[0]['n'] == 25
+        logs = real_db_manager.execute_query(
+            "SELECT COUNT(*) AS n FROM adw_activity_logs WHERE event_data LIKE '%migrated_from%'"
+        )
+        assert logs[0]['n'] == 25
+
+    @patch('migrate_json_to_db.get_project_root')
+    @patch('migrate_json_to_db.get_db_manager')
+    def test_unchanged_files_are_not_read_again(self, mock_db_manager, mock_root, temp_agents_dir, real_db_manager):
+        """A second run skips files whose mtime matches the recorded import."""
+        mock_root.return_value = temp_agents_dir.parent
+        mock_db_manager.return_value = real_db_manager
+        _write_states(temp_agents_dir, 5)
+        migrate_json_to_database()
+
+        _write_states(temp_agents_dir, 2, start=5)
+        touched = temp_agents_dir / "bulk0000" / "adw_state.json"
+        os.utime(touched, (touched.stat().st_atime, touched.stat().st_mtime + 10))
+
+        with patch('migrate_json_to_db.read_adw_state_json', wraps=read_adw_state_json) as reader:
+            result = migrate_json_to_database()
+
+        assert result['unchanged'] == 4
+        assert result['imported'] == 2
+        assert result['already_exists'] == 1
+        assert reader.call_count == 3
+
+    @patch('migrate_json_to_db.get_project_root')
+    @patch('migrate_json_to_db.get_db_manager')
+    def test_bad_row_does_not_sink_its_chunk(self, mock_db_manager, mock_root, temp_agents_dir, real_db_manager):
+        """A row violating a constraint fails alone; the rest of its chunk is imported."""
+        mock_root.return_value = temp_agents_dir.parent
+        mock_db_manager.return_value = real_db_manager
+        _write_states(temp_agents_dir, 4)
+        (temp_agents_dir / "bulk0002" / "adw_state.json").write_text(json.dumps({
+            "adw_id": "bulk0002", "issue_number": -1
+        }))
+
+        result = migrate_json_to_database(chunk_size=10)
+
+        assert result['imported'] == 3
+        assert result['errors'] == 1
+        imported = real_db_manager.execute_query("SELECT adw_id FROM adw_json_imports")
+        assert "bulk0002" not in {row['adw_id'] for row in imported}
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])